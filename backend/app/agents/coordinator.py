@@ -0,0 +1,261 @@
+"""
+Coordinator - Development 워크플로우 LangGraph 그래프
+
+parse_request (순차)
+    ├─ search_ingredients  ┐
+    ├─ market_research     ├─ 병렬 실행 (fan-out, 같은 superstep)
+    └─ validate_safety     ┘
+            ↓ (fan-in)
+      merge_results
+
+- 서로 독립적인 노드는 한 superstep에서 동시에 실행됩니다.
+- 노드별 실행 시간은 `node_timings`에 기록됩니다.
+- 노드 결과는 checkpointer에 저장되므로, 실패 후 재시도 시 완료된 노드는 다시 실행하지 않고
+  마지막 checkpoint부터 이어서 실행합니다. 완료되었거나 모든 재시도가 실패한 실행의 checkpoint는 삭제합니다.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, START, END
+from sqlalchemy.orm import Session
+from app.schema.config import settings
+from app.schema.states import CoordinatorState
+from app.resources import resources
+from app.db.queries import get_ingredient_usage_limits
+from app.db.vector import search_ingredients_semantic
+from app.agents.research.market_research_agent import analyze_market_trends, load_formula_trends
+from app.agents.validation.safety_validator import validate_safety
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULTS = 10
+
+# parse_request 이후 병렬로 실행되는 노드
+PARALLEL_NODES = ("search_ingredients", "market_research", "validate_safety")
+
+
+def _timed(name: str, node: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """노드 실행 시간(ms)을 node_timings에 기록"""
+
+    def wrapper(state: CoordinatorState, config: RunnableConfig) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            update = node(state, config)
+        finally:
+            elapsed = round((time.perf_counter() - started) * 1000, 2)
+            logger.info(f"[coordinator] {name}: {elapsed}ms")
+        update["node_timings"] = {name: elapsed}
+        return update
+
+    return wrapper
+
+
+# =====================
+# Nodes
+# =====================
+
+def parse_request(state: CoordinatorState, config: RunnableConfig) -> Dict[str, Any]:
+    """사용자 입력 추출 및 공유 컨텍스트 로드 (DB 사용은 이 노드에서만)"""
+    history = state.get("conversation_history") or []
+    user_input = state.get("user_input") or next(
+        (message["content"] for message in reversed(history) if message.get("role") == "user"),
+        ""
+    )
+
+    db: Optional[Session] = config.get("configurable", {}).get("db")
+    usage_limits = get_ingredient_usage_limits(db) if db is not None else {}
+    formula_trends = load_formula_trends(db) if db is not None else {}
+
+    return {
+        "user_input": user_input,
+        "ingredient_usage_limits": usage_limits,
+        "formula_trends": formula_trends,
+        "current_agent": "parse_request",
+    }
+
+
+def route_parallel(state: CoordinatorState) -> List[str]:
+    """Fan-out: 실행할 독립 노드 목록 (배합이 없으면 검증 생략)"""
+    nodes = ["search_ingredients", "market_research"]
+    if state.get("current_formulation"):
+        nodes.append("validate_safety")
+    return nodes
+
+
+def search_ingredients(state: CoordinatorState, config: RunnableConfig) -> Dict[str, Any]:
+    """사용자 요청으로 원료 의미 검색 (ChromaDB)"""
+    query = state.get("user_input", "")
+    results = search_ingredients_semantic(query, n_results=SEARCH_RESULTS) if query else []
+
+    return {
+        "search_result": {
+            "query": query,
+            "search_type": "semantic",
+            "search_results": results,
+        }
+    }
+
+
+def market_research(state: CoordinatorState, config: RunnableConfig) -> Dict[str, Any]:
+    """저장된 Formula 기준 시장 트렌드 분석 (parse_request에서 로드한 통계 사용)"""
+    return {"research_result": analyze_market_trends(state.get("user_input", ""), state.get("formula_trends"))}
+
+
+def validate_safety_node(state: CoordinatorState, config: RunnableConfig) -> Dict[str, Any]:
+    """현재 배합의 IFRA / 알레르기 유발 성분 검증"""
+    return {
+        "validation_result": validate_safety(
+            state["current_formulation"],
+            state.get("ingredient_usage_limits")
+        )
+    }
+
+
+def merge_results(state: CoordinatorState, config: RunnableConfig) -> Dict[str, Any]:
+    """Fan-in: 병렬 노드 결과 통합"""
+    search = state.get("search_result") or {}
+    research = state.get("research_result") or {}
+    validation = state.get("validation_result")
+
+    lines = [f"Found {len(search.get('search_results') or [])} related ingredients."]
+    if research.get("popular_families"):
+        families = ", ".join(item["note_family"] for item in research["popular_families"])
+        lines.append(f"Popular note families in {research['formulas_analyzed']} saved formulas: {families}.")
+    if validation:
+        status = "passed" if validation.get("is_valid") else "failed"
+        lines.append(
+            f"Safety validation {status} "
+            f"({len(validation.get('validation_errors') or [])} errors, "
+            f"{len(validation.get('validation_warnings') or [])} warnings)."
+        )
+
+    return {
+        "current_agent": "merge_results",
+        "next_agent": "formulation",
+        "workflow_complete": True,
+        "final_response": " ".join(lines),
+    }
+
+
+# =====================
+# Graph
+# =====================
+
+def build_coordinator_graph(checkpointer: Optional[Any] = None):
+    """
+    Coordinator 그래프 생성 및 컴파일
+
+    Args:
+        checkpointer: 노드 결과 저장소 (기본: MemorySaver)
+
+    Returns:
+        컴파일된 LangGraph
+    """
+    graph = StateGraph(CoordinatorState)
+
+    graph.add_node("parse_request", _timed("parse_request", parse_request))
+    graph.add_node("search_ingredients", _timed("search_ingredients", search_ingredients))
+    graph.add_node("market_research", _timed("market_research", market_research))
+    graph.add_node("validate_safety", _timed("validate_safety", validate_safety_node))
+    graph.add_node("merge_results", _timed("merge_results", merge_results))
+
+    graph.add_edge(START, "parse_request")
+    graph.add_conditional_edges("parse_request", route_parallel, list(PARALLEL_NODES))
+    for node in PARALLEL_NODES:
+        graph.add_edge(node, "merge_results")
+    graph.add_edge("merge_results", END)
+
+    compiled = graph.compile(checkpointer=checkpointer or MemorySaver())
+    compiled.step_timeout = settings.LANGGRAPH_TIMEOUT
+    return compiled
+
+
+def _thread_id(session_id: str, conversation_history: List[Dict[str, str]], current_formulation: Optional[Dict]) -> str:
+    """같은 입력의 재시도는 같은 checkpoint thread를 사용"""
+    digest = hashlib.sha256(
+        repr((conversation_history, current_formulation)).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{session_id}:{digest}"
+
+
+def run_coordinator(
+    session_id: str,
+    conversation_history: List[Dict[str, str]],
+    db: Session,
+    current_formulation: Optional[Dict[str, Any]] = None,
+) -> CoordinatorState:
+    """
+    Coordinator 그래프 실행 (실패 시 마지막 checkpoint부터 재시도)
+
+    Args:
+        session_id: 세션 ID (CoordinatorState.session_id)
+        conversation_history: 대화 히스토리
+        db: Database session (parse_request에서만 사용)
+        current_formulation: 검증할 현재 배합 (없으면 검증 노드 생략)
+
+    Returns:
+        최종 CoordinatorState
+    """
+    config = {
+        "configurable": {
+            "thread_id": _thread_id(session_id, conversation_history, current_formulation),
+            "db": db,
+        },
+        "recursion_limit": settings.LANGGRAPH_RECURSION_LIMIT,
+    }
+    initial_state: Optional[CoordinatorState] = {
+        "session_id": session_id,
+        "conversation_history": conversation_history,
+        "current_formulation": current_formulation,
+        "workflow_complete": False,
+        "node_timings": {},
+    }
+
+    coordinator_graph = get_coordinator_graph()
+
+    # 이전 요청이 중간에 실패했다면 처음부터가 아니라 checkpoint부터 재개
+    snapshot = coordinator_graph.get_state(config)
+    if snapshot.next:
+        logger.info(f"[coordinator] Resuming {config['configurable']['thread_id']} at {snapshot.next}")
+        initial_state = None
+
+    thread_id = config["configurable"]["thread_id"]
+    attempts = max(1, settings.LANGGRAPH_MAX_RETRIES)
+    for attempt in range(1, attempts + 1):
+        try:
+            result = coordinator_graph.invoke(initial_state, config)
+            # 완료된 실행의 checkpoint는 더 필요 없음
+            _delete_thread(coordinator_graph, thread_id)
+            return result
+        except Exception as e:
+            logger.warning(f"[coordinator] Attempt {attempt}/{attempts} failed: {e}")
+            if attempt == attempts:
+                # 재시도를 모두 실패한 실행의 checkpoint도 삭제 (MemorySaver에 계속 쌓이지 않도록)
+                _delete_thread(coordinator_graph, thread_id)
+                raise
+            # 완료된 노드 결과는 checkpoint에 남아 있으므로 이어서 실행
+            initial_state = None
+
+
+def _delete_thread(graph: Any, thread_id: str) -> None:
+    """checkpointer에서 실행 기록 삭제 (지원하지 않는 checkpointer는 무시)"""
+    delete_thread = getattr(graph.checkpointer, "delete_thread", None)
+    if delete_thread is None:
+        return
+    try:
+        delete_thread(thread_id)
+    except Exception as e:
+        logger.warning(f"[coordinator] Failed to delete checkpoint {thread_id}: {e}")
+
+
+# Singleton instance (첫 실행 시 컴파일)
+_coordinator_graph = resources.register("coordinator_graph", build_coordinator_graph)
+
+
+def get_coordinator_graph():
+    """공유 Coordinator 그래프 (checkpoint 저장소 포함)"""
+    return _coordinator_graph.get()
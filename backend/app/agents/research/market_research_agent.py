@@ -1,5 +1,125 @@
 """
 Market Research Agent - 시장 트렌드 분석
+
+외부 트렌드 데이터 없이 저장된 Formula를 시장 데이터로 사용합니다.
+- 인기 향 계열: 전체 Formula 중 그 note family의 원료를 하나 이상 쓰는 비율
+- 성장 카테고리: 최근 RECENT_DAYS일 동안 저장된 Formula에서의 비율이 전체 비율보다 높은 계열
+- 트렌드 키워드: 최근 Formula에서 많이 쓰인 원료
+
+DB 조회(`load_formula_trends`)는 coordinator의 parse_request에서 한 번 하고,
+병렬로 실행되는 market_research 노드는 집계 결과로 분석만 합니다 (DB 세션을 공유하지 않음).
 """
 
-# TODO: Implement market trend analysis
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import Session
+from app.db.queries import get_formula_trend_rows, get_ingredient_note_families
+
+# 최근으로 보는 기간 (성장 카테고리 / 트렌드 키워드)
+RECENT_DAYS = 90
+
+# 반환할 계열 / 키워드 수
+TOP_FAMILIES = 5
+TOP_KEYWORDS = 10
+
+
+def _normalize(name: Any) -> str:
+    # composition 원료명과 DB 원료명 비교 (대소문자 / 공백 차이 무시, composition_index와 같은 규칙)
+    return " ".join(str(name or "").lower().split())
+
+
+def load_formula_trends(db: Session, recent_days: int = RECENT_DAYS, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    저장된 Formula의 note family / 원료 사용 통계
+
+    Args:
+        db: Database session
+        recent_days: 최근으로 보는 기간 (일)
+        now: 기준 시각 (기본: 현재)
+
+    Returns:
+        {"formulas", "recent_formulas", "recent_days", "families", "recent_families", "recent_ingredients"}
+        - families: {note family: 그 계열 원료를 쓰는 Formula 수}
+    """
+    families_by_name = {_normalize(name): family for name, family in get_ingredient_note_families(db).items()}
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=recent_days)
+
+    formulas = recent_formulas = 0
+    families: Counter = Counter()
+    recent_families: Counter = Counter()
+    recent_ingredients: Counter = Counter()
+    for created_at, composition in get_formula_trend_rows(db):
+        names = {
+            _normalize(item.get("name"))
+            for item in composition or []
+            if isinstance(item, dict) and _normalize(item.get("name"))
+        }
+        used = {families_by_name[name] for name in names if name in families_by_name}
+        formulas += 1
+        families.update(used)
+
+        if created_at is not None and created_at.tzinfo is None:
+            # SQLite는 timezone 없이 반환 (UTC로 저장됨)
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if created_at is not None and created_at >= cutoff:
+            recent_formulas += 1
+            recent_families.update(used)
+            recent_ingredients.update(names)
+
+    return {
+        "formulas": formulas,
+        "recent_formulas": recent_formulas,
+        "recent_days": recent_days,
+        "families": dict(families),
+        "recent_families": dict(recent_families),
+        "recent_ingredients": dict(recent_ingredients.most_common(TOP_KEYWORDS)),
+    }
+
+
+def analyze_market_trends(user_request: str, formula_trends: Optional[Dict[str, Any]] = None) -> Dict:
+    """
+    시장 트렌드 분석
+
+    Args:
+        user_request: 사용자 요청사항
+        formula_trends: `load_formula_trends` 결과 (없으면 빈 분석)
+
+    Returns:
+        트렌드 분석 결과 - popular_families / growing_categories / requested_families는
+        [{"note_family", "formulas", "share", ...}], trend_keywords는 원료명 목록
+    """
+    trends = formula_trends or {}
+    total = trends.get("formulas") or 0
+    recent_total = trends.get("recent_formulas") or 0
+    families: Dict[str, int] = trends.get("families") or {}
+    recent_families: Dict[str, int] = trends.get("recent_families") or {}
+
+    def family_stats(family: str) -> Dict[str, Any]:
+        count = families.get(family, 0)
+        return {"note_family": family, "formulas": count, "share": round(count / total, 3) if total else 0.0}
+
+    ranked = sorted(families, key=lambda family: (-families[family], family))
+    popular = [family_stats(family) for family in ranked[:TOP_FAMILIES]]
+
+    growing = []
+    if total and recent_total:
+        for family, count in recent_families.items():
+            recent_share = count / recent_total
+            growth = recent_share - families.get(family, 0) / total
+            if growth > 0:
+                growing.append({**family_stats(family), "recent_share": round(recent_share, 3), "growth": round(growth, 3)})
+        growing.sort(key=lambda item: (-item["growth"], item["note_family"]))
+
+    request = _normalize(user_request)
+    requested = [family_stats(family) for family in ranked if _normalize(family) and _normalize(family) in request]
+
+    return {
+        "query": user_request,
+        "formulas_analyzed": total,
+        "recent_days": trends.get("recent_days", RECENT_DAYS),
+        "popular_families": popular,
+        "growing_categories": growing[:TOP_FAMILIES],
+        "requested_families": requested,
+        "trend_keywords": list(trends.get("recent_ingredients") or {})[:TOP_KEYWORDS],
+    }
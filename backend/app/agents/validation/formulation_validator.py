@@ -2,47 +2,199 @@
 Formulation Validator - IFRA 규제 및 노트 밸런스 체크
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import re
 
+# 노트별 권장 비율 (%)
+NOTE_BALANCE_RANGES: Dict[str, Tuple[float, float]] = {
+    "top": (20.0, 30.0),
+    "middle": (40.0, 50.0),
+    "base": (20.0, 30.0),
+}
 
-def validate_ifra(formulation: Dict) -> Dict:
+# Formula 생성 프롬프트(get_formula_generation_prompt) 기준 비율
+FORMULA_NOTE_RANGES: Dict[str, Tuple[float, float]] = {
+    "top": (5.0, 15.0),
+    "middle": (50.0, 70.0),
+    "base": (15.0, 30.0),
+}
+
+_NOTE_ALIASES = {
+    "top": "top",
+    "head": "top",
+    "middle": "middle",
+    "heart": "middle",
+    "mid": "middle",
+    "base": "base",
+    "bottom": "base",
+}
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _normalize_name(name: Optional[str]) -> str:
+    return " ".join(str(name or "").lower().split())
+
+
+def _percentage(item: Dict) -> float:
+    try:
+        return float(item.get("percentage") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_max_usage(value: Optional[str]) -> Optional[float]:
+    """
+    DB의 max_usage_percentage 텍스트에서 최대 사용량(%) 추출
+
+    예: "5%" → 5.0, "0.1-1%" → 1.0, "No restriction" → None
+    """
+    if not value:
+        return None
+    numbers = [float(n) for n in _NUMBER.findall(str(value))]
+    return max(numbers) if numbers else None
+
+
+def validate_ifra(formulation: Dict, usage_limits: Optional[Dict[str, Optional[str]]] = None) -> Dict:
     """
-    IFRA 규제 체크 (Placeholder)
+    IFRA 규제 체크
+
+    DB에 등록된 원료의 max_usage_percentage와 배합 내 비율을 비교합니다.
+    (배합/concentrate 기준 비율)
 
     Args:
-        formulation: 검증할 배합
+        formulation: 검증할 배합 ({"ingredients": [{"name", "percentage", ...}]})
+        usage_limits: {원료명: max_usage_percentage 텍스트}
 
     Returns:
         검증 결과
     """
-    print("[formulation_validator] Checking IFRA compliance...")
+    limits = {
+        _normalize_name(name): parse_max_usage(value)
+        for name, value in (usage_limits or {}).items()
+    }
+
+    violations: List[str] = []
+    warnings: List[str] = []
+    for item in formulation.get("ingredients") or []:
+        name = item.get("name")
+        limit = limits.get(_normalize_name(name))
+        if limit is None:
+            continue
+        percentage = _percentage(item)
+        if percentage > limit:
+            violations.append(f"{name}: {percentage}% exceeds max usage {limit}%")
+        elif percentage > limit * 0.9:
+            warnings.append(f"{name}: {percentage}% is close to max usage {limit}%")
+
+    return {
+        "is_compliant": not violations,
+        "violations": violations,
+        "warnings": warnings
+    }
+
+
+def validate_note_balance(
+    formulation: Dict,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> Dict:
+    """
+    노트 밸런스 체크
+
+    Top: 20-30%, Middle: 40-50%, Base: 20-30% (기본값)
+
+    Args:
+        formulation: 검증할 배합
+        ranges: 노트별 (최소, 최대) 비율
+
+    Returns:
+        밸런스 검증 결과 (deviation: 권장 범위를 벗어난 비율의 합)
+    """
+    ranges = ranges or NOTE_BALANCE_RANGES
+    totals = {"top": 0.0, "middle": 0.0, "base": 0.0}
+    for item in formulation.get("ingredients") or []:
+        note = _NOTE_ALIASES.get(str(item.get("note") or "").strip().lower())
+        if note:
+            totals[note] += _percentage(item)
+
+    deviation = 0.0
+    for note, (low, high) in ranges.items():
+        value = totals[note]
+        if value < low:
+            deviation += low - value
+        elif value > high:
+            deviation += value - high
+
+    return {
+        "is_balanced": deviation == 0,
+        "top_percent": round(totals["top"], 2),
+        "middle_percent": round(totals["middle"], 2),
+        "base_percent": round(totals["base"], 2),
+        "deviation": round(deviation, 2)
+    }
+
 
-    # TODO: 실제 IFRA 규제 체크 로직
+def validate_total_percentage(formulation: Dict, tolerance: float = 0.5) -> Dict:
+    """총 비율이 100%인지 체크"""
+    total = sum(_percentage(item) for item in formulation.get("ingredients") or [])
     return {
-        "is_compliant": True,
-        "violations": [],
-        "warnings": []
+        "is_valid": abs(total - 100.0) <= tolerance,
+        "total_percent": round(total, 2)
     }
 
 
-def validate_note_balance(formulation: Dict) -> Dict:
+def check_catalog_coverage(formulation: Dict, catalog_names: Optional[List[str]] = None) -> Dict:
+    """
+    DB 원료 사용 비율 체크 (원가/수급 기준)
+
+    DB에 등록된 원료는 원가와 수급이 확인된 원료이므로, 목록 밖 원료가 많을수록
+    추가 소싱 비용이 발생합니다.
     """
-    노트 밸런스 체크 (Placeholder)
+    catalog = {_normalize_name(name) for name in catalog_names or []}
+    ingredients = formulation.get("ingredients") or []
+    missing = [item.get("name") for item in ingredients if _normalize_name(item.get("name")) not in catalog]
+    coverage = 1.0 - len(missing) / len(ingredients) if ingredients else 0.0
 
-    Top: 20-30%, Middle: 40-50%, Base: 20-30%
+    return {
+        "coverage": round(coverage, 3),
+        "missing_ingredients": missing
+    }
+
+
+def score_formulation(
+    formulation: Dict,
+    usage_limits: Optional[Dict[str, Optional[str]]] = None,
+    catalog_names: Optional[List[str]] = None,
+    note_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> Dict:
+    """
+    로컬 검증 결과를 종합한 배합 점수 (0-100, 높을수록 좋음)
 
     Args:
         formulation: 검증할 배합
+        usage_limits: {원료명: max_usage_percentage}
+        catalog_names: DB 원료명 리스트
+        note_ranges: 노트 밸런스 기준 (None이면 밸런스 체크 생략 - 예: Accord)
 
     Returns:
-        밸런스 검증 결과
+        {"score": float, "checks": {...}}
     """
-    print("[formulation_validator] Checking note balance...")
+    total = validate_total_percentage(formulation)
+    ifra = validate_ifra(formulation, usage_limits)
+    coverage = check_catalog_coverage(formulation, catalog_names)
+    checks = {"total_percentage": total, "ifra": ifra, "catalog": coverage}
+
+    score = 100.0
+    score -= min(abs(total["total_percent"] - 100.0), 20.0)
+    score -= 15.0 * len(ifra["violations"]) + 3.0 * len(ifra["warnings"])
+    score -= 20.0 * (1.0 - coverage["coverage"])
+
+    if note_ranges is not None:
+        balance = validate_note_balance(formulation, note_ranges)
+        checks["note_balance"] = balance
+        score -= min(balance["deviation"], 30.0)
 
-    # TODO: 실제 밸런스 체크 로직
     return {
-        "is_balanced": True,
-        "top_percent": 25.0,
-        "middle_percent": 50.0,
-        "base_percent": 25.0
+        "score": round(max(score, 0.0), 2),
+        "checks": checks
     }
@@ -2,4 +2,76 @@
 Safety Validator - 안전성 검증
 """
 
-# TODO: Implement allergen and safety checks
+from typing import Dict, List, Optional
+import re
+from app.agents.validation.formulation_validator import validate_ifra
+
+# EU 화장품 규정 표시 대상 알레르기 유발 성분 (26종)
+DECLARABLE_ALLERGENS = (
+    "amyl cinnamal", "amylcinnamyl alcohol", "anise alcohol", "benzyl alcohol",
+    "benzyl benzoate", "benzyl cinnamate", "benzyl salicylate", "cinnamal",
+    "cinnamyl alcohol", "citral", "citronellol", "coumarin", "eugenol",
+    "farnesol", "geraniol", "hexyl cinnamal", "hydroxycitronellal",
+    "hydroxyisohexyl 3-cyclohexene carboxaldehyde", "isoeugenol",
+    "butylphenyl methylpropional", "d-limonene", "limonene", "linalool",
+    "methyl 2-octynoate", "alpha-isomethyl ionone", "oakmoss", "treemoss",
+)
+
+
+def _normalize(name: str) -> str:
+    # 대소문자 / 하이픈 / 공백 차이 무시 ("Alpha-Isomethyl  Ionone" → "alpha isomethyl ionone")
+    return " ".join(name.lower().replace("-", " ").split())
+
+
+# 단어 단위로 비교, 긴 이름부터 (isoeugenol / hexyl cinnamal이 eugenol / cinnamal보다 먼저)
+_ALLERGEN_PATTERNS = tuple(
+    (allergen, re.compile(rf"\b{re.escape(_normalize(allergen))}\b"))
+    for allergen in sorted(DECLARABLE_ALLERGENS, key=lambda allergen: -len(_normalize(allergen)))
+)
+
+
+def find_allergens(formulation: Dict) -> List[Dict]:
+    """
+    배합 내 알레르기 유발 성분 확인 (원료명 기준)
+
+    Returns:
+        [{"name": "Linalool", "allergen": "linalool", "percentage": 3.0}, ...]
+    """
+    found = []
+    for item in formulation.get("ingredients") or []:
+        name = str(item.get("name") or "")
+        normalized = _normalize(name)
+        for allergen, pattern in _ALLERGEN_PATTERNS:
+            if pattern.search(normalized):
+                found.append({"name": name, "allergen": allergen, "percentage": item.get("percentage")})
+                break
+    return found
+
+
+def validate_safety(formulation: Dict, usage_limits: Optional[Dict[str, Optional[str]]] = None) -> Dict:
+    """
+    안전성 검증 (IFRA 최대 사용량 + 알레르기 유발 성분)
+
+    Args:
+        formulation: 검증할 배합 ({"ingredients": [{"name", "percentage", ...}]})
+        usage_limits: {원료명: max_usage_percentage 텍스트}
+
+    Returns:
+        ValidationState 형식의 검증 결과
+    """
+    ifra = validate_ifra(formulation, usage_limits)
+    allergens = find_allergens(formulation)
+
+    warnings = list(ifra["warnings"])
+    if allergens:
+        names = ", ".join(sorted({a["name"] for a in allergens}))
+        warnings.append(f"Contains declarable allergens: {names}")
+
+    return {
+        "formulation": formulation,
+        "is_valid": ifra["is_compliant"],
+        "ifra_compliant": ifra["is_compliant"],
+        "validation_errors": ifra["violations"],
+        "validation_warnings": warnings,
+        "suggestions": [],
+    }
@@ -1,7 +1,53 @@
+from typing import List
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from app.schema.config import settings
+from app.resources import resources
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=(settings.ENV == "development")
-)
+
+def _create_engine() -> Engine:
+    if not settings.DATABASE_URL:
+        raise RuntimeError("DATABASE_URL is not configured")
+    return create_engine(
+        settings.DATABASE_URL,
+        echo=(settings.ENV == "development")
+    )
+
+
+def _create_replica_engines() -> List[Engine]:
+    # 연결 실패 시 primary로 대체하는 이벤트는 replicas.py에서 설치
+    return [
+        create_engine(
+            url,
+            echo=(settings.ENV == "development"),
+            pool_pre_ping=True
+        )
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+
+
+def _dispose_all(engines: List[Engine]) -> None:
+    for engine in engines:
+        engine.dispose()
+
+
+# 첫 DB 사용 시 생성 (import 시점에는 연결 설정을 읽지 않음)
+_engine = resources.register("database", _create_engine, close=lambda engine: engine.dispose())
+_replica_engines = resources.register("database_replicas", _create_replica_engines, close=_dispose_all)
+
+
+def get_engine() -> Engine:
+    """공유 SQLAlchemy 엔진 (primary - 쓰기 및 replica가 없을 때 모든 쿼리)"""
+    return _engine.get()
+
+
+def get_replica_engines() -> List[Engine]:
+    """읽기 전용 replica 엔진 (DATABASE_REPLICA_URLS 순서, 없으면 빈 리스트)"""
+    return _replica_engines.get()
+
+
+def __getattr__(name: str):
+    # 기존 `from app.db.initialization.engine import engine` 호환
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,131 @@
+"""
+기존 DB 스키마 업데이트
+
+`create_tables.py`(create_all)는 없는 테이블만 만들고, 이미 있는 테이블에 추가된 인덱스 / 컬럼은 만들지 않습니다.
+이미 운영 중인 DB에는 이 스크립트로 변경을 적용합니다. 적용한 migration은 `schema_migrations`에 기록되어
+다시 실행해도 건너뜁니다.
+
+실행:
+    python -m app.db.initialization.migrations
+"""
+
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from app.db.initialization.engine import get_engine
+from app.db.queries.accord_queries import composition_notes
+from app.db.schema import Base, Ingredient, Formula, Accord, DevelopmentSession
+
+# 적용 기록 (모델 metadata와 분리 - create_all 대상 아님)
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("name", String(255), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def _create_indexes(table_name: str, *index_names: str) -> Callable[[Connection], None]:
+    """모델(`db/schema.py`)에 선언된 인덱스 생성 (dialect 조건 `ddl_if` 적용, 이미 있으면 건너뜀)"""
+    def migrate(connection: Connection) -> None:
+        table = Base.metadata.tables[table_name]
+        for index in table.indexes:
+            if index.name in index_names:
+                index.create(connection, checkfirst=True)
+    return migrate
+
+
+def _add_columns(table_name: str, *column_names: str) -> Callable[[Connection], None]:
+    """모델에 선언된 nullable 컬럼 추가 (이미 있으면 건너뜀)"""
+    def migrate(connection: Connection) -> None:
+        table = Base.metadata.tables[table_name]
+        existing = {column["name"] for column in inspect(connection).get_columns(table_name)}
+        for name in column_names:
+            if name in existing:
+                continue
+            column_type = table.c[name].type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+    return migrate
+
+
+def _json_to_jsonb(connection: Connection) -> None:
+    """배합 / 노트 JSON 컬럼 → JSONB (PostgreSQL만, SQLite는 JSON 그대로) + GIN 인덱스"""
+    if connection.dialect.name == "postgresql":
+        for table, column in (
+            (Formula.__tablename__, "ingredients_composition"),
+            (Accord.__tablename__, "ingredients_composition"),
+            (Accord.__tablename__, "top_notes"),
+            (Accord.__tablename__, "middle_notes"),
+            (Accord.__tablename__, "base_notes"),
+        ):
+            connection.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+            ))
+    _create_indexes(Formula.__tablename__, "ix_formulas_ingredients_composition_gin")(connection)
+    _create_indexes(
+        Accord.__tablename__,
+        "ix_accords_ingredients_composition_gin",
+        "ix_accords_top_notes_gin",
+        "ix_accords_middle_notes_gin",
+        "ix_accords_base_notes_gin",
+    )(connection)
+
+
+def _backfill_accord_notes(connection: Connection) -> None:
+    """기존 Accord의 노트 컬럼을 ingredients_composition의 note로 채움 (비어 있는 것만)"""
+    accords = Accord.__table__
+    rows = connection.execute(select(
+        accords.c.id, accords.c.ingredients_composition, accords.c.top_notes, accords.c.middle_notes, accords.c.base_notes
+    )).all()
+    for accord_id, composition, *notes in rows:
+        # SQL NULL / JSON null / [] 모두 비어 있는 것으로 처리
+        if any(notes):
+            continue
+        connection.execute(update(accords).where(accords.c.id == accord_id).values(**composition_notes(composition)))
+
+
+# (이름, 적용 함수) - 순서대로 한 번씩 적용, 이름은 바꾸지 말 것
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    (
+        "0001_ingredient_facet_indexes",
+        _create_indexes(
+            Ingredient.__tablename__,
+            "ix_ingredients_note_family_volatility_tenacity",
+            "ix_ingredients_volatility",
+            "ix_ingredients_tenacity",
+            "ix_ingredients_perfume_applications_gin",
+        ),
+    ),
+    ("0002_composition_jsonb", _json_to_jsonb),
+    ("0003_backfill_accord_notes", _backfill_accord_notes),
+    (
+        "0004_development_session_producer",
+        _add_columns(DevelopmentSession.__tablename__, "producer_id", "heartbeat_at"),
+    ),
+]
+
+
+def run_migrations() -> List[str]:
+    """적용하지 않은 migration 실행 (migration마다 트랜잭션 하나) - 새로 적용한 이름 목록 반환"""
+    engine = get_engine()
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migrations.c.name)).scalars())
+
+    newly_applied = []
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as connection:
+            migrate(connection)
+            connection.execute(schema_migrations.insert().values(name=name))
+        newly_applied.append(name)
+    return newly_applied
+
+
+if __name__ == "__main__":
+    print("Applying migrations...")
+    applied = run_migrations()
+    for name in applied:
+        print(f"  - {name}")
+    print(f"✅ {len(applied)} migration(s) applied")
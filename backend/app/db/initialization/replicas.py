@@ -0,0 +1,127 @@
+"""
+Read replica 선택 / 장애 시 primary fallback / 요청 단위 read-your-writes 상태
+
+- `replica_router.choose()`: 사용 가능한 replica를 round-robin으로 선택 (없거나 모두 장애면 None → primary)
+- replica 연결이 실패하면 DATABASE_REPLICA_RETRY_SECONDS 동안 장애로 표시하고,
+  실패한 그 연결은 primary DBAPI 연결로 대체 (해당 쿼리는 에러 없이 primary에서 실행)
+- `current_read_routing`: 요청 단위 상태 (`ReplicaStickinessMiddleware`가 설정, 세션이 쓰기를 기록)
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from app.db.initialization.engine import get_engine, get_replica_engines
+from app.schema.config import settings
+from app.services.metrics import DB_REPLICA_FAILURES
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# =====================
+# Request context (read-your-writes)
+# =====================
+
+class ReadRouting:
+    __slots__ = ("primary", "wrote")
+
+    def __init__(self, primary: bool = False):
+        self.primary = primary  # 최근에 쓴 클라이언트 - 이 요청의 읽기도 primary로
+        self.wrote = False  # 이 요청에서 쓰기 발생 - 응답에 stickiness cookie 설정
+
+
+# threadpool로 실행되는 sync 라우트 / 의존성에도 context가 복사되므로 같은 객체에 기록됨
+current_read_routing: ContextVar[Optional[ReadRouting]] = ContextVar("current_read_routing", default=None)
+
+
+# =====================
+# Replica selection
+# =====================
+
+class ReplicaRouter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._down_until: Dict[int, float] = {}  # id(engine) → 다시 시도할 시각 (time.monotonic)
+        self._errors: Dict[int, str] = {}
+        self._installed: set = set()
+
+    def engines(self) -> List[Engine]:
+        """replica 엔진 (첫 호출 시 fallback 이벤트 설치)"""
+        engines = get_replica_engines()
+        if len(self._installed) < len(engines):
+            with self._lock:
+                for engine in engines:
+                    if id(engine) not in self._installed:
+                        self._install_fallback(engine)
+                        self._installed.add(id(engine))
+        return engines
+
+    def available(self, engine: Engine) -> bool:
+        return self._down_until.get(id(engine), 0.0) <= time.monotonic()
+
+    def choose(self) -> Optional[Engine]:
+        """사용 가능한 replica (round-robin) - 없으면 None"""
+        engines = self.engines()
+        if not engines:
+            return None
+        healthy = [engine for engine in engines if self.available(engine)]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_down(self, engine: Engine, error: BaseException) -> None:
+        with self._lock:
+            self._down_until[id(engine)] = time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+            self._errors[id(engine)] = f"{type(error).__name__}: {error}"
+        DB_REPLICA_FAILURES.inc(replica=engine.url.render_as_string(hide_password=True))
+        logger.warning(
+            f"Replica {engine.url.render_as_string(hide_password=True)} unavailable, "
+            f"using primary for {settings.DATABASE_REPLICA_RETRY_SECONDS}s: {error}"
+        )
+
+    def status(self) -> List[Dict[str, Any]]:
+        """replica별 상태 (`/health`) - 생성 전이면 빈 리스트"""
+        if not settings.DATABASE_REPLICA_URLS:
+            return []
+        now = time.monotonic()
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "available": self.available(engine),
+                "retry_in_seconds": round(max(0.0, self._down_until.get(id(engine), 0.0) - now), 1),
+                "last_error": self._errors.get(id(engine)),
+            }
+            for engine in self.engines()
+        ]
+
+    def _install_fallback(self, engine: Engine) -> None:
+        router = self
+
+        @event.listens_for(engine, "do_connect")
+        def _connect(dialect, conn_rec, cargs, cparams):
+            try:
+                connection = dialect.connect(*cargs, **cparams)
+            except Exception as error:
+                # replica 대신 primary에 연결 - 이 풀 슬롯은 재시도 시각 이후 checkout 시 다시 연결
+                router.mark_down(engine, error)
+                primary = get_engine()
+                primary_args, primary_params = primary.dialect.create_connect_args(primary.url)
+                conn_rec.info["replica_fallback"] = True
+                return primary.dialect.connect(*primary_args, **primary_params)
+            conn_rec.info.pop("replica_fallback", None)
+            return connection
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_connection, conn_rec, proxy):
+            if conn_rec.info.get("replica_fallback") and router.available(engine):
+                # 풀이 이 연결을 버리고 replica로 다시 연결 (실패하면 다시 primary로 대체)
+                raise exc.DisconnectionError("Retrying replica connection")
+
+
+# Singleton instance
+replica_router = ReplicaRouter()
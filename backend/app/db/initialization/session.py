@@ -1,12 +1,91 @@
+from typing import Any, Optional
 from sqlalchemy.orm import sessionmaker, Session
-from app.db.initialization.engine import engine
+from app.db.initialization.engine import get_engine
+from app.db.initialization.replicas import current_read_routing, replica_router
+from app.db.queries.version_queries import listen_table_versions
+from app.schema.config import settings
+from app.services.metrics import DB_SESSION_ROUTES
 
-SessionLocal = sessionmaker(
+
+def _is_read_only(clause: Any) -> bool:
+    """replica로 보내도 되는 문장: SELECT (FOR UPDATE / `use_primary` 옵션 제외)"""
+    if clause is None or not getattr(clause, "is_select", False):
+        return False
+    if getattr(clause, "_for_update_arg", None) is not None:
+        return False
+    return not clause.get_execution_options().get("use_primary", False)
+
+
+def _is_write(clause: Any) -> bool:
+    """INSERT / UPDATE / DELETE 또는 쓰기 전 잠금 (SELECT ... FOR UPDATE)"""
+    return getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None
+
+
+class RoutingSession(Session):
+    """
+    읽기 전용 SELECT는 read replica로, 나머지는 primary(세션 bind)로 보내는 세션
+
+    - flush / INSERT / UPDATE / DELETE / FOR UPDATE / text() / 문장 없는 `connection()`: primary
+    - 세션에서 한 번 쓰면 이후 읽기도 primary (read-your-writes, commit 이후에도 유지)
+    - 요청 단위: 최근에 쓴 클라이언트(`ReplicaStickinessMiddleware`)의 읽기도 primary
+    - `.execution_options(use_primary=True)`: 그 쿼리만 primary
+    - 세션은 처음 고른 replica 하나만 사용 (replica마다 지연이 달라도 읽기 결과가 뒤로 가지 않음)
+    - replica가 없거나 모두 장애면 primary
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wrote = False
+        self._replica = None
+
+    def get_bind(self, mapper: Optional[Any] = None, *, clause: Optional[Any] = None, bind: Optional[Any] = None, **kw):
+        primary = super().get_bind(mapper, clause=clause, bind=bind, **kw)
+        if bind is not None or not settings.DATABASE_REPLICA_URLS:
+            return primary
+
+        if self._flushing or _is_write(clause):
+            self._record_write()
+            return primary
+
+        routing = current_read_routing.get()
+        if not _is_read_only(clause) or self.wrote or (routing is not None and routing.primary):
+            if clause is not None:
+                DB_SESSION_ROUTES.inc(target="primary")
+            return primary
+
+        if self._replica is None:
+            self._replica = replica_router.choose()
+        DB_SESSION_ROUTES.inc(target="primary" if self._replica is None else "replica")
+        return primary if self._replica is None else self._replica
+
+    def _record_write(self) -> None:
+        DB_SESSION_ROUTES.inc(target="primary")
+        if self.wrote:
+            return
+        self.wrote = True
+        routing = current_read_routing.get()
+        if routing is not None:
+            routing.wrote = True
+
+
+class _LazySessionmaker(sessionmaker):
+    """첫 세션 생성 시 엔진 연결 (import 시점에 엔진을 만들지 않음)"""
+
+    def __call__(self, **local_kw) -> Session:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(
+    class_=RoutingSession,
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
+# 카탈로그 테이블 변경 시 table_versions 증가 (목록 API ETag), 세션이 만든 버전 기록 (composition index)
+listen_table_versions(SessionLocal)
+
 def get_db() -> Session:
     """FastAPI 의존성 주입용 DB 세션"""
     db = SessionLocal()
@@ -4,55 +4,192 @@ DB Queries Layer
 
 from .ingredient_queries import (
     get_all_ingredients,
+    get_ingredient_list_rows,
+    INGREDIENT_FACETS,
+    filter_ingredient_rows,
+    count_filtered_ingredients,
+    get_ingredient_facets,
     get_ingredient_by_id,
     create_ingredient,
     update_ingredient,
     delete_ingredient,
     search_ingredients_by_name,
     get_ingredient_names,
+    get_ingredient_usage_limits,
+    get_ingredient_note_families,
+    INGREDIENT_BULK_FIELDS,
+    bulk_update_ingredients,
+    bulk_delete_ingredients,
 )
 
 from .accord_queries import (
     get_all_accords,
+    get_accord_list_rows,
+    get_accord_rows_with_ingredient,
+    composition_notes,
+    get_accord_detail_row,
     get_accord_by_id,
+    get_accords_by_ids,
+    get_accord_compositions,
     get_accord_by_name,
     create_accord,
     update_accord,
     delete_accord,
+    ACCORD_BULK_FIELDS,
+    ACCORD_FILTERS,
+    bulk_update_accords,
+    bulk_delete_accords,
 )
 
 from .formula_queries import (
     get_all_formulas,
+    get_formula_list_rows,
+    get_formula_rows_with_ingredient,
+    get_formula_detail_row,
     get_formula_by_id,
+    get_formulas_by_ids,
+    get_formula_compositions,
+    get_formula_trend_rows,
     get_formula_by_name,
     create_formula,
     update_formula,
     delete_formula,
+    FORMULA_BULK_FIELDS,
+    FORMULA_FILTERS,
+    bulk_update_formulas,
+    bulk_delete_formulas,
+)
+
+from .json_queries import (
+    is_postgresql,
+    json_array_length,
+    json_array_contains,
+)
+
+from .bulk_queries import (
+    id_condition,
+    bulk_update_rows,
+    bulk_delete_rows,
+)
+
+from .session_queries import (
+    get_development_session,
+    save_development_session,
+    touch_development_session,
+    delete_development_session,
+)
+
+from .version_queries import (
+    VERSIONED_TABLES,
+    bump_table_versions,
+    record_table_versions,
+    pop_table_versions,
+    track_table_versions,
+    listen_table_versions,
+    get_table_version,
+    get_entity_timestamps,
+)
+
+from .job_queries import (
+    create_job,
+    get_job_by_id,
+    get_jobs,
+    claim_next_job,
+    touch_job,
+    complete_job,
+    fail_job,
+    requeue_stale_jobs,
 )
 
 __all__ = [
     # Ingredient queries
     "get_all_ingredients",
+    "get_ingredient_list_rows",
+    "INGREDIENT_FACETS",
+    "filter_ingredient_rows",
+    "count_filtered_ingredients",
+    "get_ingredient_facets",
     "get_ingredient_by_id",
     "create_ingredient",
     "update_ingredient",
     "delete_ingredient",
     "search_ingredients_by_name",
     "get_ingredient_names",
+    "get_ingredient_usage_limits",
+    "get_ingredient_note_families",
+    "INGREDIENT_BULK_FIELDS",
+    "bulk_update_ingredients",
+    "bulk_delete_ingredients",
 
     # Accord queries
     "get_all_accords",
+    "get_accord_list_rows",
+    "get_accord_rows_with_ingredient",
+    "composition_notes",
+    "get_accord_detail_row",
     "get_accord_by_id",
+    "get_accords_by_ids",
+    "get_accord_compositions",
     "get_accord_by_name",
     "create_accord",
     "update_accord",
     "delete_accord",
+    "ACCORD_BULK_FIELDS",
+    "ACCORD_FILTERS",
+    "bulk_update_accords",
+    "bulk_delete_accords",
 
     # Formula queries
     "get_all_formulas",
+    "get_formula_list_rows",
+    "get_formula_rows_with_ingredient",
+    "get_formula_detail_row",
     "get_formula_by_id",
+    "get_formulas_by_ids",
+    "get_formula_compositions",
+    "get_formula_trend_rows",
     "get_formula_by_name",
     "create_formula",
     "update_formula",
     "delete_formula",
+    "FORMULA_BULK_FIELDS",
+    "FORMULA_FILTERS",
+    "bulk_update_formulas",
+    "bulk_delete_formulas",
+
+    # JSON column helpers
+    "is_postgresql",
+    "json_array_length",
+    "json_array_contains",
+
+    # Bulk write helpers
+    "id_condition",
+    "bulk_update_rows",
+    "bulk_delete_rows",
+
+    # Development session queries
+    "get_development_session",
+    "save_development_session",
+    "touch_development_session",
+    "delete_development_session",
+
+    # Table version queries
+    "VERSIONED_TABLES",
+    "bump_table_versions",
+    "record_table_versions",
+    "pop_table_versions",
+    "track_table_versions",
+    "listen_table_versions",
+    "get_table_version",
+    "get_entity_timestamps",
+
+    # Job queries
+    "create_job",
+    "get_job_by_id",
+    "get_jobs",
+    "claim_next_job",
+    "touch_job",
+    "complete_job",
+    "fail_job",
+    "requeue_stale_jobs",
 ]
@@ -2,9 +2,22 @@
 Accord DB query functions
 """
 
+from sqlalchemy import func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.db.schema import Accord
-from typing import List, Optional
+from app.db.queries.json_queries import json_array_contains, json_array_length
+from app.db.queries.bulk_queries import bulk_delete_rows, bulk_update_rows, bulk_values, filter_values, id_condition
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Note columns (top_notes / middle_notes / base_notes)
+NOTE_POSITIONS = ("top", "middle", "base")
+
+# Columns the bulk PATCH endpoint may set (name is unique, composition is per accord)
+ACCORD_BULK_FIELDS = ("accord_type", "description", "longevity", "sillage", "llm_recommendation")
+
+# Bulk selection filters: {"type": [...], "ingredient": "Ambroxan", "note": "base"}
+ACCORD_FILTERS = ("type", "ingredient", "note")
 
 
 def get_all_accords(db: Session) -> List[Accord]:
@@ -12,18 +25,106 @@ def get_all_accords(db: Session) -> List[Accord]:
     return db.query(Accord).all()
 
 
+def get_accord_list_rows(db: Session) -> List[Row]:
+    """
+    Get (id, name, type, ingredients_count, created_at) rows for the list endpoint
+
+    Counts composition items in SQL (jsonb_array_length on PostgreSQL, json_array_length on SQLite)
+    instead of loading and parsing every composition.
+    """
+    return _list_query(db).all()
+
+
+def _list_query(db: Session):
+    return db.query(
+        Accord.id,
+        Accord.name,
+        Accord.accord_type.label("type"),
+        func.coalesce(json_array_length(db, Accord.ingredients_composition), 0).label("ingredients_count"),
+        Accord.created_at,
+    )
+
+
+def get_accord_rows_with_ingredient(db: Session, ingredient: str, note: Optional[str] = None) -> List[Row]:
+    """
+    Get list rows of accords containing an ingredient (exact name, containment query in SQL)
+
+    Args:
+        note: "top" / "middle" / "base" - only accords with the ingredient in that note column
+              (e.g. note="base", ingredient="Ambroxan")
+    """
+    return _list_query(db).filter(_ingredient_condition(db, ingredient, note)).order_by(Accord.id).all()
+
+
+def _ingredient_condition(db: Session, ingredient: str, note: Optional[str]):
+    if note is None:
+        return json_array_contains(db, Accord.ingredients_composition, {"name": ingredient})
+    if note not in NOTE_POSITIONS:
+        raise ValueError(f"note must be one of {NOTE_POSITIONS}")
+    return json_array_contains(db, getattr(Accord, f"{note}_notes"), ingredient)
+
+
+def composition_notes(composition: Any) -> Dict[str, List[str]]:
+    """
+    Group composition ingredient names by their "note" into the note columns
+
+    "Top" / "Middle" / "Heart" / "Base" (any case, e.g. "Base note") are recognised;
+    items without a note are left out.
+    """
+    notes: Dict[str, List[str]] = {f"{position}_notes": [] for position in NOTE_POSITIONS}
+    for item in composition or []:
+        if not isinstance(item, dict) or not item.get("name"):
+            continue
+        note = str(item.get("note") or "").strip().lower()
+        if note.startswith("heart"):
+            note = "middle"
+        position = next((position for position in NOTE_POSITIONS if note.startswith(position)), None)
+        if position and item["name"] not in notes[f"{position}_notes"]:
+            notes[f"{position}_notes"].append(item["name"])
+    return notes
+
+
+def get_accord_detail_row(db: Session, accord_id: int) -> Optional[Row]:
+    """Get the columns returned by the detail endpoint as a single row"""
+    return db.query(
+        Accord.id,
+        Accord.name,
+        Accord.accord_type.label("type"),
+        Accord.description,
+        Accord.ingredients_composition,
+        Accord.longevity,
+        Accord.sillage,
+        Accord.llm_recommendation,
+        Accord.created_at,
+    ).filter(Accord.id == accord_id).first()
+
+
 def get_accord_by_id(db: Session, accord_id: int) -> Optional[Accord]:
     """Get Accord by ID"""
     return db.query(Accord).filter(Accord.id == accord_id).first()
 
 
+def get_accords_by_ids(db: Session, accord_ids: List[int]) -> List[Accord]:
+    """Get Accords by IDs (single query)"""
+    if not accord_ids:
+        return []
+    return db.query(Accord).filter(Accord.id.in_(accord_ids)).all()
+
+
+def get_accord_compositions(db: Session) -> List[Tuple[int, list]]:
+    """Get (id, ingredients_composition) pairs for similarity indexing"""
+    return db.query(Accord.id, Accord.ingredients_composition).all()
+
+
 def get_accord_by_name(db: Session, name: str) -> Optional[Accord]:
     """Get Accord by name"""
     return db.query(Accord).filter(Accord.name == name).first()
 
 
 def create_accord(db: Session, accord_data: dict) -> Accord:
-    """Create new Accord"""
+    """Create new Accord (note columns derived from the composition unless given)"""
+    if "ingredients_composition" in accord_data:
+        accord_data = {**composition_notes(accord_data["ingredients_composition"]), **accord_data}
     new_accord = Accord(**accord_data)
     db.add(new_accord)
     db.commit()
@@ -32,11 +133,14 @@ def create_accord(db: Session, accord_data: dict) -> Accord:
 
 
 def update_accord(db: Session, accord_id: int, update_data: dict) -> Optional[Accord]:
-    """Update Accord"""
+    """Update Accord (note columns follow a new composition)"""
     accord = get_accord_by_id(db, accord_id)
     if not accord:
         return None
 
+    if "ingredients_composition" in update_data:
+        update_data = {**composition_notes(update_data["ingredients_composition"]), **update_data}
+
     for key, value in update_data.items():
         setattr(accord, key, value)
 
@@ -54,3 +158,43 @@ def delete_accord(db: Session, accord_id: int) -> bool:
     db.delete(accord)
     db.commit()
     return True
+
+
+def _accord_selection(db: Session, ids: Optional[Sequence[int]], filters: Optional[Dict[str, Any]]) -> List[Any]:
+    """WHERE conditions for bulk writes: id list and/or filters (both given = both must match)"""
+    conditions = []
+    if ids:
+        conditions.append(id_condition(db, Accord.id, ids))
+    if filters:
+        unknown = set(filters) - set(ACCORD_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filter fields: {sorted(unknown)} (available: {list(ACCORD_FILTERS)})")
+        types = filter_values(filters.get("type"))
+        if types:
+            conditions.append(Accord.accord_type.in_(types))
+        if filters.get("ingredient"):
+            conditions.append(_ingredient_condition(db, filters["ingredient"], filters.get("note")))
+        elif filters.get("note"):
+            raise ValueError("filter.note requires filter.ingredient")
+    return conditions
+
+
+def bulk_update_accords(
+    db: Session,
+    values: Dict[str, Any],
+    ids: Optional[Sequence[int]] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Row]:
+    """Update the selected accords in one statement; returns (id, name) of updated rows"""
+    return bulk_update_rows(
+        db, Accord, _accord_selection(db, ids, filters), bulk_values(values, ACCORD_BULK_FIELDS), (Accord.id, Accord.name)
+    )
+
+
+def bulk_delete_accords(
+    db: Session,
+    ids: Optional[Sequence[int]] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Row]:
+    """Delete the selected accords in one statement; returns (id, name) of deleted rows"""
+    return bulk_delete_rows(db, Accord, _accord_selection(db, ids, filters), (Accord.id, Accord.name))
@@ -0,0 +1,105 @@
+"""
+Set-based bulk write functions
+
+One `UPDATE ... RETURNING` / `DELETE ... RETURNING` statement and one transaction per call,
+instead of a SELECT + per-object setattr / delete + commit + refresh for each row.
+Core statements bypass the `track_table_versions` flush listener, so the table version
+(list ETag) is bumped here in the same transaction.
+"""
+
+from sqlalchemy import Integer, any_, bindparam, delete, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from app.db.queries.json_queries import is_postgresql
+from app.db.queries.version_queries import bump_table_versions, record_table_versions
+from typing import Any, Dict, List, Sequence
+
+
+def id_condition(db: Session, column: Any, ids: Sequence[int]) -> Any:
+    """
+    `column = ANY(:ids)` on PostgreSQL (one array parameter, same statement for any list size),
+    `column IN (...)` elsewhere
+    """
+    ids = list(dict.fromkeys(ids))
+    if is_postgresql(db):
+        return column == any_(bindparam("ids", ids, type_=ARRAY(Integer), unique=True))
+    return column.in_(ids)
+
+
+def bulk_update_rows(
+    db: Session,
+    model: Any,
+    conditions: Sequence[Any],
+    values: Dict[str, Any],
+    returning: Sequence[Any]
+) -> List[Row]:
+    """
+    UPDATE model SET values WHERE conditions RETURNING returning, then commit
+
+    Raises:
+        ValueError: no conditions (refuses to update the whole table) or no values
+    """
+    if not conditions:
+        raise ValueError("Bulk update requires ids or a filter")
+    if not values:
+        raise ValueError("Bulk update requires values")
+    statement = (
+        update(model)
+        .where(*conditions)
+        .values(**values)
+        .returning(*returning)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(statement).all()
+    if rows:
+        record_table_versions(db, bump_table_versions(db.connection(), [model.__tablename__]))
+    db.commit()
+    return rows
+
+
+def bulk_delete_rows(
+    db: Session,
+    model: Any,
+    conditions: Sequence[Any],
+    returning: Sequence[Any]
+) -> List[Row]:
+    """
+    DELETE FROM model WHERE conditions RETURNING returning, then commit
+
+    Raises:
+        ValueError: no conditions (refuses to delete the whole table)
+    """
+    if not conditions:
+        raise ValueError("Bulk delete requires ids or a filter")
+    statement = (
+        delete(model)
+        .where(*conditions)
+        .returning(*returning)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(statement).all()
+    if rows:
+        record_table_versions(db, bump_table_versions(db.connection(), [model.__tablename__]))
+    db.commit()
+    return rows
+
+
+def bulk_values(values: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Check the columns of a bulk update
+
+    Raises:
+        ValueError: a column outside `fields` (identity / unique columns are never bulk-updatable)
+    """
+    unknown = set(values) - set(fields)
+    if unknown:
+        raise ValueError(f"Fields cannot be bulk updated: {sorted(unknown)} (allowed: {list(fields)})")
+    return dict(values)
+
+
+def filter_values(value: Any) -> List[Any]:
+    """Filter value as a list (a single value or a list of alternatives)"""
+    if value is None:
+        return []
+    return [value] if isinstance(value, (str, int, float)) else list(value)
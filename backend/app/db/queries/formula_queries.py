@@ -2,9 +2,28 @@
 Formula DB query functions
 """
 
+from sqlalchemy import func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.db.schema import Formula
-from typing import List, Optional
+from app.db.queries.json_queries import json_array_contains, json_array_length
+from app.db.queries.bulk_queries import bulk_delete_rows, bulk_update_rows, bulk_values, filter_values, id_condition
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Columns the bulk PATCH endpoint may set (name is unique, composition is per formula)
+FORMULA_BULK_FIELDS = (
+    "formula_type",
+    "description",
+    "longevity",
+    "sillage",
+    "stability_notes",
+    "shelf_life_months",
+    "cost_per_ml",
+    "llm_recommendation",
+)
+
+# Bulk selection filters: {"type": [...], "ingredient": "Ambroxan"}
+FORMULA_FILTERS = ("type", "ingredient")
 
 
 def get_all_formulas(db: Session) -> List[Formula]:
@@ -12,11 +31,70 @@ def get_all_formulas(db: Session) -> List[Formula]:
     return db.query(Formula).all()
 
 
+def get_formula_list_rows(db: Session) -> List[Row]:
+    """
+    Get (id, name, type, ingredients_count, created_at) rows for the list endpoint
+
+    Counts composition items in SQL (jsonb_array_length on PostgreSQL, json_array_length on SQLite)
+    instead of loading and parsing every composition.
+    """
+    return _list_query(db).all()
+
+
+def _list_query(db: Session):
+    return db.query(
+        Formula.id,
+        Formula.name,
+        Formula.formula_type.label("type"),
+        func.coalesce(json_array_length(db, Formula.ingredients_composition), 0).label("ingredients_count"),
+        Formula.created_at,
+    )
+
+
+def get_formula_rows_with_ingredient(db: Session, ingredient: str) -> List[Row]:
+    """Get list rows of formulas containing an ingredient (exact name, containment query in SQL)"""
+    condition = json_array_contains(db, Formula.ingredients_composition, {"name": ingredient})
+    return _list_query(db).filter(condition).order_by(Formula.id).all()
+
+
+def get_formula_detail_row(db: Session, formula_id: int) -> Optional[Row]:
+    """Get the columns returned by the detail endpoint as a single row"""
+    return db.query(
+        Formula.id,
+        Formula.name,
+        Formula.formula_type.label("type"),
+        Formula.description,
+        Formula.ingredients_composition,
+        Formula.longevity,
+        Formula.sillage,
+        Formula.stability_notes,
+        Formula.llm_recommendation,
+        Formula.created_at,
+    ).filter(Formula.id == formula_id).first()
+
+
 def get_formula_by_id(db: Session, formula_id: int) -> Optional[Formula]:
     """Get Formula by ID"""
     return db.query(Formula).filter(Formula.id == formula_id).first()
 
 
+def get_formulas_by_ids(db: Session, formula_ids: List[int]) -> List[Formula]:
+    """Get Formulas by IDs (single query)"""
+    if not formula_ids:
+        return []
+    return db.query(Formula).filter(Formula.id.in_(formula_ids)).all()
+
+
+def get_formula_compositions(db: Session) -> List[Tuple[int, list]]:
+    """Get (id, ingredients_composition) pairs for similarity indexing"""
+    return db.query(Formula.id, Formula.ingredients_composition).all()
+
+
+def get_formula_trend_rows(db: Session) -> List[Row]:
+    """Get (created_at, ingredients_composition) of every formula for market trend analysis"""
+    return db.query(Formula.created_at, Formula.ingredients_composition).all()
+
+
 def get_formula_by_name(db: Session, name: str) -> Optional[Formula]:
     """Get Formula by name"""
     return db.query(Formula).filter(Formula.name == name).first()
@@ -54,3 +132,41 @@ def delete_formula(db: Session, formula_id: int) -> bool:
     db.delete(formula)
     db.commit()
     return True
+
+
+def _formula_selection(db: Session, ids: Optional[Sequence[int]], filters: Optional[Dict[str, Any]]) -> List[Any]:
+    """WHERE conditions for bulk writes: id list and/or filters (both given = both must match)"""
+    conditions = []
+    if ids:
+        conditions.append(id_condition(db, Formula.id, ids))
+    if filters:
+        unknown = set(filters) - set(FORMULA_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filter fields: {sorted(unknown)} (available: {list(FORMULA_FILTERS)})")
+        types = filter_values(filters.get("type"))
+        if types:
+            conditions.append(Formula.formula_type.in_(types))
+        if filters.get("ingredient"):
+            conditions.append(json_array_contains(db, Formula.ingredients_composition, {"name": filters["ingredient"]}))
+    return conditions
+
+
+def bulk_update_formulas(
+    db: Session,
+    values: Dict[str, Any],
+    ids: Optional[Sequence[int]] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Row]:
+    """Update the selected formulas in one statement; returns (id, name) of updated rows"""
+    return bulk_update_rows(
+        db, Formula, _formula_selection(db, ids, filters), bulk_values(values, FORMULA_BULK_FIELDS), (Formula.id, Formula.name)
+    )
+
+
+def bulk_delete_formulas(
+    db: Session,
+    ids: Optional[Sequence[int]] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Row]:
+    """Delete the selected formulas in one statement; returns (id, name) of deleted rows"""
+    return bulk_delete_rows(db, Formula, _formula_selection(db, ids, filters), (Formula.id, Formula.name))
@@ -2,9 +2,58 @@
 Ingredient DB query functions
 """
 
+from sqlalchemy import String, cast, distinct, exists, func, literal, select, true, tuple_, union_all
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.db.schema import Ingredient
-from typing import List, Optional
+from app.db.queries.json_queries import is_postgresql
+from app.db.queries.bulk_queries import bulk_delete_rows, bulk_update_rows, bulk_values, filter_values, id_condition
+from typing import Any, Dict, List, Optional, Sequence
+
+# Filterable / faceted columns (perfume_applications is an array: match any value)
+INGREDIENT_FACETS = ("note_family", "volatility", "tenacity", "perfume_applications")
+
+# Columns the bulk PATCH endpoint may set (identity / unique columns excluded)
+INGREDIENT_BULK_FIELDS = (
+    "synonyms",
+    "odor_description",
+    "odor_threshold",
+    "suggested_usage_level",
+    "note_family",
+    "max_usage_percentage",
+    "perfume_applications",
+    "stability",
+    "tenacity",
+    "volatility",
+)
+
+# Columns used to build vector documents (`ingredient_vector.ingredient_documents`)
+_DOCUMENT_COLUMNS = (
+    Ingredient.id,
+    Ingredient.ingredient_name,
+    Ingredient.inci_name,
+    Ingredient.synonyms,
+    Ingredient.odor_description,
+    Ingredient.note_family,
+    Ingredient.perfume_applications,
+    Ingredient.cas_number,
+)
+
+_LIST_COLUMNS = (
+    Ingredient.id,
+    Ingredient.ingredient_name,
+    Ingredient.inci_name,
+    Ingredient.cas_number,
+    Ingredient.synonyms,
+    Ingredient.odor_description,
+    Ingredient.note_family,
+    Ingredient.suggested_usage_level,
+    Ingredient.max_usage_percentage,
+    Ingredient.stability,
+    Ingredient.tenacity,
+    Ingredient.volatility,
+)
 
 
 def get_all_ingredients(db: Session) -> List[Ingredient]:
@@ -12,6 +61,106 @@ def get_all_ingredients(db: Session) -> List[Ingredient]:
     return db.query(Ingredient).all()
 
 
+def get_ingredient_list_rows(db: Session) -> List[Row]:
+    """Get only the columns returned by the list endpoint (no ORM objects)"""
+    return db.query(*_LIST_COLUMNS).all()
+
+
+def _ingredient_filter_conditions(db: Session, filters: Dict[str, Sequence[str]]) -> List[Any]:
+    """
+    WHERE conditions for facet filters
+
+    Values of one facet are ORed, facets are ANDed. Applications use the
+    GIN-indexed `&&` operator on PostgreSQL and json_each on SQLite (JSON column).
+    """
+    conditions = []
+    for facet in INGREDIENT_FACETS:
+        values = list(dict.fromkeys(filter_values(filters.get(facet))))
+        if not values:
+            continue
+        if facet != "perfume_applications":
+            conditions.append(getattr(Ingredient, facet).in_(values))
+        elif is_postgresql(db):
+            conditions.append(
+                Ingredient.perfume_applications.op("&&")(cast(postgresql.array(values), postgresql.ARRAY(String)))
+            )
+        else:
+            applications = func.json_each(Ingredient.perfume_applications).table_valued("value")
+            conditions.append(exists().select_from(applications).where(applications.c.value.in_(values)))
+    return conditions
+
+
+def filter_ingredient_rows(
+    db: Session,
+    filters: Dict[str, Sequence[str]],
+    limit: int = 100,
+    offset: int = 0
+) -> List[Row]:
+    """Get list columns of ingredients matching the facet filters, ordered by id"""
+    return db.query(*_LIST_COLUMNS).filter(
+        *_ingredient_filter_conditions(db, filters)
+    ).order_by(Ingredient.id).limit(limit).offset(offset).all()
+
+
+def count_filtered_ingredients(db: Session, filters: Dict[str, Sequence[str]]) -> int:
+    """Count ingredients matching the facet filters"""
+    return db.query(func.count(Ingredient.id)).filter(*_ingredient_filter_conditions(db, filters)).scalar()
+
+
+def get_ingredient_facets(db: Session, filters: Dict[str, Sequence[str]]) -> Dict[str, Any]:
+    """
+    Count matching ingredients per facet value in a single statement
+
+    PostgreSQL: one scan with GROUPING SETS over `LEFT JOIN LATERAL unnest(perfume_applications)`;
+    SQLite: one UNION ALL statement (no GROUPING SETS).
+
+    Returns:
+        {"total": n, "facets": {facet: {value: count}}} (values by count desc, NULL values omitted)
+    """
+    conditions = _ingredient_filter_conditions(db, filters)
+    if is_postgresql(db):
+        applications = func.unnest(Ingredient.perfume_applications).table_valued("value").lateral("applications")
+        application = applications.c.value
+        keys = (Ingredient.note_family, Ingredient.volatility, Ingredient.tenacity, application)
+        # GROUPING(a, b, c, d) sets the bit of every key not in the row's grouping set
+        grouping = func.grouping(*keys)
+        statement = select(
+            grouping.label("grouping"),
+            *keys,
+            func.count(distinct(Ingredient.id)).label("count"),
+        ).select_from(Ingredient).outerjoin(applications, true()).where(*conditions).group_by(
+            func.grouping_sets(*[tuple_(key) for key in keys], tuple_())
+        )
+        facet_by_grouping = {0b0111: 0, 0b1011: 1, 0b1101: 2, 0b1110: 3}  # 0b1111 = total
+        rows = []
+        for row in db.execute(statement):
+            facet = facet_by_grouping.get(row.grouping)
+            rows.append((facet, None if facet is None else row[1 + facet], row.count))
+    else:
+        # SQLite has no LATERAL keyword but joins correlated table-valued functions the same way
+        applications = func.json_each(Ingredient.perfume_applications).table_valued("value").alias("applications")
+        parts = [
+            select(literal(index).label("facet"), column.label("value"), func.count(Ingredient.id).label("count"))
+            .where(*conditions).group_by(column)
+            for index, column in enumerate((Ingredient.note_family, Ingredient.volatility, Ingredient.tenacity))
+        ]
+        parts.append(
+            select(literal(3).label("facet"), applications.c.value, func.count(distinct(Ingredient.id)))
+            .select_from(Ingredient).join(applications, true()).where(*conditions).group_by(applications.c.value)
+        )
+        parts.append(select(literal(None).label("facet"), literal(None), func.count(Ingredient.id)).where(*conditions))
+        rows = [tuple(row) for row in db.execute(union_all(*parts))]
+
+    total = 0
+    facets: Dict[str, Dict[str, int]] = {facet: {} for facet in INGREDIENT_FACETS}
+    for facet, value, count in sorted(rows, key=lambda row: -row[2]):
+        if facet is None:
+            total = count
+        elif value is not None:
+            facets[INGREDIENT_FACETS[facet]][value] = count
+    return {"total": total, "facets": facets}
+
+
 def get_ingredient_by_id(db: Session, ingredient_id: int) -> Optional[Ingredient]:
     """Get Ingredient by ID"""
     return db.query(Ingredient).filter(Ingredient.id == ingredient_id).first()
@@ -63,3 +212,56 @@ def get_ingredient_names(db: Session) -> List[str]:
     """Get all ingredient names for LLM context"""
     ingredients = db.query(Ingredient.ingredient_name).all()
     return [ing[0] for ing in ingredients]
+
+
+def get_ingredient_usage_limits(db: Session) -> Dict[str, Optional[str]]:
+    """Get {ingredient_name: max_usage_percentage} for local validation"""
+    rows = db.query(Ingredient.ingredient_name, Ingredient.max_usage_percentage).all()
+    return {name: max_usage for name, max_usage in rows}
+
+
+def get_ingredient_note_families(db: Session) -> Dict[str, str]:
+    """Get {ingredient_name: note_family} of ingredients with a note family (market trend analysis)"""
+    rows = db.query(Ingredient.ingredient_name, Ingredient.note_family).filter(Ingredient.note_family.isnot(None)).all()
+    return {name: note_family for name, note_family in rows if note_family}
+
+
+def _ingredient_selection(
+    db: Session,
+    ids: Optional[Sequence[int]],
+    filters: Optional[Dict[str, Sequence[str]]]
+) -> List[Any]:
+    """WHERE conditions for bulk writes: id list and/or facet filters (both given = both must match)"""
+    conditions = []
+    if ids:
+        conditions.append(id_condition(db, Ingredient.id, ids))
+    if filters:
+        unknown = set(filters) - set(INGREDIENT_FACETS)
+        if unknown:
+            raise ValueError(f"Unknown filter fields: {sorted(unknown)} (available: {list(INGREDIENT_FACETS)})")
+        conditions += _ingredient_filter_conditions(db, filters)
+    return conditions
+
+
+def bulk_update_ingredients(
+    db: Session,
+    values: Dict[str, Any],
+    ids: Optional[Sequence[int]] = None,
+    filters: Optional[Dict[str, Sequence[str]]] = None
+) -> List[Row]:
+    """Update the selected ingredients in one statement; returns their document columns (for vector sync)"""
+    return bulk_update_rows(
+        db, Ingredient, _ingredient_selection(db, ids, filters),
+        bulk_values(values, INGREDIENT_BULK_FIELDS), _DOCUMENT_COLUMNS
+    )
+
+
+def bulk_delete_ingredients(
+    db: Session,
+    ids: Optional[Sequence[int]] = None,
+    filters: Optional[Dict[str, Sequence[str]]] = None
+) -> List[Row]:
+    """Delete the selected ingredients in one statement; returns (id, ingredient_name) of deleted rows"""
+    return bulk_delete_rows(
+        db, Ingredient, _ingredient_selection(db, ids, filters), (Ingredient.id, Ingredient.ingredient_name)
+    )
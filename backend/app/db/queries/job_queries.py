@@ -0,0 +1,205 @@
+"""
+Background job DB query functions
+
+Claim은 Postgres에서는 `SELECT ... FOR UPDATE SKIP LOCKED`로 워커 간 경합 없이 처리하고,
+SKIP LOCKED를 지원하지 않는 SQLite에서는 조건부 UPDATE (status = 'queued')의 rowcount로
+한 워커만 작업을 가져가도록 보장합니다.
+
+실행 중인 워커는 `touch_job`으로 locked_at을 갱신합니다 (heartbeat). 갱신이 끊긴 작업만
+`requeue_stale_jobs`가 다시 queued로 돌리고, 시도 횟수를 다 쓴 작업은 failed로 표시합니다.
+"""
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.db.schema import Job, JobStatus
+from typing import Any, Dict, List, Optional
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def create_job(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    max_attempts: int = 3,
+    priority: int = 0
+) -> Job:
+    """Create new Job (queued)"""
+    job = Job(
+        job_type=job_type,
+        payload=payload or {},
+        status=JobStatus.QUEUED.value,
+        priority=priority,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=_now(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job_by_id(db: Session, job_id: int) -> Optional[Job]:
+    """Get Job by ID"""
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def get_jobs(
+    db: Session,
+    status: Optional[str] = None,
+    job_type: Optional[str] = None,
+    limit: int = 50
+) -> List[Job]:
+    """Get recent Jobs (newest first)"""
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+    return query.order_by(Job.id.desc()).limit(limit).all()
+
+
+def claim_next_job(db: Session, worker_id: str, job_types: Optional[List[str]] = None) -> Optional[Job]:
+    """
+    실행할 다음 Job을 가져와 running으로 표시
+
+    Returns:
+        Claim한 Job (없으면 None)
+    """
+    now = _now()
+    for _ in range(5):
+        query = db.query(Job.id).filter(
+            Job.status == JobStatus.QUEUED.value,
+            Job.run_after <= now,
+            Job.attempts < Job.max_attempts
+        )
+        if job_types:
+            query = query.filter(Job.job_type.in_(job_types))
+        candidate = (
+            query.order_by(Job.priority.desc(), Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if candidate is None:
+            db.rollback()
+            return None
+
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == candidate.id, Job.status == JobStatus.QUEUED.value)
+            .values(
+                status=JobStatus.RUNNING.value,
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=Job.attempts + 1
+            )
+        ).rowcount
+        db.commit()
+
+        if claimed:
+            return get_job_by_id(db, candidate.id)
+        # 다른 워커가 먼저 가져감 (SQLite) - 다음 후보
+
+    return None
+
+
+def touch_job(db: Session, job_id: int, worker_id: str) -> bool:
+    """Heartbeat - refresh locked_at while `worker_id` still holds the running Job"""
+    touched = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING.value, Job.locked_by == worker_id)
+        .values(locked_at=_now())
+    ).rowcount
+    db.commit()
+    return touched > 0
+
+
+def _still_locked_by(db: Session, job: Job, worker_id: Optional[str]) -> bool:
+    """The Job was not requeued / taken over since `worker_id` claimed it"""
+    if worker_id is None:
+        return True
+    db.refresh(job)
+    return job.status == JobStatus.RUNNING.value and job.locked_by == worker_id
+
+
+def complete_job(db: Session, job: Job, result: Any, worker_id: Optional[str] = None) -> Optional[Job]:
+    """
+    Mark Job succeeded
+
+    Returns:
+        The Job, or None when `worker_id` no longer holds it (requeued after a missed heartbeat)
+    """
+    if not _still_locked_by(db, job, worker_id):
+        return None
+    job.status = JobStatus.SUCCEEDED.value
+    job.result = result
+    job.error = None
+    job.locked_by = None
+    job.finished_at = _now()
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def fail_job(
+    db: Session,
+    job: Job,
+    error: str,
+    retry_delay: Optional[float] = None,
+    worker_id: Optional[str] = None
+) -> Optional[Job]:
+    """
+    Mark Job failed - 재시도 횟수가 남아 있으면 retry_delay 후 다시 queued
+
+    Returns:
+        The Job, or None when `worker_id` no longer holds it
+    """
+    if not _still_locked_by(db, job, worker_id):
+        return None
+    job.error = error
+    job.locked_by = None
+    if retry_delay is not None and job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED.value
+        job.run_after = _now() + timedelta(seconds=retry_delay)
+    else:
+        job.status = JobStatus.FAILED.value
+        job.finished_at = _now()
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def requeue_stale_jobs(db: Session, lock_timeout_seconds: float) -> Dict[str, int]:
+    """
+    heartbeat(locked_at)가 끊긴 running Job 처리 (워커가 죽었거나 멈춤)
+
+    - 시도 횟수가 남았으면 다시 queued
+    - attempts >= max_attempts면 failed (워커를 죽이는 작업이 무한히 재실행되지 않도록)
+
+    Returns:
+        {"requeued": n, "failed": n}
+    """
+    now = _now()
+    stale = (Job.status == JobStatus.RUNNING.value, Job.locked_at < now - timedelta(seconds=lock_timeout_seconds))
+    failed = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(
+            status=JobStatus.FAILED.value,
+            locked_by=None,
+            error=f"Worker stopped responding (no heartbeat for {lock_timeout_seconds:.0f}s) on the last attempt",
+            finished_at=now
+        )
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts < Job.max_attempts)
+        .values(status=JobStatus.QUEUED.value, locked_by=None, run_after=now)
+    ).rowcount
+    db.commit()
+    return {"requeued": requeued, "failed": failed}
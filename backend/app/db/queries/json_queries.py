@@ -0,0 +1,44 @@
+"""
+JSON column query helpers
+
+JSON document columns (`JSONDocument` in db/schema.py) are JSONB on PostgreSQL and JSON text on SQLite.
+These helpers build the matching SQL for each dialect so the queries stay in the database.
+"""
+
+from typing import Any
+from sqlalchemy import exists, func, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+
+def is_postgresql(db: Session) -> bool:
+    """Whether the session is bound to PostgreSQL"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def json_array_length(db: Session, column: Any) -> Any:
+    """Length of a JSON array column (jsonb_array_length on PostgreSQL, json_array_length on SQLite)"""
+    if is_postgresql(db):
+        return func.jsonb_array_length(column)
+    return func.json_array_length(column)
+
+
+def json_array_contains(db: Session, column: Any, element: Any) -> Any:
+    """
+    Condition: the JSON array column has `element`
+
+    A dict element matches array items that contain all of its keys and values
+    (e.g. {"name": "Ambroxan"} matches {"name": "Ambroxan", "percentage": 10}).
+
+    PostgreSQL: `column @> '[element]'` (uses the jsonb_path_ops GIN index)
+    SQLite: EXISTS over json_each(column)
+    """
+    if is_postgresql(db):
+        return type_coerce(column, JSONB).contains([element])
+
+    items = func.json_each(column).table_valued("value")
+    if isinstance(element, dict):
+        conditions = [func.json_extract(items.c.value, f"$.{key}") == value for key, value in element.items()]
+    else:
+        conditions = [items.c.value == element]
+    return exists().select_from(items).where(*conditions)
@@ -0,0 +1,101 @@
+"""
+Development session DB query functions
+"""
+
+from datetime import datetime, timezone
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.schema import DevelopmentSession
+from typing import Any, Dict, List, Optional
+
+
+def get_development_session(db: Session, session_id: str) -> Optional[DevelopmentSession]:
+    """Get Development session by ID (always from the primary - the turn may have been saved by another worker)"""
+    return (
+        db.query(DevelopmentSession)
+        .filter(DevelopmentSession.session_id == session_id)
+        .execution_options(use_primary=True)
+        .first()
+    )
+
+
+def save_development_session(
+    db: Session,
+    session_id: str,
+    messages: List[Dict[str, Any]],
+    turn: int,
+    last_chunks: Optional[List[str]],
+    stream_complete: bool,
+    expected_turn: Optional[int] = None,
+    producer_id: Optional[str] = None
+) -> Optional[DevelopmentSession]:
+    """
+    Create or update Development session
+
+    Args:
+        expected_turn: only save if the stored turn is still this one (0 = the row must not exist yet).
+            Guards against a worker with an outdated copy overwriting turns saved by another worker.
+        producer_id: worker generating the turn (stored with a heartbeat while `stream_complete` is False)
+
+    Returns:
+        The saved row, or None when `expected_turn` did not match
+    """
+    session = (
+        db.query(DevelopmentSession)
+        .filter(DevelopmentSession.session_id == session_id)
+        .with_for_update()
+        .first()
+    )
+    if expected_turn is not None and (session.turn if session is not None else 0) != expected_turn:
+        db.rollback()
+        return None
+    if session is None:
+        session = DevelopmentSession(session_id=session_id)
+        db.add(session)
+
+    session.messages = messages
+    session.turn = turn
+    session.last_chunks = last_chunks
+    session.stream_complete = stream_complete
+    session.producer_id = producer_id
+    session.heartbeat_at = None if stream_complete else datetime.now(timezone.utc)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # another worker created the same session first
+        db.rollback()
+        if expected_turn is not None:
+            return None
+        raise
+    db.refresh(session)
+    return session
+
+
+def touch_development_session(db: Session, session_id: str, turn: int, producer_id: str) -> bool:
+    """Refresh the heartbeat of a turn that is still being generated by `producer_id`"""
+    result = db.execute(
+        update(DevelopmentSession)
+        .where(
+            DevelopmentSession.session_id == session_id,
+            DevelopmentSession.turn == turn,
+            DevelopmentSession.producer_id == producer_id,
+            DevelopmentSession.stream_complete.is_(False),
+        )
+        .values(heartbeat_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount > 0
+
+
+def delete_development_session(db: Session, session_id: str) -> bool:
+    """Delete Development session"""
+    session = get_development_session(db, session_id)
+    if not session:
+        return False
+
+    db.delete(session)
+    db.commit()
+    return True
@@ -0,0 +1,118 @@
+"""
+Table version query functions
+
+목록 API의 조건부 GET (ETag / Last-Modified)에 쓰이는 테이블별 변경 카운터입니다.
+ORM flush에서 카탈로그 테이블이 바뀌면 `track_table_versions` listener가 같은 트랜잭션 안에서
+`table_versions`를 증가시키므로, 워커 프로세스의 변경도 반영되고 rollback되면 함께 취소됩니다.
+Core `insert()` / `update()`로 직접 쓰는 코드는 `bump_table_versions`를 함께 호출해야 합니다.
+
+세션은 자기 쓰기가 만든 카운터 범위를 `session.info`에 기록합니다 (`pop_table_versions`).
+프로세스 내 색인(composition index)은 이 범위로 자기 쓰기를 구분하여, 다른 워커의 변경일 때만 다시 로드합니다.
+"""
+
+from datetime import datetime, timezone
+from sqlalchemy import event, select, update
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.schema import TableVersion
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# 버전을 관리하는 테이블 (목록 응답을 캐시하는 테이블)
+VERSIONED_TABLES = frozenset({"ingredients", "accords", "formulas"})
+
+# session.info 키: {테이블: (이 세션이 만든 첫 버전, 마지막 버전)}
+_WRITTEN_VERSIONS = "written_table_versions"
+
+
+def bump_table_versions(connection: Connection, tables: Iterable[str]) -> Dict[str, int]:
+    """Increment the change counter of each table (same transaction as the write); returns the new versions"""
+    now = datetime.now(timezone.utc)
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        insert = None
+
+    versions = {}
+    for table in sorted(set(tables)):
+        if insert is not None:
+            # INSERT ... ON CONFLICT DO UPDATE (첫 변경 시 행 생성)
+            versions[table] = connection.execute(
+                insert(TableVersion)
+                .values(table_name=table, version=1, updated_at=now)
+                .on_conflict_do_update(
+                    index_elements=[TableVersion.table_name],
+                    set_={"version": TableVersion.version + 1, "updated_at": now},
+                )
+                .returning(TableVersion.version)
+            ).scalar_one()
+            continue
+
+        result = connection.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name == table)
+            .values(version=TableVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(TableVersion.__table__.insert().values(table_name=table, version=1, updated_at=now))
+        versions[table] = connection.execute(
+            select(TableVersion.version).where(TableVersion.table_name == table)
+        ).scalar_one()
+    return versions
+
+
+def record_table_versions(session: Session, versions: Dict[str, int]) -> None:
+    """
+    Remember the versions this session's writes produced
+
+    Consecutive versions extend the recorded range. A gap means another writer committed
+    in between, so the range restarts at the new version (the range only ever holds own writes).
+    """
+    written = session.info.setdefault(_WRITTEN_VERSIONS, {})
+    for table, version in versions.items():
+        first, last = written.get(table, (version, version - 1))
+        written[table] = (first if version == last + 1 else version, version)
+
+
+def pop_table_versions(session: Session, table: str) -> Optional[Tuple[int, int]]:
+    """Take the (first, last) versions of a table produced by this session's committed writes"""
+    return session.info.get(_WRITTEN_VERSIONS, {}).pop(table, None)
+
+
+def forget_table_versions(session: Session, *args: Any) -> None:
+    """Session `after_rollback` listener: rolled-back bumps never happened"""
+    session.info.pop(_WRITTEN_VERSIONS, None)
+
+
+def track_table_versions(session: Session, flush_context: Any) -> None:
+    """Session `after_flush` listener: bump versions of catalogue tables touched by the flush"""
+    tables = set()
+    for obj in session.new:
+        tables.add(getattr(obj, "__tablename__", None))
+    for obj in session.deleted:
+        tables.add(getattr(obj, "__tablename__", None))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tables.add(getattr(obj, "__tablename__", None))
+
+    tables &= VERSIONED_TABLES
+    if tables:
+        record_table_versions(session, bump_table_versions(session.connection(), tables))
+
+
+def listen_table_versions(factory: sessionmaker) -> None:
+    """Register the table version listeners on a session factory"""
+    event.listen(factory, "after_flush", track_table_versions)
+    event.listen(factory, "after_rollback", forget_table_versions)
+
+
+def get_table_version(db: Session, table: str) -> Tuple[int, Optional[datetime]]:
+    """Get (version, last change time) of a table - (0, None) if never written through the ORM"""
+    row = db.query(TableVersion.version, TableVersion.updated_at).filter(TableVersion.table_name == table).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def get_entity_timestamps(db: Session, model: Any, entity_id: int) -> Optional[Row]:
+    """Get (updated_at, created_at) of one row without loading its other columns"""
+    return db.query(model.updated_at, model.created_at).filter(model.id == entity_id).first()
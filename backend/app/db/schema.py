@@ -1,10 +1,24 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ARRAY, Enum
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ARRAY, Enum, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import declarative_base
 import enum
 
 Base = declarative_base()
 
+# PostgreSQL ARRAY, SQLite(로컬 벤치마크)에서는 JSON 리스트로 저장
+StringArray = ARRAY(String).with_variant(JSON(), "sqlite")
+
+# 검색 대상 JSON 문서 - PostgreSQL에서는 JSONB (GIN 인덱스 / @> containment, `db/queries/json_queries.py`)
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _jsonb_gin_index(name: str, column: str) -> Index:
+    """JSONB containment(@>) 전용 GIN 인덱스 - SQLite에는 만들지 않음"""
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "jsonb_path_ops"}
+    ).ddl_if(dialect="postgresql")
+
 # =====================
 # Enums
 # =====================
@@ -32,7 +46,7 @@ class Ingredient(Base):
     id = Column(Integer, primary_key=True, index=True)
     ingredient_name = Column(Text, unique=True, index=True, nullable=False)
     inci_name = Column(Text, nullable=False)
-    synonyms = Column(ARRAY(String), nullable=True)
+    synonyms = Column(StringArray, nullable=True)
     cas_number = Column(Text, unique=True, nullable=True)
 
     odor_description = Column(Text, nullable=True)
@@ -41,7 +55,7 @@ class Ingredient(Base):
     note_family = Column(Text, nullable=True)
 
     max_usage_percentage = Column(Text, nullable=True)
-    perfume_applications = Column(ARRAY(String), nullable=True)
+    perfume_applications = Column(StringArray, nullable=True)
     stability = Column(Text, nullable=True)
     tenacity = Column(Text, nullable=True)
     volatility = Column(Text, nullable=True)
@@ -49,6 +63,17 @@ class Ingredient(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # 카탈로그 facet 필터 (`db/queries/ingredient_queries.py`의 filter_ingredient_rows / get_ingredient_facets)
+        Index("ix_ingredients_note_family_volatility_tenacity", "note_family", "volatility", "tenacity"),
+        Index("ix_ingredients_volatility", "volatility"),
+        Index("ix_ingredients_tenacity", "tenacity"),
+        # perfume_applications && ARRAY[...] - SQLite(JSON)에는 만들지 않음
+        Index(
+            "ix_ingredients_perfume_applications_gin", "perfume_applications", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<Ingredient(id={self.id}, name={self.ingredient_name})>"
 
@@ -62,7 +87,7 @@ class Formula(Base):
     description = Column(Text, nullable=True)
 
     # 원료 구성
-    ingredients_composition = Column(JSON, nullable=False)  # [{name, percentage, notes}, ...]
+    ingredients_composition = Column(JSONDocument, nullable=False)  # [{name, percentage, notes}, ...]
     total_percentage = Column(Float, nullable=True)  # 보통 100%
 
     # 특성
@@ -84,6 +109,11 @@ class Formula(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # 원료 포함 검색: ingredients_composition @> '[{"name": ...}]'
+        _jsonb_gin_index("ix_formulas_ingredients_composition_gin", "ingredients_composition"),
+    )
+
     def __repr__(self):
         return f"<Formula(id={self.id}, name={self.name}, type={self.formula_type})>"
 
@@ -97,7 +127,7 @@ class Accord(Base):
     description = Column(Text, nullable=True)
 
     # 원료 구성 (JSON 형식)
-    ingredients_composition = Column(JSON, nullable=False)
+    ingredients_composition = Column(JSONDocument, nullable=False)
     # 예: [
     #   {"name": "Pineapple Ester", "percentage": 40, "cas_number": "..."},
     #   {"name": "Green Note", "percentage": 30, "cas_number": "..."},
@@ -106,10 +136,10 @@ class Accord(Base):
 
     total_percentage = Column(Float, nullable=True)
 
-    # 특성
-    top_notes = Column(JSON, nullable=True)
-    middle_notes = Column(JSON, nullable=True)
-    base_notes = Column(JSON, nullable=True)
+    # 특성 - 노트별 원료명 목록 ["Ambroxan", ...] (저장 시 ingredients_composition의 note로 채움)
+    top_notes = Column(JSONDocument, nullable=True)
+    middle_notes = Column(JSONDocument, nullable=True)
+    base_notes = Column(JSONDocument, nullable=True)
 
     longevity = Column(String(50), nullable=True)
     sillage = Column(String(50), nullable=True)
@@ -121,8 +151,97 @@ class Accord(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        _jsonb_gin_index("ix_accords_ingredients_composition_gin", "ingredients_composition"),
+        # 노트 검색: base_notes @> '["Ambroxan"]'
+        _jsonb_gin_index("ix_accords_top_notes_gin", "top_notes"),
+        _jsonb_gin_index("ix_accords_middle_notes_gin", "middle_notes"),
+        _jsonb_gin_index("ix_accords_base_notes_gin", "base_notes"),
+    )
+
     def __repr__(self):
         return f"<Accord(id={self.id}, name={self.name})>"
 
 
-__all__ = ["Base", "Ingredient", "Formula", "Accord", "FormulaType"]
+class DevelopmentSession(Base):
+    __tablename__ = "development_sessions"
+
+    session_id = Column(String(64), primary_key=True)  # CoordinatorState.session_id
+
+    # 대화 히스토리 [{"role": "user", "content": "..."}, ...]
+    messages = Column(JSON, nullable=False, default=list)
+
+    # 마지막 턴의 스트리밍 청크 (재연결 시 재전송용, 인덱스 = sequence ID)
+    turn = Column(Integer, nullable=False, default=0)
+    last_chunks = Column(JSON, nullable=True)
+    stream_complete = Column(Boolean, nullable=False, default=True)
+
+    # 생성 중인 턴의 producer (워커 ID + heartbeat) - heartbeat가 끊긴 턴만 중단된 것으로 처리
+    producer_id = Column(String(128), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DevelopmentSession(session_id={self.session_id}, turn={self.turn})>"
+
+
+class JobStatus(str, enum.Enum):
+    """백그라운드 작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False, index=True)  # "reindex_ingredients", ...
+    payload = Column(JSON, nullable=True)
+
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED.value)
+    priority = Column(Integer, nullable=False, default=0)  # 높을수록 먼저
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False)  # 재시도 backoff
+
+    # 실행 중인 워커 (죽은 워커의 작업은 locked_at 기준으로 재할당)
+    locked_by = Column(String(255), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # 워커 claim 쿼리: status = queued AND run_after <= now ORDER BY priority, id
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, type={self.job_type}, status={self.status})>"
+
+
+class TableVersion(Base):
+    """
+    테이블별 변경 카운터 (목록 API의 ETag / Last-Modified)
+
+    ORM flush 시 `db/queries/version_queries.py`의 listener가 같은 트랜잭션에서 증가시킵니다.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<TableVersion(table={self.table_name}, version={self.version})>"
+
+
+__all__ = ["Base", "Ingredient", "Formula", "Accord", "DevelopmentSession", "Job", "TableVersion", "FormulaType", "JobStatus"]
@@ -1,15 +1,44 @@
 """
 Vector search module for semantic ingredient search
+and composition similarity search
 """
 
+from .embeddings import embedder
+
 from .ingredient_vector import (
+    FIELDS,
+    DOCUMENT_COLUMNS,
+    field_weights,
     index_ingredient,
+    index_ingredients,
+    remove_ingredients,
     index_all_ingredients,
     search_ingredients_semantic,
+    search_ingredients_semantic_batch,
+)
+
+from .composition_index import (
+    SIMILARITY_METRICS,
+    CompositionIndex,
+    composition_vector,
+    get_formula_composition_index,
+    get_accord_composition_index,
 )
 
 __all__ = [
+    "embedder",
+    "FIELDS",
+    "DOCUMENT_COLUMNS",
+    "field_weights",
     "index_ingredient",
+    "index_ingredients",
+    "remove_ingredients",
     "index_all_ingredients",
     "search_ingredients_semantic",
+    "search_ingredients_semantic_batch",
+    "SIMILARITY_METRICS",
+    "CompositionIndex",
+    "composition_vector",
+    "get_formula_composition_index",
+    "get_accord_composition_index",
 ]
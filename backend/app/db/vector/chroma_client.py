@@ -1,46 +1,51 @@
 """
 ChromaDB client for vector search
+
+PersistentClient는 첫 벡터 검색/색인 시점에 생성됩니다 (chromadb import 포함).
 """
 
-import chromadb
+from app.resources import resources
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
 
+def _create_client():
+    try:
+        import chromadb
+
+        logger.info("Initializing ChromaDB client...")
+
+        # 최신 ChromaDB 설정 방식 (v0.4.0+)
+        # PersistentClient 사용 (persist_directory 지정)
+        persist_dir = os.getenv("CHROMADB_PATH", "./chroma_db")
+
+        client = chromadb.PersistentClient(
+            path=persist_dir
+        )
+
+        logger.info(f"ChromaDB client initialized successfully at {persist_dir}")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to initialize ChromaDB: {e}")
+        raise
+
+
 class ChromaClient:
-    """Singleton ChromaDB client"""
+    """Singleton ChromaDB client (lazy)"""
     _instance = None
-    _client = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ChromaClient, cls).__new__(cls)
+            cls._instance._resource = resources.register("chroma", _create_client)
         return cls._instance
 
-    def __init__(self):
-        if self._client is None:
-            try:
-                logger.info("Initializing ChromaDB client...")
-
-                # 최신 ChromaDB 설정 방식 (v0.4.0+)
-                # PersistentClient 사용 (persist_directory 지정)
-                persist_dir = os.getenv("CHROMADB_PATH", "./chroma_db")
-
-                self._client = chromadb.PersistentClient(
-                    path=persist_dir
-                )
-
-                logger.info(f"ChromaDB client initialized successfully at {persist_dir}")
-            except Exception as e:
-                logger.error(f"Failed to initialize ChromaDB: {e}")
-                raise
-
     @property
     def client(self):
-        """Get ChromaDB client instance"""
-        return self._client
+        """Get ChromaDB client instance (첫 호출 시 생성)"""
+        return self._resource.get()
 
 
 # Singleton instance
@@ -0,0 +1,266 @@
+"""
+Sparse composition index for Formula / Accord similarity search
+
+각 배합의 ingredients_composition을 {원료 키: 비율} 희소 벡터로 변환하여
+역색인(inverted index)에 보관합니다. 유사도 계산은 쿼리 벡터와 원료를
+하나 이상 공유하는 배합만 순회하므로 전체 배합 수에 비례하지 않습니다.
+
+색인은 워커 프로세스마다 있으므로, 사용할 때마다 `table_versions`의 카운터를 로드 시점의
+값과 비교하여 다른 워커(또는 대량 수정 / 삭제)가 테이블을 바꿨으면 다시 로드합니다.
+이 프로세스의 저장 / 삭제는 upsert / remove로 바로 반영하면서 그 쓰기가 만든 카운터 범위
+(`pop_table_versions`)를 함께 넘기므로, 그 사이 다른 쓰기가 없었다면 다시 로드하지 않습니다.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.db.queries import get_formula_compositions, get_accord_compositions, get_table_version
+import heapq
+import logging
+import math
+import threading
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_METRICS = ("cosine", "jaccard")
+
+
+def composition_vector(composition: Optional[List[Dict[str, Any]]]) -> Dict[str, float]:
+    """
+    ingredients_composition JSON을 희소 벡터로 변환
+
+    Composition 항목은 원료를 이름으로 참조하므로 (DB에 없는 원료도 포함될 수 있음)
+    정규화된 원료명을 키로 사용합니다.
+
+    Args:
+        composition: [{"name": "...", "percentage": 25, ...}, ...]
+
+    Returns:
+        {"bergamot oil": 25.0, ...}
+    """
+    vector: Dict[str, float] = {}
+    for item in composition or []:
+        if not isinstance(item, dict):
+            continue
+        key = " ".join(str(item.get("name") or "").lower().split())
+        if not key:
+            continue
+        try:
+            percentage = float(item.get("percentage") or 0)
+        except (TypeError, ValueError):
+            continue
+        if percentage <= 0:
+            continue
+        vector[key] = vector.get(key, 0.0) + percentage
+    return vector
+
+
+class CompositionIndex:
+    """In-process inverted index over composition vectors"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version: Optional[int] = None  # 로드 시점의 table_versions 카운터
+        self._vectors: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._l2_norms: Dict[int, float] = {}
+        self._l1_norms: Dict[int, float] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def ensure_current(self, version: int, loader: Callable[[], Iterable[Tuple[int, Any]]]) -> None:
+        """
+        처음 사용할 때, 또는 테이블 버전이 로드 시점과 다르면 DB에서 전체 composition을 다시 읽어 색인
+
+        Args:
+            version: 현재 `table_versions` 카운터
+            loader: (id, ingredients_composition) iterator
+        """
+        if self._loaded and self._version == version:
+            return
+        with self._lock:
+            if self._loaded and self._version == version:
+                return
+            reloading = self._loaded
+            self._clear()
+            for entity_id, composition in loader():
+                self._upsert(entity_id, composition)
+            self._loaded = True
+            self._version = version
+            action = "reloaded" if reloading else "loaded"
+            logger.info(f"Composition index '{self.name}' {action} at version {version}: {len(self._vectors)} entries")
+
+    def upsert(
+        self,
+        entity_id: int,
+        composition: Optional[List[Dict[str, Any]]],
+        written: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """
+        배합 추가 또는 갱신
+
+        Args:
+            written: 이 변경을 저장한 쓰기가 만든 (첫 버전, 마지막 버전) - `pop_table_versions`
+        """
+        with self._lock:
+            self._upsert(entity_id, composition)
+            self._advance(written)
+
+    def remove(self, entity_id: int, written: Optional[Tuple[int, int]] = None) -> None:
+        """배합 제거"""
+        with self._lock:
+            self._remove(entity_id)
+            self._advance(written)
+
+    def remove_many(self, entity_ids: Iterable[int], written: Optional[Tuple[int, int]] = None) -> None:
+        """여러 배합 제거 (대량 삭제) - lock 한 번"""
+        with self._lock:
+            for entity_id in entity_ids:
+                self._remove(entity_id)
+            self._advance(written)
+
+    def advance(self, written: Optional[Tuple[int, int]]) -> None:
+        """composition을 바꾸지 않는 이 프로세스의 쓰기 (대량 수정) - 다시 로드하지 않도록 버전만 갱신"""
+        with self._lock:
+            self._advance(written)
+
+    def clear(self) -> None:
+        """색인 초기화 (다음 사용 시 다시 로드)"""
+        with self._lock:
+            self._clear()
+            self._loaded = False
+            self._version = None
+
+    def query(
+        self,
+        composition: Optional[List[Dict[str, Any]]],
+        limit: int = 10,
+        metric: str = "cosine",
+        exclude_id: Optional[int] = None,
+        min_score: float = 0.0,
+    ) -> List[Tuple[int, float]]:
+        """
+        Composition과 가장 유사한 배합 검색
+
+        Args:
+            composition: 기준 composition
+            limit: 반환할 최대 개수
+            metric: "cosine" (비율 가중 코사인) 또는 "jaccard" (가중 Jaccard)
+            exclude_id: 결과에서 제외할 ID (자기 자신)
+            min_score: 최소 유사도
+
+        Returns:
+            [(entity_id, score), ...] 유사도 내림차순
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Unknown similarity metric: {metric}")
+
+        query = composition_vector(composition)
+        if not query:
+            return []
+
+        query_l2 = math.sqrt(sum(v * v for v in query.values()))
+        query_l1 = sum(query.values())
+
+        with self._lock:
+            dots: Dict[int, float] = {}
+            overlaps: Dict[int, float] = {}
+            for key, weight in query.items():
+                for entity_id, value in self._postings.get(key, {}).items():
+                    dots[entity_id] = dots.get(entity_id, 0.0) + weight * value
+                    overlaps[entity_id] = overlaps.get(entity_id, 0.0) + min(weight, value)
+
+            scores = []
+            for entity_id, dot in dots.items():
+                if entity_id == exclude_id:
+                    continue
+                if metric == "cosine":
+                    score = dot / (query_l2 * self._l2_norms[entity_id])
+                else:
+                    overlap = overlaps[entity_id]
+                    score = overlap / (query_l1 + self._l1_norms[entity_id] - overlap)
+                if score >= min_score:
+                    scores.append((entity_id, round(score, 6)))
+
+        return heapq.nlargest(limit, scores, key=lambda pair: pair[1])
+
+    def find_duplicates(
+        self,
+        composition: Optional[List[Dict[str, Any]]],
+        threshold: float,
+        exclude_id: Optional[int] = None,
+        limit: int = 5,
+    ) -> List[Tuple[int, float]]:
+        """저장 시 중복 경고용: 코사인 유사도가 threshold 이상인 배합"""
+        return self.query(
+            composition,
+            limit=limit,
+            metric="cosine",
+            exclude_id=exclude_id,
+            min_score=threshold,
+        )
+
+    def _advance(self, written: Optional[Tuple[int, int]]) -> None:
+        # 로드 시점 바로 다음부터 모두 이 프로세스의 쓰기일 때만 (아니면 다음 사용 시 다시 로드)
+        if written is not None and self._loaded and self._version == written[0] - 1:
+            self._version = written[1]
+
+    def _clear(self) -> None:
+        self._vectors.clear()
+        self._postings.clear()
+        self._l2_norms.clear()
+        self._l1_norms.clear()
+
+    def _upsert(self, entity_id: int, composition: Optional[List[Dict[str, Any]]]) -> None:
+        self._remove(entity_id)
+        vector = composition_vector(composition)
+        if not vector:
+            return
+        self._vectors[entity_id] = vector
+        self._l2_norms[entity_id] = math.sqrt(sum(v * v for v in vector.values()))
+        self._l1_norms[entity_id] = sum(vector.values())
+        for key, value in vector.items():
+            self._postings.setdefault(key, {})[entity_id] = value
+
+    def _remove(self, entity_id: int) -> None:
+        vector = self._vectors.pop(entity_id, None)
+        if vector is None:
+            return
+        self._l2_norms.pop(entity_id, None)
+        self._l1_norms.pop(entity_id, None)
+        for key in vector:
+            postings = self._postings.get(key)
+            if postings is None:
+                continue
+            postings.pop(entity_id, None)
+            if not postings:
+                del self._postings[key]
+
+
+# Singleton instances
+formula_composition_index = CompositionIndex("formulas")
+accord_composition_index = CompositionIndex("accords")
+
+
+def get_formula_composition_index(db: Session) -> CompositionIndex:
+    """Formula composition index (처음 또는 formulas 테이블이 바뀌었으면 DB에서 로드)"""
+    version, _ = get_table_version(db, "formulas")
+    formula_composition_index.ensure_current(version, lambda: get_formula_compositions(db))
+    return formula_composition_index
+
+
+def get_accord_composition_index(db: Session) -> CompositionIndex:
+    """Accord composition index (처음 또는 accords 테이블이 바뀌었으면 DB에서 로드)"""
+    version, _ = get_table_version(db, "accords")
+    accord_composition_index.ensure_current(version, lambda: get_accord_compositions(db))
+    return accord_composition_index
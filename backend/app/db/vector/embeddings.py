@@ -0,0 +1,328 @@
+"""
+Embeddings - ChromaDB 색인 / 검색용 임베딩 계층
+
+ChromaDB의 embedding function 대신 여기서 임베딩을 계산해 `embeddings=` / `query_embeddings=`로 전달합니다.
+
+- Backend (EMBEDDING_BACKEND):
+  - `chroma-default`: ChromaDB 기본 모델 (all-MiniLM-L6-v2, ONNX) - 기존과 같은 벡터
+  - `sentence-transformers:<model>`: sentence-transformers 모델 (선택 의존성)
+  - `hashing`: 외부 모델 없는 feature hashing (로컬 벤치마크 / 오프라인용, 의미 검색 품질은 낮음)
+- 디스크 캐시: (모델, 텍스트 sha256) → float32 벡터 (SQLite 파일, EMBEDDING_CACHE_PATH)
+  - 텍스트가 바뀌지 않은 원료는 재색인 시 다시 임베딩하지 않음
+- 캐시에 없는 텍스트는 EMBEDDING_BATCH_SIZE 단위 배치로 나눠 EMBEDDING_WORKERS 스레드에서 계산
+  (ONNX Runtime / PyTorch는 연산 중 GIL을 놓으므로 CPU 코어를 병렬로 사용)
+- 검색어: 프로세스 내 LRU (EMBEDDING_QUERY_CACHE_SIZE) → 디스크 캐시 → backend 순서
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from app.schema.config import settings
+from app.resources import resources
+from app.services.metrics import metrics
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HASHING_DIMENSIONS = 384
+_WORD = re.compile(r"\w+")
+# SQLite IN (...) 파라미터 수 제한 이하로 나눠 조회
+_CACHE_LOOKUP_CHUNK = 500
+
+EMBEDDING_CACHE = metrics.counter(
+    "embedding_cache_total", "Embedding cache lookups", ("layer", "result")
+)
+EMBEDDING_BATCH_LATENCY = metrics.histogram(
+    "embedding_batch_duration_seconds", "Embedding backend batch latency", ("model",)
+)
+
+
+# =====================
+# Backends
+# =====================
+
+class EmbeddingBackend:
+    """텍스트 목록 → (n, dim) float32 배열"""
+    name = ""
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class ChromaDefaultBackend(EmbeddingBackend):
+    name = "chroma-default/all-MiniLM-L6-v2"
+
+    def __init__(self):
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+        self._function = DefaultEmbeddingFunction()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._function(texts), dtype=np.float32)
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    def __init__(self, model: str):
+        from sentence_transformers import SentenceTransformer
+        self.name = f"sentence-transformers/{model}"
+        self._model = SentenceTransformer(model, device="cpu")
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(
+            self._model.encode(texts, batch_size=len(texts), normalize_embeddings=True, show_progress_bar=False),
+            dtype=np.float32
+        )
+
+
+class HashingBackend(EmbeddingBackend):
+    """단어 / 단어 bigram feature hashing (L2 정규화)"""
+    name = f"hashing-words/{HASHING_DIMENSIONS}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), HASHING_DIMENSIONS), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # 구두점 제외 ("creamy," == "creamy")
+            words = _WORD.findall(text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                digest = zlib.crc32(feature.encode())
+                vectors[row, digest % HASHING_DIMENSIONS] += 1.0 if digest & 0x80000000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _create_backend() -> EmbeddingBackend:
+    spec = settings.EMBEDDING_BACKEND
+    logger.info(f"Loading embedding backend '{spec}'...")
+    if spec == "chroma-default":
+        return ChromaDefaultBackend()
+    if spec == "hashing":
+        return HashingBackend()
+    if spec.startswith("sentence-transformers:"):
+        return SentenceTransformerBackend(spec.split(":", 1)[1])
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {spec}")
+
+
+# 모델 로드가 무거우므로 첫 임베딩 시 생성 (STARTUP_WARM_UP에 "embedding_model"로 미리 로드 가능)
+_backend = resources.register("embedding_model", _create_backend)
+
+
+# =====================
+# Caches
+# =====================
+
+class EmbeddingDiskCache:
+    """(모델, 텍스트 hash) → 벡터 SQLite 캐시 (여러 스레드 / 프로세스에서 공유)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), _CACHE_LOOKUP_CHUNK):
+                chunk = list(keys[start:start + _CACHE_LOOKUP_CHUNK])
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [model, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]) -> None:
+        if not vectors:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(model, key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()]
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            # 워커 프로세스와 API 프로세스가 동시에 읽고 쓸 수 있도록 WAL
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+        return self._conn
+
+
+class _QueryLRU:
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._items.get(key)
+            if vector is not None:
+                self._items.move_to_end(key)
+            return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._items[key] = vector
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _create_disk_cache() -> Optional[EmbeddingDiskCache]:
+    # EMBEDDING_CACHE_PATH가 비어 있으면 디스크 캐시 사용 안 함
+    return EmbeddingDiskCache(settings.EMBEDDING_CACHE_PATH) if settings.EMBEDDING_CACHE_PATH else None
+
+
+_disk_cache = resources.register("embedding_cache", _create_disk_cache, close=lambda cache: cache and cache.close())
+
+
+# =====================
+# Embedder
+# =====================
+
+class Embedder:
+    """캐시 + 배치 / 병렬 임베딩"""
+
+    def __init__(self):
+        self._query_cache: Optional[_QueryLRU] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"query_hits": 0, "disk_hits": 0, "computed": 0}
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        return _backend.get()
+
+    @property
+    def model(self) -> str:
+        return self.backend.name
+
+    def embed_documents(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        문서 임베딩 (입력 순서 유지)
+
+        같은 텍스트는 한 번만 계산하고, 디스크 캐시에 있는 텍스트는 계산하지 않습니다.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        model = self.model
+        keys = [text_hash(text) for text in texts]
+        unique: Dict[str, str] = dict(zip(keys, texts))
+
+        disk = _disk_cache.get()
+        vectors = disk.get_many(model, list(unique)) if disk else {}
+        hits = len(vectors)
+        EMBEDDING_CACHE.inc(hits, layer="disk", result="hit")
+        EMBEDDING_CACHE.inc(len(unique) - hits, layer="disk", result="miss")
+
+        missing = [key for key in unique if key not in vectors]
+        if missing:
+            computed = self._compute([unique[key] for key in missing])
+            new_vectors = dict(zip(missing, computed))
+            vectors.update(new_vectors)
+            if disk:
+                disk.put_many(model, new_vectors)
+
+        with self._lock:
+            self.stats["disk_hits"] += hits
+            self.stats["computed"] += len(missing)
+        return np.stack([vectors[key] for key in keys])
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """검색어 임베딩 (LRU → 디스크 캐시 → backend)"""
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: Sequence[str]) -> np.ndarray:
+        """여러 검색어 임베딩 - LRU에 없는 검색어는 한 번의 embed_documents로 계산"""
+        model = self.model
+        cache = self._queries()
+        keys = [f"{model}:{text_hash(text)}" for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        for key in keys:
+            vector = cache.get(key)
+            if vector is not None:
+                vectors[key] = vector
+        hits = sum(1 for key in keys if key in vectors)
+        EMBEDDING_CACHE.inc(hits, layer="query_lru", result="hit")
+        EMBEDDING_CACHE.inc(len(keys) - hits, layer="query_lru", result="miss")
+        with self._lock:
+            self.stats["query_hits"] += hits
+
+        missing = [index for index, key in enumerate(keys) if key not in vectors]
+        if missing:
+            computed = self.embed_documents([texts[index] for index in missing])
+            for index, vector in zip(missing, computed):
+                vectors[keys[index]] = vector
+                cache.put(keys[index], vector)
+        return np.stack([vectors[key] for key in keys])
+
+    def reset(self) -> None:
+        """검색어 LRU / 통계 초기화 (backend / 설정 변경 후)"""
+        with self._lock:
+            self._query_cache = None
+            self.stats = {"query_hits": 0, "disk_hits": 0, "computed": 0}
+
+    def _compute(self, texts: List[str]) -> List[np.ndarray]:
+        backend = self.backend
+        batch_size = max(1, settings.EMBEDDING_BATCH_SIZE)
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+
+        def run(batch: List[str]) -> np.ndarray:
+            started = time.perf_counter()
+            result = backend.embed(batch)
+            EMBEDDING_BATCH_LATENCY.observe(time.perf_counter() - started, model=backend.name)
+            return result
+
+        if len(batches) == 1 or settings.EMBEDDING_WORKERS <= 1:
+            results = [run(batch) for batch in batches]
+        else:
+            results = list(self._executor().map(run, batches))
+        logger.info(f"Embedded {len(texts)} texts in {len(batches)} batches ({backend.name})")
+        return [vector for result in results for vector in result]
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=settings.EMBEDDING_WORKERS, thread_name_prefix="embedding")
+            return self._pool
+
+    def _queries(self) -> _QueryLRU:
+        if self._query_cache is None:
+            with self._lock:
+                if self._query_cache is None:
+                    self._query_cache = _QueryLRU(settings.EMBEDDING_QUERY_CACHE_SIZE)
+        return self._query_cache
+
+
+# Singleton instance
+embedder = Embedder()
@@ -0,0 +1,391 @@
+"""
+Exact (brute-force) ingredient vector index
+
+원료 임베딩을 필드별 연속 float32 행렬(`vectors-<field>.npy`, memory-map, 행 = 원료)로,
+metadata를 열 배열로 보관하고 필터된 후보 전체와 내적을 계산해 정확한 top-k를 반환합니다.
+note family 하나처럼 후보가 적은 검색은 ChromaDB HNSW + 후처리 필터보다 빠르고 recall 손실이 없습니다.
+
+- 파일: `EXACT_INDEX_PATH/<generation>/` (vectors-<field>.npy, ids.npy, families.npy, meta.json)
+  + 현재 generation을 가리키는 `CURRENT` 파일 (교체는 os.replace로 원자적)
+- `index_all_ingredients`가 ChromaDB 동기화 후 새 generation을 만들고,
+  다른 프로세스(API / 워커)는 `CURRENT`의 mtime이 바뀌면 다시 memory-map 합니다.
+- 단건 / 대량 색인과 삭제는 `apply`로 현재 generation에서 바뀐 원료의 행만 교체한 새 generation을 만듭니다.
+  generation 작성은 `LOCK` 파일 (flock)로 프로세스 간 직렬화하여 동시에 patch한 변경이 사라지지 않습니다.
+- 거리: 필드별 squared L2 (ChromaDB 기본 공간 l2와 같음)의 가중 평균
+  - 값이 없는 필드는 0 벡터로 저장하고 norm을 1로 두어 직교 벡터와 같은 거리로 계산
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.schema.config import settings
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows - 프로세스 간 잠금 없이 프로세스 내 lock만
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "LOCK"
+
+
+class _Snapshot:
+    """memory-map 된 한 generation"""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.model: str = meta["model"]
+        self.fields: List[str] = meta["fields"]
+        self.names: List[str] = meta["names"]
+        self.cas_numbers: List[str] = meta["cas_numbers"]
+        self.families: List[str] = meta["families"]
+        self.vectors: Dict[str, np.ndarray] = {
+            field: np.load(os.path.join(directory, f"vectors-{field}.npy"), mmap_mode="r") for field in self.fields
+        }
+        self.ids = np.load(os.path.join(directory, "ids.npy"))
+        self.family_codes = np.load(os.path.join(directory, "families.npy"))
+        self.sq_norms: Dict[str, np.ndarray] = {}
+        for field, vectors in self.vectors.items():
+            sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+            sq_norms[sq_norms == 0] = 1.0
+            self.sq_norms[field] = sq_norms
+        # note family → 행 번호 (필터 후보를 바로 구성)
+        order = np.argsort(self.family_codes, kind="stable")
+        bounds = np.searchsorted(self.family_codes[order], np.arange(len(self.families) + 1))
+        self.rows_by_family: Dict[str, np.ndarray] = {
+            family: order[bounds[code]:bounds[code + 1]] for code, family in enumerate(self.families)
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def candidates(self, note_family: Optional[Sequence[str]]) -> Optional[np.ndarray]:
+        """필터에 맞는 행 번호 (None = 전체)"""
+        if not note_family:
+            return None
+        rows = [self.rows_by_family[family] for family in set(note_family) if family in self.rows_by_family]
+        return np.sort(np.concatenate(rows)) if rows else np.zeros(0, dtype=np.int64)
+
+
+class ExactIndex:
+    """Filtered exact top-k over a memory-mapped embedding matrix"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._loaded_mtime: Optional[float] = None
+        self._checked_at = 0.0
+
+    @property
+    def path(self) -> str:
+        return settings.EXACT_INDEX_PATH
+
+    def snapshot(self, model: str) -> Optional[_Snapshot]:
+        """현재 모델로 만든 색인 (없거나 모델이 다르면 None) - 다른 프로세스가 새로 만들었으면 다시 로드"""
+        if not self.path:
+            return None
+        now = time.monotonic()
+        # CURRENT stat은 초당 1번만
+        if now - self._checked_at >= 1.0:
+            self._checked_at = now
+            self._refresh()
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None and snapshot.model == model else None
+
+    def count(self, snapshot: _Snapshot, note_family: Optional[Sequence[str]]) -> int:
+        rows = snapshot.candidates(note_family)
+        return len(snapshot) if rows is None else len(rows)
+
+    def search(
+        self,
+        snapshot: _Snapshot,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        weights: Dict[str, float],
+        note_family: Optional[Sequence[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Exact top-k for each query embedding
+
+        Args:
+            weights: 필드별 가중치 (합 1, `ingredient_vector.field_weights`)
+
+        Returns:
+            검색어별 결과 목록 (`search_ingredients_semantic`과 같은 형식, distance = 가중 squared L2)
+        """
+        rows = snapshot.candidates(note_family)
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        total = len(snapshot) if rows is None else len(rows)
+        if total == 0:
+            return [[] for _ in queries]
+
+        # Σ w·||q - v_f||² = Σ w·(||q||² + ||v_f||² - 2 q·v_f)  (필드마다 행렬곱 한 번)
+        distances = np.zeros((len(queries), total), dtype=np.float32)
+        query_sq_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        for field, weight in weights.items():
+            vectors = snapshot.vectors[field] if rows is None else snapshot.vectors[field][rows]
+            sq_norms = snapshot.sq_norms[field] if rows is None else snapshot.sq_norms[field][rows]
+            distances += weight * (query_sq_norms + sq_norms[None, :] - 2.0 * (queries @ vectors.T))
+        np.maximum(distances, 0.0, out=distances)
+
+        if n_results < total:
+            top = np.argpartition(distances, n_results - 1, axis=1)[:, :n_results]
+        else:
+            top = np.broadcast_to(np.arange(total), (len(queries), total))
+        results = []
+        for query_index in range(len(queries)):
+            order = top[query_index][np.argsort(distances[query_index, top[query_index]], kind="stable")]
+            matches = []
+            for column in order:
+                row = int(column if rows is None else rows[column])
+                matches.append({
+                    "id": int(snapshot.ids[row]),
+                    "name": snapshot.names[row],
+                    "note_family": snapshot.families[snapshot.family_codes[row]],
+                    "cas_number": snapshot.cas_numbers[row],
+                    "distance": float(distances[query_index, column]),
+                })
+            results.append(matches)
+        return results
+
+    def build(
+        self,
+        model: str,
+        fields: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Any
+    ) -> None:
+        """
+        새 generation 작성 후 CURRENT 교체
+
+        Args:
+            fields: 필드 순서 (`ingredient_vector.FIELDS`)
+            metadatas: ChromaDB 레코드 metadata 목록 (`ingredient_documents`의 metadata - id, name, field, ...)
+            embeddings: metadatas 순서의 (n, dim) 벡터
+        """
+        if not self.path:
+            return
+        if not metadatas:
+            self.invalidate()
+            return
+        ids, ingredients, matrices = _rows(fields, metadatas, embeddings)
+        with self._writing():
+            generation = self._write_generation(model, fields, ids, ingredients, matrices)
+        logger.info(f"Exact index built: {len(ids)} ingredients x {len(fields)} fields ({generation})")
+
+    def apply(
+        self,
+        model: str,
+        fields: Sequence[str],
+        replaced_ids: Iterable[int],
+        metadatas: Sequence[Dict[str, Any]] = (),
+        embeddings: Any = None
+    ) -> bool:
+        """
+        단건 / 대량 색인 변경을 새 generation에 반영 (바뀐 원료의 행만 교체, 나머지는 현재 generation에서 복사)
+
+        Args:
+            replaced_ids: 다시 색인했거나 삭제한 원료 id (기존 행 제거)
+            metadatas / embeddings: 새로 색인한 필드 레코드 (`build`와 같은 형식, 삭제만 하면 비움)
+
+        Returns:
+            반영 여부 - 색인이 없거나 다른 모델 / 필드 구성이면 False (다음 전체 재색인에서 생성)
+        """
+        if not self.path:
+            return False
+        replaced = np.array(sorted(set(replaced_ids)), dtype=np.int64)
+        new_ids, new_ingredients, new_matrices = _rows(fields, metadatas, embeddings)
+
+        with self._writing():
+            # 캐시된 snapshot이 아니라 CURRENT를 다시 읽음 (다른 프로세스가 방금 patch했을 수 있음)
+            generation = self._read_current()
+            if generation is None:
+                return False
+            current = _Snapshot(os.path.join(self.path, generation))
+            if current.model != model or current.fields != list(fields):
+                return False
+
+            keep = np.flatnonzero(~np.isin(current.ids, replaced))
+            kept_ids = [int(ingredient_id) for ingredient_id in current.ids[keep]]
+            ingredients = {
+                ingredient_id: {
+                    "name": current.names[row],
+                    "cas_number": current.cas_numbers[row],
+                    "note_family": current.families[current.family_codes[row]],
+                }
+                for ingredient_id, row in zip(kept_ids, keep)
+            }
+            ingredients.update(new_ingredients)
+
+            ids = kept_ids + new_ids
+            order = np.argsort(np.array(ids, dtype=np.int64), kind="stable")
+            matrices = {}
+            for field in fields:
+                kept = np.asarray(current.vectors[field][keep])
+                added = new_matrices.get(field)
+                if added is None or len(added) == 0:
+                    added = np.zeros((0, kept.shape[1]), dtype=np.float32)
+                matrices[field] = np.concatenate([kept, added])[order]
+            ids = [ids[index] for index in order]
+
+            if not ids:
+                self._remove_current()
+                return True
+            generation = self._write_generation(model, fields, ids, ingredients, matrices)
+        logger.info(
+            f"Exact index patched: {len(replaced)} replaced, {len(new_ids)} indexed, {len(ids)} ingredients ({generation})"
+        )
+        return True
+
+    def invalidate(self) -> None:
+        """색인 제거 (단건 색인 등으로 ChromaDB와 달라졌을 때) - 다음 전체 재색인까지 ChromaDB만 사용"""
+        if not self.path:
+            return
+        with self._writing():
+            self._remove_current()
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """generation 작성 / CURRENT 교체 잠금 (프로세스 내 + 프로세스 간)"""
+        os.makedirs(self.path, exist_ok=True)
+        with self._write_lock, open(os.path.join(self.path, LOCK_FILE), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_generation(
+        self,
+        model: str,
+        fields: Sequence[str],
+        ids: List[int],
+        ingredients: Dict[int, Dict[str, Any]],
+        matrices: Dict[str, np.ndarray]
+    ) -> str:
+        """id 순서의 행렬로 새 generation 작성 → CURRENT 교체 → 이전 generation 삭제"""
+        families = sorted({ingredients[i]["note_family"] for i in ids})
+        codes = {family: code for code, family in enumerate(families)}
+
+        generation = f"{time.time_ns()}-{os.getpid()}"
+        directory = os.path.join(self.path, generation)
+        os.makedirs(directory, exist_ok=True)
+
+        for field in fields:
+            np.save(os.path.join(directory, f"vectors-{field}.npy"), matrices[field])
+        np.save(os.path.join(directory, "ids.npy"), np.array(ids, dtype=np.int64))
+        np.save(
+            os.path.join(directory, "families.npy"),
+            np.array([codes[ingredients[i]["note_family"]] for i in ids], dtype=np.int32)
+        )
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "model": model,
+                "fields": list(fields),
+                "names": [ingredients[i]["name"] for i in ids],
+                "cas_numbers": [ingredients[i]["cas_number"] for i in ids],
+                "families": families,
+            }, f, ensure_ascii=False)
+
+        self._write_current(generation)
+        self._cleanup(keep=generation)
+        with self._lock:
+            self._checked_at = 0.0
+        self._refresh()
+        return generation
+
+    def _read_current(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, CURRENT_FILE), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _remove_current(self) -> None:
+        try:
+            os.remove(os.path.join(self.path, CURRENT_FILE))
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._snapshot = None
+            self._loaded_mtime = None
+
+    def _refresh(self) -> None:
+        current = os.path.join(self.path, CURRENT_FILE)
+        try:
+            mtime = os.stat(current).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._snapshot = None
+                self._loaded_mtime = None
+            return
+        if mtime == self._loaded_mtime:
+            return
+        with self._lock:
+            if mtime == self._loaded_mtime:
+                return
+            try:
+                with open(current, encoding="utf-8") as f:
+                    generation = f.read().strip()
+                self._snapshot = _Snapshot(os.path.join(self.path, generation))
+                self._loaded_mtime = mtime
+                logger.info(f"Exact index loaded: {len(self._snapshot)} ingredients ({generation})")
+            except Exception as e:
+                logger.warning(f"Failed to load exact index: {e}")
+                self._snapshot = None
+
+    def _write_current(self, generation: str) -> None:
+        temporary = os.path.join(self.path, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(generation)
+        os.replace(temporary, os.path.join(self.path, CURRENT_FILE))
+
+    def _cleanup(self, keep: str) -> None:
+        # 이전 generation 삭제 (이미 memory-map 한 프로세스는 unlink 된 파일을 계속 읽을 수 있음)
+        for entry in os.listdir(self.path):
+            entry_path = os.path.join(self.path, entry)
+            if entry != keep and os.path.isdir(entry_path):
+                shutil.rmtree(entry_path, ignore_errors=True)
+
+
+def _rows(
+    fields: Sequence[str],
+    metadatas: Sequence[Dict[str, Any]],
+    embeddings: Any
+) -> Tuple[List[int], Dict[int, Dict[str, Any]], Dict[str, np.ndarray]]:
+    """필드 레코드 → (정렬된 원료 id, 원료별 metadata, 필드별 행렬 (행 = id 순서, 값이 없는 필드는 0 벡터))"""
+    if not metadatas:
+        return [], {}, {}
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    # 원료 id 기준으로 행 정렬 (필드 레코드 → 같은 행)
+    ingredients: Dict[int, Dict[str, Any]] = {}
+    for metadata in metadatas:
+        ingredients.setdefault(metadata["id"], metadata)
+    ids = sorted(ingredients)
+    row_of = {ingredient_id: row for row, ingredient_id in enumerate(ids)}
+
+    matrices = {}
+    for field in fields:
+        matrix = np.zeros((len(ids), embeddings.shape[1]), dtype=np.float32)
+        positions = [index for index, metadata in enumerate(metadatas) if metadata["field"] == field]
+        if positions:
+            matrix[[row_of[metadatas[index]["id"]] for index in positions]] = embeddings[positions]
+        matrices[field] = matrix
+    return ids, ingredients, matrices
+
+
+# Singleton instance
+exact_index = ExactIndex()
@@ -1,143 +1,426 @@
 """
 Ingredient vector operations using ChromaDB
+
+임베딩은 `embeddings.embedder`가 계산하고 (디스크 캐시 + 배치), ChromaDB에는 벡터만 전달합니다.
+Collection metadata의 `embedding_model` / `index_fields`가 현재 설정과 다르면 전체 재색인 시 collection을 다시 만듭니다.
+
+원료마다 필드별 벡터를 따로 저장합니다 (`ingredient_{id}:{field}`, metadata `field`):
+- `odor`: 향 설명 + note family
+- `name`: 원료명 + INCI + 동의어
+- `applications`: 사용 분야 (perfume_applications)
+검색 시 필드별 거리를 가중 평균하므로 ("creamy lactonic" 같은 향 표현이 이름 / INCI 토큰에 희석되지 않음)
+작은 n_results로도 관련 원료가 상위에 옵니다.
+
+검색은 후보 수(필터 적용 후)가 EXACT_SEARCH_MAX_CANDIDATES 이하이고 exact index가 있으면
+`exact_index` (NumPy brute force), 아니면 ChromaDB HNSW를 사용합니다.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from app.db.schema import Ingredient
 from app.db.queries import get_all_ingredients
+from app.schema.config import settings
+from app.services.metrics import chroma_timer, metrics
+from app.services.profiling import span
 from .chroma_client import chroma_client
+from .embeddings import embedder
+from .exact_index import exact_index
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "ingredients"
 
+# 원료별로 따로 임베딩하는 필드 (순서 = exact index 행렬 순서)
+FIELDS = ("odor", "name", "applications")
+
+# ingredient_documents가 읽는 원료 컬럼 - 이 컬럼이 바뀌면 다시 색인
+DOCUMENT_COLUMNS = frozenset({
+    "ingredient_name", "inci_name", "synonyms", "odor_description", "note_family", "perfume_applications", "cas_number",
+})
+
+# 한 필드의 결과에 없는 원료의 그 필드 거리: 단위 벡터 사이의 직교 거리 (squared L2 = 1 + 1)
+# exact index가 값이 없는 필드를 norm 1인 0 벡터로 계산한 값과 같음
+MISSING_FIELD_DISTANCE = 2.0
+
+SEARCH_PLAN = metrics.counter(
+    "semantic_search_plan_total", "Semantic search queries by execution engine", ("engine",)
+)
+
 
 def get_or_create_collection():
     """Get or create ChromaDB collection for ingredients"""
+    # embedding_function=None: 벡터는 항상 직접 전달 (ChromaDB 기본 모델을 따로 로드하지 않음)
     try:
+        return chroma_client.client.get_collection(name=COLLECTION_NAME, embedding_function=None)
+    except Exception:
+        pass
+
+    try:
+        # metadata는 생성 시에만 기록 (기존 collection의 embedding_model을 덮어쓰지 않도록)
         return chroma_client.client.get_or_create_collection(
             name=COLLECTION_NAME,
-            metadata={"description": "Fragrance ingredients with semantic search"}
+            metadata={
+                "description": "Fragrance ingredients with semantic search",
+                "embedding_model": embedder.model,
+                "index_fields": ",".join(FIELDS),
+            },
+            embedding_function=None
         )
     except Exception as e:
         logger.error(f"Failed to get/create collection: {e}")
         raise
 
 
+def ingredient_documents(ingredient: Ingredient) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Build (id, document, metadata) of each non-empty field of an ingredient"""
+    texts = {
+        "odor": " ".join(filter(None, [
+            ingredient.odor_description,
+            f"Note family: {ingredient.note_family}" if ingredient.note_family else None,
+        ])),
+        "name": "; ".join(filter(None, [ingredient.ingredient_name, ingredient.inci_name, *(ingredient.synonyms or [])])),
+        "applications": ", ".join(ingredient.perfume_applications or []),
+    }
+    records = []
+    for field in FIELDS:
+        if not texts[field]:
+            continue
+        records.append((f"ingredient_{ingredient.id}:{field}", texts[field], {
+            "id": ingredient.id,
+            "name": ingredient.ingredient_name,
+            "note_family": ingredient.note_family or "",
+            "cas_number": ingredient.cas_number or "",
+            "field": field,
+        }))
+    return records
+
+
+def field_weights(weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    검색 필드 가중치 (합이 1이 되도록 정규화, 0인 필드는 제외)
+
+    Raises:
+        ValueError: 알 수 없는 필드, 음수, 모두 0인 경우
+    """
+    weights = weights if weights is not None else settings.SEMANTIC_FIELD_WEIGHTS
+    unknown = set(weights) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)} (available: {list(FIELDS)})")
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Field weights must be >= 0")
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("At least one field weight must be > 0")
+    return {field: weights[field] / total for field in FIELDS if weights.get(field, 0) > 0}
+
+
 def index_ingredient(ingredient: Ingredient) -> None:
-    """Index a single ingredient into ChromaDB"""
+    """Index (or re-index) a single ingredient into ChromaDB"""
+    index_ingredients([ingredient])
+
+
+def index_ingredients(ingredients: Sequence[Any]) -> None:
+    """
+    Index (or re-index) ingredients into ChromaDB with one embed / delete / upsert call
+
+    Args:
+        ingredients: Ingredient 객체 또는 같은 속성의 row (`bulk_update_ingredients`의 RETURNING)
+    """
+    if not ingredients:
+        return
     try:
         collection = get_or_create_collection()
+        records = [record for ingredient in ingredients for record in ingredient_documents(ingredient)]
+        current = {record[0] for record in records}
+        # 비어서 빠진 필드의 이전 벡터 제거
+        stale = [
+            f"ingredient_{ingredient.id}:{field}"
+            for ingredient in ingredients for field in FIELDS
+            if f"ingredient_{ingredient.id}:{field}" not in current
+        ]
+        if stale:
+            with chroma_timer("delete"), span("vector", "delete"):
+                collection.delete(ids=stale)
 
-        # Create searchable document from ingredient properties
-        document = f"""
-        Name: {ingredient.ingredient_name}
-        INCI: {ingredient.inci_name or 'N/A'}
-        Odor: {ingredient.odor_description or 'N/A'}
-        Note Family: {ingredient.note_family or 'N/A'}
-        """.strip()
+        metadatas, embeddings = [], None
+        if records:
+            ids, documents, metadatas = (list(column) for column in zip(*records))
+            with span("vector", "embed"):
+                embeddings = embedder.embed_documents(documents)
+            with chroma_timer("upsert"), span("vector", "upsert"):
+                collection.upsert(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                    embeddings=embeddings.tolist()
+                )
+        # exact index에서도 이 원료들의 행만 교체 (ChromaDB와 같은 벡터)
+        _patch_exact_index([ingredient.id for ingredient in ingredients], metadatas, embeddings)
+        logger.info(f"Indexed {len(ingredients)} ingredients ({len(records)} field vectors)")
+    except Exception as e:
+        logger.error(f"Failed to index {len(ingredients)} ingredients: {e}")
+        raise
 
-        metadata = {
-            "id": ingredient.id,
-            "name": ingredient.ingredient_name,
-            "note_family": ingredient.note_family or "",
-            "cas_number": ingredient.cas_number or "",
-        }
 
-        collection.add(
-            ids=[f"ingredient_{ingredient.id}"],
-            documents=[document],
-            metadatas=[metadata]
-        )
-        logger.info(f"Indexed ingredient: {ingredient.ingredient_name}")
+def remove_ingredients(ingredient_ids: Sequence[int]) -> None:
+    """Remove the field vectors of deleted ingredients from ChromaDB (one delete call)"""
+    if not ingredient_ids:
+        return
+    try:
+        collection = get_or_create_collection()
+        with chroma_timer("delete"), span("vector", "delete"):
+            collection.delete(ids=[f"ingredient_{ingredient_id}:{field}" for ingredient_id in ingredient_ids for field in FIELDS])
+        _patch_exact_index(ingredient_ids)
+        logger.info(f"Removed {len(ingredient_ids)} ingredients from vector store")
     except Exception as e:
-        logger.error(f"Failed to index ingredient {ingredient.ingredient_name}: {e}")
+        logger.error(f"Failed to remove {len(ingredient_ids)} ingredients from vector store: {e}")
         raise
 
 
+def _patch_exact_index(
+    ingredient_ids: Sequence[int],
+    metadatas: Sequence[Dict[str, Any]] = (),
+    embeddings: Optional[np.ndarray] = None
+) -> None:
+    """exact index에 단건 / 대량 색인 결과 반영 - 실패하면 ChromaDB와 다른 결과를 내지 않도록 색인 제거"""
+    if not settings.EXACT_INDEX_PATH:
+        return
+    try:
+        with span("vector", "exact_patch"):
+            exact_index.apply(embedder.model, FIELDS, ingredient_ids, metadatas, embeddings)
+    except Exception as e:
+        logger.warning(f"Failed to patch exact index, removing it until the next full re-index: {e}")
+        exact_index.invalidate()
+
+
 def index_all_ingredients(db: Session) -> int:
-    """Index all ingredients from database into ChromaDB"""
+    """
+    Sync all ingredients from database into ChromaDB
+
+    같은 모델 / 필드 구성으로 색인된 collection이면 문서 / metadata가 바뀐 필드만 upsert하고
+    DB에서 삭제된 원료 (또는 비워진 필드)는 제거합니다.
+    바뀐 필드도 텍스트가 같으면 임베딩 캐시에서 벡터를 가져오므로 다시 계산하지 않습니다.
+    """
     try:
         ingredients = get_all_ingredients(db)
+        records = [record for ing in ingredients for record in ingredient_documents(ing)]
         collection = get_or_create_collection()
 
-        # Clear existing collection
-        try:
+        signature = collection.metadata or {}
+        if signature.get("embedding_model") != embedder.model or signature.get("index_fields") != ",".join(FIELDS):
+            logger.info(f"Embedding model / fields changed ({embedder.model}, {FIELDS}), recreating collection")
             chroma_client.client.delete_collection(name=COLLECTION_NAME)
             collection = get_or_create_collection()
-        except Exception:
-            pass
-
-        documents = []
-        ids = []
-        metadatas = []
-
-        for ing in ingredients:
-            document = f"""
-            Name: {ing.ingredient_name}
-            INCI: {ing.inci_name or 'N/A'}
-            Odor: {ing.odor_description or 'N/A'}
-            Note Family: {ing.note_family or 'N/A'}
-            """.strip()
-
-            documents.append(document)
-            ids.append(f"ingredient_{ing.id}")
-            metadatas.append({
-                "id": ing.id,
-                "name": ing.ingredient_name,
-                "note_family": ing.note_family or "",
-                "cas_number": ing.cas_number or "",
-            })
-
-        if documents:
-            collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas
-            )
 
-        logger.info(f"Indexed {len(documents)} ingredients")
-        return len(documents)
+        with chroma_timer("get"), span("vector", "get"):
+            existing = collection.get(include=["documents", "metadatas"])
+        indexed = {
+            record_id: (document, metadata)
+            for record_id, document, metadata in zip(existing["ids"], existing["documents"], existing["metadatas"])
+        }
+
+        changed = [record for record in records if indexed.get(record[0]) != (record[1], record[2])]
+        current_ids = {record[0] for record in records}
+        removed = [record_id for record_id in indexed if record_id not in current_ids]
+
+        if removed:
+            with chroma_timer("delete"), span("vector", "delete"):
+                collection.delete(ids=removed)
+
+        if changed:
+            ids, documents, metadatas = (list(column) for column in zip(*changed))
+            with span("vector", "embed"):
+                embeddings = embedder.embed_documents(documents)
+            with chroma_timer("upsert_batch"), span("vector", "upsert_batch"):
+                collection.upsert(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                    embeddings=embeddings.tolist()
+                )
+
+        if settings.EXACT_INDEX_PATH:
+            # ChromaDB에 저장된 벡터 그대로 exact index 생성 (다시 임베딩하지 않음)
+            with chroma_timer("get"), span("vector", "get"):
+                stored = collection.get(include=["embeddings", "metadatas"])
+            with span("vector", "exact_build"):
+                exact_index.build(embedder.model, FIELDS, stored["metadatas"], stored["embeddings"])
+
+        logger.info(
+            f"Indexed {len(ingredients)} ingredients / {len(records)} field vectors "
+            f"({len(changed)} updated, {len(removed)} removed)"
+        )
+        return len(ingredients)
     except Exception as e:
         logger.error(f"Failed to index all ingredients: {e}")
         raise
 
 
-def search_ingredients_semantic(query: str, n_results: int = 10) -> List[Dict[str, Any]]:
+def search_ingredients_semantic(
+    query: str,
+    n_results: int = 10,
+    note_family: Optional[List[str]] = None,
+    weights: Optional[Dict[str, float]] = None
+) -> List[Dict[str, Any]]:
     """
     Search ingredients using semantic similarity
 
     Args:
         query: Natural language query (e.g., "sweet floral ingredients")
         n_results: Number of results to return
+        note_family: Only search ingredients of these note families
+        weights: Per-field weights (e.g., {"odor": 1.0}) - default SEMANTIC_FIELD_WEIGHTS
 
     Returns:
         List of matching ingredients with metadata
     """
     try:
-        collection = get_or_create_collection()
-
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results
-        )
+        normalized = field_weights(weights)
+        with span("vector", "embed"):
+            query_embedding = embedder.embed_query(query)
 
-        # Format results
-        matches = []
-        if results['metadatas'] and results['metadatas'][0]:
-            for i, metadata in enumerate(results['metadatas'][0]):
-                matches.append({
-                    "id": metadata.get("id"),
-                    "name": metadata.get("name"),
-                    "note_family": metadata.get("note_family"),
-                    "cas_number": metadata.get("cas_number"),
-                    "distance": results['distances'][0][i] if results['distances'] else None
-                })
+        matches = _search(query_embedding[None, :], [n_results], note_family, normalized, "query")[0]
 
         logger.info(f"Semantic search for '{query}': found {len(matches)} results")
         return matches
     except Exception as e:
         logger.error(f"Semantic search failed for '{query}': {e}")
         raise
+
+
+def search_ingredients_semantic_batch(queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Search ingredients for several queries at once
+
+    검색어를 한 번에 임베딩하고, 필터 / 가중치가 같은 검색어끼리 묶어 한 번에 검색합니다.
+
+    Args:
+        queries: [{"query": str, "n_results": int, "note_family": Optional[List[str]],
+                   "weights": Optional[Dict[str, float]]}, ...]
+
+    Returns:
+        검색어 순서대로 각 검색 결과 목록 (`search_ingredients_semantic`과 같은 형식)
+    """
+    if not queries:
+        return []
+    try:
+        normalized = [field_weights(q.get("weights")) for q in queries]
+        with span("vector", "embed"):
+            query_embeddings = embedder.embed_queries([q["query"] for q in queries])
+
+        groups: Dict[Tuple, List[int]] = {}
+        for index, q in enumerate(queries):
+            families = tuple(sorted(set(q["note_family"]))) if q.get("note_family") else ()
+            groups.setdefault((families, tuple(normalized[index].items())), []).append(index)
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for (note_family, weights), indexes in groups.items():
+            limits = [queries[index].get("n_results", 10) for index in indexes]
+            grouped = _search(query_embeddings[indexes], limits, list(note_family), dict(weights), "query_batch")
+            for index, matches in zip(indexes, grouped):
+                results[index] = matches
+
+        logger.info(f"Batch semantic search: {len(queries)} queries in {len(groups)} searches")
+        return results
+    except Exception as e:
+        logger.error(f"Batch semantic search failed ({len(queries)} queries): {e}")
+        raise
+
+
+def _search(
+    query_embeddings: np.ndarray,
+    limits: List[int],
+    note_family: Optional[List[str]],
+    weights: Dict[str, float],
+    operation: str
+) -> List[List[Dict[str, Any]]]:
+    """
+    Plan and run one search for query embeddings sharing the same filter and weights
+
+    exact index가 현재 모델로 만들어져 있고 필터 후 후보 수가 EXACT_SEARCH_MAX_CANDIDATES 이하면
+    NumPy exact search, 아니면 ChromaDB.
+    """
+    n_results = max(limits)
+    snapshot = exact_index.snapshot(embedder.model)
+    if (
+        snapshot is not None
+        and set(weights) <= set(snapshot.fields)
+        and exact_index.count(snapshot, note_family) <= settings.EXACT_SEARCH_MAX_CANDIDATES
+    ):
+        SEARCH_PLAN.inc(engine="exact")
+        with span("vector", f"exact_{operation}"):
+            grouped = exact_index.search(snapshot, query_embeddings, n_results, weights, note_family)
+    else:
+        SEARCH_PLAN.inc(engine="chroma")
+        grouped = _search_chroma(query_embeddings, n_results, note_family, weights, operation)
+    return [matches[:limit] for matches, limit in zip(grouped, limits)]
+
+
+def _search_chroma(
+    query_embeddings: np.ndarray,
+    n_results: int,
+    note_family: Optional[List[str]],
+    weights: Dict[str, float],
+    operation: str
+) -> List[List[Dict[str, Any]]]:
+    """
+    필드별로 ChromaDB를 조회한 뒤 가중 평균 거리로 병합
+
+    필드마다 n_results × SEMANTIC_FIELD_OVERFETCH개를 가져오며, 한 필드의 결과에 없는 원료는
+    그 필드를 MISSING_FIELD_DISTANCE (직교, exact index의 빈 필드와 같은 값)로 계산합니다.
+    """
+    collection = get_or_create_collection()
+    fetch = n_results * max(1, settings.SEMANTIC_FIELD_OVERFETCH) if len(weights) > 1 else n_results
+    embeddings = query_embeddings.tolist()
+
+    responses = {}
+    for field in weights:
+        with chroma_timer(operation), span("vector", operation):
+            responses[field] = collection.query(
+                query_embeddings=embeddings,
+                n_results=fetch,
+                where=_where(field, note_family)
+            )
+
+    results = []
+    for position in range(len(embeddings)):
+        distances: Dict[str, Dict[int, float]] = {}
+        metadata_by_id: Dict[int, Dict[str, Any]] = {}
+        for field, response in responses.items():
+            field_metadatas = response["metadatas"][position] if response["metadatas"] else []
+            field_distances = response["distances"][position] if response["distances"] else []
+            distances[field] = {}
+            for metadata, distance in zip(field_metadatas, field_distances):
+                distances[field][metadata["id"]] = distance
+                metadata_by_id.setdefault(metadata["id"], metadata)
+
+        scored = []
+        for ingredient_id, metadata in metadata_by_id.items():
+            combined = 0.0
+            for field, weight in weights.items():
+                combined += weight * distances[field].get(ingredient_id, MISSING_FIELD_DISTANCE)
+            scored.append((combined, ingredient_id, metadata))
+        scored.sort(key=lambda item: (item[0], item[1]))
+
+        results.append([
+            {
+                "id": metadata.get("id"),
+                "name": metadata.get("name"),
+                "note_family": metadata.get("note_family"),
+                "cas_number": metadata.get("cas_number"),
+                "distance": distance
+            }
+            for distance, _, metadata in scored[:n_results]
+        ])
+    return results
+
+
+def _where(field: str, note_families: Optional[List[str]]) -> Dict[str, Any]:
+    if not note_families:
+        return {"field": field}
+    families = sorted(set(note_families))
+    family_filter = {"note_family": families[0]} if len(families) == 1 else {"note_family": {"$in": families}}
+    return {"$and": [{"field": field}, family_filter]}
@@ -1,17 +1,52 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import accords, formulas, ingredients, development
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from app.routes import accords, formulas, ingredients, development, jobs, admin
 from app.schema.config import settings
+from app.services.llm_scheduler import llm_scheduler, LLMOverloadedError
+from app.services.llm_client import llm_client
+from app.resources import resources
+from app.db.initialization.replicas import replica_router
+from app.services.metrics import metrics, instrument_sqlalchemy
+from app.services.profiling import install_profiling
+from app.middleware import MetricsMiddleware, ProfilingMiddleware, ReplicaStickinessMiddleware
+from app.services.job_queue import job_worker_pool
 import logging
 
 logging.basicConfig(level=logging.INFO)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 무거운 리소스는 첫 사용 시 생성 - STARTUP_WARM_UP에 적은 것만 미리 생성
+    if settings.STARTUP_WARM_UP:
+        timings = await run_in_threadpool(resources.warm_up, settings.STARTUP_WARM_UP)
+        logging.getLogger(__name__).info(f"Warm-up: {timings}")
+
+    # 내장 백그라운드 작업 워커 (JOB_WORKERS=0이면 별도 프로세스 `python -m app.worker`만 사용)
+    job_worker_pool.start()
+    yield
+    job_worker_pool.stop()
+    resources.close_all()
+
+
 app = FastAPI(
     title="Fragrance Formulation API",
     version="0.2.0",
-    description="AI-powered fragrance accord & formula generator"
+    description="AI-powered fragrance accord & formula generator",
+    lifespan=lifespan
 )
 
+if settings.METRICS_ENABLED:
+    instrument_sqlalchemy()
+    app.add_middleware(MetricsMiddleware)
+
+if settings.DATABASE_REPLICA_URLS:
+    # 쓰기 직후 같은 클라이언트의 읽기는 primary로 (read-your-writes)
+    app.add_middleware(ReplicaStickinessMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -24,10 +59,38 @@ app.include_router(accords.router)
 app.include_router(formulas.router)
 app.include_router(ingredients.router)
 app.include_router(development.router)
+app.include_router(jobs.router)
+app.include_router(admin.router)
+
+if settings.PROFILING_ENABLED:
+    # 라우트 등록 이후에 endpoint를 래핑해야 함
+    install_profiling(app)
+    app.add_middleware(ProfilingMiddleware)
+
+@app.exception_handler(LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+    """LLM 대기열 포화 / 대기 기한 초과 / circuit open → 503 + Retry-After"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok", "version": "0.2.0"}
+    return {"status": "ok", "version": "0.2.0", "resources": resources.status(), "replicas": replica_router.status()}
+
+@app.get("/health/llm")
+async def llm_scheduler_stats():
+    """LLM admission 대기열 길이 / 대기 시간 + 모델별 요청, 에러, 지연 시간, circuit 상태"""
+    return {**llm_scheduler.stats(), "models": llm_client.stats()}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    if not metrics.enabled:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,165 @@
+"""
+ASGI Middleware
+
+- MetricsMiddleware: 라우트별 요청 수 / 지연 시간, 요청당 DB 쿼리 수 / 시간 (`GET /metrics`)
+- ProfilingMiddleware: 선택된 요청의 샘플링 프로파일 + span 기록 (PROFILING_ENABLED, 디버그 전용)
+- ReplicaStickinessMiddleware: 쓰기 직후 같은 클라이언트의 읽기를 primary DB로 (DATABASE_REPLICA_URLS 설정 시)
+
+BaseHTTPMiddleware 대신 순수 ASGI로 구현 - 스트리밍 응답(SSE)이 끝날 때까지의 시간을 측정하고
+응답 본문을 버퍼링하지 않습니다.
+"""
+
+from typing import Any, Callable, Dict
+from starlette.concurrency import run_in_threadpool
+from app.services.metrics import (
+    HTTP_REQUESTS,
+    HTTP_LATENCY,
+    HTTP_DB_QUERIES,
+    HTTP_DB_SECONDS,
+    RequestStats,
+    current_request,
+)
+from app.services.profiling import profiler, current_profile
+from app.db.initialization.replicas import ReadRouting, current_read_routing
+from app.schema.config import settings
+from http.cookies import SimpleCookie
+import time
+
+# 메트릭에서 제외할 경로 (scrape 자체)
+EXCLUDED_PATHS = {"/metrics"}
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """실제 경로 대신 라우트 템플릿 (`/api/formulas/{id}`) - label cardinality 제한"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return "unmatched"
+
+    routes = getattr(app.state, "route_templates", None)
+    if routes is None:
+        routes = {}
+        for route in app.routes:
+            routes.setdefault(getattr(route, "endpoint", None), getattr(route, "path", "unmatched"))
+        app.state.route_templates = routes
+    return routes.get(endpoint, "unmatched")
+
+
+class MetricsMiddleware:
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            route = route_template(scope)
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=status)
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=scope["method"], route=route)
+            HTTP_DB_QUERIES.observe(stats.db_queries, route=route)
+            HTTP_DB_SECONDS.observe(stats.db_seconds, route=route)
+
+
+class ProfilingMiddleware:
+    """`X-Profile` 헤더 또는 PROFILING_SAMPLE_RATE로 선택된 요청 프로파일 (응답 헤더 `X-Profile-Id`)"""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/api/admin"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        if not profiler.should_profile(headers):
+            await self.app(scope, receive, send)
+            return
+
+        profile = profiler.start(scope["method"], scope["path"])
+        token = current_profile.set(profile)
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profile.endpoint_finished is not None:
+                    # endpoint 반환 이후 응답 모델 검증 / JSON 직렬화 구간
+                    profile.add_span("serialization", None, profile.endpoint_finished, time.perf_counter())
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            # 파일 저장은 이벤트 루프 밖에서
+            await run_in_threadpool(profiler.finish, profile, status)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes: 요청 중 DB 쓰기가 있으면 응답에 `db_primary_until` cookie (DATABASE_REPLICA_STICKY_SECONDS),
+    cookie가 유효한 동안 그 클라이언트의 읽기는 replica 대신 primary로 (`RoutingSession`)
+
+    스트리밍 응답은 헤더를 보낸 뒤의 쓰기를 cookie에 반영하지 못함 - 그 세션 안의 읽기만 primary
+    """
+
+    COOKIE = "db_primary_until"
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        routing = ReadRouting(primary=self._sticky(scope))
+        token = current_read_routing.set(routing)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and routing.wrote:
+                sticky_seconds = settings.DATABASE_REPLICA_STICKY_SECONDS
+                cookie = (
+                    f"{self.COOKIE}={time.time() + sticky_seconds:.3f}; "
+                    f"Max-Age={max(1, int(sticky_seconds + 0.999))}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_read_routing.reset(token)
+
+    def _sticky(self, scope: Dict[str, Any]) -> bool:
+        """cookie의 시각이 아직 지나지 않았으면 True"""
+        for key, value in scope["headers"]:
+            if key != b"cookie":
+                continue
+            morsel = SimpleCookie(value.decode("latin-1")).get(self.COOKIE)
+            if morsel is None:
+                continue
+            try:
+                return float(morsel.value) > time.time()
+            except ValueError:
+                return False
+        return False
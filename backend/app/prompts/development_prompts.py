@@ -2,14 +2,22 @@
 Development mode LLM prompt templates
 """
 
+from typing import Any, Dict, Optional
+import json
 
-def get_development_system_prompt(ingredient_list: str = "", ingredient_count: int = 0) -> str:
+
+def get_development_system_prompt(
+    ingredient_list: str = "",
+    ingredient_count: int = 0,
+    conversation_context: str = ""
+) -> str:
     """
     Get development mode system prompt
 
     Args:
         ingredient_list: Formatted string of available ingredients from database (optional)
         ingredient_count: Total count of available ingredients (optional)
+        conversation_context: Summary of earlier (compacted) turns (optional)
 
     Returns:
         System prompt string for development chat
@@ -82,9 +90,80 @@ Through conversation with the user, understand their desired fragrance and devel
 - Total percentage H 100%
 - All formulas must have complete Top/Heart/Base note structure
 - If the user's ingredient library is insufficient to create a complete formula, DO NOT attempt to create a formula based on their limited ingredients. Instead, make proper formula with commonly used fragrance materials.
+{conversation_context}"""
+
+
+def get_conversation_context_block(
+    summary: str,
+    user_preferences: Dict[str, Any],
+    current_formulation: Optional[Dict[str, Any]],
+    compacted_messages: int
+) -> str:
+    """
+    Render compacted conversation state for the development system prompt
+
+    Args:
+        summary: Running summary of earlier turns
+        user_preferences: Extracted user preferences
+        current_formulation: Formulation currently being worked on (if any)
+        compacted_messages: Number of earlier messages covered by the summary
+
+    Returns:
+        System prompt section string
+    """
+    formulation = json.dumps(current_formulation, ensure_ascii=False) if current_formulation else "None yet"
+
+    return f"""
+[Earlier Conversation ({compacted_messages} messages, summarized)]
+{summary}
+
+[User Preferences So Far]
+{json.dumps(user_preferences or {}, ensure_ascii=False)}
+
+[Current Formulation]
+{formulation}
+
+Continue the conversation from the recent messages below, consistent with the state above.
 """
 
 
+def get_conversation_summary_prompt(
+    previous_summary: str,
+    previous_state: Dict[str, Any],
+    transcript: str
+) -> str:
+    """
+    Get prompt that rolls older development chat turns into the running summary
+
+    Args:
+        previous_summary: Summary of turns compacted before (may be empty)
+        previous_state: Previously extracted user_preferences/current_formulation
+        transcript: Newly compacted turns ("user: ...\nassistant: ...")
+
+    Returns:
+        LLM prompt string
+    """
+    return f"""You maintain the working memory of a perfume development conversation between a user and a perfumer AI.
+
+[Previous Summary]
+{previous_summary or "(none)"}
+
+[Previous Structured State]
+{json.dumps(previous_state, ensure_ascii=False)}
+
+[New Messages To Fold In]
+{transcript}
+
+Update the memory by calling the provided tool:
+- summary: concise running summary (max ~250 words) of everything decided, requested or rejected so far
+- user_preferences: key facts about the desired fragrance (mood, target, season, liked/disliked notes or materials, budget, concentration)
+- current_formulation: the latest formula being worked on with exact ingredient names and percentages, or null if none yet
+
+Keep every concrete decision (materials, percentages, constraints); drop pleasantries and repetition."""
+
+
 __all__ = [
     "get_development_system_prompt",
+    "get_conversation_context_block",
+    "get_conversation_summary_prompt",
 ]
@@ -24,20 +24,15 @@ IMPORTANT: Prefer using ingredients from this list when possible.
 
     return f"""You are a professional perfumer. Generate a simple and clear {accord_type} accord.
 {ingredient_list}
-Return JSON format:
-{{
-  "name": "{accord_type} Accord",
-  "type": "{accord_type}",
-  "description": "Clear description of this accord",
-  "ingredients": [
-    {{"name": "Ingredient", "percentage": 25, "note": "top", "role": "Top Impact", "cas_number": "", "supplier": ""}},
-    {{"name": "Ingredient", "percentage": 50, "note": "middle", "role": "Supporting", "cas_number": "", "supplier": ""}},
-    {{"name": "Ingredient", "percentage": 25, "note": "base", "role": "Masking", "cas_number": "", "supplier": ""}}
-  ],
-  "longevity": "6-8 hours",
-  "sillage": "moderate",
-  "recommendation": "Brief explanation of this accord composition"
-}}"""
+Record the accord by calling the provided tool:
+- name: "{accord_type} Accord"
+- type: "{accord_type}"
+- description: Clear description of this accord
+- items: each with ingredient.ingredient_name (and cas_number if known), percentage,
+  note ("top", "middle" or "base") and role (e.g., "Top Impact", "Supporting", "Masking")
+- percentages must add up to 100
+- longevity (e.g., "6-8 hours"), sillage (e.g., "moderate")
+- recommendation: Brief explanation of this accord composition"""
 
 
 def get_formula_generation_prompt(formula_type: str, ingredient_names: Optional[List[str]] = None) -> str:
@@ -67,22 +62,16 @@ Include proper percentages for:
 Your formula can include roles such as:
 Fixative, Main Accord, Supporting, Top Impact, Bridge, Modifier, Booster, Character, Masking, Sweetener, Texture
 
-Return JSON:
-{{
-  "name": "{formula_type} Formula",
-  "type": "{formula_type}",
-  "description": "Professional fragrance formula description",
-  "ingredients": [
-    {{"name": "Ingredient", "percentage": 25, "note": "top", "role": "Top Impact", "cas_number": "", "supplier": ""}},
-    {{"name": "Ingredient", "percentage": 50, "note": "middle", "role": "Supporting", "cas_number": "", "supplier": ""}},
-    {{"name": "Ingredient", "percentage": 25, "note": "base", "role": "Masking", "cas_number": "", "supplier": ""}}
-  ],
-  "total_percentage": 100.0,
-  "longevity": "10+ hours",
-  "sillage": "strong",
-  "stability_notes": "Storage and stability information",
-  "recommendation": "Complete fragrance development recommendation"
-}}"""
+Record the formula by calling the provided tool:
+- name: "{formula_type} Formula"
+- type: "{formula_type}"
+- description: Professional fragrance formula description
+- items: each with ingredient.ingredient_name (and cas_number if known), percentage,
+  note ("top", "middle" or "base") and role
+- percentages must add up to 100
+- longevity (e.g., "10+ hours"), sillage (e.g., "strong")
+- stability_notes: Storage and stability information
+- recommendation: Complete fragrance development recommendation"""
 
 
 __all__ = [
@@ -0,0 +1,144 @@
+"""
+Resource Registry - 무거운 외부 리소스의 지연 초기화
+
+DB 엔진, ChromaDB, Anthropic 클라이언트, LangGraph 그래프는 import 시점이 아니라
+처음 사용할 때 (또는 lifespan warm-up에서) 생성됩니다.
+
+- `resources.get(name)`: 리소스 반환 (처음이면 생성, 스레드 안전)
+- `resources.warm_up(names)`: 서버 시작 시 미리 생성 (STARTUP_WARM_UP) - 실패해도 서버는 시작
+- `resources.close_all()`: 서버 종료 시 정리
+- `resources.override(name, factory)`: factory 교체 (벤치마크의 로컬 fake)
+- `resources.status()`: 생성 여부 / 생성 시간 → `GET /health`
+
+리소스는 정의된 모듈에서 `resources.register(...)`로 등록하며, 아직 import되지 않은
+모듈의 리소스는 `_PROVIDERS`에 적힌 모듈을 import하여 등록합니다.
+"""
+
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, TypeVar
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 리소스 이름 → 등록하는 모듈 (warm-up 시 import)
+_PROVIDERS = {
+    "database": "app.db.initialization.engine",
+    "database_replicas": "app.db.initialization.engine",
+    "chroma": "app.db.vector.chroma_client",
+    "embedding_model": "app.db.vector.embeddings",
+    "embedding_cache": "app.db.vector.embeddings",
+    "anthropic": "app.services.llm_client",
+    "coordinator_graph": "app.agents.coordinator",
+}
+
+
+class LazyResource(Generic[T]):
+    """처음 get() 할 때 factory로 생성되는 리소스"""
+
+    def __init__(self, name: str, factory: Callable[[], T], close: Optional[Callable[[T], Any]] = None):
+        self.name = name
+        self.factory = factory
+        self._close = close
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._initialized = False
+        self.init_ms: Optional[float] = None
+
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
+
+    def get(self) -> T:
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    started = time.perf_counter()
+                    self._value = self.factory()
+                    self.init_ms = round((time.perf_counter() - started) * 1000, 2)
+                    self._initialized = True
+                    logger.info(f"Resource '{self.name}' initialized in {self.init_ms}ms")
+        return self._value
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._initialized:
+                return
+            try:
+                if self._close is not None:
+                    self._close(self._value)
+            except Exception as e:
+                logger.warning(f"Failed to close resource '{self.name}': {e}")
+            finally:
+                self._value = None
+                self._initialized = False
+                self.init_ms = None
+
+
+class ResourceRegistry:
+    """프로세스 공유 리소스 목록"""
+
+    def __init__(self):
+        self._resources: Dict[str, LazyResource] = {}
+
+    def register(self, name: str, factory: Callable[[], T], close: Optional[Callable[[T], Any]] = None) -> LazyResource[T]:
+        """리소스 등록 (생성은 첫 get() 시점)"""
+        resource = LazyResource(name, factory, close)
+        self._resources[name] = resource
+        return resource
+
+    def get(self, name: str) -> Any:
+        return self._resource(name).get()
+
+    def override(self, name: str, factory: Callable[[], T], close: Optional[Callable[[T], Any]] = None) -> None:
+        """
+        등록된 리소스의 factory 교체 (벤치마크용 fake 등) - 이미 생성된 값은 닫고 다음 get()에서 새로 생성
+
+        모듈이 보관 중인 LazyResource 객체는 그대로 유지되므로 기존 참조에도 적용됩니다.
+        """
+        resource = self._resource(name)
+        resource.close()
+        resource.factory = factory
+        resource._close = close
+
+    def warm_up(self, names: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        리소스 미리 생성
+
+        Returns:
+            {이름: 생성 시간(ms)} - 실패한 리소스는 None (에러는 로그만 남김)
+        """
+        timings: Dict[str, Optional[float]] = {}
+        for name in names:
+            try:
+                resource = self._resource(name)
+                resource.get()
+                timings[name] = resource.init_ms
+            except Exception as e:
+                logger.warning(f"Warm-up of '{name}' failed: {e}")
+                timings[name] = None
+        return timings
+
+    def close_all(self) -> None:
+        for resource in reversed(list(self._resources.values())):
+            resource.close()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"initialized": resource.initialized, "init_ms": resource.init_ms}
+            for name, resource in self._resources.items()
+        }
+
+    def _resource(self, name: str) -> LazyResource:
+        if name not in self._resources and name in _PROVIDERS:
+            importlib.import_module(_PROVIDERS[name])
+        if name not in self._resources:
+            raise KeyError(f"Unknown resource: {name}")
+        return self._resources[name]
+
+
+# Singleton instance
+resources = ResourceRegistry()
@@ -2,18 +2,33 @@
 Accords Routes - Accord 조합 관련 API 엔드포인트
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
+from typing import Iterator, Literal, Optional
 from app.db.initialization.session import get_db
+from app.db.schema import Accord
 from app.db.queries import (
-    get_all_accords,
+    get_accord_list_rows,
+    get_accord_rows_with_ingredient,
+    get_accord_detail_row,
     get_accord_by_id,
+    get_accords_by_ids,
     get_accord_by_name,
     create_accord,
     update_accord,
     delete_accord,
+    bulk_update_accords,
+    bulk_delete_accords,
+    pop_table_versions,
 )
+from app.db.vector import SIMILARITY_METRICS, get_accord_composition_index
 from app.services.accord_service import accord_service
+from app.services.llm_scheduler import LLMOverloadedError
+from app.services.http_cache import table_validators, entity_validators, not_modified, with_validators
+from app.schema.config import settings
+from app.schema.requests import BulkDeleteRequest, BulkUpdateRequest
+from app.schema.responses import AccordListResponse, AccordDetail, ClosingStreamingResponse, rows_response, row_response
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,7 +36,7 @@ router = APIRouter(prefix="/api/accords", tags=["accords"])
 
 
 @router.post("/generate")
-async def generate_accord(
+def generate_accord(
     request: dict,
     db: Session = Depends(get_db)
 ):
@@ -31,18 +46,76 @@ async def generate_accord(
         if not accord_type:
             raise HTTPException(status_code=400, detail="Accord type required")
 
-        logger.info(f"Accord 생성 요청: {accord_type}")
-        result = accord_service.generate_accord(accord_type, db)
+        candidates = request.get("candidates", 1)
+        if not isinstance(candidates, int) or not 1 <= candidates <= settings.GENERATION_MAX_CANDIDATES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"candidates must be between 1 and {settings.GENERATION_MAX_CANDIDATES}"
+            )
 
+        logger.info(f"Accord 생성 요청: {accord_type} (candidates={candidates})")
+
+        if candidates == 1:
+            result = accord_service.generate_accord(accord_type, db)
+            return {
+                "status": "success",
+                "data": result
+            }
+
+        # N개 후보 병렬 생성 → 로컬 검증 점수로 정렬, 최고 점수 후보를 data로 반환
+        ranked = accord_service.generate_accord_candidates(accord_type, db, candidates)
         return {
             "status": "success",
-            "data": result
+            "data": ranked[0]["data"],
+            "candidates": ranked
         }
+    except (HTTPException, LLMOverloadedError):
+        raise
     except Exception as e:
         logger.error(f"Accord 생성 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate/stream")
+def generate_accord_stream(
+    request: dict,
+    db: Session = Depends(get_db)
+):
+    """
+    Accord 조합 생성 (SSE 스트리밍)
+
+    원료 항목이 완성될 때마다 전송하여 UI가 배합을 점진적으로 렌더링할 수 있습니다.
+    """
+    accord_type = request.get("accord_type", "").strip()
+    if not accord_type:
+        raise HTTPException(status_code=400, detail="Accord type required")
+
+    logger.info(f"Accord 스트리밍 생성 요청: {accord_type}")
+
+    # DB 조회 및 LLM admission은 스트리밍 시작 전에 (대기열이 가득 차면 503)
+    events = accord_service.stream_accord(accord_type, db)
+
+    def generate() -> Iterator[str]:
+        try:
+            for event in events:
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"Accord 스트리밍 생성 실패: {e}", exc_info=True)
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    # 연결이 끊기거나 본문 전송 전에 실패해도 LLM 호출을 닫고 admission slot 반환
+    return ClosingStreamingResponse(
+        generate(),
+        on_close=events.close,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+
 @router.post("/save")
 async def save_accord(
     request: dict,
@@ -77,14 +150,33 @@ async def save_accord(
             "llm_recommendation": llm_recommendation
         }
 
+        # 유사 배합(중복) 확인 - 저장은 진행하고 경고만 반환
+        composition_index = get_accord_composition_index(db)
+        duplicates = composition_index.find_duplicates(
+            ingredients_composition,
+            threshold=settings.COMPOSITION_DUPLICATE_THRESHOLD
+        )
+
         accord = create_accord(db, accord_data)
+        # 방금 저장한 버전은 이 upsert로 반영됨 (다음 조회에서 다시 로드하지 않음)
+        composition_index.upsert(accord.id, accord.ingredients_composition, written=pop_table_versions(db, "accords"))
 
         logger.info(f"Accord 저장 완료: ID={accord.id}, Name={name}")
 
+        warnings = []
+        if duplicates:
+            names = {e.id: e.name for e in get_accords_by_ids(db, [d[0] for d in duplicates])}
+            warnings = [
+                f"Composition is {score:.0%} similar to accord '{names.get(dup_id)}' (ID={dup_id})"
+                for dup_id, score in duplicates
+            ]
+            logger.info(f"Accord 중복 의심: ID={accord.id}, similar={duplicates}")
+
         return {
             "status": "success",
             "message": f"Accord '{name}' saved",
-            "accord_id": accord.id
+            "accord_id": accord.id,
+            "warnings": warnings
         }
     except HTTPException:
         raise
@@ -94,42 +186,91 @@ async def save_accord(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("")
-async def list_accords(db: Session = Depends(get_db)):
-    """저장된 Accord 목록"""
-    accords = get_all_accords(db)
-    return {
-        "count": len(accords),
-        "accords": [
-            {
-                "id": a.id,
-                "name": a.name,
-                "type": a.accord_type,
-                "ingredients_count": len(a.ingredients_composition) if a.ingredients_composition else 0,
-                "created_at": a.created_at.isoformat() if a.created_at else None
-            }
-            for a in accords
-        ]
-    }
+@router.get("", response_model=AccordListResponse)
+async def list_accords(request: Request, db: Session = Depends(get_db)):
+    """저장된 Accord 목록 (필요한 컬럼만 조회하여 row tuple을 바로 직렬화, ETag 조건부 GET)"""
+    validators = table_validators(db, "accords")
+    cached = not_modified(request, validators)
+    if cached:
+        return cached
+    return with_validators(rows_response("accords", get_accord_list_rows(db)), validators)
+
+
+@router.get("/search", response_model=AccordListResponse)
+async def search_accords(
+    request: Request,
+    ingredient: str = Query(..., min_length=1),
+    note: Optional[Literal["top", "middle", "base"]] = None,
+    db: Session = Depends(get_db)
+):
+    """원료를 포함한 Accord 목록 (예: ?ingredient=Ambroxan&note=base - base note에 Ambroxan이 있는 Accord)"""
+    try:
+        validators = table_validators(db, "accords")
+        cached = not_modified(request, validators)
+        if cached:
+            return cached
+        rows = get_accord_rows_with_ingredient(db, ingredient.strip(), note=note)
+        return with_validators(rows_response("accords", rows), validators)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Accord 검색 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{id}", response_model=AccordDetail)
+async def get_accord_detail(id: int, request: Request, db: Session = Depends(get_db)):
+    """특정 Accord 상세 조회 (ETag 조건부 GET)"""
+    validators = entity_validators(db, Accord, id)
+    cached = not_modified(request, validators)
+    if cached:
+        return cached
+
+    row = get_accord_detail_row(db, id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Accord not found")
+    return with_validators(row_response(row), validators)
+
 
+@router.get("/{id}/similar")
+async def get_similar_accords(
+    id: int,
+    limit: int = 10,
+    metric: str = "cosine",
+    db: Session = Depends(get_db)
+):
+    """Composition 기반 유사 Accord 검색"""
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(status_code=400, detail=f"Metric must be one of {', '.join(SIMILARITY_METRICS)}")
+    if limit < 1 or limit > 50:
+        raise HTTPException(status_code=400, detail="Limit must be between 1 and 50")
 
-@router.get("/{id}")
-async def get_accord_detail(id: int, db: Session = Depends(get_db)):
-    """특정 Accord 상세 조회"""
     accord = get_accord_by_id(db, id)
     if not accord:
         raise HTTPException(status_code=404, detail="Accord not found")
 
+    matches = get_accord_composition_index(db).query(
+        accord.ingredients_composition,
+        limit=limit,
+        metric=metric,
+        exclude_id=id
+    )
+    accords_by_id = {e.id: e for e in get_accords_by_ids(db, [m[0] for m in matches])}
+
     return {
-        "id": accord.id,
-        "name": accord.name,
-        "type": accord.accord_type,
-        "description": accord.description,
-        "ingredients_composition": accord.ingredients_composition,
-        "longevity": accord.longevity,
-        "sillage": accord.sillage,
-        "llm_recommendation": accord.llm_recommendation,
-        "created_at": accord.created_at.isoformat() if accord.created_at else None
+        "accord_id": id,
+        "metric": metric,
+        "count": len(matches),
+        "results": [
+            {
+                "id": match_id,
+                "name": accords_by_id[match_id].name,
+                "type": accords_by_id[match_id].accord_type,
+                "score": score
+            }
+            for match_id, score in matches
+            if match_id in accords_by_id
+        ]
     }
 
 
@@ -156,10 +297,17 @@ async def update_accord_route(
         if "llm_recommendation" in request:
             update_data["llm_recommendation"] = request["llm_recommendation"]
 
+        composition_index = get_accord_composition_index(db)
         accord = update_accord(db, id, update_data)
         if not accord:
             raise HTTPException(status_code=404, detail="Accord not found")
 
+        written = pop_table_versions(db, "accords")
+        if "ingredients_composition" in update_data:
+            composition_index.upsert(accord.id, accord.ingredients_composition, written=written)
+        else:
+            composition_index.advance(written)
+
         logger.info(f"Accord 수정 완료: ID={id}")
 
         return {
@@ -175,13 +323,56 @@ async def update_accord_route(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.patch("/bulk")
+async def bulk_update_accords_route(request: BulkUpdateRequest, db: Session = Depends(get_db)):
+    """여러 Accord를 한 번에 수정 (ids / filter, UPDATE ... RETURNING 한 번 + 트랜잭션 하나)"""
+    try:
+        composition_index = get_accord_composition_index(db)
+        rows = bulk_update_accords(db, request.values, ids=request.ids, filters=request.filter)
+        # composition은 대량 수정 대상이 아님 - 색인 내용은 그대로, 버전만 갱신
+        composition_index.advance(pop_table_versions(db, "accords"))
+        logger.info(f"Accord 일괄 수정 완료: {len(rows)}개, fields={sorted(request.values)}")
+        return {"status": "success", "count": len(rows), "ids": [row.id for row in rows]}
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Accord 일괄 수정 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/bulk")
+async def bulk_delete_accords_route(request: BulkDeleteRequest, db: Session = Depends(get_db)):
+    """여러 Accord를 한 번에 삭제 (DELETE ... RETURNING 한 번) + 유사도 색인에서 일괄 제거"""
+    try:
+        composition_index = get_accord_composition_index(db)
+        rows = bulk_delete_accords(db, ids=request.ids, filters=request.filter)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Accord 일괄 삭제 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    ids = [row.id for row in rows]
+    composition_index.remove_many(ids, written=pop_table_versions(db, "accords"))
+
+    logger.info(f"Accord 일괄 삭제 완료: {len(ids)}개")
+    return {"status": "success", "count": len(ids), "ids": ids}
+
+
 @router.delete("/{id}")
 async def delete_accord_route(id: int, db: Session = Depends(get_db)):
     """Accord 삭제"""
+    composition_index = get_accord_composition_index(db)
     success = delete_accord(db, id)
     if not success:
         raise HTTPException(status_code=404, detail="Accord not found")
 
+    composition_index.remove(id, written=pop_table_versions(db, "accords"))
+
     logger.info(f"Accord 삭제 완료: ID={id}")
 
     return {"status": "success", "message": f"Accord deleted"}
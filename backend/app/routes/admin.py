@@ -0,0 +1,65 @@
+"""
+Admin Routes - 프로파일 조회 (PROFILING_ENABLED일 때만)
+
+PROFILING_TOKEN이 설정되어 있으면 `X-Admin-Token` 헤더가 같아야 합니다.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from typing import Optional
+from app.schema.config import settings
+from app.services.profiling import profiler
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def require_profiling(x_admin_token: Optional[str] = Header(None)):
+    """프로파일링이 꺼져 있으면 404, 토큰이 다르면 403"""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.PROFILING_TOKEN and x_admin_token != settings.PROFILING_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_profiling)])
+
+
+@router.get("/profiles")
+def list_profiles(limit: int = 50):
+    """저장된 프로파일 목록 (최신순, 요약만)"""
+    try:
+        profiles = profiler.list_profiles(limit=min(max(limit, 1), 500))
+        return {"count": len(profiles), "profiles": profiles}
+    except Exception as e:
+        logger.error(f"Profile 목록 조회 실패: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    """프로파일 요약 + span 목록 (DB / vector / LLM / serialization 구간)"""
+    path = profiler.profile_path(profile_id, "summary")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@router.get("/profiles/{profile_id}/speedscope")
+def download_speedscope(profile_id: str):
+    """speedscope 파일 (https://www.speedscope.app 에서 열기)"""
+    path = profiler.profile_path(profile_id, "speedscope")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.speedscope.json")
+
+
+@router.get("/profiles/{profile_id}/collapsed")
+def download_collapsed(profile_id: str):
+    """collapsed stack (flamegraph.pl 입력)"""
+    path = profiler.profile_path(profile_id, "collapsed")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.collapsed.txt")
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, AsyncGenerator
+from typing import Any, Dict, List, Iterator, Optional
 from sqlalchemy.orm import Session
 from app.db.initialization.session import get_db
 from app.services.development_service import development_service
+from app.services.llm_scheduler import llm_scheduler, Priority, LLMOverloadedError
+from app.services.session_store import (
+    development_session_store,
+    parse_event_id,
+    SessionBusyError,
+)
 import json
 import logging
 
@@ -12,6 +18,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/development", tags=["development"])
 
+# Admission 예산 계산용 대화 1턴 예상 토큰 (압축된 컨텍스트 + max_tokens)
+CHAT_ESTIMATED_TOKENS = 8192
+
 
 class Message(BaseModel):
     role: str
@@ -19,41 +28,96 @@ class Message(BaseModel):
 
 
 class ChatRequest(BaseModel):
-    messages: List[Message]
+    # 서버 세션 사용 시: session_id + message (새 메시지만 전송)
+    session_id: Optional[str] = None
+    message: Optional[str] = None
+    # 기존 방식: 전체 히스토리 전송 (마지막 메시지가 새 사용자 메시지)
+    messages: Optional[List[Message]] = None
+
+
+class WorkflowRequest(BaseModel):
+    session_id: Optional[str] = None
+    messages: Optional[List[Message]] = None  # 없으면 세션 히스토리 사용
+    current_formulation: Optional[Dict[str, Any]] = None  # {"ingredients": [{"name", "percentage", ...}]}
 
 
 @router.post("/chat")
-async def chat_stream(request: ChatRequest, db: Session = Depends(get_db)):
+def chat_stream(
+    request: ChatRequest,
+    db: Session = Depends(get_db),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
     """
     Development Mode - 간단한 대화형 향수 개발 서비스
 
-    복잡한 Agent 구조 없이 스트리밍 대화만 제공합니다.
+    - `session_id` + `message`: 서버에 저장된 히스토리에 새 메시지를 추가하여 응답 생성
+    - `messages`만 전송: 새 세션을 만들고 히스토리로 사용 (기존 클라이언트 호환)
+    - `session_id`만 전송 + `Last-Event-ID` 헤더: 끊긴 스트림 재개 (버퍼에서 재전송, LLM 호출 없음)
+
+    각 청크는 `id: {turn}-{seq}` 이벤트 ID와 함께 전송되며, 첫 이벤트로 session_id를 알려줍니다.
     """
     try:
-        # Convert Pydantic models to dicts
-        messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
+        session = None
+        if request.session_id:
+            session = development_session_store.get(db, request.session_id)
 
-        logger.info(f"[/api/development/chat] 메시지 수: {len(messages)}")
+        if request.message is not None or request.messages:
+            if request.message is not None:
+                if session is None:
+                    raise HTTPException(status_code=404, detail=f"Session {request.session_id} not found")
+                user_message = request.message
+            else:
+                history = [{"role": msg.role, "content": msg.content} for msg in request.messages]
+                if history[-1]["role"] != "user":
+                    raise HTTPException(status_code=400, detail="Last message must be from the user")
+                if session is None:
+                    session = development_session_store.create(request.session_id, history[:-1])
+                user_message = history[-1]["content"]
 
-        # Stream chat
-        async def generate() -> AsyncGenerator[str, None]:
+            ingredient_list, ingredient_count = development_service.load_ingredient_context(db)
+
+            # 대화는 최우선 순위 - 슬롯은 응답 생성이 끝날 때 반환 (컨텍스트 요약 호출 포함)
+            ticket = llm_scheduler.admit(Priority.INTERACTIVE, CHAT_ESTIMATED_TOKENS)
             try:
-                # Development service로 스트리밍
-                async for chunk in development_service.stream_chat(
-                    messages=messages,
-                    db=db
-                ):
-                    # SSE 형식으로 전송
-                    yield f"data: {json.dumps({'content': chunk})}\n\n"
+                development_session_store.start_turn(
+                    db,
+                    session,
+                    user_message,
+                    lambda messages: ticket.guard(
+                        development_service.iter_chat(messages, ingredient_list, ingredient_count)
+                    )
+                )
+            except Exception:
+                ticket.release()
+                raise
+            after = None
+            logger.info(f"[/api/development/chat] 세션 {session.session_id} 턴 {session.turn} 시작 (메시지 수: {len(session.messages)})")
 
-                # 완료 신호
-                logger.info("[/api/development/chat] ✓ 완료")
-                yield "data: [DONE]\n\n"
+        elif session is not None:
+            after = parse_event_id(last_event_id)
+            logger.info(f"[/api/development/chat] 세션 {session.session_id} 재개 (Last-Event-ID: {last_event_id})")
 
-            except Exception as e:
-                logger.error(f"[/api/development/chat] 에러: {e}", exc_info=True)
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-                yield "data: [DONE]\n\n"
+        else:
+            raise HTTPException(status_code=400, detail="Either messages, message or an existing session_id is required")
+
+        # Stream chat (버퍼에서 읽기 - 연결이 끊겨도 생성은 계속됨)
+        def generate() -> Iterator[str]:
+            yield f"data: {json.dumps({'session_id': session.session_id, 'turn': session.turn})}\n\n"
+
+            for kind, payload in development_session_store.iter_events(session, after):
+                if kind == "chunk":
+                    event_id, chunk = payload
+                    # SSE 형식으로 전송
+                    yield f"id: {event_id}\ndata: {json.dumps({'content': chunk})}\n\n"
+                elif kind == "keepalive":
+                    yield ": keep-alive\n\n"
+                else:
+                    logger.error(f"[/api/development/chat] 에러: {payload}")
+                    yield f"data: {json.dumps({'error': payload})}\n\n"
+
+            # 완료 신호
+            logger.info("[/api/development/chat] ✓ 완료")
+            yield "data: [DONE]\n\n"
 
         return StreamingResponse(
             generate(),
@@ -61,9 +125,82 @@ async def chat_stream(request: ChatRequest, db: Session = Depends(get_db)):
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                "X-Session-Id": session.session_id,
             }
         )
 
+    except (HTTPException, LLMOverloadedError):
+        raise
+    except SessionBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"[/api/development/chat] 초기화 에러: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sessions/{session_id}")
+def get_session(session_id: str, db: Session = Depends(get_db)):
+    """Development 세션 히스토리 조회"""
+    session = development_session_store.get(db, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    return session.snapshot()
+
+
+@router.delete("/sessions/{session_id}")
+def delete_session(session_id: str, db: Session = Depends(get_db)):
+    """Development 세션 삭제"""
+    try:
+        if not development_session_store.delete(db, session_id):
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        return {"message": f"Session {session_id} deleted"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting session {session_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/workflow")
+def run_workflow(request: WorkflowRequest, db: Session = Depends(get_db)):
+    """
+    Coordinator 그래프 실행 (LangGraph)
+
+    원료 검색, 시장 조사, 안전성 검증을 병렬로 실행하고 결과를 통합합니다.
+    실패한 요청을 다시 보내면 완료된 노드는 건너뛰고 checkpoint부터 재개합니다.
+    """
+    try:
+        # langgraph import가 무거우므로 첫 워크플로우 요청 시 로드
+        from app.agents.coordinator import run_coordinator
+
+        session = development_session_store.get(db, request.session_id) if request.session_id else None
+        if request.messages:
+            history = [{"role": msg.role, "content": msg.content} for msg in request.messages]
+        elif session is not None:
+            history = session.snapshot()["messages"]
+        else:
+            raise HTTPException(status_code=400, detail="Either messages or an existing session_id is required")
+
+        session_id = request.session_id or (session.session_id if session else "anonymous")
+        result = run_coordinator(
+            session_id=session_id,
+            conversation_history=history,
+            db=db,
+            current_formulation=request.current_formulation
+        )
+
+        return {
+            "session_id": session_id,
+            "final_response": result.get("final_response"),
+            "next_agent": result.get("next_agent"),
+            "search_result": result.get("search_result"),
+            "research_result": result.get("research_result"),
+            "validation_result": result.get("validation_result"),
+            "node_timings": result.get("node_timings", {}),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[/api/development/workflow] 에러: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
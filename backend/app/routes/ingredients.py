@@ -1,20 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
 from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
 from app.db.initialization.session import get_db
 from app.db.schema import Ingredient
 from app.db.queries import (
-    get_all_ingredients,
+    get_ingredient_list_rows,
+    filter_ingredient_rows,
+    count_filtered_ingredients,
+    get_ingredient_facets,
     get_ingredient_by_id,
     create_ingredient,
     update_ingredient,
     delete_ingredient,
     search_ingredients_by_name,
+    bulk_update_ingredients,
+    bulk_delete_ingredients,
 )
 from app.db.vector import (
     search_ingredients_semantic,
-    index_all_ingredients,
+    search_ingredients_semantic_batch,
+    index_ingredients,
+    remove_ingredients,
+    field_weights,
+    DOCUMENT_COLUMNS,
 )
+from app.schema.requests import BulkDeleteRequest, BulkUpdateRequest
+from app.schema.responses import IngredientListResponse, IngredientFilterResponse, row_dicts, rows_response
 from app.services.ingredient_service import ingredient_service
+from app.services.http_cache import table_validators, not_modified, with_validators
+from app.services.llm_scheduler import LLMOverloadedError
+from app.services.job_queue import submit_job
+import app.services.job_handlers  # noqa: F401 - 작업 핸들러 등록
 import logging
 from dotenv import load_dotenv
 
@@ -25,29 +44,83 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/ingredients", tags=["ingredients"])
 
-@router.get("")
-async def list_ingredients(db: Session = Depends(get_db)):
-    """모든 재료 조회"""
-    ingredients = get_all_ingredients(db)
-    return {
-        "ingredients": [
-            {
-                "id": ing.id,
-                "ingredient_name": ing.ingredient_name,
-                "inci_name": ing.inci_name,
-                "cas_number": ing.cas_number,
-                "synonyms": ing.synonyms,
-                "odor_description": ing.odor_description,
-                "note_family": ing.note_family,
-                "suggested_usage_level": ing.suggested_usage_level,
-                "max_usage_percentage": ing.max_usage_percentage,
-                "stability": ing.stability,
-                "tenacity": ing.tenacity,
-                "volatility": ing.volatility,
-            }
-            for ing in ingredients
-        ]
-    }
+# 배치 semantic search 요청당 최대 검색어 수
+SEMANTIC_BATCH_MAX_QUERIES = 50
+
+# 필터 API 한 페이지 최대 행 수
+FILTER_MAX_LIMIT = 500
+
+
+class SemanticQuery(BaseModel):
+    query: str = Field(min_length=3)
+    n_results: int = Field(default=10, ge=1, le=50)
+    note_family: Optional[List[str]] = None  # 이 note family의 원료만 검색
+    weights: Optional[Dict[str, float]] = None  # 필드별 가중치 (예: {"odor": 1.0}) - 없으면 SEMANTIC_FIELD_WEIGHTS
+
+    @field_validator("weights")
+    @classmethod
+    def validate_weights(cls, weights: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        if weights is not None:
+            field_weights(weights)
+        return weights
+
+
+class SemanticBatchRequest(BaseModel):
+    queries: List[SemanticQuery] = Field(min_length=1, max_length=SEMANTIC_BATCH_MAX_QUERIES)
+
+@router.get("", response_model=IngredientListResponse)
+async def list_ingredients(request: Request, db: Session = Depends(get_db)):
+    """모든 재료 조회 (필요한 컬럼만 조회하여 row tuple을 바로 직렬화, ETag 조건부 GET)"""
+    validators = table_validators(db, "ingredients")
+    cached = not_modified(request, validators)
+    if cached:
+        return cached
+    return with_validators(rows_response("ingredients", get_ingredient_list_rows(db), count=False), validators)
+
+@router.get("/filter", response_model=IngredientFilterResponse)
+async def filter_ingredients(
+    request: Request,
+    note_family: Optional[List[str]] = Query(None),
+    volatility: Optional[List[str]] = Query(None),
+    tenacity: Optional[List[str]] = Query(None),
+    application: Optional[List[str]] = Query(None),
+    limit: int = Query(100, ge=1, le=FILTER_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    facets: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    note_family / volatility / tenacity / perfume_applications 필터 + facet 개수
+
+    같은 항목의 값은 OR, 항목끼리는 AND (예: ?note_family=Woody&note_family=Amber&volatility=low)
+    """
+    try:
+        validators = table_validators(db, "ingredients")
+        cached = not_modified(request, validators)
+        if cached:
+            return cached
+
+        filters = {
+            "note_family": note_family,
+            "volatility": volatility,
+            "tenacity": tenacity,
+            "perfume_applications": application,
+        }
+        # facet 집계가 전체 개수도 같이 계산 (facets=false면 COUNT만)
+        facet_counts = get_ingredient_facets(db, filters) if facets else None
+        content = {
+            "count": facet_counts["total"] if facet_counts else count_filtered_ingredients(db, filters),
+            "ingredients": row_dicts(filter_ingredient_rows(db, filters, limit=limit, offset=offset)),
+        }
+        if facet_counts:
+            content["facets"] = facet_counts["facets"]
+        return with_validators(ORJSONResponse(content), validators)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error filtering ingredients: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("")
 async def create_ingredient(data: dict, db: Session = Depends(get_db)):
@@ -86,6 +159,60 @@ async def create_ingredient(data: dict, db: Session = Depends(get_db)):
         logger.error(f"Error creating ingredient: {e}", exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     
+@router.patch("/bulk")
+async def bulk_update_ingredients_route(request: BulkUpdateRequest, db: Session = Depends(get_db)):
+    """
+    여러 원료를 한 번에 수정 (ids / facet filter, UPDATE ... RETURNING 한 번 + 트랜잭션 하나)
+
+    색인 대상 컬럼이 바뀌면 수정된 원료를 ChromaDB에 한 번에 다시 색인합니다.
+    """
+    try:
+        rows = bulk_update_ingredients(db, request.values, ids=request.ids, filters=request.filter)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Bulk ingredient update failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # DB 변경은 이미 커밋됨 - 벡터 동기화 실패는 응답에 표시 (POST /index/vector로 복구)
+    vector_synced = True
+    if rows and DOCUMENT_COLUMNS & set(request.values):
+        try:
+            await run_in_threadpool(index_ingredients, rows)
+        except Exception as e:
+            vector_synced = False
+            logger.error(f"Bulk ingredient vector sync failed: {e}")
+
+    logger.info(f"Bulk updated {len(rows)} ingredients: {sorted(request.values)}")
+    return {"count": len(rows), "ids": [row.id for row in rows], "vector_synced": vector_synced}
+
+@router.delete("/bulk")
+async def bulk_delete_ingredients_route(request: BulkDeleteRequest, db: Session = Depends(get_db)):
+    """여러 원료를 한 번에 삭제 (DELETE ... RETURNING 한 번) + 벡터 일괄 제거"""
+    try:
+        rows = bulk_delete_ingredients(db, ids=request.ids, filters=request.filter)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Bulk ingredient delete failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    ids = [row.id for row in rows]
+    vector_synced = True
+    if ids:
+        try:
+            await run_in_threadpool(remove_ingredients, ids)
+        except Exception as e:
+            vector_synced = False
+            logger.error(f"Bulk ingredient vector removal failed: {e}")
+
+    logger.info(f"Bulk deleted {len(ids)} ingredients")
+    return {"count": len(ids), "ids": ids, "vector_synced": vector_synced}
+
 @router.delete("/{id}")
 async def delete_ingredient_route(id: int, db: Session = Depends(get_db)):
     """재료 삭제"""
@@ -96,7 +223,7 @@ async def delete_ingredient_route(id: int, db: Session = Depends(get_db)):
     return {"message": "Ingredient deleted successfully"}
 
 @router.post("/auto-fill")
-async def auto_fill_ingredient(data: dict, db: Session = Depends(get_db)):
+def auto_fill_ingredient(data: dict, db: Session = Depends(get_db)):
     """재료명으로 정보 자동 채우기 LLM"""
     try:
         ingredient_name = data.get("name", "").strip()
@@ -109,6 +236,8 @@ async def auto_fill_ingredient(data: dict, db: Session = Depends(get_db)):
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Auto-fill error: {type(e).__name__}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Auto-fill failed: {str(e)}")
@@ -151,8 +280,8 @@ async def search_by_name(query: str, db: Session = Depends(get_db)):
 
 
 @router.get("/search/semantic")
-async def search_semantic(query: str, limit: int = 10):
-    """Search ingredients using semantic similarity (ChromaDB)"""
+async def search_semantic(query: str, limit: int = 10, note_family: Optional[List[str]] = Query(None)):
+    """Search ingredients using semantic similarity (ChromaDB / exact index, note_family 필터 선택)"""
     try:
         if not query or len(query) < 3:
             raise HTTPException(status_code=400, detail="Query must be at least 3 characters")
@@ -160,27 +289,58 @@ async def search_semantic(query: str, limit: int = 10):
         if limit < 1 or limit > 50:
             raise HTTPException(status_code=400, detail="Limit must be between 1 and 50")
 
-        results = search_ingredients_semantic(query, n_results=limit)
+        # 임베딩 / ChromaDB 검색은 동기 호출이므로 threadpool에서 실행 (event loop 차단 방지)
+        results = await run_in_threadpool(search_ingredients_semantic, query, n_results=limit, note_family=note_family)
 
         return {
             "query": query,
             "count": len(results),
             "results": results
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Semantic search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/index/vector")
-async def index_vector(db: Session = Depends(get_db)):
-    """Index all ingredients into ChromaDB for semantic search"""
+@router.post("/search/semantic/batch")
+async def search_semantic_batch(request: SemanticBatchRequest):
+    """
+    여러 검색어를 한 번에 semantic search (예: brief의 노트 목록)
+
+    검색어를 한 번에 임베딩하고 필터가 같은 검색어는 ChromaDB 조회 1번으로 묶습니다.
+    결과는 요청한 검색어 순서대로 반환합니다.
+    """
+    try:
+        queries = [q.model_dump() for q in request.queries]
+        grouped = await run_in_threadpool(search_ingredients_semantic_batch, queries)
+
+        return {
+            "count": len(grouped),
+            "results": [
+                {"query": q["query"], "count": len(results), "results": results}
+                for q, results in zip(queries, grouped)
+            ]
+        }
+    except Exception as e:
+        logger.error(f"Batch semantic search failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/index/vector", status_code=202)
+def index_vector(db: Session = Depends(get_db)):
+    """
+    Index all ingredients into ChromaDB for semantic search
+
+    재색인은 백그라운드 작업으로 실행됩니다 - 결과는 GET /api/jobs/{job_id}로 확인
+    """
     try:
-        count = index_all_ingredients(db)
+        job = submit_job(db, "reindex_ingredients")
         return {
-            "status": "success",
-            "message": f"Indexed {count} ingredients into ChromaDB",
-            "count": count
+            "status": "queued",
+            "message": "Ingredient reindex job queued",
+            "job_id": job.id
         }
     except Exception as e:
         logger.error(f"Indexing failed: {e}")
@@ -0,0 +1,87 @@
+"""
+Jobs Routes - 백그라운드 작업 등록 / 상태 조회 API
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.db.initialization.session import get_db
+from app.db.queries import get_job_by_id, get_jobs
+from app.schema.config import settings
+from app.services.job_queue import submit_job, job_to_dict, registered_job_types
+import app.services.job_handlers  # noqa: F401 - 작업 핸들러 등록
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.post("", status_code=202)
+def create_job_route(request: dict, db: Session = Depends(get_db)):
+    """
+    작업 등록 (즉시 반환, 워커가 비동기로 실행)
+
+    요청: {"job_type": "generate_bulk", "payload": {...}, "max_attempts": 3, "priority": 0}
+    """
+    try:
+        job_type = (request.get("job_type") or "").strip()
+        if not job_type:
+            raise HTTPException(status_code=400, detail="job_type required")
+
+        max_attempts = request.get("max_attempts")
+        if max_attempts is not None and (
+            isinstance(max_attempts, bool)
+            or not isinstance(max_attempts, int)
+            or not 1 <= max_attempts <= settings.JOB_MAX_ATTEMPTS_LIMIT
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"max_attempts must be an integer between 1 and {settings.JOB_MAX_ATTEMPTS_LIMIT}"
+            )
+
+        job = submit_job(
+            db,
+            job_type=job_type,
+            payload=request.get("payload") or {},
+            max_attempts=max_attempts,
+            priority=int(request.get("priority", 0))
+        )
+        return job_to_dict(job)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Job 등록 실패: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/types")
+def list_job_types():
+    """등록된 작업 종류"""
+    return {"job_types": registered_job_types()}
+
+
+@router.get("")
+def list_jobs(
+    status: Optional[str] = None,
+    job_type: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """최근 작업 목록"""
+    try:
+        jobs = get_jobs(db, status=status, job_type=job_type, limit=min(max(limit, 1), 500))
+        return {"count": len(jobs), "jobs": [job_to_dict(job) for job in jobs]}
+    except Exception as e:
+        logger.error(f"Job 목록 조회 실패: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{id}")
+def get_job_route(id: int, db: Session = Depends(get_db)):
+    """작업 상태 / 결과 조회"""
+    job = get_job_by_id(db, id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
@@ -1,12 +1,19 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List
 
 class Settings(BaseSettings):
-    # Database
-    DATABASE_URL: str
+    # Database (엔진은 첫 DB 사용 시 생성 - 없으면 그때 에러)
+    DATABASE_URL: str = ""
 
-    # Anthropic Claude
-    ANTHROPIC_API_KEY: str
+    # Database read replicas (비우면 모든 쿼리가 DATABASE_URL로)
+    DATABASE_REPLICA_URLS: List[str] = []  # JSON: ["postgresql://...replica1", "postgresql://...replica2"]
+    DATABASE_REPLICA_STICKY_SECONDS: float = 5.0  # 쓰기 후 같은 클라이언트의 읽기를 primary로 보내는 시간 (replica 지연보다 길게)
+    DATABASE_REPLICA_RETRY_SECONDS: float = 30.0  # 연결 실패한 replica를 다시 시도하기까지 primary 사용
+
+    # Anthropic Claude (클라이언트는 첫 LLM 호출 시 생성 - 키가 없으면 그때 에러)
+    ANTHROPIC_API_KEY: str = ""
+    ANTHROPIC_BASE_URL: str = ""  # 비우면 SDK 기본값 (벤치마크: 로컬 fake 서버 주소)
 
     # Environment
     ENV: str = "development"
@@ -15,11 +22,92 @@ class Settings(BaseSettings):
     CHROMADB_PATH: str = "./data/chromadb"
     CHROMADB_COLLECTION_NAME: str = "fragrance_ingredients"
 
+    # Embeddings (원료 semantic search - ChromaDB에는 계산된 벡터를 전달)
+    EMBEDDING_BACKEND: str = "chroma-default"  # chroma-default | sentence-transformers:<model> | hashing
+    EMBEDDING_BATCH_SIZE: int = 64  # backend 1회 호출당 텍스트 수
+    EMBEDDING_WORKERS: int = 4  # 배치를 병렬로 계산할 스레드 수
+    EMBEDDING_CACHE_PATH: str = "./data/embedding_cache.sqlite3"  # (모델, 텍스트 hash) → 벡터 (비우면 사용 안 함)
+    EMBEDDING_QUERY_CACHE_SIZE: int = 1024  # 검색어 임베딩 LRU
+
+    # Semantic search 필드 가중치 (odor: 향 설명 + note family, name: 이름 + INCI + 동의어, applications: 사용 분야)
+    SEMANTIC_FIELD_WEIGHTS: Dict[str, float] = {"odor": 0.6, "name": 0.25, "applications": 0.15}  # JSON
+    SEMANTIC_FIELD_OVERFETCH: int = 3  # ChromaDB 경로: 필드별로 n_results × 이 값만큼 조회 후 병합
+
+    # Exact vector search (NumPy brute force - 후보가 적은 / 필터된 semantic search)
+    EXACT_INDEX_PATH: str = "./data/exact_index"  # 재색인 시 생성되는 memory-map 행렬 (비우면 사용 안 함)
+    EXACT_SEARCH_MAX_CANDIDATES: int = 20000  # 필터 후 후보 수가 이 이하면 ChromaDB 대신 exact search
+
+    # Composition similarity
+    COMPOSITION_DUPLICATE_THRESHOLD: float = 0.95  # 저장 시 중복 경고 기준 (cosine)
+
+    # Bulk update / delete (PATCH / DELETE /api/{ingredients,accords,formulas}/bulk)
+    BULK_MAX_IDS: int = 1000  # 요청당 ids 최대 개수 (filter로 고른 행 수는 제한 없음)
+
+    # Speculative candidate generation
+    GENERATION_MAX_CANDIDATES: int = 5  # candidates=N 최대값
+    GENERATION_MAX_PARALLEL: int = 3  # 동시 LLM 호출 수
+
+    # Development chat context compaction
+    DEVELOPMENT_CONTEXT_RECENT_MESSAGES: int = 8  # 그대로 보내는 최근 메시지 수
+    DEVELOPMENT_CONTEXT_MAX_TOKENS: int = 4000  # 이 이상이면 오래된 턴을 요약
+    DEVELOPMENT_CONTEXT_CACHE_SIZE: int = 256  # 요약 캐시 (LRU)
+    DEVELOPMENT_SUMMARY_MODEL: str = "claude-haiku-4-5-20251001"
+    DEVELOPMENT_SESSION_CACHE_SIZE: int = 512  # 메모리에 유지할 세션 수 (LRU)
+    DEVELOPMENT_SESSION_HEARTBEAT_SECONDS: float = 5.0  # 생성 중인 턴의 heartbeat 주기
+    DEVELOPMENT_SESSION_STALE_SECONDS: float = 30.0  # heartbeat가 이 시간 이상 없으면 producer가 죽은 것으로 간주
+
+    # LLM admission control (전 서비스 공유)
+    LLM_MAX_CONCURRENCY: int = 8  # 동시에 실행 중인 LLM 호출 수
+    LLM_TOKENS_PER_MINUTE: int = 0  # 분당 토큰 예산 (0 = 제한 없음)
+    LLM_MAX_QUEUE: int = 24  # 대기열 최대 길이 (대기 요청도 threadpool 스레드를 점유)
+    LLM_QUEUE_TIMEOUT_INTERACTIVE: float = 20.0  # 대기 기한 (초) - chat, 스트리밍
+    LLM_QUEUE_TIMEOUT_STANDARD: float = 60.0  # generate
+    LLM_QUEUE_TIMEOUT_BATCH: float = 120.0  # auto-fill
+
+    # LLM retry / circuit breaker (재시도 횟수는 LANGGRAPH_MAX_RETRIES)
+    LLM_RETRY_BASE_DELAY: float = 0.5  # 지수 backoff 기본 간격 (초, full jitter)
+    LLM_RETRY_MAX_DELAY: float = 20.0  # backoff / retry-after 상한 (초)
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 시 circuit open (0 = 사용 안 함)
+    LLM_CIRCUIT_COOLDOWN_SECONDS: float = 30.0  # open 유지 시간, 이후 probe 1개 허용
+    LLM_FALLBACK_MODELS: Dict[str, str] = {}  # JSON: {"claude-sonnet-4-5-20250929": "claude-haiku-4-5-20251001"}
+    LLM_HEDGE_AFTER_SECONDS: float = 0.0  # 응답이 늦으면 fallback 모델에 동시 요청 (0 = 사용 안 함)
+
+    # Anthropic HTTP 연결 풀 (전 서비스 / 워커 스레드 공유)
+    LLM_HTTP_MAX_CONNECTIONS: int = 32  # LLM_MAX_CONCURRENCY + hedge 요청 여유
+    LLM_HTTP_MAX_KEEPALIVE: int = 16  # 유지할 idle 연결 수
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 120.0  # idle 연결 유지 시간 (초, SDK 기본 5초)
+    LLM_HTTP_TIMEOUT: float = 600.0  # read/write (초)
+    LLM_HTTP_CONNECT_TIMEOUT: float = 5.0
+    LLM_HTTP_POOL_TIMEOUT: float = 30.0  # 풀에서 연결을 기다리는 최대 시간
+
+    # Background jobs
+    JOB_WORKERS: int = 2  # API 프로세스 내 워커 수 (0 = 별도 워커 프로세스만 사용)
+    JOB_POLL_INTERVAL: float = 1.0  # 대기열이 비었을 때 polling 주기 (초)
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 10.0  # 재시도 간격 (지수 증가)
+    JOB_LOCK_TIMEOUT_SECONDS: int = 300  # heartbeat가 이 시간 이상 끊긴 running 작업은 워커가 죽은 것으로 간주
+    JOB_HEARTBEAT_SECONDS: float = 30.0  # 실행 중인 작업의 locked_at 갱신 주기
+    JOB_MAX_ATTEMPTS_LIMIT: int = 10  # POST /api/jobs의 max_attempts 상한
+
     # LangGraph
     LANGGRAPH_TIMEOUT: int = 300  # 5분
     LANGGRAPH_MAX_RETRIES: int = 3
     LANGGRAPH_RECURSION_LIMIT: int = 25
 
+    # Metrics (GET /metrics, Prometheus text format)
+    METRICS_ENABLED: bool = True  # false = no-op (middleware / SQLAlchemy 이벤트 미설치)
+
+    # Profiling (디버그 전용 - 요청별 샘플링 프로파일, GET /api/admin/profiles)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # X-Profile 헤더 없이 무작위로 프로파일할 요청 비율
+    PROFILING_INTERVAL_MS: float = 5.0  # 스택 샘플링 간격
+    PROFILING_DIR: str = "./data/profiles"
+    PROFILING_MAX_FILES: int = 100  # 보관할 프로파일 수 (오래된 것부터 삭제)
+    PROFILING_TOKEN: str = ""  # 설정 시 X-Profile / X-Admin-Token 헤더 값이 같아야 함
+
+    # Startup
+    STARTUP_WARM_UP: List[str] = []  # lifespan에서 미리 생성할 리소스 (JSON: ["database", "chroma", "embedding_model", "anthropic", "coordinator_graph"])
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
@@ -30,5 +118,16 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     return Settings()
 
-settings = get_settings()
+
+class _LazySettings:
+    """환경 변수 / .env는 설정값을 처음 읽을 때 로드 (import 시점이 아님)"""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_settings(), name, value)
+
+
+settings = _LazySettings()
 
@@ -0,0 +1,29 @@
+"""
+공통 요청 타입 (여러 라우트에서 같은 형식을 쓰는 요청)
+"""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+from app.schema.config import settings
+
+
+class BulkDeleteRequest(BaseModel):
+    """
+    대량 삭제 대상 - ids / filter 중 하나 이상 (둘 다 주면 둘 다 만족하는 행)
+
+    filter 항목은 엔티티별 (`db/queries`의 INGREDIENT_FACETS / ACCORD_FILTERS / FORMULA_FILTERS)
+    """
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=settings.BULK_MAX_IDS)
+    filter: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="after")
+    def require_selection(self) -> "BulkDeleteRequest":
+        # 빈 요청으로 테이블 전체가 바뀌지 않도록
+        if not self.ids and not any(self.filter.values() if self.filter else ()):
+            raise ValueError("ids or a non-empty filter is required")
+        return self
+
+
+class BulkUpdateRequest(BulkDeleteRequest):
+    """대량 수정 - 고른 행 모두에 같은 values를 적용"""
+    values: Dict[str, Any] = Field(min_length=1)
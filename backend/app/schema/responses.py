@@ -0,0 +1,116 @@
+"""
+Response Schemas - 목록 / 상세 API 응답 타입
+
+OpenAPI 문서용 타입이며, 실제 응답은 `rows_response` / `row_response`가
+DB row tuple을 orjson으로 바로 직렬화합니다 (FastAPI의 jsonable_encoder / 검증 단계를 거치지 않음).
+응답 형식을 바꿀 때는 이 모델과 `db/queries`의 `*_list_rows` / `*_detail_row` 컬럼을 함께 수정하세요.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+import anyio
+
+
+class IngredientSummary(BaseModel):
+    id: int
+    ingredient_name: str
+    inci_name: Optional[str] = None
+    cas_number: Optional[str] = None
+    synonyms: Optional[List[str]] = None
+    odor_description: Optional[str] = None
+    note_family: Optional[str] = None
+    suggested_usage_level: Optional[str] = None
+    max_usage_percentage: Optional[str] = None
+    stability: Optional[str] = None
+    tenacity: Optional[str] = None
+    volatility: Optional[str] = None
+
+
+class IngredientListResponse(BaseModel):
+    ingredients: List[IngredientSummary]
+
+
+class IngredientFilterResponse(BaseModel):
+    """facet 필터 결과 - count는 limit/offset 적용 전 전체 개수"""
+    count: int
+    ingredients: List[IngredientSummary]
+    facets: Optional[Dict[str, Dict[str, int]]] = None  # {facet: {값: 개수}} (facets=false면 없음)
+
+
+class CompositionSummary(BaseModel):
+    """Accord / Formula 목록 항목"""
+    id: int
+    name: str
+    type: Optional[str] = None
+    ingredients_count: int
+    created_at: Optional[datetime] = None
+
+
+class AccordListResponse(BaseModel):
+    count: int
+    accords: List[CompositionSummary]
+
+
+class FormulaListResponse(BaseModel):
+    count: int
+    formulas: List[CompositionSummary]
+
+
+class AccordDetail(BaseModel):
+    id: int
+    name: str
+    type: Optional[str] = None
+    description: Optional[str] = None
+    ingredients_composition: List[Dict[str, Any]]
+    longevity: Optional[str] = None
+    sillage: Optional[str] = None
+    llm_recommendation: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class FormulaDetail(AccordDetail):
+    stability_notes: Optional[str] = None
+
+
+def row_dicts(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """SQLAlchemy Row 목록 → dict 목록 (컬럼 label이 키)"""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def rows_response(key: str, rows: Sequence[Any], count: bool = True) -> ORJSONResponse:
+    """{"count": n, key: [...]} 목록 응답"""
+    content: Dict[str, Any] = {"count": len(rows)} if count else {}
+    content[key] = row_dicts(rows)
+    return ORJSONResponse(content)
+
+
+def row_response(row: Any) -> ORJSONResponse:
+    """단일 row 상세 응답"""
+    return ORJSONResponse(dict(row._mapping))
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    응답이 어떻게 끝나든 (완료, 클라이언트 연결 끊김, 헤더 전송 실패, 취소) `on_close` 호출
+
+    본문 generator의 finally는 iterator가 시작되지 않으면 실행되지 않고, `background`는
+    전송이 실패하면 실행되지 않으므로 LLM admission slot 같은 자원은 여기서 반환합니다.
+    """
+
+    def __init__(self, content: Any, on_close: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # 요청 task가 취소된 경우에도 실행 (close는 진행 중인 청크를 기다릴 수 있어 threadpool에서)
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(self.on_close)
@@ -5,11 +5,16 @@ LangGraph State 정의
 각 Agent는 이 State를 기반으로 입력을 받고 출력을 반환합니다.
 """
 
-from typing import List, Dict, Optional, TypedDict, Annotated
+from typing import Any, List, Dict, Optional, TypedDict, Annotated
 from pydantic import BaseModel, Field
 from operator import add
 
 
+def merge_dicts(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    """State reducer: 병렬 노드의 dict 업데이트 병합"""
+    return {**(left or {}), **(right or {})}
+
+
 # ============================================================================
 # Message Types
 # ============================================================================
@@ -31,23 +36,59 @@ class Ingredient(BaseModel):
     usage_percentage: Optional[float] = None
 
 
+class IngredientProfile(BaseModel):
+    """원료 자동 채우기 결과 (LLM structured output)"""
+    inci_name: Optional[str] = Field(None, description="INCI chemical name")
+    cas_number: Optional[str] = Field(None, description="CAS number")
+    synonyms: Optional[str] = Field(None, description="Comma-separated synonyms")
+    odor_description: Optional[str] = Field(None, description="Descriptive odor profile")
+    note_family: Optional[str] = Field(
+        None,
+        description="Floral, Woody, Citrus, Herbal, Spicy, Fresh, Sweet, Oriental, or Other"
+    )
+    suggested_usage_level: Optional[str] = Field(None, description="Typical usage percentage (e.g., 0.1-1%)")
+    max_usage_percentage: Optional[str] = Field(None, description="Maximum allowed usage percentage")
+    stability: Optional[str] = Field(None, description="Chemical or environmental stability")
+    tenacity: Optional[str] = Field(None, description="Duration of scent on skin or blotter")
+    volatility: Optional[str] = Field(None, description="high, medium, or low")
+
+
 class FormulationItem(BaseModel):
     """배합 항목"""
     ingredient: Ingredient
     percentage: float
     note: Optional[str] = None  # Top/Middle/Base note
+    role: Optional[str] = None  # "Top Impact", "Fixative", "Supporting", ...
 
 
 class Formulation(BaseModel):
     """완성된 배합"""
     name: str
+    type: Optional[str] = None  # Accord/Formula 타입 (예: "Fresh Floral")
     description: Optional[str] = None
     items: List[FormulationItem]
     total_percentage: float = 100.0
+    longevity: Optional[str] = None  # "6-8 hours"
+    sillage: Optional[str] = None  # "moderate", "strong"
+    stability_notes: Optional[str] = None
+    recommendation: Optional[str] = None
     validation_status: Optional[str] = None  # "valid", "invalid", "warning"
     validation_messages: List[str] = Field(default_factory=list)
 
 
+class ConversationMemory(BaseModel):
+    """Development 대화 압축 결과 (오래된 턴의 요약 + 추출된 상태)"""
+    summary: str = Field(description="Running summary of the earlier conversation")
+    user_preferences: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Extracted user preferences (DevelopmentState.user_preferences)"
+    )
+    current_formulation: Optional[Formulation] = Field(
+        None,
+        description="Formulation currently being worked on (DevelopmentState.current_formulation)"
+    )
+
+
 # ============================================================================
 # LangGraph States
 # ============================================================================
@@ -155,9 +196,15 @@ class CoordinatorState(TypedDict, total=False):
     user_input: str  # 원본 사용자 입력
     conversation_history: List[Dict[str, str]]  # 전체 대화 히스토리
 
+    # 공유 컨텍스트 (parse_request에서 한 번 로드)
+    current_formulation: Optional[Dict[str, any]]  # 검증 대상 배합 (대화 중 작업 중인 배합)
+    ingredient_usage_limits: Dict[str, Optional[str]]  # {원료명: max_usage_percentage}
+    formula_trends: Dict[str, any]  # 저장된 Formula의 note family 사용 통계 (market_research_agent.load_formula_trends)
+
     # 각 Agent 결과
     development_result: Optional[DevelopmentState]
     search_result: Optional[IngredientSearchState]
+    research_result: Optional[Dict[str, any]]
     formulation_result: Optional[FormulationState]
     validation_result: Optional[ValidationState]
 
@@ -169,3 +216,6 @@ class CoordinatorState(TypedDict, total=False):
     # 최종 출력
     final_response: str  # 사용자에게 반환할 최종 응답
     error: Optional[str]  # 오류 메시지
+
+    # 노드별 실행 시간 (ms) - 병렬 노드가 동시에 기록하므로 병합
+    node_timings: Annotated[Dict[str, float], merge_dicts]
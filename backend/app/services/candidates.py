@@ -0,0 +1,71 @@
+"""
+Speculative candidate generation - N개 후보 병렬 생성 및 로컬 랭킹
+
+같은 프롬프트로 N개의 생성을 제한된 병렬도로 동시에 실행하고,
+LLM 호출 없이 로컬 검증(총 비율, IFRA, 노트 밸런스, DB 원료 사용률)으로 순위를 매깁니다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.agents.validation.formulation_validator import score_formulation
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def fan_out(generate: Callable[[], Dict[str, Any]], n: int, max_parallel: int) -> List[Dict[str, Any]]:
+    """
+    generate()를 n번 병렬 실행
+
+    Args:
+        generate: 후보 1개를 생성하는 함수 (DB 세션을 사용하지 않아야 함)
+        n: 후보 수
+        max_parallel: 최대 동시 실행 수
+
+    Returns:
+        성공한 후보 리스트 (완료 순서)
+
+    Raises:
+        모든 후보가 실패한 경우 마지막 예외
+    """
+    results: List[Dict[str, Any]] = []
+    last_error: Optional[Exception] = None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(n, max_parallel))) as pool:
+        futures = [pool.submit(generate) for _ in range(n)]
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Candidate generation failed: {e}")
+
+    if not results and last_error is not None:
+        raise last_error
+
+    logger.info(f"Generated {len(results)}/{n} candidates")
+    return results
+
+
+def rank_candidates(
+    candidates: List[Dict[str, Any]],
+    usage_limits: Optional[Dict[str, Optional[str]]] = None,
+    catalog_names: Optional[List[str]] = None,
+    note_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    후보를 로컬 점수로 정렬
+
+    Returns:
+        [{"rank": 1, "score": 92.5, "checks": {...}, "data": {...}}, ...]
+    """
+    scored = []
+    for candidate in candidates:
+        result = score_formulation(candidate, usage_limits, catalog_names, note_ranges)
+        scored.append({"score": result["score"], "checks": result["checks"], "data": candidate})
+
+    scored.sort(key=lambda c: c["score"], reverse=True)
+    for rank, candidate in enumerate(scored, start=1):
+        candidate["rank"] = rank
+
+    return scored
@@ -0,0 +1,206 @@
+"""
+Conversation Context Manager - Development 대화 컨텍스트 압축
+
+대화가 길어지면 매 턴마다 전체 히스토리를 다시 보내는 대신,
+최근 메시지는 그대로 유지하고 오래된 턴은 요약 + 구조화된 상태
+(DevelopmentState의 user_preferences / current_formulation)로 압축합니다.
+
+요약은 "압축 경계까지의 메시지 prefix" 해시를 키로 캐시되며,
+경계를 일정 간격(step)으로만 이동시키므로 대부분의 턴은 캐시를 그대로 재사용하고
+경계가 이동한 턴에서만 새로 밀려난 메시지를 이전 요약에 합쳐 갱신합니다.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.schema.states import ConversationMemory
+from app.prompts.development_prompts import (
+    get_conversation_context_block,
+    get_conversation_summary_prompt,
+)
+from app.services.llm_client import ResilientLLMClient
+from app.services.structured_output import (
+    formulation_to_dict,
+    parse_tool_response,
+    pydantic_tool,
+    tool_choice,
+)
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 대략적인 토큰 추정 (문자 4개 ≈ 1 토큰)
+_CHARS_PER_TOKEN = 4
+
+CONVERSATION_MEMORY_TOOL = pydantic_tool(
+    name="record_conversation_memory",
+    description="Record the running summary and structured state of the development conversation.",
+    model=ConversationMemory,
+)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """메시지 리스트의 대략적인 토큰 수"""
+    return sum(len(_content_text(message.get("content"))) for message in messages) // _CHARS_PER_TOKEN
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    return str(content or "")
+
+
+def _transcript(messages: List[Dict[str, Any]]) -> str:
+    return "\n\n".join(
+        f"{message.get('role', 'user')}: {_content_text(message.get('content'))}"
+        for message in messages
+    )
+
+
+def _prefix_digests(messages: List[Dict[str, Any]]) -> List[str]:
+    """digests[i] = messages[:i]의 체인 해시 (digests[0]은 빈 prefix)"""
+    digests = [hashlib.sha256(b"").hexdigest()]
+    for message in messages:
+        payload = json.dumps(
+            [message.get("role"), _content_text(message.get("content"))],
+            ensure_ascii=False
+        )
+        digests.append(hashlib.sha256((digests[-1] + payload).encode("utf-8")).hexdigest())
+    return digests
+
+
+class ConversationContextManager:
+    """최근 메시지 + 캐시된 요약으로 대화 컨텍스트를 제한"""
+
+    def __init__(
+        self,
+        client: ResilientLLMClient,
+        model: str,
+        recent_messages: int = 8,
+        max_tokens: int = 4000,
+        cache_size: int = 256,
+    ):
+        self.client = client
+        self.model = model
+        self.recent_messages = max(2, recent_messages)
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        # 경계는 step 단위로만 이동 → 요약 갱신은 step개 메시지마다 한 번
+        self.step = max(2, self.recent_messages // 2)
+        self._cache: "OrderedDict[str, ConversationMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compact(self, messages: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        대화 히스토리 압축
+
+        Args:
+            messages: 전체 대화 히스토리 [{"role": ..., "content": ...}, ...]
+
+        Returns:
+            (system prompt에 추가할 컨텍스트 블록 ("" = 압축 없음), LLM에 그대로 보낼 최근 메시지)
+        """
+        if len(messages) <= self.recent_messages or estimate_tokens(messages) <= self.max_tokens:
+            return "", messages
+
+        boundary = self._boundary(messages)
+        if boundary <= 0:
+            return "", messages
+
+        digests = _prefix_digests(messages[:boundary])
+        memory, boundary = self._memory_for(messages, boundary, digests)
+        if memory is None:
+            # 요약이 전혀 없으면 원본 히스토리 그대로 전송
+            logger.warning("Context summary unavailable, sending full history")
+            return "", messages
+
+        current_formulation = (
+            formulation_to_dict(memory.current_formulation)
+            if memory.current_formulation else None
+        )
+        context = get_conversation_context_block(
+            summary=memory.summary,
+            user_preferences=memory.user_preferences,
+            current_formulation=current_formulation,
+            compacted_messages=boundary,
+        )
+        logger.info(f"Compacted {boundary} messages, sending {len(messages) - boundary} recent messages")
+        return context, messages[boundary:]
+
+    def _boundary(self, messages: List[Dict[str, Any]]) -> int:
+        """압축 경계: step 배수로 내림, 최근 구간이 user 메시지로 시작하도록 조정"""
+        boundary = (len(messages) - self.recent_messages) // self.step * self.step
+        while boundary > 0 and messages[boundary].get("role") != "user":
+            boundary -= 1
+        return boundary
+
+    def _memory_for(
+        self,
+        messages: List[Dict[str, Any]],
+        boundary: int,
+        digests: List[str],
+    ) -> Tuple[Optional[ConversationMemory], int]:
+        """
+        messages[:boundary]의 요약 (캐시된 가장 긴 prefix부터 이어서 갱신)
+
+        Returns:
+            (요약, 요약이 포함하는 메시지 수) - 요약 실패 시 캐시된 이전 요약과 그 범위
+        """
+        with self._lock:
+            cached = self._cache.get(digests[boundary])
+            if cached is not None:
+                self._cache.move_to_end(digests[boundary])
+                return cached, boundary
+
+            start, previous = 0, None
+            for index in range(boundary - 1, 0, -1):
+                if digests[index] in self._cache:
+                    start, previous = index, self._cache[digests[index]]
+                    break
+
+        try:
+            memory = self._summarize(previous, messages[start:boundary])
+        except Exception as e:
+            logger.error(f"Context summary 실패: {e}")
+            return previous, start
+
+        with self._lock:
+            self._cache[digests[boundary]] = memory
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return memory, boundary
+
+    def _summarize(
+        self,
+        previous: Optional[ConversationMemory],
+        messages: List[Dict[str, Any]],
+    ) -> ConversationMemory:
+        previous_state = {
+            "user_preferences": previous.user_preferences if previous else {},
+            "current_formulation": (
+                formulation_to_dict(previous.current_formulation)
+                if previous and previous.current_formulation else None
+            ),
+        }
+        prompt = get_conversation_summary_prompt(
+            previous_summary=previous.summary if previous else "",
+            previous_state=previous_state,
+            transcript=_transcript(messages),
+        )
+
+        response = self.client.create(
+            model=self.model,
+            max_tokens=2048,
+            tools=[CONVERSATION_MEMORY_TOOL],
+            tool_choice=tool_choice(CONVERSATION_MEMORY_TOOL),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.0
+        )
+        return parse_tool_response(response, CONVERSATION_MEMORY_TOOL, ConversationMemory)
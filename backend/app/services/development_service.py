@@ -5,11 +5,13 @@ Development Service - 간단한 대화형 향수 개발 서비스
 나중에 필요시 Tool 추가 가능 (레퍼런스 분석, validation 등)
 """
 
-from anthropic import Anthropic
 from app.schema.config import settings
 from app.prompts.development_prompts import get_development_system_prompt
 from app.db.queries import get_ingredient_names
+from app.services.context_manager import ConversationContextManager
+from app.services.llm_client import llm_client
 from sqlalchemy.orm import Session
+from typing import Iterator, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,71 +21,104 @@ class DevelopmentService:
     """Development Mode 대화 서비스"""
 
     def __init__(self):
+        # 공유 LLM 클라이언트 (재시도, circuit breaker, fallback)
+        self.client = llm_client
+        self.model = "claude-sonnet-4-5-20250929"
+        self.context_manager = ConversationContextManager(
+            client=self.client,
+            model=settings.DEVELOPMENT_SUMMARY_MODEL,
+            recent_messages=settings.DEVELOPMENT_CONTEXT_RECENT_MESSAGES,
+            max_tokens=settings.DEVELOPMENT_CONTEXT_MAX_TOKENS,
+            cache_size=settings.DEVELOPMENT_CONTEXT_CACHE_SIZE
+        )
+
+    def load_ingredient_context(self, db: Session) -> Tuple[str, int]:
+        """
+        System prompt용 DB 향료 리스트
+
+        Returns:
+            (콤마로 연결된 향료명, 향료 수)
+        """
         try:
-            logger.info("🔧 Anthropic Client 초기화 중 (Development Service)...")
-            self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            self.model = "claude-sonnet-4-5-20250929"
-            logger.info("✓ Anthropic Client 초기화 완료")
+            ingredient_names = get_ingredient_names(db)
+            logger.info(f"Loaded {len(ingredient_names)} ingredients from DB")
+            return ", ".join(ingredient_names), len(ingredient_names)
         except Exception as e:
-            logger.error(f"Anthropic Client 초기화 실패: {e}")
-            raise
+            logger.error(f"Failed to load ingredients: {e}")
+            return "", 0
 
-    async def stream_chat(self, messages: list, db: Session):
+    def iter_chat(self, messages: list, ingredient_list: str = "", ingredient_count: int = 0) -> Iterator[str]:
         """
-        대화 스트리밍 생성
+        대화 스트리밍 생성 (동기, 에러는 그대로 raise)
+
+        DB 세션을 사용하지 않으므로 요청과 분리된 스레드에서 실행할 수 있습니다.
 
         Args:
             messages: 대화 히스토리 [{"role": "user", "content": "..."}, ...]
-            db: Database session
+            ingredient_list: load_ingredient_context()의 향료 리스트
+            ingredient_count: 향료 수
 
         Yields:
             스트리밍 텍스트 청크
         """
-        # DB에서 향료 리스트 가져오기
-        try:
-            ingredient_names = get_ingredient_names(db)
-            ingredient_list = ", ".join(ingredient_names)
-            ingredient_count = len(ingredient_names)
-            logger.info(f"Loaded {ingredient_count} ingredients from DB")
-        except Exception as e:
-            logger.error(f"Failed to load ingredients: {e}")
-            ingredient_list = ""
-            ingredient_count = 0
+        # 긴 대화는 오래된 턴을 요약으로 압축 (최근 메시지만 그대로 전송)
+        conversation_context, messages = self.context_manager.compact(messages)
 
         # System prompt 생성
         system_prompt = get_development_system_prompt(
             ingredient_list=ingredient_list,
-            ingredient_count=ingredient_count
+            ingredient_count=ingredient_count,
+            conversation_context=conversation_context
         )
 
         logger.info(f"🚀 Development chat 시작 (메시지 수: {len(messages)})")
 
+        # Anthropic streaming API
+        with self.client.stream(
+            model=self.model,
+            max_tokens=4096,
+            system=system_prompt,
+            messages=messages,
+            temperature=0.7
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+
+        logger.info("✓ Development chat 완료")
+
+    async def stream_chat(self, messages: list, db: Session):
+        """
+        대화 스트리밍 생성
+
+        Args:
+            messages: 대화 히스토리 [{"role": "user", "content": "..."}, ...]
+            db: Database session
+
+        Yields:
+            스트리밍 텍스트 청크
+        """
+        ingredient_list, ingredient_count = self.load_ingredient_context(db)
+
         try:
-            # Anthropic streaming API
-            with self.client.messages.stream(
-                model=self.model,
-                max_tokens=4096,
-                system=system_prompt,
-                messages=messages,
-                temperature=0.7
-            ) as stream:
-                for text in stream.text_stream:
-                    yield text
-
-            logger.info("✓ Development chat 완료")
+            for text in self.iter_chat(messages, ingredient_list, ingredient_count):
+                yield text
 
         except Exception as e:
             logger.error(f"Development chat 에러: {e}", exc_info=True)
 
             # 에러 메시지 스트리밍
-            error_message = f"""
+            yield format_chat_error(e)
+
+
+def format_chat_error(error: Exception) -> str:
+    """사용자에게 스트리밍할 에러 메시지"""
+    return f"""
 죄송합니다. 응답 생성 중 오류가 발생했습니다.
 
-**오류:** {str(e)}
+**오류:** {str(error)}
 
 잠시 후 다시 시도해 주세요.
 """
-            yield error_message
 
 
 # Singleton instance
@@ -5,13 +5,25 @@ Formula는 완성된 향수 배합을 의미합니다.
 Accord보다 더 복잡하고 완성도 높은 배합입니다.
 """
 
-from anthropic import Anthropic
 from app.schema.config import settings
 from app.prompts import get_formula_generation_prompt
-from app.db.queries import get_ingredient_names
+from app.db.queries import get_ingredient_names, get_ingredient_usage_limits
+from app.schema.states import Formulation
+from app.services.structured_output import (
+    FORMULATION_TOOL,
+    tool_choice,
+    parse_tool_response,
+    formulation_to_dict,
+    iter_formulation_events,
+)
+from app.services.candidates import fan_out, rank_candidates
+from app.services.llm_scheduler import llm_scheduler, Priority, estimate_tokens
+from app.services.llm_client import llm_client
+from app.services.profiling import span
+from app.agents.validation.formulation_validator import FORMULA_NOTE_RANGES
 from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +32,9 @@ class FormulaService:
     """완제품 향수 배합 생성 서비스"""
 
     def __init__(self):
-        try:
-            logger.info("🔧 Anthropic Client 초기화 중 (Formula Service)...")
-            self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            self.model = "claude-sonnet-4-5-20250929"
-            logger.info("✓ Anthropic Client 초기화 완료")
-        except Exception as e:
-            logger.error(f"Anthropic Client 초기화 실패: {e}")
-            raise
+        # 공유 LLM 클라이언트 (재시도, circuit breaker, fallback)
+        self.client = llm_client
+        self.model = "claude-sonnet-4-5-20250929"
 
     def generate_formula(self, formula_type: str, db: Session) -> dict:
         """
@@ -59,33 +66,107 @@ class FormulaService:
             logger.error(f"Failed to load ingredients: {e}")
             raise
 
-        prompt = get_formula_generation_prompt(formula_type, ingredient_names)
+        with span("prompt", "get_formula_generation_prompt"):
+            prompt = get_formula_generation_prompt(formula_type, ingredient_names)
+
+        logger.info(f"🚀 Formula 생성 시작: {formula_type}")
+        return self._generate_from_prompt(prompt)
+
+    def generate_formula_candidates(self, formula_type: str, db: Session, n: int) -> List[Dict[str, Any]]:
+        """
+        Formula 후보 N개 병렬 생성 및 로컬 랭킹
+
+        Args:
+            formula_type: Formula 타입 (예: "Fresh Floral", "Woody Oriental")
+            db: Database session
+            n: 후보 수
 
+        Returns:
+            점수 내림차순 후보 리스트 [{"rank", "score", "checks", "data"}, ...]
+        """
+        # DB 조회는 요청 스레드에서 한 번만 (세션은 스레드 간 공유 불가)
+        ingredient_names = get_ingredient_names(db)
+        usage_limits = get_ingredient_usage_limits(db)
+        with span("prompt", "get_formula_generation_prompt"):
+            prompt = get_formula_generation_prompt(formula_type, ingredient_names)
+
+        logger.info(f"🚀 Formula 후보 {n}개 생성 시작: {formula_type}")
+        candidates = fan_out(
+            lambda: self._generate_from_prompt(prompt),
+            n=n,
+            max_parallel=settings.GENERATION_MAX_PARALLEL
+        )
+        return rank_candidates(
+            candidates,
+            usage_limits=usage_limits,
+            catalog_names=ingredient_names,
+            note_ranges=FORMULA_NOTE_RANGES
+        )
+
+    def _generate_from_prompt(self, prompt: str) -> dict:
+        """프롬프트로 Formula 1개 생성 (DB 접근 없음)"""
         try:
-            logger.info(f"🚀 Formula 생성 시작: {formula_type}")
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7
-            )
-            result_text = response.content[0].text
+            with llm_scheduler.admit(Priority.STANDARD, estimate_tokens(prompt, 4096)) as ticket:
+                response = self.client.create(
+                    model=self.model,
+                    max_tokens=4096,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.7,
+                    tools=[FORMULATION_TOOL],
+                    tool_choice=tool_choice(FORMULATION_TOOL)
+                )
+                ticket.record_usage(response.usage)
             logger.info(f"✓ Formula 응답 완료")
 
-            # JSON 파싱
-            try:
-                result = json.loads(result_text)
-            except json.JSONDecodeError:
-                # JSON 추출 시도
-                start = result_text.find('{')
-                end = result_text.rfind('}') + 1
-                result = json.loads(result_text[start:end])
-
-            return result
+            # Tool 입력을 Formulation 모델로 바로 검증
+            formulation = parse_tool_response(response, FORMULATION_TOOL, Formulation)
+            return formulation_to_dict(formulation)
         except Exception as e:
             logger.error(f"Formula 생성 실패: {e}", exc_info=True)
             raise
 
+    def stream_formula(self, formula_type: str, db: Session) -> Iterator[Dict[str, Any]]:
+        """
+        Formula 조합 생성 (점진적 스트리밍)
+
+        Tool 입력 JSON을 토큰 단위로 받아, 원료 항목이 완성될 때마다 이벤트를 반환합니다.
+        DB 조회와 LLM admission은 호출 시점에 바로 수행되므로 (대기열이 가득 차면
+        LLMOverloadedError), 응답 스트리밍을 시작하기 전에 호출해야 합니다.
+
+        Args:
+            formula_type: Formula 타입 (예: "Fresh Floral", "Woody Oriental")
+            db: Database session
+
+        Returns:
+            {"type": "field" | "ingredient" | "complete", ...} 이벤트 iterator
+        """
+        ingredient_names = get_ingredient_names(db)
+        logger.info(f"Loaded {len(ingredient_names)} ingredients from DB")
+
+        with span("prompt", "get_formula_generation_prompt"):
+            prompt = get_formula_generation_prompt(formula_type, ingredient_names)
+
+        ticket = llm_scheduler.admit(Priority.INTERACTIVE, estimate_tokens(prompt, 4096))
+        logger.info(f"🚀 Formula 스트리밍 생성 시작: {formula_type}")
+        return ticket.guard(self._stream_from_prompt(prompt))
+
+    def _stream_from_prompt(self, prompt: str) -> Iterator[Dict[str, Any]]:
+        """프롬프트로 Formula 스트리밍 생성 (DB 접근 없음)"""
+        try:
+            with self.client.stream(
+                model=self.model,
+                max_tokens=4096,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                tools=[FORMULATION_TOOL],
+                tool_choice=tool_choice(FORMULATION_TOOL)
+            ) as stream:
+                yield from iter_formulation_events(stream)
+            logger.info(f"✓ Formula 스트리밍 완료")
+        except Exception as e:
+            logger.error(f"Formula 스트리밍 생성 실패: {e}", exc_info=True)
+            raise
+
 
 # Singleton instance
 formula_service = FormulaService()
@@ -0,0 +1,99 @@
+"""
+HTTP Cache - 카탈로그 조회 API의 조건부 GET (ETag / Last-Modified)
+
+- 목록: `table_versions`의 변경 카운터 → `W/"formulas-v42-<timestamp>"` (PK 조회 1번, 목록 행은 읽지 않음)
+- 상세: 해당 행의 updated_at / created_at → `W/"formulas-7-<timestamp>"` (두 컬럼만 조회)
+
+`If-None-Match`가 일치하면 (없으면 `If-Modified-Since` 비교) 본문 없이 304를 반환합니다.
+`Cache-Control: no-cache`로 브라우저가 매번 재검증하므로 변경은 바로 반영됩니다.
+
+주의: SQLite의 `CURRENT_TIMESTAMP`는 초 단위이므로 같은 초 안에 두 번 수정된 상세 응답은
+구분되지 않습니다 (PostgreSQL은 마이크로초).
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+from app.db.queries import get_table_version, get_entity_timestamps
+
+CACHE_CONTROL = "no-cache"
+
+
+class Validators:
+    """응답의 ETag / Last-Modified 값"""
+    __slots__ = ("etag", "last_modified")
+
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified) if last_modified else None
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def table_validators(db: Session, table: str) -> Validators:
+    """목록 응답 validator (테이블 변경 카운터)"""
+    version, changed_at = get_table_version(db, table)
+    # 테이블을 다시 만들어 카운터가 초기화돼도 이전 ETag와 겹치지 않도록 변경 시각 포함
+    return Validators(f'W/"{table}-v{version}-{_stamp(changed_at)}"', changed_at)
+
+
+def entity_validators(db: Session, model: Any, entity_id: int) -> Optional[Validators]:
+    """상세 응답 validator - 행이 없으면 None (라우트에서 404 처리)"""
+    row = get_entity_timestamps(db, model, entity_id)
+    if row is None:
+        return None
+    changed_at = row.updated_at or row.created_at
+    return Validators(f'W/"{model.__tablename__}-{entity_id}-{_stamp(changed_at)}"', changed_at)
+
+
+def not_modified(request: Request, validators: Optional[Validators]) -> Optional[Response]:
+    """요청의 조건 헤더가 현재 validator와 일치하면 304 응답, 아니면 None"""
+    if validators is None:
+        return None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110 13.2.2)
+        if if_none_match.strip() == "*" or _opaque(validators.etag) in {
+            _opaque(tag) for tag in if_none_match.split(",")
+        }:
+            return Response(status_code=304, headers=validators.headers())
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified:
+        try:
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return None
+        if validators.last_modified.replace(microsecond=0) <= since:
+            return Response(status_code=304, headers=validators.headers())
+    return None
+
+
+def with_validators(response: Response, validators: Optional[Validators]) -> Response:
+    """200 응답에 ETag / Last-Modified / Cache-Control 추가"""
+    if validators is not None:
+        response.headers.update(validators.headers())
+    return response
+
+
+def _opaque(tag: str) -> str:
+    """약한 비교 (W/ 접두사 무시)"""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _stamp(value: Optional[datetime]) -> str:
+    return _as_utc(value).strftime("%Y%m%d%H%M%S%f") if value else "0"
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite는 timezone 없는 값을 반환 (UTC로 저장됨)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
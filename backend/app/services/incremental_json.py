@@ -0,0 +1,122 @@
+"""
+Incremental JSON parser for streamed LLM tool input
+
+Tool use 스트리밍은 tool 입력 JSON을 조각(partial_json) 단위로 전달합니다.
+전체 JSON이 완성될 때까지 기다리지 않고, 얕은 경로(최상위 필드, 최상위 배열의 원소)의
+값이 완성되는 즉시 반환하여 UI가 점진적으로 렌더링할 수 있게 합니다.
+"""
+
+from typing import Any, List, Optional, Tuple
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+class _Frame:
+    """현재 열려 있는 object/array"""
+    __slots__ = ("kind", "key", "index", "expect_key")
+
+    def __init__(self, kind: str):
+        self.kind = kind  # "object" | "array"
+        self.key: Optional[str] = None
+        self.index = -1
+        self.expect_key = kind == "object"
+
+
+class IncrementalJSONParser:
+    """
+    스트리밍 JSON에서 완성된 값을 경로와 함께 반환
+
+    최상위 object 기준 깊이 `max_depth` 이하의 값만 반환합니다.
+    예: {"name": "A", "items": [{...}, {...}]}
+        → (("name",), "A"), (("items", 0), {...}), (("items", 1), {...}), (("items",), [...])
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._value_starts: List[int] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._scalar_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple[Any, ...], Any]]:
+        """
+        JSON 조각을 추가하고 이번에 완성된 값들을 반환
+
+        Returns:
+            [(path, value), ...]
+        """
+        self._text += chunk
+        completed: List[Tuple[Tuple[Any, ...], Any]] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    frame = self._stack[-1] if self._stack else None
+                    if frame is not None and frame.kind == "object" and frame.expect_key:
+                        frame.key = json.loads(text[self._string_start:i + 1])
+                    else:
+                        self._complete(self._string_start, i + 1, completed)
+                continue
+
+            if self._scalar_start is not None and (c in _WHITESPACE or c in ",}]"):
+                self._complete(self._scalar_start, i, completed)
+                self._scalar_start = None
+
+            if c in _WHITESPACE:
+                continue
+            if c == '"':
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and not (frame.kind == "object" and frame.expect_key):
+                    self._begin_value(frame)
+                self._in_string = True
+                self._string_start = i
+            elif c == ":":
+                if self._stack:
+                    self._stack[-1].expect_key = False
+            elif c == ",":
+                if self._stack and self._stack[-1].kind == "object":
+                    self._stack[-1].expect_key = True
+            elif c in "{[":
+                if self._stack:
+                    self._begin_value(self._stack[-1])
+                self._stack.append(_Frame("object" if c == "{" else "array"))
+                self._value_starts.append(i)
+            elif c in "}]":
+                self._stack.pop()
+                start = self._value_starts.pop()
+                if self._stack:
+                    self._complete(start, i + 1, completed)
+            elif self._scalar_start is None:
+                if self._stack:
+                    self._begin_value(self._stack[-1])
+                self._scalar_start = i
+
+        self._pos = len(text)
+        return completed
+
+    @staticmethod
+    def _begin_value(frame: _Frame) -> None:
+        if frame.kind == "array":
+            frame.index += 1
+
+    def _complete(self, start: int, end: int, completed: list) -> None:
+        if len(self._stack) > self.max_depth:
+            return
+        path = tuple(
+            frame.key if frame.kind == "object" else frame.index
+            for frame in self._stack
+        )
+        completed.append((path, json.loads(self._text[start:end])))
@@ -0,0 +1,128 @@
+"""
+Job Handlers - 백그라운드 작업 종류
+
+각 핸들러는 워커의 DB 세션과 payload를 받아 JSON 직렬화 가능한 결과를 반환합니다.
+예외를 raise하면 재시도되며, 재시도 횟수를 넘기면 failed로 기록됩니다.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.db.queries import get_all_formulas, get_formulas_by_ids
+from app.db.vector import index_all_ingredients
+from app.services.job_queue import job_handler
+from app.services.ingredient_service import ingredient_service
+from app.services.accord_service import accord_service
+from app.services.formula_service import formula_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler("reindex_ingredients")
+def reindex_ingredients(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """전체 원료 ChromaDB 재색인"""
+    return {"indexed": index_all_ingredients(db)}
+
+
+@job_handler("auto_fill_ingredients")
+def auto_fill_ingredients(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    원료 정보 일괄 auto-fill
+
+    payload: {"names": ["Bergamot Oil", ...]}
+    """
+    names: List[str] = payload.get("names") or []
+    if not names:
+        raise ValueError("payload.names is required")
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for name in names:
+        try:
+            results[name] = ingredient_service.auto_fill(name)["data"]
+        except Exception as e:
+            errors[name] = str(e)
+
+    if errors and not results:
+        raise RuntimeError(f"All auto-fill requests failed: {errors}")
+
+    return {"results": results, "errors": errors}
+
+
+@job_handler("generate_bulk")
+def generate_bulk(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Accord / Formula 일괄 생성
+
+    payload: {"kind": "accord" | "formula", "types": ["Fresh Citrus", ...], "candidates": 1}
+    """
+    kind = payload.get("kind", "accord")
+    types: List[str] = payload.get("types") or []
+    candidates = int(payload.get("candidates", 1))
+    if kind not in ("accord", "formula"):
+        raise ValueError("payload.kind must be 'accord' or 'formula'")
+    if not types:
+        raise ValueError("payload.types is required")
+
+    service = accord_service if kind == "accord" else formula_service
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for generation_type in types:
+        try:
+            if candidates > 1:
+                generate = getattr(service, f"generate_{kind}_candidates")
+                results[generation_type] = generate(generation_type, db, candidates)[0]["data"]
+            else:
+                results[generation_type] = getattr(service, f"generate_{kind}")(generation_type, db)
+        except Exception as e:
+            errors[generation_type] = str(e)
+
+    if errors and not results:
+        raise RuntimeError(f"All generations failed: {errors}")
+
+    return {"kind": kind, "results": results, "errors": errors}
+
+
+@job_handler("reprice_formulas")
+def reprice_formulas(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Formula 원가(cost_per_ml) 재계산
+
+    원료 테이블에는 가격 정보가 없으므로 가격표를 payload로 받습니다.
+    cost_per_ml = Σ(비율/100 × g당 가격) × 밀도(g/ml)
+
+    payload: {"prices": {"Bergamot Oil": 0.12, ...}, "density": 1.0, "formula_ids": [1, 2]}
+    """
+    prices = {
+        " ".join(str(name).lower().split()): float(price)
+        for name, price in (payload.get("prices") or {}).items()
+    }
+    if not prices:
+        raise ValueError("payload.prices is required")
+    density = float(payload.get("density", 1.0))
+    formula_ids: Optional[List[int]] = payload.get("formula_ids")
+
+    formulas = get_formulas_by_ids(db, formula_ids) if formula_ids else get_all_formulas(db)
+
+    updated = 0
+    missing: Dict[int, List[str]] = {}
+    for formula in formulas:
+        cost_per_gram = 0.0
+        unpriced = []
+        for item in formula.ingredients_composition or []:
+            key = " ".join(str(item.get("name") or "").lower().split())
+            if key not in prices:
+                unpriced.append(item.get("name"))
+                continue
+            cost_per_gram += float(item.get("percentage") or 0) / 100.0 * prices[key]
+
+        if unpriced:
+            # 가격을 모르는 원료가 있으면 원가를 갱신하지 않음
+            missing[formula.id] = unpriced
+            continue
+        formula.cost_per_ml = round(cost_per_gram * density, 4)
+        updated += 1
+
+    db.commit()
+    logger.info(f"Repriced {updated}/{len(formulas)} formulas")
+    return {"updated": updated, "total": len(formulas), "missing_prices": missing}
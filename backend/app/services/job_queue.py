@@ -0,0 +1,245 @@
+"""
+Job Queue - DB 기반 백그라운드 작업 큐
+
+오래 걸리는 작업(재색인, 일괄 auto-fill, 일괄 생성, 재계산)을 HTTP 요청 밖에서 실행합니다.
+
+- 작업은 `jobs` 테이블에 저장되므로 서버가 재시작되어도 유실되지 않습니다.
+- 워커는 Postgres `SKIP LOCKED` (SQLite: 조건부 UPDATE)로 작업을 가져오므로
+  여러 프로세스(`python -m app.worker`)로 확장할 수 있습니다.
+- 실패한 작업은 지수 backoff로 `max_attempts`까지 재시도합니다.
+- 실행 중에는 heartbeat로 locked_at을 갱신합니다 - 갱신이 `lock_timeout` 이상 끊긴 작업만 재할당되고,
+  시도 횟수를 다 쓴 작업(워커를 죽이는 작업)은 failed로 끝납니다.
+
+작업 핸들러는 `@job_handler("job_type")`으로 등록합니다 (`services/job_handlers.py`).
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlalchemy.orm import Session
+from app.schema.config import settings
+from app.db.initialization.session import SessionLocal
+from app.db.schema import Job
+from app.db.queries import (
+    create_job,
+    claim_next_job,
+    touch_job,
+    complete_job,
+    fail_job,
+    requeue_stale_jobs,
+)
+from app.services.llm_scheduler import LLMOverloadedError
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 죽은 워커의 작업 재할당 확인 주기 (초)
+STALE_CHECK_SECONDS = 60.0
+
+JobHandler = Callable[[Session, Dict[str, Any]], Any]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """작업 핸들러 등록 데코레이터 - handler(db, payload) -> JSON 직렬화 가능한 결과"""
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[job_type] = handler
+        return handler
+
+    return register
+
+
+def registered_job_types() -> List[str]:
+    return sorted(_handlers)
+
+
+def submit_job(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    max_attempts: Optional[int] = None,
+    priority: int = 0
+) -> Job:
+    """
+    작업 등록 (즉시 반환)
+
+    Raises:
+        ValueError: 등록되지 않은 job_type
+    """
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type} (available: {', '.join(registered_job_types())})")
+
+    job = create_job(
+        db,
+        job_type=job_type,
+        payload=payload,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        priority=priority
+    )
+    logger.info(f"Job {job.id} ({job_type}) queued")
+    return job
+
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    """Job → API 응답"""
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "payload": job.payload,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class JobWorkerPool:
+    """작업을 polling하여 실행하는 워커 스레드 풀"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        retry_backoff: float = 10.0,
+        lock_timeout: float = 300,
+        heartbeat_interval: float = 30.0,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.lock_timeout = lock_timeout
+        # lock_timeout 안에 여러 번 갱신되도록
+        self.heartbeat_interval = min(heartbeat_interval, lock_timeout / 3)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._last_requeue = 0.0
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        if self.running or self.workers <= 0:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"{self._prefix}:{index}",), name=f"job-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Started {self.workers} job workers")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def run_once(self, worker_id: str) -> bool:
+        """
+        작업 1개 실행
+
+        Returns:
+            작업을 실행했으면 True (대기열이 비어 있으면 False)
+        """
+        db = self.session_factory()
+        try:
+            job = claim_next_job(db, worker_id, registered_job_types())
+            if job is None:
+                return False
+
+            logger.info(f"[{worker_id}] Job {job.id} ({job.job_type}) attempt {job.attempts}/{job.max_attempts}")
+            try:
+                with self._heartbeat(job.id, worker_id):
+                    result = _handlers[job.job_type](db, job.payload or {})
+            except LLMOverloadedError as e:
+                db.rollback()
+                saved = fail_job(db, job, str(e), retry_delay=e.retry_after, worker_id=worker_id)
+            except Exception as e:
+                logger.error(f"[{worker_id}] Job {job.id} failed: {e}", exc_info=True)
+                db.rollback()
+                saved = fail_job(
+                    db, job, f"{type(e).__name__}: {e}",
+                    retry_delay=self.retry_backoff * 2 ** (job.attempts - 1),
+                    worker_id=worker_id
+                )
+            else:
+                saved = complete_job(db, job, result, worker_id=worker_id)
+                if saved is not None:
+                    logger.info(f"[{worker_id}] Job {job.id} succeeded")
+            if saved is None:
+                logger.warning(f"[{worker_id}] Job {job.id} was requeued while running (missed heartbeat) - result discarded")
+            return True
+        finally:
+            db.close()
+
+    @contextmanager
+    def _heartbeat(self, job_id: int, worker_id: str) -> Iterator[None]:
+        """핸들러 실행 중 heartbeat_interval마다 locked_at 갱신 (별도 스레드 / 세션)"""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.heartbeat_interval):
+                db = self.session_factory()
+                try:
+                    if not touch_job(db, job_id, worker_id):
+                        return
+                except Exception as e:
+                    logger.warning(f"[{worker_id}] Job {job_id} heartbeat 실패: {e}")
+                finally:
+                    db.close()
+
+        thread = threading.Thread(target=beat, name=f"job-heartbeat-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _requeue_stale(self) -> None:
+        self._last_requeue = time.monotonic()
+        db = self.session_factory()
+        try:
+            stale = requeue_stale_jobs(db, self.lock_timeout)
+            if stale["requeued"]:
+                logger.warning(f"Requeued {stale['requeued']} stale jobs")
+            if stale["failed"]:
+                logger.error(f"Failed {stale['failed']} stale jobs on their last attempt")
+        finally:
+            db.close()
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                if worker_id.endswith(":0") and time.monotonic() - self._last_requeue > STALE_CHECK_SECONDS:
+                    self._requeue_stale()
+                if self.run_once(worker_id):
+                    continue
+            except Exception as e:
+                logger.error(f"[{worker_id}] Job worker error: {e}", exc_info=True)
+            self._stop.wait(self.poll_interval)
+
+
+# Singleton instance
+job_worker_pool = JobWorkerPool(
+    session_factory=SessionLocal,
+    workers=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+    lock_timeout=settings.JOB_LOCK_TIMEOUT_SECONDS,
+    heartbeat_interval=settings.JOB_HEARTBEAT_SECONDS
+)
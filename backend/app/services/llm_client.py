@@ -0,0 +1,594 @@
+"""
+LLM Client - 모든 서비스가 공유하는 Anthropic 호출 래퍼
+
+- 일시적 오류 (429, 5xx, 529 overloaded, 연결/타임아웃) 재시도:
+  jitter가 적용된 지수 backoff, 서버가 보낸 `retry-after`를 우선 적용
+- 모델별 circuit breaker: 연속 실패가 임계값을 넘으면 cooldown 동안 바로 실패
+  (장애 중에 모든 요청이 타임아웃까지 기다리지 않도록)
+- fallback 모델 (LLM_FALLBACK_MODELS): 기본 모델이 실패하거나 circuit이 열려 있으면 전환,
+  LLM_HEDGE_AFTER_SECONDS > 0이면 응답이 늦을 때 fallback 모델로 동시에 요청 (먼저 끝난 응답 사용)
+- LLM scheduler 연동: 재시도 backoff 동안 호출의 슬롯을 반환했다가 다시 허가 대기,
+  hedge 요청은 별도 슬롯을 바로 얻을 수 있을 때만 실행 (스케줄러가 포화 상태면 기본 모델 응답만 기다림)
+- 모델별 요청 수, 에러, 재시도, 지연 시간 통계 → `stats()` (`GET /health/llm`)
+
+Anthropic 클라이언트는 첫 호출 시 한 번만 생성되며 (`get_anthropic_client()`), 모든 서비스와
+워커 스레드가 keep-alive HTTP 연결 풀을 공유합니다 - import 시점에 API 키가 없어도 서버는 시작되고,
+부하 중에도 TLS handshake를 반복하지 않습니다.
+
+스트리밍은 스트림을 여는 단계까지만 재시도합니다 (이미 전송한 청크는 되돌릴 수 없음).
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+from anthropic import Anthropic, APIConnectionError, APIStatusError, DefaultHttpxClient
+from app.schema.config import settings
+from app.resources import resources
+from app.services.llm_scheduler import AdmissionTicket, LLMOverloadedError, Priority, current_ticket, llm_scheduler
+from app.services.metrics import LLM_ERRORS, LLM_LATENCY, LLM_TTFT, record_llm_usage
+from app.services.profiling import span
+import logging
+import httpx
+import math
+import random
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 통계용 최근 샘플 수 (모델별)
+_LATENCY_SAMPLES = 500
+
+# 재시도할 HTTP 상태 (529 = overloaded)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# 스트림 도중 error 이벤트로 전달되는 일시적 오류 타입
+RETRYABLE_ERROR_TYPES = {"overloaded_error", "api_error", "rate_limit_error"}
+
+
+class CircuitOpenError(LLMOverloadedError):
+    """모델의 circuit이 열려 있어 호출하지 않음 (HTTP 503 + Retry-After)"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적 오류 여부 (재시도 / circuit breaker 실패 집계 대상)"""
+    if isinstance(error, APIConnectionError):
+        return True
+    if isinstance(error, APIStatusError):
+        if error.status_code in RETRYABLE_STATUS:
+            return True
+        body = error.body if isinstance(error.body, dict) else {}
+        return (body.get("error") or {}).get("type") in RETRYABLE_ERROR_TYPES
+    return False
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """응답 헤더의 retry-after (초 또는 HTTP date, retry-after-ms)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _create_anthropic_client() -> Anthropic:
+    if not settings.ANTHROPIC_API_KEY:
+        raise RuntimeError("ANTHROPIC_API_KEY is not configured")
+
+    logger.info("🔧 Anthropic Client 초기화 중...")
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            settings.LLM_HTTP_TIMEOUT,
+            connect=settings.LLM_HTTP_CONNECT_TIMEOUT,
+            pool=settings.LLM_HTTP_POOL_TIMEOUT
+        )
+    )
+    client = Anthropic(
+        api_key=settings.ANTHROPIC_API_KEY,
+        base_url=settings.ANTHROPIC_BASE_URL or None,
+        http_client=http_client,
+        max_retries=0
+    )
+    logger.info("✓ Anthropic Client 초기화 완료")
+    return client
+
+
+_anthropic_client = resources.register("anthropic", _create_anthropic_client, close=lambda client: client.close())
+
+
+def get_anthropic_client() -> Anthropic:
+    """
+    프로세스 공유 Anthropic 클라이언트 (첫 호출 시 생성)
+
+    keep-alive 연결을 오래 유지하여 요청마다 TLS handshake를 반복하지 않습니다.
+    SDK 자체 재시도는 끄고 ResilientLLMClient에서 처리합니다.
+
+    Raises:
+        RuntimeError: ANTHROPIC_API_KEY가 설정되지 않음
+    """
+    return _anthropic_client.get()
+
+
+def _error_key(error: Exception) -> str:
+    status = getattr(error, "status_code", None)
+    return str(status) if status and status != 200 else type(error).__name__
+
+
+class CircuitBreaker:
+    """
+    모델별 circuit breaker
+
+    closed → (연속 실패 threshold회) → open → (cooldown 경과) → half_open
+    half_open에서는 probe 요청 1개만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half_open이면 probe 1개만)"""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self.failure_threshold > 0 and self._failures >= self.failure_threshold):
+                if self._opened_at is None or self._probing:
+                    logger.warning(f"LLM circuit opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+
+class _ModelStats:
+    """모델별 호출 통계 (lock은 ResilientLLMClient가 보유)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0  # circuit open으로 호출하지 않은 요청
+        self.fallbacks = 0  # 이 모델 대신 fallback 모델을 사용한 요청
+        self.hedges = 0  # 응답 지연으로 fallback 모델에 동시 요청한 횟수
+        self.hedges_skipped = 0  # 응답이 늦었지만 스케줄러에 빈 슬롯이 없어 hedge하지 않은 횟수
+        self.errors: Dict[str, int] = {}
+        self.latency_ms: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+
+class ResilientLLMClient:
+    """재시도, circuit breaker, fallback을 적용한 Anthropic Messages 클라이언트"""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Anthropic] = get_anthropic_client,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        fallback_models: Optional[Dict[str, str]] = None,
+        hedge_after: float = 0.0,
+    ):
+        self.client_factory = client_factory
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.fallback_models = fallback_models or {}
+        self.hedge_after = hedge_after
+
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, _ModelStats] = {}
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def client(self) -> Anthropic:
+        """공유 Anthropic 클라이언트 (첫 LLM 호출 시 생성)"""
+        return self.client_factory()
+
+    # =====================
+    # Public API
+    # =====================
+
+    def create(self, **kwargs: Any) -> Any:
+        """
+        `client.messages.create(**kwargs)` + 재시도 / circuit breaker / fallback
+
+        Raises:
+            CircuitOpenError: 기본 모델과 fallback 모델의 circuit이 모두 열려 있음
+            anthropic.APIError: 재시도 후에도 실패
+        """
+        model = kwargs["model"]
+        fallback = self.fallback_models.get(model)
+        ticket = current_ticket.get()
+        if fallback and self.hedge_after > 0:
+            return self._hedged_create(kwargs, fallback, ticket)
+
+        try:
+            return self._call(model, kwargs, self.client.messages.create, ticket=ticket)
+        except Exception as e:
+            if not fallback or not _should_fallback(e):
+                raise
+            self._count(model, "fallbacks")
+            logger.warning(f"LLM {model} failed ({_error_key(e)}), falling back to {fallback}")
+            return self._call(fallback, kwargs, self.client.messages.create, ticket=ticket)
+
+    @contextmanager
+    def stream(self, **kwargs: Any) -> Iterator[Any]:
+        """
+        `client.messages.stream(**kwargs)` + 스트림 연결 재시도 / circuit breaker / fallback
+
+        Yields:
+            MessageStream
+        """
+        model = kwargs["model"]
+        fallback = self.fallback_models.get(model)
+        ticket = current_ticket.get()
+        try:
+            manager, stream, started = self._call(model, kwargs, self._open_stream, kind="stream", ticket=ticket)
+        except Exception as e:
+            if not fallback or not _should_fallback(e):
+                raise
+            self._count(model, "fallbacks")
+            logger.warning(f"LLM {model} stream failed ({_error_key(e)}), falling back to {fallback}")
+            model = fallback
+            manager, stream, started = self._call(model, kwargs, self._open_stream, kind="stream", ticket=ticket)
+
+        try:
+            with span("llm", f"{model} stream body"):
+                yield _TimedStream(stream, model, started)
+        except BaseException as e:
+            manager.__exit__(*sys.exc_info())
+            # 클라이언트 연결 종료(GeneratorExit 등)는 집계하지 않음
+            if isinstance(e, Exception):
+                self._record(model, started, error=e, trip=is_retryable(e), kind="stream")
+            raise
+        else:
+            manager.__exit__(None, None, None)
+            self._record(model, started, kind="stream")
+            try:
+                record_llm_usage(model, stream.current_message_snapshot.usage)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """모델별 요청 / 에러 / 재시도 / 지연 시간 / circuit 상태"""
+        with self._lock:
+            models = {}
+            for model, stats in self._stats.items():
+                latencies = sorted(stats.latency_ms)
+                models[model] = {
+                    "circuit": self._breaker(model).state,
+                    "requests_total": stats.requests,
+                    "successes_total": stats.successes,
+                    "failures_total": stats.failures,
+                    "retries_total": stats.retries,
+                    "rejected_total": stats.rejected,
+                    "fallbacks_total": stats.fallbacks,
+                    "hedges_total": stats.hedges,
+                    "hedges_skipped_total": stats.hedges_skipped,
+                    "errors": dict(stats.errors),
+                    "latency_ms": {
+                        "avg": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+                        "p50": round(_percentile(latencies, 0.50), 2),
+                        "p95": round(_percentile(latencies, 0.95), 2),
+                        "max": round(latencies[-1], 2) if latencies else 0.0,
+                    },
+                }
+            return models
+
+    # =====================
+    # Internal
+    # =====================
+
+    def _call(
+        self,
+        model: str,
+        kwargs: Dict[str, Any],
+        call: Any,
+        kind: str = "create",
+        ticket: Optional[AdmissionTicket] = None
+    ) -> Any:
+        """
+        model로 call(**kwargs) 실행, 일시적 오류는 backoff 후 재시도 (kind: "create" | "stream")
+
+        ticket이 있으면 backoff 동안 슬롯을 반환하고 재시도 전에 다시 허가 대기
+        (대기열이 가득 차면 LLMOverloadedError, 그 사이 티켓이 release되었으면 마지막 에러)
+        """
+        breaker = self._breaker(model)
+        request = dict(kwargs, model=model)
+
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self._count(model, "rejected")
+                retry_after = breaker.retry_after()
+                raise CircuitOpenError(
+                    f"LLM {model} is unavailable (circuit open)",
+                    int(min(60, max(1, math.ceil(retry_after))))
+                )
+
+            started = time.monotonic()
+            self._count(model, "requests")
+            try:
+                with span("llm", f"{model} {kind}"):
+                    result = call(**request)
+            except Exception as e:
+                retryable = is_retryable(e)
+                self._record(model, started, error=e, trip=retryable, kind=kind)
+                if not retryable or attempt == self.max_retries:
+                    raise
+
+                delay = self._backoff(attempt, retry_after_seconds(e))
+                self._count(model, "retries")
+                logger.warning(
+                    f"LLM {model} {_error_key(e)} (attempt {attempt + 1}/{self.max_retries + 1}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                if ticket is None:
+                    time.sleep(delay)
+                    continue
+                if not ticket.suspend():
+                    # 호출 측이 이미 끝남 (hedge에서 진 요청 등) - 더 재시도하지 않음
+                    raise
+                try:
+                    time.sleep(delay)
+                finally:
+                    resumed = ticket.resume()
+                if not resumed:
+                    raise
+                continue
+
+            if kind == "create":
+                self._record(model, started)
+                record_llm_usage(model, getattr(result, "usage", None))
+            else:
+                # 스트림 연결 성공 - 통계는 스트림 종료 시 기록
+                breaker.record_success()
+            return result
+
+    def _open_stream(self, **kwargs: Any) -> Tuple[Any, Any, float]:
+        """스트림 연결 (HTTP 응답 상태까지 확인) → (manager, stream, 시작 시각)"""
+        started = time.monotonic()
+        manager = self.client.messages.stream(**kwargs)
+        return manager, manager.__enter__(), started
+
+    def _hedged_create(self, kwargs: Dict[str, Any], fallback: str, ticket: Optional[AdmissionTicket]) -> Any:
+        """
+        기본 모델 응답이 hedge_after초 안에 오지 않으면 fallback 모델에도 요청
+
+        hedge 요청은 별도 슬롯 (`try_admit`)으로 실행하며, 바로 허가되지 않으면 (대기자가 있거나 포화)
+        hedge하지 않고 기본 모델 응답을 기다립니다. hedge 슬롯은 두 요청이 모두 끝날 때 반환
+        (먼저 끝난 응답을 반환한 뒤에도 늦은 요청이 백그라운드에서 실행되는 동안 슬롯을 차지).
+        """
+        model = kwargs["model"]
+        pool = self._pool()
+        create = self.client.messages.create
+        primary = pool.submit(self._call, model, kwargs, create, "create", ticket)
+        done, _ = wait([primary], timeout=self.hedge_after)
+
+        if done:
+            error = primary.exception()
+            if error is None:
+                return primary.result()
+            if not _should_fallback(error):
+                raise error
+            self._count(model, "fallbacks")
+            return self._call(fallback, kwargs, create, ticket=ticket)
+
+        scheduler = ticket.scheduler if ticket is not None else llm_scheduler
+        hedge_ticket = scheduler.try_admit(
+            ticket.priority if ticket is not None else Priority.STANDARD,
+            ticket.tokens if ticket is not None else 0
+        )
+        if hedge_ticket is None:
+            self._count(model, "hedges_skipped")
+            logger.info(f"LLM {model} slower than {self.hedge_after}s, not hedging (scheduler saturated)")
+            return primary.result()
+
+        self._count(model, "hedges")
+        logger.info(f"LLM {model} slower than {self.hedge_after}s, hedging to {fallback}")
+        hedge = pool.submit(self._call, fallback, kwargs, create, "create", hedge_ticket)
+
+        def release_when_settled(_future: Any) -> None:
+            if primary.done() and hedge.done():
+                hedge_ticket.release()
+
+        primary.add_done_callback(release_when_settled)
+        hedge.add_done_callback(release_when_settled)
+
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    # 늦게 끝나는 요청은 백그라운드에서 완료되고 결과는 버려짐
+                    if future is not primary:
+                        self._count(model, "fallbacks")
+                    return future.result()
+                if future is primary or first_error is None:
+                    first_error = error
+        raise first_error
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=max(2, settings.LLM_MAX_CONCURRENCY * 2),
+                    thread_name_prefix="llm-hedge"
+                )
+            return self._hedge_pool
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """full jitter 지수 backoff (retry-after가 있으면 우선)"""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers.setdefault(model, CircuitBreaker(self.failure_threshold, self.cooldown))
+        return breaker
+
+    def _model_stats(self, model: str) -> _ModelStats:
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = self._stats.setdefault(model, _ModelStats())
+        return stats
+
+    def _count(self, model: str, field: str) -> None:
+        with self._lock:
+            stats = self._model_stats(model)
+            setattr(stats, field, getattr(stats, field) + 1)
+
+    def _record(
+        self,
+        model: str,
+        started: float,
+        error: Optional[Exception] = None,
+        trip: bool = True,
+        kind: str = "create",
+    ) -> None:
+        """호출 결과 기록 (error가 일시적 오류면 circuit breaker 실패로 집계)"""
+        breaker = self._breaker(model)
+        elapsed = time.monotonic() - started
+        with self._lock:
+            stats = self._model_stats(model)
+            if error is None:
+                stats.successes += 1
+                stats.latency_ms.append(elapsed * 1000)
+            else:
+                stats.failures += 1
+                key = _error_key(error)
+                stats.errors[key] = stats.errors.get(key, 0) + 1
+
+        LLM_LATENCY.observe(elapsed, model=model, kind=kind, outcome="ok" if error is None else "error")
+        if error is not None:
+            LLM_ERRORS.inc(model=model, error=_error_key(error))
+
+        if error is not None and trip:
+            breaker.record_failure()
+        else:
+            # 400 등 요청 자체의 오류는 모델이 정상 응답한 것으로 간주
+            breaker.record_success()
+
+
+class _TimedStream:
+    """MessageStream 프록시 - 첫 콘텐츠 토큰까지의 시간 (time-to-first-token) 기록"""
+
+    def __init__(self, stream: Any, model: str, started: float):
+        self._stream = stream
+        self._model = model
+        self._started = started
+        self._first_token = False
+
+    def _mark(self) -> None:
+        if not self._first_token:
+            self._first_token = True
+            LLM_TTFT.observe(time.monotonic() - self._started, model=self._model)
+
+    def __iter__(self) -> Iterator[Any]:
+        for event in self._stream:
+            if event.type == "content_block_delta":
+                self._mark()
+            yield event
+
+    @property
+    def text_stream(self) -> Iterator[str]:
+        for text in self._stream.text_stream:
+            self._mark()
+            yield text
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def _should_fallback(error: BaseException) -> bool:
+    return isinstance(error, CircuitOpenError) or (isinstance(error, Exception) and is_retryable(error))
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+# Singleton instance
+llm_client = ResilientLLMClient(
+    client_factory=get_anthropic_client,
+    max_retries=settings.LANGGRAPH_MAX_RETRIES,
+    base_delay=settings.LLM_RETRY_BASE_DELAY,
+    max_delay=settings.LLM_RETRY_MAX_DELAY,
+    failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+    cooldown=settings.LLM_CIRCUIT_COOLDOWN_SECONDS,
+    fallback_models=settings.LLM_FALLBACK_MODELS,
+    hedge_after=settings.LLM_HEDGE_AFTER_SECONDS
+)
@@ -0,0 +1,451 @@
+"""
+LLM Scheduler - LLM 호출 admission control 및 우선순위 큐
+
+모든 서비스의 Anthropic 호출이 공유하는 프로세스 내 스케줄러입니다.
+
+- 전역 동시 실행 수 (LLM_MAX_CONCURRENCY) 및 분당 토큰 예산 (LLM_TOKENS_PER_MINUTE, token bucket)
+- 우선순위: INTERACTIVE (대화, 스트리밍) > STANDARD (generate) > BATCH (auto-fill)
+- 대기열 + 우선순위별 대기 기한 (기한 초과 시 503)
+- 대기열이 가득 차면 즉시 503 + Retry-After (더 낮은 우선순위 대기자가 있으면 그쪽을 밀어냄)
+- 대기열 길이, 대기 시간 통계를 `stats()`로 제공 (`GET /health/llm`)
+
+호출 측 라우트는 threadpool에서 실행되어야 합니다 (`def` 라우트) - 대기 중 이벤트 루프를 막지 않기 위해.
+
+허가된 티켓은 `with ticket:` / `ticket.guard()` 안에서 `current_ticket`으로 노출되어, `llm_client`가
+재시도 backoff 동안 슬롯을 잠시 반환하고 (`suspend` / `resume`) hedge 요청을 별도 슬롯(`try_admit`)으로 실행합니다.
+"""
+
+from collections import deque
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from app.schema.config import settings
+from app.services.metrics import metrics
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 대기 시간 통계용 최근 샘플 수
+_WAIT_SAMPLES = 1000
+
+
+class Priority(IntEnum):
+    """LLM 요청 우선순위 (값이 작을수록 먼저)"""
+    INTERACTIVE = 0
+    STANDARD = 1
+    BATCH = 2
+
+
+class LLMOverloadedError(Exception):
+    """대기열이 가득 찼거나 대기 기한을 넘긴 경우 (HTTP 503 + Retry-After)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "enqueued", "admitted", "rejected")
+
+    def __init__(self, priority: Priority, seq: int, tokens: int):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.admitted = False
+        self.rejected: Optional[LLMOverloadedError] = None
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionTicket:
+    """
+    허가된 LLM 호출 슬롯 - 호출이 끝나면 release()
+
+    상태: held (슬롯 보유) → suspended (재시도 대기 중 슬롯 반환) → held ... → released (최종)
+    """
+
+    def __init__(self, scheduler: "LLMScheduler", priority: Priority, tokens: int, wait_ms: float):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.tokens = tokens
+        self.wait_ms = wait_ms
+        self._lock = threading.Lock()
+        self._state = "held"
+        self._context_tokens: List[Any] = []
+
+    @property
+    def released(self) -> bool:
+        return self._state == "released"
+
+    def record_usage(self, usage: Any) -> None:
+        """실제 사용 토큰으로 예산 보정 (response.usage)"""
+        used = (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+        if used:
+            self.scheduler._adjust_tokens(self.tokens - used)
+            self.tokens = used
+
+    def release(self) -> None:
+        """슬롯 반환 (여러 번 / 여러 스레드에서 호출해도 한 번만)"""
+        with self._lock:
+            held = self._state == "held"
+            self._state = "released"
+        if held:
+            self.scheduler._release(self)
+
+    def suspend(self) -> bool:
+        """재시도 backoff 동안 슬롯을 다른 요청에 양보 - 양보했으면 True (resume 필요)"""
+        with self._lock:
+            if self._state != "held":
+                return False
+            self._state = "suspended"
+        self.scheduler._release(self)
+        return True
+
+    def resume(self) -> bool:
+        """
+        suspend 후 같은 우선순위 / 토큰으로 다시 허가 대기
+
+        Returns:
+            다시 슬롯을 보유하면 True, 그 사이 소유자가 release()했으면 False (호출을 계속하지 않음)
+
+        Raises:
+            LLMOverloadedError: 대기열이 가득 찼거나 대기 기한 초과
+        """
+        with self._lock:
+            if self._state != "suspended":
+                return self._state == "held"
+        wait_ms = self.scheduler._acquire(self.priority, self.tokens, None)
+        with self._lock:
+            resumed = self._state == "suspended"
+            if resumed:
+                self._state = "held"
+                self.wait_ms = round(self.wait_ms + wait_ms, 2)
+        if resumed:
+            self.scheduler._started[id(self)] = time.monotonic()
+        else:
+            self.scheduler._release(self)
+        return resumed
+
+    def guard(self, iterator: Iterator[Any]) -> "GuardedStream":
+        """스트리밍 호출: iterator가 끝나거나, 에러가 나거나, close()되면 release"""
+        return GuardedStream(self, iterator)
+
+    def __enter__(self) -> "AdmissionTicket":
+        self._context_tokens.append(current_ticket.set(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        current_ticket.reset(self._context_tokens.pop())
+        self.release()
+
+
+# 현재 스레드 / 요청에서 실행 중인 호출의 티켓 (`with ticket:`, `GuardedStream.__next__`)
+current_ticket: ContextVar[Optional[AdmissionTicket]] = ContextVar("current_llm_ticket", default=None)
+
+
+class GuardedStream:
+    """
+    슬롯을 가진 스트리밍 iterator
+
+    generator의 finally는 iterator가 한 번도 시작되지 않으면 실행되지 않으므로 (응답 전송 전 연결 끊김 등),
+    응답 쪽에서 close()를 반드시 호출해야 합니다 (`ClosingStreamingResponse`).
+    close()는 다른 스레드가 next() 중이면 그 청크가 끝난 뒤 upstream을 닫고 슬롯을 반환합니다.
+    """
+
+    def __init__(self, ticket: AdmissionTicket, iterator: Iterator[Any]):
+        self.ticket = ticket
+        self._iterator = iterator
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __iter__(self) -> "GuardedStream":
+        return self
+
+    def __next__(self) -> Any:
+        with self._lock:
+            if self._closed:
+                raise StopIteration
+            token = current_ticket.set(self.ticket)
+            try:
+                return next(self._iterator)
+            except BaseException:
+                self._close()
+                raise
+            finally:
+                current_ticket.reset(token)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self._iterator, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self.ticket.release()
+
+
+class LLMScheduler:
+    """프로세스 내 LLM admission scheduler"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        tokens_per_minute: int = 0,
+        max_queue: int = 24,
+        queue_timeouts: Optional[Dict[Priority, float]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute  # 0 = 제한 없음
+        self.max_queue = max_queue
+        self.queue_timeouts = queue_timeouts or {
+            Priority.INTERACTIVE: 20.0,
+            Priority.STANDARD: 60.0,
+            Priority.BATCH: 120.0,
+        }
+
+        self._condition = threading.Condition()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled = time.monotonic()
+
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_ms: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self._service_seconds: Deque[float] = deque(maxlen=100)
+        self._started: Dict[int, float] = {}
+
+    def admit(self, priority: Priority, estimated_tokens: int = 0, timeout: Optional[float] = None) -> AdmissionTicket:
+        """
+        LLM 호출 허가 대기
+
+        Args:
+            priority: 요청 우선순위
+            estimated_tokens: 예상 토큰 (입력 + max_tokens)
+            timeout: 최대 대기 시간 (None이면 우선순위별 기본값)
+
+        Returns:
+            AdmissionTicket (호출 후 release 필요, context manager 지원)
+
+        Raises:
+            LLMOverloadedError: 대기열이 가득 찼거나 대기 기한 초과
+        """
+        if self.tokens_per_minute:
+            # 예산보다 큰 요청은 영원히 대기하지 않도록 상한 적용
+            estimated_tokens = min(estimated_tokens, self.tokens_per_minute)
+        wait_ms = self._acquire(priority, estimated_tokens, timeout)
+        return self._issue(priority, estimated_tokens, wait_ms)
+
+    def try_admit(self, priority: Priority, estimated_tokens: int = 0) -> Optional[AdmissionTicket]:
+        """
+        대기 없이 바로 허가할 수 있을 때만 허가 (hedge 요청 등 선택적인 호출)
+
+        Returns:
+            AdmissionTicket, 대기자가 있거나 슬롯 / 토큰이 없으면 None (대기열에 넣지 않음)
+        """
+        if self.tokens_per_minute:
+            estimated_tokens = min(estimated_tokens, self.tokens_per_minute)
+        with self._condition:
+            self._refill()
+            if self._queue or self._in_flight >= self.max_concurrency:
+                return None
+            if self.tokens_per_minute and estimated_tokens > self._tokens:
+                return None
+            self._in_flight += 1
+            self._admitted += 1
+            if self.tokens_per_minute:
+                self._tokens -= estimated_tokens
+        return self._issue(priority, estimated_tokens, 0.0)
+
+    def _acquire(self, priority: Priority, estimated_tokens: int, timeout: Optional[float]) -> float:
+        """슬롯을 얻을 때까지 대기 → 대기 시간 (ms)"""
+        timeout = self.queue_timeouts[priority] if timeout is None else timeout
+        with self._condition:
+            waiter = _Waiter(priority, next(self._seq), estimated_tokens)
+
+            if len(self._queue) >= self.max_queue:
+                victim = max(self._queue) if self._queue else None
+                if victim is None or victim.priority <= priority:
+                    self._rejected += 1
+                    raise LLMOverloadedError("LLM queue is full", self._retry_after())
+                # 더 낮은 우선순위 대기자를 밀어냄
+                self._queue.remove(victim)
+                heapq.heapify(self._queue)
+                victim.rejected = LLMOverloadedError("Preempted by higher priority request", self._retry_after())
+                self._rejected += 1
+
+            heapq.heappush(self._queue, waiter)
+            deadline = waiter.enqueued + timeout
+
+            while True:
+                self._dispatch()
+                if waiter.admitted:
+                    break
+                if waiter.rejected is not None:
+                    self._condition.notify_all()
+                    raise waiter.rejected
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queue.remove(waiter)
+                    heapq.heapify(self._queue)
+                    self._timed_out += 1
+                    self._condition.notify_all()
+                    raise LLMOverloadedError(
+                        f"Timed out after {timeout:.0f}s waiting for LLM capacity",
+                        self._retry_after()
+                    )
+                self._condition.wait(timeout=min(remaining, self._token_wait(waiter)))
+
+            wait_ms = (time.monotonic() - waiter.enqueued) * 1000
+            self._wait_ms.append(wait_ms)
+
+        if wait_ms > 1000:
+            logger.info(f"LLM request ({priority.name}) admitted after {wait_ms:.0f}ms")
+        return wait_ms
+
+    def _issue(self, priority: Priority, tokens: int, wait_ms: float) -> AdmissionTicket:
+        ticket = AdmissionTicket(self, priority, tokens, round(wait_ms, 2))
+        self._started[id(ticket)] = time.monotonic()
+        return ticket
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 / 대기 시간 통계"""
+        with self._condition:
+            self._refill()
+            waits = sorted(self._wait_ms)
+            depth = {p.name.lower(): 0 for p in Priority}
+            for waiter in self._queue:
+                depth[waiter.priority.name.lower()] += 1
+
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": len(self._queue),
+                "queue_depth_by_priority": depth,
+                "max_queue": self.max_queue,
+                "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+                "tokens_per_minute": self.tokens_per_minute or None,
+                "admitted_total": self._admitted,
+                "rejected_total": self._rejected,
+                "timed_out_total": self._timed_out,
+                "wait_ms": {
+                    "avg": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                    "p50": round(_percentile(waits, 0.50), 2),
+                    "p95": round(_percentile(waits, 0.95), 2),
+                    "max": round(waits[-1], 2) if waits else 0.0,
+                },
+            }
+
+    # =====================
+    # Internal (self._condition 보유 상태에서 호출)
+    # =====================
+
+    def _dispatch(self) -> None:
+        """우선순위 순으로 허가 가능한 대기자 허가"""
+        self._refill()
+        while self._queue and self._in_flight < self.max_concurrency:
+            head = self._queue[0]
+            if self.tokens_per_minute and head.tokens > self._tokens:
+                # head-of-line: 높은 우선순위 요청이 토큰을 기다리는 동안 추월하지 않음
+                break
+            heapq.heappop(self._queue)
+            head.admitted = True
+            self._in_flight += 1
+            self._admitted += 1
+            if self.tokens_per_minute:
+                self._tokens -= head.tokens
+            self._condition.notify_all()
+
+    def _refill(self) -> None:
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._refilled) * self.tokens_per_minute / 60.0
+        )
+        self._refilled = now
+
+    def _token_wait(self, waiter: _Waiter) -> float:
+        """토큰이 모자랄 때 다시 확인할 시간 (초)"""
+        if not self.tokens_per_minute or waiter.tokens <= self._tokens:
+            return 1.0
+        return max(0.05, (waiter.tokens - self._tokens) * 60.0 / self.tokens_per_minute)
+
+    def _retry_after(self) -> int:
+        """대기열 / 평균 처리 시간 기반 Retry-After (초)"""
+        service = (
+            sum(self._service_seconds) / len(self._service_seconds)
+            if self._service_seconds else 5.0
+        )
+        backlog = (len(self._queue) + 1) / self.max_concurrency
+        return int(min(60, max(1, math.ceil(service * backlog))))
+
+    # =====================
+    # Ticket callbacks
+    # =====================
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        with self._condition:
+            started = self._started.pop(id(ticket), None)
+            if started is not None:
+                self._service_seconds.append(time.monotonic() - started)
+            self._in_flight -= 1
+            self._dispatch()
+            self._condition.notify_all()
+
+    def _adjust_tokens(self, delta: int) -> None:
+        if not self.tokens_per_minute:
+            return
+        with self._condition:
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + delta)
+            self._dispatch()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """예상 토큰 (입력 ≈ 문자 4개당 1토큰 + 최대 출력)"""
+    return len(prompt) // 4 + max_tokens
+
+
+# Singleton instance
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    max_queue=settings.LLM_MAX_QUEUE,
+    queue_timeouts={
+        Priority.INTERACTIVE: settings.LLM_QUEUE_TIMEOUT_INTERACTIVE,
+        Priority.STANDARD: settings.LLM_QUEUE_TIMEOUT_STANDARD,
+        Priority.BATCH: settings.LLM_QUEUE_TIMEOUT_BATCH,
+    }
+)
+
+metrics.gauge(
+    "llm_in_flight", "LLM calls currently running", (),
+    collect=lambda: {(): llm_scheduler.stats()["in_flight"]}
+)
+metrics.gauge(
+    "llm_queue_depth", "LLM calls waiting for admission", ("priority",),
+    collect=lambda: {(priority,): depth for priority, depth in llm_scheduler.stats()["queue_depth_by_priority"].items()}
+)
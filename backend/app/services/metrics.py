@@ -0,0 +1,279 @@
+"""
+Metrics - Prometheus text format 메트릭 (외부 의존성 없음)
+
+- HTTP: 라우트별 요청 수 / 지연 시간 histogram, 요청당 DB 쿼리 수 / 시간 (`app/middleware.py`)
+- DB: SQLAlchemy cursor 이벤트로 쿼리 수 / 시간 집계
+- LLM: 모델별 지연 시간, time-to-first-token (스트리밍), input/output/cache 토큰 (`llm_client.py`)
+- ChromaDB: 작업별 쿼리 시간 (`db/vector/ingredient_vector.py`)
+
+`GET /metrics`로 노출합니다. METRICS_ENABLED=false이면 모든 기록이 바로 반환되는 no-op 모드입니다.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.schema.config import settings
+import bisect
+import threading
+import time
+
+# 지연 시간 histogram 기본 bucket (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, labelnames: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _label_text(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not self.registry.enabled or not amount:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._label_text(key)} {_number(value)}" for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    """조회 시점에 callback으로 값을 읽는 gauge"""
+    type_name = "gauge"
+
+    def __init__(self, *args, collect: Callable[[], Dict[Tuple[str, ...], float]], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._label_text(key)} {_number(value)}" for key, value in self.collect().items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key → [bucket별 count..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, counts in self._values.items():
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{self._label_text(key, ('le', _number(bound)))} {_number(cumulative)}")
+                cumulative += counts[len(self.buckets)]
+                lines.append(f"{self.name}_bucket{self._label_text(key, ('le', '+Inf'))} {_number(cumulative)}")
+                lines.append(f"{self.name}_sum{self._label_text(key)} {_number(counts[-1])}")
+                lines.append(f"{self.name}_count{self._label_text(key)} {_number(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 목록 및 Prometheus text format 출력"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, help_text, labelnames, buckets=buckets))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str], collect: Callable[[], Dict[Tuple[str, ...], float]]) -> Gauge:
+        return self._add(Gauge(self, name, help_text, labelnames, collect=collect))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # 수집 callback 오류로 전체 응답이 실패하지 않도록
+                continue
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _sql_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in _SQL_OPERATIONS else "OTHER"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+# =====================
+# Request context (요청당 DB 쿼리 집계)
+# =====================
+
+class RequestStats:
+    __slots__ = ("db_queries", "db_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+# threadpool로 실행되는 sync 라우트에도 context가 복사되므로 같은 객체에 누적됨
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+# Singleton instance
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests", ("method", "route", "status")
+)
+HTTP_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency including streamed body", ("method", "route")
+)
+HTTP_DB_QUERIES = metrics.histogram(
+    "http_request_db_queries", "DB queries per HTTP request", ("route",), buckets=COUNT_BUCKETS
+)
+HTTP_DB_SECONDS = metrics.histogram(
+    "http_request_db_seconds", "Total DB time per HTTP request", ("route",), buckets=DB_BUCKETS
+)
+DB_QUERY_LATENCY = metrics.histogram(
+    "db_query_duration_seconds", "SQL statement latency", ("operation",), buckets=DB_BUCKETS
+)
+DB_SESSION_ROUTES = metrics.counter(
+    "db_session_routes_total", "Session statements by target database (primary, replica)", ("target",)
+)
+DB_REPLICA_FAILURES = metrics.counter(
+    "db_replica_failures_total", "Replica connection failures (falls back to primary)", ("replica",)
+)
+LLM_LATENCY = metrics.histogram(
+    "llm_request_duration_seconds", "LLM call latency (stream: until the stream closes)", ("model", "kind", "outcome")
+)
+LLM_TTFT = metrics.histogram(
+    "llm_time_to_first_token_seconds", "Time from stream open to the first content token", ("model",)
+)
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total", "LLM tokens by type (input, output, cache_read, cache_creation)", ("model", "type")
+)
+LLM_ERRORS = metrics.counter(
+    "llm_errors_total", "LLM call errors", ("model", "error")
+)
+CHROMA_LATENCY = metrics.histogram(
+    "chroma_query_duration_seconds", "ChromaDB operation latency", ("operation",), buckets=DB_BUCKETS + (5.0, 10.0)
+)
+
+
+def record_llm_usage(model: str, usage: Any) -> None:
+    """response.usage → 토큰 카운터"""
+    if not metrics.enabled or usage is None:
+        return
+    LLM_TOKENS.inc(getattr(usage, "input_tokens", 0) or 0, model=model, type="input")
+    LLM_TOKENS.inc(getattr(usage, "output_tokens", 0) or 0, model=model, type="output")
+    LLM_TOKENS.inc(getattr(usage, "cache_read_input_tokens", 0) or 0, model=model, type="cache_read")
+    LLM_TOKENS.inc(getattr(usage, "cache_creation_input_tokens", 0) or 0, model=model, type="cache_creation")
+
+
+@contextmanager
+def chroma_timer(operation: str) -> Iterator[None]:
+    """ChromaDB 작업 시간 기록"""
+    if not metrics.enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        CHROMA_LATENCY.observe(time.perf_counter() - started, operation=operation)
+
+
+def instrument_sqlalchemy() -> None:
+    """모든 Engine의 SQL 실행 시간 / 요청당 쿼리 수 기록 (METRICS_ENABLED일 때 한 번만)"""
+    if not metrics.enabled or getattr(instrument_sqlalchemy, "_installed", False):
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        DB_QUERY_LATENCY.observe(elapsed, operation=_sql_operation(statement))
+        stats = current_request.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(Engine, "handle_error")
+    def _error(context):
+        # 실패한 쿼리는 after_cursor_execute가 호출되지 않음
+        connection = context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+    instrument_sqlalchemy._installed = True
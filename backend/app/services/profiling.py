@@ -0,0 +1,372 @@
+"""
+Profiling - 요청 단위 샘플링 프로파일 + span 분석 (디버그 전용)
+
+PROFILING_ENABLED=true일 때만 설치되며, 다음 요청을 프로파일합니다.
+- `X-Profile` 헤더가 있는 요청 (PROFILING_TOKEN이 설정되어 있으면 값이 같아야 함)
+- PROFILING_SAMPLE_RATE 비율로 무작위 선택된 요청
+
+요청마다 저장되는 파일 (PROFILING_DIR):
+- `{id}.speedscope.json`: 스레드별 샘플링 프로파일 (https://www.speedscope.app 에서 열기)
+- `{id}.collapsed.txt`: collapsed stack (flamegraph.pl, speedscope 모두 지원)
+- `{id}.json`: 요약 + span 목록 (endpoint, prompt, db, vector, llm, serialization)
+
+샘플링 대상은 요청을 처리한 스레드 (이벤트 루프 + endpoint/span을 실행한 threadpool 스레드)이며,
+이벤트 루프 스레드의 샘플에는 동시에 처리 중인 다른 요청이 섞일 수 있습니다.
+"""
+
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from app.schema.config import settings
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# span 종류 (요약의 breakdown 순서)
+SPAN_KINDS = ("endpoint", "prompt", "db", "vector", "llm", "serialization")
+
+# 샘플 스택 최대 깊이
+MAX_STACK_DEPTH = 128
+
+
+class RequestProfile:
+    """프로파일 중인 요청 1개"""
+
+    def __init__(self, method: str, path: str):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.finished: Optional[float] = None
+        self.status: Optional[int] = None
+        self.endpoint_finished: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self.threads: Dict[int, str] = {}
+        self.spans: List[Dict[str, Any]] = []
+        # thread id → (샘플 시각, 스택) 목록
+        self.samples: Dict[int, List[Tuple[float, Tuple[str, ...]]]] = {}
+
+    def register_thread(self) -> None:
+        thread = threading.current_thread()
+        if thread.ident not in self.threads:
+            with self._lock:
+                self.threads[thread.ident] = thread.name
+
+    def add_span(self, kind: str, name: Optional[str], started: float, finished: float) -> None:
+        with self._lock:
+            self.spans.append({
+                "kind": kind,
+                "name": name,
+                "start_ms": round((started - self.started) * 1000, 3),
+                "duration_ms": round((finished - started) * 1000, 3),
+                "thread": threading.current_thread().name,
+            })
+
+    def add_sample(self, thread_id: int, stack: Tuple[str, ...], at: float) -> None:
+        with self._lock:
+            self.samples.setdefault(thread_id, []).append((at, stack))
+
+    # =====================
+    # Export
+    # =====================
+
+    def summary(self) -> Dict[str, Any]:
+        duration = ((self.finished or time.perf_counter()) - self.started) * 1000
+        breakdown = {kind: 0.0 for kind in SPAN_KINDS}
+        for span in self.spans:
+            breakdown[span["kind"]] = breakdown.get(span["kind"], 0.0) + span["duration_ms"]
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(duration, 3),
+            "breakdown_ms": {kind: round(value, 3) for kind, value in breakdown.items()},
+            "sample_count": sum(len(samples) for samples in self.samples.values()),
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"]),
+        }
+
+    def collapsed(self) -> str:
+        """collapsed stack 형식: `thread;frame;frame count`"""
+        counts: StackCounter = StackCounter()
+        for thread_id, samples in self.samples.items():
+            thread_name = self.threads.get(thread_id, str(thread_id))
+            for _, stack in samples:
+                counts[(thread_name,) + stack] += 1
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common())
+
+    def speedscope(self) -> Dict[str, Any]:
+        """speedscope file format (sampled, 스레드별 profile)"""
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[str, int] = {}
+        profiles = []
+        end = ((self.finished or time.perf_counter()) - self.started) * 1000
+
+        for thread_id, samples in self.samples.items():
+            stacks, weights = [], []
+            previous = self.started
+            for at, stack in samples:
+                indexes = []
+                for frame in stack:
+                    if frame not in frame_index:
+                        frame_index[frame] = len(frames)
+                        frames.append({"name": frame})
+                    indexes.append(frame_index[frame])
+                stacks.append(indexes)
+                # 직전 샘플 이후 경과 시간을 가중치로 사용
+                weights.append(round((at - previous) * 1000, 3))
+                previous = at
+            profiles.append({
+                "type": "sampled",
+                "name": self.threads.get(thread_id, str(thread_id)),
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(end, 3),
+                "samples": stacks,
+                "weights": weights,
+            })
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path} ({self.id})",
+            "exporter": "fragrance-profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def span(kind: str, name: Optional[str] = None) -> Iterator[None]:
+    """프로파일 중인 요청이면 구간 시간 기록 (아니면 no-op)"""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    profile.register_thread()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(kind, name, started, time.perf_counter())
+
+
+class Profiler:
+    """활성 프로파일을 하나의 샘플링 스레드로 수집하고 파일로 저장"""
+
+    def __init__(self, directory: str, interval_ms: float = 5.0, sample_rate: float = 0.0,
+                 token: str = "", max_files: int = 100):
+        self.directory = directory
+        self.interval = max(0.001, interval_ms / 1000)
+        self.sample_rate = sample_rate
+        self.token = token
+        self.max_files = max_files
+
+        self._lock = threading.Lock()
+        self._active: Dict[str, RequestProfile] = {}
+        self._sampler: Optional[threading.Thread] = None
+
+    def should_profile(self, headers: Dict[str, str]) -> bool:
+        requested = headers.get("x-profile")
+        if requested is not None:
+            return not self.token or requested == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self, method: str, path: str) -> RequestProfile:
+        profile = RequestProfile(method, path)
+        profile.register_thread()
+        with self._lock:
+            self._active[profile.id] = profile
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+                self._sampler.start()
+        return profile
+
+    def finish(self, profile: RequestProfile, status: Optional[int]) -> None:
+        profile.finished = time.perf_counter()
+        profile.status = status
+        with self._lock:
+            self._active.pop(profile.id, None)
+        try:
+            self._save(profile)
+        except Exception as e:
+            logger.warning(f"Failed to save profile {profile.id}: {e}")
+
+    # =====================
+    # Stored profiles
+    # =====================
+
+    def list_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        summaries = []
+        for filename in sorted(os.listdir(self.directory), reverse=True):
+            if filename.endswith(".json") and not filename.endswith(".speedscope.json"):
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                    summary = json.load(f)
+                summary.pop("spans", None)
+                summaries.append(summary)
+                if len(summaries) >= limit:
+                    break
+        return summaries
+
+    def profile_path(self, profile_id: str, kind: str) -> Optional[str]:
+        """저장된 파일 경로 (kind: summary | speedscope | collapsed), 없으면 None"""
+        suffix = {"summary": ".json", "speedscope": ".speedscope.json", "collapsed": ".collapsed.txt"}[kind]
+        # 경로 조작 방지
+        if not profile_id or os.path.basename(profile_id) != profile_id:
+            return None
+        path = os.path.join(self.directory, profile_id + suffix)
+        return path if os.path.isfile(path) else None
+
+    # =====================
+    # Internal
+    # =====================
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                active = list(self._active.values())
+                if not active:
+                    self._sampler = None
+                    return
+
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            stacks: Dict[int, Tuple[str, ...]] = {}
+            for profile in active:
+                for thread_id in list(profile.threads):
+                    if thread_id == own or thread_id not in frames:
+                        continue
+                    if thread_id not in stacks:
+                        stacks[thread_id] = _stack(frames[thread_id])
+                    profile.add_sample(thread_id, stacks[thread_id], now)
+            del frames
+            time.sleep(self.interval)
+
+    def _save(self, profile: RequestProfile) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile.id)
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(profile.summary(), f, ensure_ascii=False, indent=2)
+        with open(base + ".speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(profile.speedscope(), f)
+        with open(base + ".collapsed.txt", "w", encoding="utf-8") as f:
+            f.write(profile.collapsed())
+        logger.info(f"Saved profile {profile.id} ({profile.method} {profile.path})")
+        self._prune()
+
+    def _prune(self) -> None:
+        summaries = sorted(
+            name for name in os.listdir(self.directory)
+            if name.endswith(".json") and not name.endswith(".speedscope.json")
+        )
+        for name in summaries[:max(0, len(summaries) - self.max_files)]:
+            profile_id = name[:-len(".json")]
+            for suffix in (".json", ".speedscope.json", ".collapsed.txt"):
+                path = os.path.join(self.directory, profile_id + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def _stack(frame: Any) -> Tuple[str, ...]:
+    """root → leaf 순서의 frame 이름"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+@functools.lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    for marker in ("site-packages" + os.sep, "backend" + os.sep):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def wrap_endpoint(endpoint: Callable) -> Callable:
+    """endpoint 실행 구간 기록 + 실행 스레드를 샘플링 대상에 등록 (sync는 threadpool 스레드)"""
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            with span("endpoint", endpoint.__name__):
+                result = await endpoint(*args, **kwargs)
+            profile = current_profile.get()
+            if profile is not None:
+                profile.endpoint_finished = time.perf_counter()
+            return result
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        with span("endpoint", endpoint.__name__):
+            result = endpoint(*args, **kwargs)
+        profile = current_profile.get()
+        if profile is not None:
+            profile.endpoint_finished = time.perf_counter()
+        return result
+    return sync_wrapper
+
+
+def install_profiling(app: Any) -> None:
+    """endpoint 래핑 + SQLAlchemy span 이벤트 설치 (PROFILING_ENABLED일 때 main.py에서 호출)"""
+    from fastapi.routing import APIRoute
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    for route in app.routes:
+        # 요청 핸들러는 dependant.call을 실행 시점에 참조하므로 교체로 충분
+        if isinstance(route, APIRoute):
+            route.dependant.call = wrap_endpoint(route.dependant.call)
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        started_stack = conn.info.get("profile_started")
+        if profile is None or not started_stack:
+            return
+        profile.register_thread()
+        profile.add_span("db", statement.split(None, 1)[0].upper() if statement else None,
+                         started_stack.pop(), time.perf_counter())
+
+    @event.listens_for(Engine, "handle_error")
+    def _error(context):
+        connection = context.connection
+        if connection is not None and connection.info.get("profile_started"):
+            connection.info["profile_started"].pop()
+
+
+# Singleton instance
+profiler = Profiler(
+    directory=settings.PROFILING_DIR,
+    interval_ms=settings.PROFILING_INTERVAL_MS,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    token=settings.PROFILING_TOKEN,
+    max_files=settings.PROFILING_MAX_FILES
+)
@@ -0,0 +1,447 @@
+"""
+Development Session Store - 서버 측 대화 세션 및 재개 가능한 스트림
+
+세션(CoordinatorState.session_id)별로 대화 히스토리를 서버에 보관하므로
+클라이언트는 매 턴 새 메시지만 전송합니다.
+
+응답 생성은 HTTP 연결과 분리된 producer 스레드에서 실행되고, 생성된 청크는
+sequence ID와 함께 세션 버퍼에 쌓입니다. SSE 연결이 끊겨도 생성은 계속되며,
+`Last-Event-ID`로 재연결하면 버퍼에서 이어서 전송합니다 (추가 토큰 비용 없음).
+
+- 앞단: 프로세스 내 LRU (활성 스트림은 evict하지 않음)
+- 뒷단: development_sessions 테이블 (히스토리 + 마지막 턴 청크)
+  - 캐시된 세션도 매 조회마다 DB의 turn과 비교 - 다른 워커가 저장한 턴이 있으면 다시 로드
+  - 턴 시작은 DB의 turn이 그대로일 때만 저장 (오래된 사본이 다른 워커의 턴을 덮어쓰지 않음)
+  - 진행 중인 턴의 청크는 생성 중인 워커의 메모리에만 있으므로, 다른 워커에서는
+    완료될 때까지 기다렸다가 저장된 청크를 전송합니다.
+  - 생성 중인 워커는 주기적으로 heartbeat를 기록 - heartbeat가 끊긴 턴만 중단된 것으로 처리
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.schema.config import settings
+from app.db.initialization.session import SessionLocal
+from app.db.schema import DevelopmentSession
+from app.db.queries import (
+    get_development_session,
+    save_development_session,
+    touch_development_session,
+    delete_development_session,
+)
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 대기 중 keep-alive 주기 (초)
+KEEPALIVE_SECONDS = 15.0
+
+# 다른 워커가 생성 중인 턴을 기다릴 때 DB 조회 주기 (초)
+REMOTE_POLL_SECONDS = 1.0
+
+
+class SessionBusyError(Exception):
+    """이전 턴의 응답이 아직 생성 중인 경우"""
+
+
+class ChatSession:
+    """메모리에 올라온 세션 (히스토리 + 현재 턴 청크 버퍼)"""
+
+    def __init__(
+        self,
+        session_id: str,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        turn: int = 0,
+        chunks: Optional[List[str]] = None,
+        complete: bool = True,
+        error: Optional[str] = None,
+        remote: bool = False,
+    ):
+        self.session_id = session_id
+        self.messages: List[Dict[str, Any]] = list(messages or [])
+        self.turn = turn
+        self.chunks: List[str] = list(chunks or [])
+        self.complete = complete
+        self.error = error
+        # 다른 워커가 생성 중인 턴 (청크는 그 워커 메모리에만 있음 - 캐시하지 않음)
+        self.remote = remote
+        self.condition = threading.Condition()
+
+    @property
+    def streaming(self) -> bool:
+        return not self.complete
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.condition:
+            return {
+                "session_id": self.session_id,
+                "turn": self.turn,
+                "streaming": self.streaming,
+                "messages": list(self.messages),
+            }
+
+
+def parse_event_id(event_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    """SSE event ID "{turn}-{seq}" → (turn, seq)"""
+    if not event_id:
+        return None
+    try:
+        turn, seq = event_id.strip().split("-", 1)
+        return int(turn), int(seq)
+    except ValueError:
+        return None
+
+
+class DevelopmentSessionStore:
+    """In-memory LRU + DB 세션 저장소"""
+
+    def __init__(self, session_factory: Callable[[], Session], capacity: int = 512):
+        # producer 스레드는 요청이 끝난 뒤에도 저장해야 하므로 자체 세션 사용
+        self.session_factory = session_factory
+        self.capacity = capacity
+        # 이 프로세스의 producer ID (DB의 producer_id와 비교)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, session_id: str) -> Optional[ChatSession]:
+        """
+        세션 조회 - 캐시된 세션도 DB의 turn이 더 크면 다시 로드
+
+        이 프로세스에서 생성 중인 세션은 메모리가 최신이므로 DB를 읽지 않습니다.
+        """
+        with self._lock:
+            cached = self._sessions.get(session_id)
+            if cached is not None:
+                self._sessions.move_to_end(session_id)
+        if cached is not None and cached.streaming:
+            return cached
+
+        row = get_development_session(db, session_id)
+        if row is None:
+            if cached is not None and cached.turn == 0:
+                # 생성 직후 (첫 턴 시작 시 저장됨)
+                return cached
+            if cached is not None:
+                # 다른 워커에서 삭제됨
+                self._forget(cached)
+            return None
+
+        if cached is not None and cached.turn >= row.turn:
+            return cached
+
+        session = self._load(row)
+        if session.remote:
+            return session
+        return self._remember(session, replace=cached)
+
+    def create(self, session_id: Optional[str] = None, messages: Optional[List[Dict[str, Any]]] = None) -> ChatSession:
+        """새 세션 (첫 턴 시작 시 DB에 저장됨)"""
+        session = ChatSession(session_id=session_id or uuid.uuid4().hex, messages=messages)
+        return self._remember(session)
+
+    def delete(self, db: Session, session_id: str) -> bool:
+        """세션 삭제"""
+        with self._lock:
+            removed = self._sessions.pop(session_id, None) is not None
+        return delete_development_session(db, session_id) or removed
+
+    def start_turn(
+        self,
+        db: Session,
+        session: ChatSession,
+        user_message: str,
+        generate: Callable[[List[Dict[str, Any]]], Iterator[str]],
+    ) -> int:
+        """
+        사용자 메시지를 추가하고 백그라운드에서 응답 생성 시작
+
+        Args:
+            db: Database session
+            session: 대상 세션
+            user_message: 새 사용자 메시지
+            generate: 전체 히스토리를 받아 텍스트 청크를 yield하는 함수 (DB 세션 사용 금지)
+
+        Returns:
+            시작된 턴 번호
+
+        Raises:
+            SessionBusyError: 이전 턴이 아직 생성 중이거나, 다른 워커가 먼저 새 턴을 저장함
+        """
+        with session.condition:
+            if session.streaming:
+                raise SessionBusyError(f"Session {session.session_id} is still streaming turn {session.turn}")
+            previous = (session.chunks, session.error)
+            session.messages.append({"role": "user", "content": user_message})
+            session.turn += 1
+            session.chunks = []
+            session.complete = False
+            session.error = None
+            history = list(session.messages)
+            turn = session.turn
+
+        saved = save_development_session(
+            db,
+            session_id=session.session_id,
+            messages=history,
+            turn=turn,
+            last_chunks=None,
+            stream_complete=False,
+            expected_turn=turn - 1,
+            producer_id=self.worker_id
+        )
+        if saved is None:
+            # 다른 워커가 이 세션에 먼저 턴을 저장함 - 오래된 사본은 버리고 다시 로드하도록
+            with session.condition:
+                session.messages.pop()
+                session.turn -= 1
+                session.chunks, session.error = previous
+                session.complete = True
+                session.condition.notify_all()
+            self._forget(session)
+            raise SessionBusyError(f"Session {session.session_id} was updated by another request - reload and retry")
+
+        producer = threading.Thread(
+            target=self._produce,
+            args=(session, turn, history, generate),
+            name=f"dev-session-{session.session_id[:8]}",
+            daemon=True,
+        )
+        producer.start()
+        return turn
+
+    def iter_events(
+        self,
+        session: ChatSession,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        현재 턴의 청크를 버퍼에서 읽어 전송 (생성 중이면 완료까지 대기)
+
+        Args:
+            session: 대상 세션
+            after: Last-Event-ID (turn, seq) - 같은 턴이면 seq 다음 청크부터 재전송
+
+        Yields:
+            ("chunk", (event_id, text)) | ("keepalive", None) | ("error", message)
+        """
+        if session.remote:
+            yield from self._iter_remote_events(session, after)
+            return
+
+        with session.condition:
+            turn = session.turn
+        seq = after[1] + 1 if after is not None and after[0] == turn else 0
+
+        while True:
+            with session.condition:
+                if seq >= len(session.chunks) and not session.complete and session.turn == turn:
+                    session.condition.wait(timeout=KEEPALIVE_SECONDS)
+                if session.turn != turn:
+                    # 새 턴이 시작됨 - 이 스트림은 더 보낼 것이 없음
+                    return
+                pending = session.chunks[seq:]
+                done = session.complete
+                error = session.error
+
+            if not pending and not done:
+                yield "keepalive", None
+                continue
+
+            for text in pending:
+                yield "chunk", (f"{turn}-{seq}", text)
+                seq += 1
+
+            if done and seq >= len(session.chunks):
+                if error:
+                    yield "error", error
+                return
+
+    def _iter_remote_events(
+        self,
+        session: ChatSession,
+        after: Optional[Tuple[int, int]],
+    ) -> Iterator[Tuple[str, Any]]:
+        """다른 워커가 생성 중인 턴 - 완료될 때까지 DB를 polling한 뒤 저장된 청크 전송"""
+        turn = session.turn
+        seq = after[1] + 1 if after is not None and after[0] == turn else 0
+        waited = 0.0
+
+        while True:
+            db = self.session_factory()
+            try:
+                row = get_development_session(db, session.session_id)
+                state = None if row is None else (row.turn, row.stream_complete, list(row.last_chunks or []), self._producer_alive(row))
+            finally:
+                db.close()
+
+            if state is None or state[0] != turn:
+                # 삭제됐거나 새 턴이 시작됨
+                return
+            _, complete, chunks, alive = state
+            if complete:
+                for index, text in enumerate(chunks[seq:], start=seq):
+                    yield "chunk", (f"{turn}-{index}", text)
+                return
+            if not alive:
+                yield "error", "Stream was interrupted"
+                return
+
+            time.sleep(REMOTE_POLL_SECONDS)
+            waited += REMOTE_POLL_SECONDS
+            if waited >= KEEPALIVE_SECONDS:
+                waited = 0.0
+                yield "keepalive", None
+
+    def _produce(
+        self,
+        session: ChatSession,
+        turn: int,
+        history: List[Dict[str, Any]],
+        generate: Callable[[List[Dict[str, Any]]], Iterator[str]],
+    ) -> None:
+        error: Optional[str] = None
+        stop_heartbeat = threading.Event()
+        threading.Thread(
+            target=self._heartbeat,
+            args=(session.session_id, turn, stop_heartbeat),
+            name=f"dev-session-heartbeat-{session.session_id[:8]}",
+            daemon=True,
+        ).start()
+        try:
+            for text in generate(history):
+                with session.condition:
+                    session.chunks.append(text)
+                    session.condition.notify_all()
+        except Exception as e:
+            logger.error(f"Development session {session.session_id} turn {turn} 에러: {e}", exc_info=True)
+            error = str(e)
+        finally:
+            stop_heartbeat.set()
+
+        with session.condition:
+            if error:
+                # 실패한 턴의 사용자 메시지는 히스토리에서 제거 (재전송 가능)
+                if session.messages and session.messages[-1].get("role") == "user":
+                    session.messages.pop()
+            else:
+                session.messages.append({"role": "assistant", "content": "".join(session.chunks)})
+            session.complete = True
+            session.error = error
+            session.condition.notify_all()
+            messages = list(session.messages)
+            chunks = list(session.chunks)
+
+        db = self.session_factory()
+        try:
+            saved = save_development_session(
+                db,
+                session_id=session.session_id,
+                messages=messages,
+                turn=turn,
+                last_chunks=chunks,
+                stream_complete=True,
+                expected_turn=turn,
+                producer_id=self.worker_id
+            )
+            if saved is None:
+                logger.warning(f"Development session {session.session_id} turn {turn}: 다른 워커가 세션을 변경하여 저장하지 않음")
+        except Exception as e:
+            logger.error(f"Development session {session.session_id} 저장 실패: {e}")
+        finally:
+            db.close()
+
+        self._evict()
+
+    def _heartbeat(self, session_id: str, turn: int, stop: threading.Event) -> None:
+        """생성이 끝날 때까지 heartbeat_at 갱신 (다른 워커가 이 턴을 중단된 것으로 보지 않도록)"""
+        while not stop.wait(settings.DEVELOPMENT_SESSION_HEARTBEAT_SECONDS):
+            db = self.session_factory()
+            try:
+                if not touch_development_session(db, session_id, turn, self.worker_id):
+                    # 세션이 삭제됐거나 다른 워커가 새 턴을 시작함
+                    return
+            except Exception as e:
+                logger.warning(f"Development session {session_id} heartbeat 실패: {e}")
+            finally:
+                db.close()
+
+    def _load(self, row: DevelopmentSession) -> ChatSession:
+        """DB 행 → ChatSession"""
+        messages = list(row.messages or [])
+        if not row.stream_complete:
+            if self._producer_alive(row):
+                return ChatSession(
+                    session_id=row.session_id,
+                    messages=messages,
+                    turn=row.turn,
+                    complete=False,
+                    remote=True,
+                )
+            # producer의 heartbeat가 끊김 - 실패한 턴으로 처리
+            if messages and messages[-1].get("role") == "user":
+                messages.pop()
+
+        return ChatSession(
+            session_id=row.session_id,
+            messages=messages,
+            turn=row.turn,
+            chunks=row.last_chunks,
+            complete=True,
+            error=None if row.stream_complete else "Stream was interrupted",
+        )
+
+    def _producer_alive(self, row: DevelopmentSession) -> bool:
+        """다른 워커가 아직 이 턴을 생성 중인지 (heartbeat가 DEVELOPMENT_SESSION_STALE_SECONDS 이내)"""
+        if row.stream_complete or row.heartbeat_at is None or row.producer_id == self.worker_id:
+            # 이 프로세스의 producer는 캐시에 streaming 세션으로 있으므로 여기까지 왔다면 종료된 것
+            return False
+        heartbeat = row.heartbeat_at
+        if heartbeat.tzinfo is None:
+            # SQLite는 timezone 없이 저장 (UTC로 기록함)
+            heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - heartbeat).total_seconds() < settings.DEVELOPMENT_SESSION_STALE_SECONDS
+
+    def _remember(self, session: ChatSession, replace: Optional[ChatSession] = None) -> ChatSession:
+        with self._lock:
+            existing = self._sessions.get(session.session_id)
+            if existing is not None and existing is not replace:
+                # 동시에 DB에서 로드된 경우 먼저 올라온 객체 사용
+                self._sessions.move_to_end(session.session_id)
+                return existing
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+        self._evict()
+        return session
+
+    def _forget(self, session: ChatSession) -> None:
+        """캐시에서 제거 (다른 객체로 이미 교체됐으면 그대로 둠)"""
+        with self._lock:
+            if self._sessions.get(session.session_id) is session:
+                del self._sessions[session.session_id]
+
+    def _evict(self) -> None:
+        with self._lock:
+            overflow = len(self._sessions) - self.capacity
+            if overflow <= 0:
+                return
+            for session_id in list(self._sessions):
+                if overflow <= 0:
+                    break
+                if self._sessions[session_id].streaming:
+                    continue
+                del self._sessions[session_id]
+                overflow -= 1
+
+
+# Singleton instance
+development_session_store = DevelopmentSessionStore(
+    session_factory=SessionLocal,
+    capacity=settings.DEVELOPMENT_SESSION_CACHE_SIZE
+)
@@ -0,0 +1,179 @@
+"""
+Structured Output - Pydantic 모델 기반 Tool Use 출력
+
+LLM이 자유 텍스트 JSON을 반환하고 문자열을 복구하는 대신,
+Pydantic 모델에서 파생된 tool 스키마로 출력을 강제하고
+tool 입력을 해당 모델로 바로 검증합니다.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from app.schema.states import Formulation, FormulationItem, IngredientProfile
+from app.services.incremental_json import IncrementalJSONParser
+import copy
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# LLM이 채울 필요가 없는 (서버에서 계산하는) 필드
+_SERVER_FIELDS = ("validation_status", "validation_messages", "total_percentage")
+
+
+class StructuredOutputError(Exception):
+    """Tool 출력이 없거나 스키마 검증에 실패한 경우"""
+
+
+def _inline_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """$defs/$ref를 펼쳐 단일 JSON schema로 변환"""
+    defs = schema.get("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref and ref.startswith("#/$defs/"):
+                return resolve(copy.deepcopy(defs[ref.split("/")[-1]]))
+            return {key: resolve(value) for key, value in node.items() if key != "$defs"}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+
+def pydantic_tool(
+    name: str,
+    description: str,
+    model: Type[BaseModel],
+    exclude: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Pydantic 모델로부터 Anthropic tool 정의 생성
+
+    Args:
+        name: Tool 이름
+        description: Tool 설명
+        model: 입력 스키마로 사용할 Pydantic 모델
+        exclude: 스키마에서 제외할 최상위 필드
+
+    Returns:
+        {"name": ..., "description": ..., "input_schema": {...}}
+    """
+    schema = _inline_refs(model.model_json_schema())
+    for field in exclude:
+        schema.get("properties", {}).pop(field, None)
+        if field in schema.get("required", []):
+            schema["required"].remove(field)
+
+    return {
+        "name": name,
+        "description": description,
+        "input_schema": schema,
+    }
+
+
+def tool_choice(tool: Dict[str, Any]) -> Dict[str, str]:
+    """해당 tool 호출을 강제하는 tool_choice"""
+    return {"type": "tool", "name": tool["name"]}
+
+
+def parse_tool_response(response: Any, tool: Dict[str, Any], model: Type[ModelT]) -> ModelT:
+    """
+    Messages API 응답에서 tool_use 입력을 찾아 모델로 검증
+
+    Raises:
+        StructuredOutputError: tool_use 블록이 없거나 검증 실패
+    """
+    for block in response.content:
+        if getattr(block, "type", None) == "tool_use" and block.name == tool["name"]:
+            return validate_tool_input(block.input, model)
+
+    raise StructuredOutputError(
+        f"LLM response did not call '{tool['name']}' (stop_reason={getattr(response, 'stop_reason', None)})"
+    )
+
+
+def validate_tool_input(tool_input: Dict[str, Any], model: Type[ModelT]) -> ModelT:
+    """Tool 입력 dict를 모델로 검증"""
+    try:
+        return model.model_validate(tool_input)
+    except ValidationError as e:
+        raise StructuredOutputError(f"LLM output failed {model.__name__} validation: {e}") from e
+
+
+def formulation_item_to_dict(item: FormulationItem) -> Dict[str, Any]:
+    """FormulationItem → 기존 응답의 ingredient 항목 형식"""
+    return {
+        "name": item.ingredient.ingredient_name,
+        "percentage": item.percentage,
+        "note": item.note,
+        "role": item.role,
+        "cas_number": item.ingredient.cas_number or "",
+    }
+
+
+def formulation_to_dict(formulation: Formulation) -> Dict[str, Any]:
+    """
+    Formulation을 기존 generate API 응답 형식으로 변환
+
+    Returns:
+        {"name", "type", "description", "ingredients": [{"name", "percentage", "note", "role", "cas_number"}], ...}
+    """
+    ingredients = [formulation_item_to_dict(item) for item in formulation.items]
+
+    return {
+        "name": formulation.name,
+        "type": formulation.type,
+        "description": formulation.description,
+        "ingredients": ingredients,
+        "total_percentage": round(sum(item.percentage for item in formulation.items), 4),
+        "longevity": formulation.longevity,
+        "sillage": formulation.sillage,
+        "stability_notes": formulation.stability_notes,
+        "recommendation": formulation.recommendation,
+    }
+
+
+def iter_formulation_events(stream: Any) -> Iterator[Dict[str, Any]]:
+    """
+    FORMULATION_TOOL 스트리밍 응답을 점진적 이벤트로 변환
+
+    Args:
+        stream: `client.messages.stream(...)`로 연 MessageStream
+
+    Yields:
+        {"type": "field", "name": "description", "value": "..."}
+        {"type": "ingredient", "index": 0, "ingredient": {...}}
+        {"type": "complete", "data": {...}}  # 전체 검증을 통과한 최종 결과
+    """
+    parser = IncrementalJSONParser(max_depth=2)
+
+    for event in stream:
+        if event.type != "content_block_delta" or event.delta.type != "input_json_delta":
+            continue
+
+        for path, value in parser.feed(event.delta.partial_json):
+            if len(path) == 2 and path[0] == "items":
+                try:
+                    item = FormulationItem.model_validate(value)
+                except ValidationError:
+                    # 최종 결과 검증에서 다시 처리
+                    continue
+                yield {"type": "ingredient", "index": path[1], "ingredient": formulation_item_to_dict(item)}
+            elif len(path) == 1 and path[0] != "items":
+                yield {"type": "field", "name": path[0], "value": value}
+
+    formulation = parse_tool_response(stream.get_final_message(), FORMULATION_TOOL, Formulation)
+    yield {"type": "complete", "data": formulation_to_dict(formulation)}
+
+
+FORMULATION_TOOL = pydantic_tool(
+    name="record_formulation",
+    description="Record the generated fragrance composition (accord or formula).",
+    model=Formulation,
+    exclude=_SERVER_FIELDS,
+)
+
+INGREDIENT_PROFILE_TOOL = pydantic_tool(
+    name="record_ingredient_profile",
+    description="Record technical information about a fragrance ingredient.",
+    model=IngredientProfile,
+)
@@ -0,0 +1,50 @@
+"""
+Job Worker - 별도 프로세스로 백그라운드 작업 실행
+
+사용법:
+    python -m app.worker --workers 4
+
+API 프로세스의 내장 워커(JOB_WORKERS)와 함께, 또는 JOB_WORKERS=0으로 두고
+워커 프로세스만 여러 개 띄워 확장할 수 있습니다.
+"""
+
+from app.schema.config import settings
+from app.services.job_queue import JobWorkerPool, registered_job_types
+from app.db.initialization.session import SessionLocal
+import app.services.job_handlers  # noqa: F401 - 작업 핸들러 등록
+import argparse
+import logging
+import signal
+import threading
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fragrance background job worker")
+    parser.add_argument("--workers", type=int, default=max(settings.JOB_WORKERS, 1))
+    args = parser.parse_args()
+
+    pool = JobWorkerPool(
+        session_factory=SessionLocal,
+        workers=args.workers,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+        lock_timeout=settings.JOB_LOCK_TIMEOUT_SECONDS,
+        heartbeat_interval=settings.JOB_HEARTBEAT_SECONDS
+    )
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+
+    logger.info(f"Job types: {', '.join(registered_job_types())}")
+    pool.start()
+    stopped.wait()
+    logger.info("Stopping job workers...")
+    pool.stop()
+
+
+if __name__ == "__main__":
+    main()
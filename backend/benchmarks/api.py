@@ -0,0 +1,496 @@
+"""
+API benchmark - 모든 라우트의 p50/p95/p99 지연 시간과 처리량 측정
+
+1. 합성 카탈로그 seed (`benchmarks/seed.py`, 기본 SQLite)
+2. fake Anthropic (`benchmarks/fake_anthropic.py`)과 API 서버 (`benchmarks/serve.py`, fake Chroma)를 별도 프로세스로 실행
+3. 라우트별로 --requests 개 요청을 --concurrency 개 스레드로 전송 (LLM 라우트는 --llm-requests 개)
+4. 결과를 JSON으로 저장하고, 기준선(baseline)과 비교하여 p95가 --max-regression 이상 느려지면 exit code 1
+
+사용법 (backend/ 에서):
+    python -m benchmarks.api --ingredients 10000 --save-baseline main
+    python -m benchmarks.api --ingredients 10000 --baseline main
+    python -m benchmarks.api --routes accords,search --requests 500 --concurrency 16
+    python -m benchmarks.api --base-url http://127.0.0.1:8000 --skip-seed   # 이미 실행 중인 서버
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote
+import argparse
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+from benchmarks.seed import DEFAULT_DATABASE_URL, GENERATION_TYPES, NOTE_FAMILIES, ingredient_name, seed
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+BASELINES_DIR = os.path.join(BACKEND_DIR, "benchmarks", "baselines")
+
+# 이 값보다 작은 p95 차이는 측정 오차로 보고 회귀로 판단하지 않음 (ms)
+REGRESSION_FLOOR_MS = 2.0
+
+# bulk PATCH 요청당 ID 수
+BULK_SIZE = 100
+
+CHAT_MESSAGES = [{"role": "user", "content": "I want a fresh citrus cologne with a woody dry-down."}]
+
+
+class Context:
+    """시나리오가 공유하는 실행 정보"""
+
+    def __init__(self, client: Any, ingredients: int, formulas: int, accords: int):
+        self.client = client
+        self.ingredients = ingredients
+        self.formulas = formulas
+        self.accords = accords
+        self.run_id = uuid.uuid4().hex[:8]
+        self.session_id: Optional[str] = None
+        self.job_id: Optional[int] = None
+        self._etags: Dict[str, str] = {}
+
+    def unique(self, prefix: str, i: int) -> str:
+        return f"{prefix} {self.run_id}-{i}"
+
+    def composition(self, i: int) -> List[Dict[str, Any]]:
+        size = 8
+        return [
+            {"name": ingredient_name(1 + (i * 7 + k * 13) % self.ingredients), "percentage": 100 / size, "note": "Middle"}
+            for k in range(size)
+        ]
+
+    def etag(self, path: str) -> str:
+        """경로의 현재 ETag (목록은 첫 조회 값을 재사용)"""
+        if path not in self._etags:
+            response = self.client.get(path)
+            response.raise_for_status()
+            self._etags[path] = response.headers["etag"]
+        return self._etags[path]
+
+    def chat(self) -> str:
+        """Development 대화 1턴 (스트림을 끝까지 읽음) → session_id"""
+        with self.client.stream("POST", "/api/development/chat", json={"messages": CHAT_MESSAGES}) as response:
+            response.raise_for_status()
+            for _ in response.iter_bytes():
+                pass
+            return response.headers["x-session-id"]
+
+
+class Scenario:
+    """
+    라우트 하나의 요청 생성 방법
+
+    Args:
+        method / route: 메서드와 라우트 템플릿 (결과의 키)
+        path: (ctx, i, setup 결과) → 실제 경로
+        body: (ctx, i) → JSON body
+        setup: (ctx, i) → 측정 전에 준비할 값 (예: 삭제할 항목 생성) - 시간에 포함되지 않음
+        headers: (ctx, i, setup 결과) → 요청 헤더
+        label: 같은 라우트의 변형 구분 (예: "If-None-Match")
+        stream: 응답을 스트림으로 읽고 첫 바이트 시간(ttfb)도 기록
+        llm: LLM 호출 라우트 (--llm-requests 개만 전송)
+    """
+
+    def __init__(
+        self,
+        method: str,
+        route: str,
+        path: Optional[Callable[[Context, int, Any], str]] = None,
+        body: Optional[Callable[[Context, int], Any]] = None,
+        setup: Optional[Callable[[Context, int], Any]] = None,
+        headers: Optional[Callable[[Context, int, Any], Dict[str, str]]] = None,
+        label: str = "",
+        stream: bool = False,
+        llm: bool = False,
+    ):
+        self.method = method
+        self.route = route
+        self.path = path or (lambda ctx, i, prepared: route)
+        self.body = body
+        self.setup = setup
+        self.headers = headers
+        self.label = label
+        self.stream = stream
+        self.llm = llm
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}" + (f" [{self.label}]" if self.label else "")
+
+
+def _create(method: str, path: str, body: Callable[[Context, int], Any], id_key: str) -> Callable[[Context, int], int]:
+    def setup(ctx: Context, i: int) -> int:
+        response = ctx.client.request(method, path, json=body(ctx, -i - 1))
+        response.raise_for_status()
+        return response.json()[id_key]
+    return setup
+
+
+def _ingredient_body(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "ingredient_name": ctx.unique("Bench Ingredient", i),
+        "inci_name": "Bench INCI",
+        "odor_description": "bright green citrus",
+        "note_family": "Citrus",
+    }
+
+
+def _accord_body(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "name": ctx.unique("Bench Accord", i),
+        "accord_type": GENERATION_TYPES[i % len(GENERATION_TYPES)],
+        "description": "benchmark accord",
+        "ingredients": ctx.composition(i),
+    }
+
+
+def _formula_body(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "name": ctx.unique("Bench Formula", i),
+        "formula_type": f"{GENERATION_TYPES[i % len(GENERATION_TYPES)]} Type",
+        "description": "benchmark formula",
+        "ingredients": ctx.composition(i),
+    }
+
+
+def scenarios() -> List[Scenario]:
+    """routes/의 모든 엔드포인트 (admin 제외 - PROFILING_ENABLED일 때만 존재)"""
+
+    def by_id(count: Callable[[Context], int], template: str) -> Callable[[Context, int, Any], str]:
+        return lambda ctx, i, prepared: template.format(id=1 + (i * 7919) % count(ctx))
+
+    def prepared_id(template: str) -> Callable[[Context, int, Any], str]:
+        return lambda ctx, i, prepared: template.format(id=prepared)
+
+    def revalidate(path: Callable[[Context, int, Any], str]) -> Dict[str, Any]:
+        """이전 응답의 ETag로 조건부 GET (304 기대)"""
+        return {
+            "path": path,
+            "setup": lambda ctx, i: ctx.etag(path(ctx, i, None)),
+            "headers": lambda ctx, i, etag: {"If-None-Match": etag},
+            "label": "If-None-Match",
+        }
+
+    def bulk_ids(count: Callable[[Context], int]) -> Callable[[Context, int], List[int]]:
+        """요청마다 다른 연속 구간의 ID BULK_SIZE개"""
+        return lambda ctx, i: [1 + (i * BULK_SIZE + k) % count(ctx) for k in range(BULK_SIZE)]
+
+    ingredients = lambda ctx: ctx.ingredients  # noqa: E731
+    accords = lambda ctx: ctx.accords  # noqa: E731
+    formulas = lambda ctx: ctx.formulas  # noqa: E731
+
+    result = [
+        # Ingredients
+        Scenario("GET", "/api/ingredients"),
+        Scenario("GET", "/api/ingredients", **revalidate(lambda ctx, i, p: "/api/ingredients")),
+        Scenario("GET", "/api/ingredients/filter",
+                 path=lambda ctx, i, p: f"/api/ingredients/filter?note_family={NOTE_FAMILIES[i % len(NOTE_FAMILIES)]}"
+                                        "&volatility=low&application=soap&limit=50"),
+        Scenario("GET", "/api/ingredients/search/name",
+                 path=lambda ctx, i, p: f"/api/ingredients/search/name?query={ingredient_name(1 + i % ctx.ingredients).split()[0]}"),
+        Scenario("GET", "/api/ingredients/search/semantic",
+                 path=lambda ctx, i, p: "/api/ingredients/search/semantic?query=warm%20amber%20musk&limit=10"),
+        Scenario("POST", "/api/ingredients/search/semantic/batch", body=lambda ctx, i: {"queries": [
+            {"query": note, "n_results": 5} for note in ("bright bergamot", "green fig leaf", "creamy sandalwood",
+                                                         "warm amber musk", "powdery iris", "smoky vetiver")
+        ]}),
+        Scenario("POST", "/api/ingredients", body=_ingredient_body),
+        Scenario("PUT", "/api/ingredients/{id}", path=by_id(ingredients, "/api/ingredients/{id}"),
+                 body=lambda ctx, i: {"odor_description": f"updated {ctx.run_id} {i}"}),
+        Scenario("PATCH", "/api/ingredients/bulk", body=lambda ctx, i: {
+            "ids": bulk_ids(ingredients)(ctx, i), "values": {"stability": f"bulk {ctx.run_id} {i}"}
+        }),
+        Scenario("DELETE", "/api/ingredients/{id}", path=prepared_id("/api/ingredients/{id}"),
+                 setup=_create("POST", "/api/ingredients", _ingredient_body, "id")),
+        Scenario("POST", "/api/ingredients/auto-fill", llm=True,
+                 body=lambda ctx, i: {"name": ingredient_name(1 + i % ctx.ingredients)}),
+        Scenario("POST", "/api/ingredients/index/vector"),
+    ]
+
+    for kind, count, body in (("accords", accords, _accord_body), ("formulas", formulas, _formula_body)):
+        singular = kind[:-1]
+        generation_key = "accord_type" if kind == "accords" else "formula_type"
+        result += [
+            Scenario("GET", f"/api/{kind}"),
+            Scenario("GET", f"/api/{kind}", **revalidate(lambda ctx, i, p, kind=kind: f"/api/{kind}")),
+            Scenario("GET", f"/api/{kind}/{{id}}", path=by_id(count, f"/api/{kind}/{{id}}")),
+            Scenario("GET", f"/api/{kind}/{{id}}", **revalidate(by_id(count, f"/api/{kind}/{{id}}"))),
+            Scenario("GET", f"/api/{kind}/{{id}}/similar", path=by_id(count, f"/api/{kind}/{{id}}/similar")),
+            # 원료 포함 검색 (accords는 base note 컬럼)
+            Scenario("GET", f"/api/{kind}/search", path=lambda ctx, i, p, kind=kind: (
+                f"/api/{kind}/search?ingredient={quote(ingredient_name(1 + i % ctx.ingredients))}"
+                + ("&note=base" if kind == "accords" else "")
+            )),
+            Scenario("POST", f"/api/{kind}/save", body=body),
+            Scenario("PUT", f"/api/{kind}/{{id}}", path=by_id(count, f"/api/{kind}/{{id}}"),
+                     body=lambda ctx, i: {"description": f"updated {ctx.run_id} {i}"}),
+            Scenario("PATCH", f"/api/{kind}/bulk", body=lambda ctx, i, count=count: {
+                "ids": bulk_ids(count)(ctx, i), "values": {"description": f"bulk {ctx.run_id} {i}"}
+            }),
+            Scenario("DELETE", f"/api/{kind}/{{id}}", path=prepared_id(f"/api/{kind}/{{id}}"),
+                     setup=_create("POST", f"/api/{kind}/save", body, f"{singular}_id")),
+            Scenario("POST", f"/api/{kind}/generate", llm=True,
+                     body=lambda ctx, i, key=generation_key: {key: GENERATION_TYPES[i % len(GENERATION_TYPES)]}),
+            Scenario("POST", f"/api/{kind}/generate/stream", llm=True, stream=True,
+                     body=lambda ctx, i, key=generation_key: {key: GENERATION_TYPES[i % len(GENERATION_TYPES)]}),
+        ]
+
+    result += [
+        # Development
+        Scenario("POST", "/api/development/chat", llm=True, stream=True, body=lambda ctx, i: {"messages": CHAT_MESSAGES}),
+        Scenario("GET", "/api/development/sessions/{session_id}",
+                 path=lambda ctx, i, p: f"/api/development/sessions/{ctx.session_id}"),
+        Scenario("DELETE", "/api/development/sessions/{session_id}", llm=True,
+                 path=lambda ctx, i, prepared: f"/api/development/sessions/{prepared}",
+                 setup=lambda ctx, i: ctx.chat()),
+        Scenario("POST", "/api/development/workflow", llm=True, body=lambda ctx, i: {"messages": CHAT_MESSAGES}),
+        # Jobs
+        Scenario("GET", "/api/jobs/types"),
+        Scenario("GET", "/api/jobs", path=lambda ctx, i, p: "/api/jobs?limit=50"),
+        Scenario("GET", "/api/jobs/{id}", path=lambda ctx, i, p: f"/api/jobs/{ctx.job_id}"),
+        Scenario("POST", "/api/jobs", body=lambda ctx, i: {
+            "job_type": "reprice_formulas",
+            "payload": {"prices": {ingredient_name(1): 0.1}, "formula_ids": [1 + i % ctx.formulas]},
+        }),
+    ]
+    return result
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """nearest-rank 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 2)
+
+
+def run_scenario(ctx: Context, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    def one(i: int) -> Dict[str, Any]:
+        prepared = scenario.setup(ctx, i) if scenario.setup else None
+        path = scenario.path(ctx, i, prepared)
+        body = scenario.body(ctx, i) if scenario.body else None
+        headers = scenario.headers(ctx, i, prepared) if scenario.headers else None
+        started = time.perf_counter()
+        ttfb = None
+        if scenario.stream:
+            with ctx.client.stream(scenario.method, path, json=body, headers=headers) as response:
+                for _ in response.iter_bytes():
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - started
+        else:
+            response = ctx.client.request(scenario.method, path, json=body, headers=headers)
+        return {"status": response.status_code, "seconds": time.perf_counter() - started, "ttfb": ttfb}
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    ok = [s for s in samples if 200 <= s["status"] < 300 or s["status"] == 304]
+    latencies = [s["seconds"] for s in ok]
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[str(sample["status"])] = statuses.get(str(sample["status"]), 0) + 1
+
+    summary = {
+        "requests": requests,
+        "errors": requests - len(ok),
+        "statuses": statuses,
+        "throughput_rps": round(len(ok) / wall, 2) if wall else None,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "max_ms": _ms(max(latencies) if latencies else None),
+    }
+    if scenario.stream:
+        ttfbs = [s["ttfb"] for s in ok if s["ttfb"] is not None]
+        summary["ttfb_p50_ms"] = _ms(percentile(ttfbs, 50))
+        summary["ttfb_p95_ms"] = _ms(percentile(ttfbs, 95))
+    return summary
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """p95가 기준선보다 max_regression 비율 이상 느려진 라우트"""
+    regressions = []
+    for name, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous or previous.get("p95_ms") is None or current.get("p95_ms") is None:
+            continue
+        before, after = previous["p95_ms"], current["p95_ms"]
+        if after > before * (1 + max_regression) and after - before > REGRESSION_FLOOR_MS:
+            regressions.append(f"{name}: p95 {before}ms → {after}ms (+{(after / before - 1) * 100:.0f}%)")
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: errors {previous.get('errors', 0)} → {current['errors']}")
+    return regressions
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(client: Any, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if client.get("/health").status_code == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API server did not become ready")
+
+
+def _prepare(ctx: Context) -> None:
+    """벡터 색인 (semantic search용), 세션, 조회용 job 준비"""
+    response = ctx.client.post("/api/ingredients/index/vector")
+    response.raise_for_status()
+    ctx.job_id = response.json()["job_id"]
+    deadline = time.monotonic() + 600
+    while time.monotonic() < deadline:
+        status = ctx.client.get(f"/api/jobs/{ctx.job_id}").json()["status"]
+        if status in ("succeeded", "failed"):
+            if status == "failed":
+                print("WARNING: reindex job failed - semantic search results will be empty", file=sys.stderr)
+            break
+        time.sleep(0.5)
+    ctx.session_id = ctx.chat()
+
+
+def _print_table(results: Dict[str, Any]) -> None:
+    print(f"{'route':<52} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>8} {'err':>5}")
+    for name, row in results["routes"].items():
+        cells = [row.get(key) for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")]
+        print(f"{name:<52} " + " ".join(f"{'-' if v is None else v:>9}" for v in cells[:3]) + f" {cells[3] or '-':>8} {row['errors']:>5}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every API route against local fakes")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL") or DEFAULT_DATABASE_URL)
+    parser.add_argument("--ingredients", type=int, default=1000)
+    parser.add_argument("--formulas", type=int, default=1000)
+    parser.add_argument("--accords", type=int, default=1000)
+    parser.add_argument("--skip-seed", action="store_true", help="기존 seed 데이터 사용 (개수 인자는 seed 때와 같아야 함)")
+    parser.add_argument("--requests", type=int, default=200, help="라우트별 요청 수")
+    parser.add_argument("--llm-requests", type=int, default=20, help="LLM 라우트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", default="", help="콤마로 구분한 필터 (라우트 이름에 포함된 문자열)")
+    parser.add_argument("--fake-latency", type=float, default=0.3, help="fake Anthropic 첫 토큰 지연 (초)")
+    parser.add_argument("--fake-tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--base-url", default="", help="이미 실행 중인 API 서버 (fake / 서버 실행 생략)")
+    parser.add_argument("--real-chroma", action="store_true")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--save-baseline", default="", help="결과를 benchmarks/baselines/{이름}.json으로 저장")
+    parser.add_argument("--baseline", default="", help="비교할 기준선 이름 또는 경로")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 p95 증가 비율")
+    args = parser.parse_args()
+
+    baseline_path = ""
+    if args.baseline:
+        baseline_path = args.baseline if args.baseline.endswith(".json") else os.path.join(BASELINES_DIR, f"{args.baseline}.json")
+        if not os.path.exists(baseline_path):
+            # 기준선은 머신마다 다르므로 저장소에 포함하지 않음 - 비교할 머신에서 먼저 저장
+            print(f"Baseline not found: {baseline_path} (create it on this machine with --save-baseline)", file=sys.stderr)
+            return 2
+
+    import httpx
+
+    if not args.skip_seed and not args.base_url:
+        print(f"Seeding {args.database_url}: {seed(args.database_url, args.ingredients, args.formulas, args.accords)}")
+
+    processes: List[subprocess.Popen] = []
+    base_url = args.base_url
+    try:
+        if not base_url:
+            fake_port, api_port = _free_port(), _free_port()
+            processes.append(subprocess.Popen([
+                sys.executable, "-m", "benchmarks.fake_anthropic",
+                "--port", str(fake_port),
+                "--latency", str(args.fake_latency),
+                "--tokens-per-second", str(args.fake_tokens_per_second),
+            ], cwd=BACKEND_DIR))
+            env = dict(os.environ)
+            env.update({
+                "DATABASE_URL": args.database_url,
+                "ANTHROPIC_API_KEY": "benchmark",
+                "ANTHROPIC_BASE_URL": f"http://127.0.0.1:{fake_port}",
+                "ENV": "benchmark",
+                "JOB_WORKERS": "1",
+                "JOB_POLL_INTERVAL": "0.2",
+            })
+            command = [sys.executable, "-m", "benchmarks.serve", "--port", str(api_port)]
+            if args.real_chroma:
+                command.append("--real-chroma")
+            processes.append(subprocess.Popen(command, cwd=BACKEND_DIR, env=env))
+            base_url = f"http://127.0.0.1:{api_port}"
+
+        limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+        with httpx.Client(base_url=base_url, timeout=300.0, limits=limits) as client:
+            _wait_ready(client)
+            ctx = Context(client, args.ingredients, args.formulas, args.accords)
+            _prepare(ctx)
+
+            filters = [f.strip() for f in args.routes.split(",") if f.strip()]
+            results: Dict[str, Any] = {
+                "meta": {
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "database": args.database_url.split("://")[0],
+                    "catalogue": {"ingredients": args.ingredients, "formulas": args.formulas, "accords": args.accords},
+                    "concurrency": args.concurrency,
+                    "fake_anthropic": {"latency": args.fake_latency, "tokens_per_second": args.fake_tokens_per_second},
+                    "chroma": "real" if args.real_chroma else "fake",
+                    "python": platform.python_version(),
+                },
+                "routes": {},
+            }
+            for scenario in scenarios():
+                if filters and not any(f in scenario.name for f in filters):
+                    continue
+                count = args.llm_requests if scenario.llm else args.requests
+                results["routes"][scenario.name] = run_scenario(ctx, scenario, count, args.concurrency)
+                print(f"  {scenario.name}: p95={results['routes'][scenario.name]['p95_ms']}ms", flush=True)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    _print_table(results)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+        path = os.path.join(BASELINES_DIR, f"{args.save_baseline}.json")
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved: {path}")
+
+    if args.baseline:
+        path = baseline_path
+        with open(path) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print("FAIL: regressions against baseline", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"OK: no p95 regression over {args.max_regression:.0%} against {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Fake Anthropic - 벤치마크용 로컬 Messages API 서버
+
+`POST /v1/messages`만 구현합니다 (stream / non-stream).
+- tool_choice로 tool이 강제되면 tool의 input_schema에서 결정적인 입력을 만들어 tool_use로 응답
+- 그 외에는 텍스트 응답 (--output-tokens 단어)
+- 첫 토큰까지 --latency 초, 이후 --tokens-per-second 속도로 생성 (non-stream은 전체 시간 후 한 번에 응답)
+
+API 서버를 `ANTHROPIC_BASE_URL=http://127.0.0.1:{port}`로 실행하면 실제 API 대신 이 서버를 호출합니다.
+
+사용법 (backend/ 에서):
+    python -m benchmarks.fake_anthropic --port 8089 --latency 0.3 --tokens-per-second 80
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+import argparse
+import itertools
+import json
+import sys
+import time
+
+# SSE 청크 하나에 담는 토큰 수 (실제 API도 여러 토큰씩 묶어 전송)
+TOKENS_PER_CHUNK = 4
+# 토큰 ≈ 4문자로 계산
+CHARS_PER_TOKEN = 4
+
+_WORDS = "fresh bergamot opens onto a soft floral heart of jasmine and iris over warm amber musk".split()
+_ids = itertools.count(1)
+
+
+def sample_from_schema(schema: Dict[str, Any], name: str = "value", index: int = 0) -> Any:
+    """
+    JSON schema를 만족하는 결정적인 값 생성
+
+    배열은 5개 항목, 숫자는 20.0이므로 배합 항목의 비율 합은 100이 됩니다.
+    """
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return sample_from_schema(options[0] if options else {"type": "null"}, name, index)
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if kind == "object":
+        return {
+            key: sample_from_schema(child, key, index)
+            for key, child in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", 0), 5)
+        return [sample_from_schema(schema.get("items", {}), name, i) for i in range(count)]
+    if kind == "number":
+        return 20.0
+    if kind == "integer":
+        return index + 1
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return f"Benchmark {name.replace('_', ' ')} {index + 1}"
+
+
+def _text(tokens: int) -> str:
+    return " ".join(_WORDS[i % len(_WORDS)] for i in range(tokens))
+
+
+def _chunks(text: str) -> Iterator[str]:
+    size = TOKENS_PER_CHUNK * CHARS_PER_TOKEN
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+class FakeAnthropicHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # ThreadingHTTPServer에서 설정 (FakeAnthropicServer 참고)
+    latency = 0.3
+    tokens_per_second = 80.0
+    output_tokens = 200
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        if self.path.split("?")[0] != "/v1/messages":
+            self._json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+            return
+
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+        request = json.loads(body or b"{}")
+        block, text = self._output_block(request)
+        input_tokens = max(1, len(body) // CHARS_PER_TOKEN)
+        output_tokens = max(1, len(text) // CHARS_PER_TOKEN)
+        message = {
+            "id": f"msg_bench_{next(_ids)}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "fake"),
+            "content": [],
+            "stop_reason": None,
+            "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+        }
+        stop_reason = "tool_use" if block["type"] == "tool_use" else "end_turn"
+
+        if not request.get("stream"):
+            time.sleep(self.latency + output_tokens / self.tokens_per_second)
+            if block["type"] == "tool_use":
+                block["input"] = json.loads(text)
+            else:
+                block["text"] = text
+            message.update({
+                "content": [block],
+                "stop_reason": stop_reason,
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            })
+            self._json(200, message)
+            return
+
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("cache-control", "no-cache")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+
+        time.sleep(self.latency)
+        self._event("message_start", {"type": "message_start", "message": message})
+        self._event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": block})
+        delta_type, delta_key = ("input_json_delta", "partial_json") if block["type"] == "tool_use" else ("text_delta", "text")
+        chunk_delay = TOKENS_PER_CHUNK / self.tokens_per_second
+        for chunk in _chunks(text):
+            self._event("content_block_delta", {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": delta_type, delta_key: chunk},
+            })
+            time.sleep(chunk_delay)
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+            "usage": {"output_tokens": output_tokens},
+        })
+        self._event("message_stop", {"type": "message_stop"})
+        self._write_chunk(b"")
+
+    def _output_block(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """(content block 골격, 생성할 텍스트 또는 tool 입력 JSON)"""
+        choice = request.get("tool_choice") or {}
+        tools: List[Dict[str, Any]] = request.get("tools") or []
+        if choice.get("type") in ("tool", "any") and tools:
+            tool = next((t for t in tools if t.get("name") == choice.get("name")), tools[0])
+            tool_input = sample_from_schema(tool.get("input_schema", {}))
+            block = {"type": "tool_use", "id": f"toolu_bench_{next(_ids)}", "name": tool["name"], "input": {}}
+            return block, json.dumps(tool_input)
+        return {"type": "text", "text": ""}, _text(min(self.output_tokens, request.get("max_tokens", self.output_tokens)))
+
+    def _json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _event(self, event: str, data: Dict[str, Any]) -> None:
+        self._write_chunk(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, latency: float, tokens_per_second: float, output_tokens: int):
+        handler = type("Handler", (FakeAnthropicHandler,), {
+            "latency": latency,
+            "tokens_per_second": tokens_per_second,
+            "output_tokens": output_tokens,
+        })
+        super().__init__(("127.0.0.1", port), handler)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local fake Anthropic Messages API")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.3, help="첫 토큰까지 시간 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="출력 토큰 생성 속도")
+    parser.add_argument("--output-tokens", type=int, default=200, help="텍스트 응답 길이 (토큰)")
+    args = parser.parse_args()
+
+    server = FakeAnthropicServer(args.port, args.latency, args.tokens_per_second, args.output_tokens)
+    print(f"Fake Anthropic listening on http://127.0.0.1:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
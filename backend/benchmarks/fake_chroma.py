@@ -0,0 +1,140 @@
+"""
+Fake Chroma - 벤치마크용 메모리 내 ChromaDB 클라이언트
+
+`app/db/vector`가 사용하는 API만 구현합니다
+(get_or_create_collection / get_collection / delete_collection / Collection.add / upsert / get / query).
+`query_embeddings`가 오면 저장된 벡터와 cosine 거리로 전수 비교하고, `query_texts`만 오면
+단어 집합 overlap으로 거리를 계산합니다. 검색 품질이 아니라 라우트 / 직렬화 오버헤드를 측정하는 용도이며,
+실제 ChromaDB 비용은 `--real-chroma`로 측정합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import re
+import threading
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(_TOKEN.findall(text.lower()))
+
+
+def _matches(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """metadata 필터 (`{"key": value}` / `{"key": {"$in": [...]}}` / `{"$and": [...]}`만 지원)"""
+    for key, condition in (where or {}).items():
+        if key == "$and":
+            if not all(_matches(metadata, part) for part in condition):
+                return False
+            continue
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _unit(embedding: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class FakeCollection:
+    def __init__(self, name: str, metadata: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.metadata = metadata or {}
+        self._lock = threading.Lock()
+        self._records: Dict[str, tuple] = {}  # id → (tokens, document, metadata, embedding)
+
+    def count(self) -> int:
+        return len(self._records)
+
+    def add(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        embeddings: Optional[Sequence[Sequence[float]]] = None,
+        **kwargs
+    ) -> None:
+        metadatas = metadatas or [{} for _ in ids]
+        vectors = [_unit(embedding) for embedding in embeddings] if embeddings is not None else [None] * len(ids)
+        with self._lock:
+            for record_id, document, metadata, vector in zip(ids, documents, metadatas, vectors):
+                self._records[record_id] = (_tokens(document), document, metadata, vector)
+
+    upsert = add
+
+    def get(self, ids: Optional[List[str]] = None, **kwargs) -> Dict[str, List[Any]]:
+        with self._lock:
+            wanted = ids if ids is not None else list(self._records)
+            selected = [(record_id, self._records[record_id]) for record_id in wanted if record_id in self._records]
+        return {
+            "ids": [record_id for record_id, _ in selected],
+            "documents": [record[1] for _, record in selected],
+            "metadatas": [record[2] for _, record in selected],
+            "embeddings": [record[3].tolist() if record[3] is not None else None for _, record in selected],
+        }
+
+    def delete(self, ids: List[str], **kwargs) -> None:
+        with self._lock:
+            for record_id in ids:
+                self._records.pop(record_id, None)
+
+    def query(
+        self,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 10,
+        query_embeddings: Optional[Sequence[Sequence[float]]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, List[List[Any]]]:
+        with self._lock:
+            records = [item for item in self._records.items() if _matches(item[1][2], where)]
+
+        result: Dict[str, List[List[Any]]] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        queries = query_embeddings if query_embeddings is not None else query_texts
+        for query in queries:
+            if query_embeddings is not None:
+                vector = _unit(query)
+                distance = lambda tokens, embedding: 1.0 - float(vector @ embedding) if embedding is not None else 1.0
+            else:
+                words = _tokens(query)
+                distance = lambda tokens, embedding: 1.0 - len(words & tokens) / (len(words | tokens) or 1)
+            scored = sorted(
+                ((distance(tokens, embedding), record_id, document, metadata)
+                 for record_id, (tokens, document, metadata, embedding) in records),
+                key=lambda row: row[0]
+            )[:n_results]
+            result["ids"].append([row[1] for row in scored])
+            result["documents"].append([row[2] for row in scored])
+            result["metadatas"].append([row[3] for row in scored])
+            result["distances"].append([row[0] for row in scored])
+        return result
+
+
+class FakeChromaClient:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None, **kwargs) -> FakeCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = FakeCollection(name, metadata)
+            return self._collections[name]
+
+    def get_collection(self, name: str, **kwargs) -> FakeCollection:
+        with self._lock:
+            if name not in self._collections:
+                raise ValueError(f"Collection {name} does not exist.")
+            return self._collections[name]
+
+    def delete_collection(self, name: str) -> None:
+        with self._lock:
+            if self._collections.pop(name, None) is None:
+                raise ValueError(f"Collection {name} does not exist.")
@@ -0,0 +1,201 @@
+"""
+Benchmark seed - 합성 원료 / Formula / Accord 카탈로그 생성
+
+같은 --seed 값이면 항상 같은 데이터가 생성되므로 측정 결과를 비교할 수 있습니다.
+기본적으로 테이블을 새로 만들므로 (--no-reset 제외) ID는 1부터 개수만큼 연속으로 부여됩니다.
+
+사용법 (backend/ 에서):
+    python -m benchmarks.seed --ingredients 1000 --formulas 1000 --accords 500
+    DATABASE_URL=postgresql://... python -m benchmarks.seed --ingredients 100000
+"""
+
+from typing import Any, Dict, Iterator, List
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+DEFAULT_DATABASE_URL = "sqlite:///./data/benchmark.db"
+BATCH_SIZE = 2000
+
+NOTE_FAMILIES = ["Floral", "Woody", "Citrus", "Herbal", "Spicy", "Fresh", "Sweet", "Oriental", "Other"]
+VOLATILITY = ["high", "medium", "low"]
+DESCRIPTORS = [
+    "bright", "green", "powdery", "creamy", "smoky", "resinous", "juicy", "zesty", "warm", "dry",
+    "aquatic", "musky", "balsamic", "leathery", "honeyed", "waxy", "metallic", "earthy", "sparkling", "soft",
+]
+MATERIALS = [
+    "Bergamot", "Jasmine", "Rose", "Vetiver", "Sandalwood", "Cedarwood", "Patchouli", "Vanilla", "Lavender",
+    "Neroli", "Iris", "Amber", "Musk", "Oakmoss", "Tonka", "Ylang", "Pepper", "Cardamom", "Galbanum", "Labdanum",
+]
+FORMS = ["Oil", "Absolute", "Extract", "Resinoid", "Aldehyde", "Ester", "Accord Base", "Isolate"]
+GENERATION_TYPES = [
+    "Fresh Citrus", "White Floral", "Woody Amber", "Green Aromatic", "Soft Musk",
+    "Spicy Oriental", "Fruity Chypre", "Powdery Iris", "Aquatic Fresh", "Gourmand Vanilla",
+]
+
+
+def ingredient_name(index: int) -> str:
+    """ID(1부터)에 대응하는 원료명 - 부하 스크립트에서도 같은 이름을 계산"""
+    material = MATERIALS[index % len(MATERIALS)]
+    form = FORMS[(index // len(MATERIALS)) % len(FORMS)]
+    return f"{material} {form} {index}"
+
+
+def _ingredient_rows(count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    for index in range(1, count + 1):
+        family = NOTE_FAMILIES[index % len(NOTE_FAMILIES)]
+        odor = ", ".join(rng.sample(DESCRIPTORS, 3))
+        yield {
+            "id": index,
+            "ingredient_name": ingredient_name(index),
+            "inci_name": f"{ingredient_name(index)} INCI",
+            "synonyms": [f"{ingredient_name(index)} Synonym"],
+            "cas_number": f"{100000 + index}-{index % 97:02d}-{index % 10}",
+            "odor_description": f"{odor} {family.lower()} note",
+            "odor_threshold": round(rng.uniform(0.01, 10.0), 3),
+            "suggested_usage_level": f"{rng.randint(1, 5)}-{rng.randint(6, 20)}%",
+            "note_family": family,
+            "max_usage_percentage": str(rng.choice([1, 2, 5, 10, 20, 50])),
+            "perfume_applications": ["fine fragrance", "soap"],
+            "stability": "good",
+            "tenacity": f"{rng.randint(2, 200)} hours",
+            "volatility": rng.choice(VOLATILITY),
+        }
+
+
+def _composition(ingredient_count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """5~15개 원료, 비율 합 100"""
+    size = min(ingredient_count, rng.randint(5, 15))
+    indexes = rng.sample(range(1, ingredient_count + 1), size)
+    weights = [rng.random() + 0.1 for _ in indexes]
+    total = sum(weights)
+    composition = [
+        {
+            "name": ingredient_name(index),
+            "percentage": round(weight / total * 100, 2),
+            "note": rng.choice(["Top", "Middle", "Base"]),
+        }
+        for index, weight in zip(indexes, weights)
+    ]
+    composition[-1]["percentage"] = round(100 - sum(item["percentage"] for item in composition[:-1]), 2)
+    return composition
+
+
+def _formula_rows(count: int, ingredient_count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    for index in range(1, count + 1):
+        generation_type = GENERATION_TYPES[index % len(GENERATION_TYPES)]
+        yield {
+            "id": index,
+            "name": f"Benchmark Formula {index}",
+            "formula_type": f"{generation_type} Type",
+            "description": f"Synthetic {generation_type.lower()} formula",
+            "ingredients_composition": _composition(ingredient_count, rng),
+            "total_percentage": 100.0,
+            "longevity": f"{rng.randint(4, 12)} hours",
+            "sillage": rng.choice(["soft", "moderate", "strong"]),
+            "shelf_life_months": rng.choice([12, 24, 36]),
+            "cost_per_ml": round(rng.uniform(0.1, 5.0), 4),
+        }
+
+
+def _accord_rows(count: int, ingredient_count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    from app.db.queries import composition_notes
+
+    for index in range(1, count + 1):
+        generation_type = GENERATION_TYPES[index % len(GENERATION_TYPES)]
+        composition = _composition(ingredient_count, rng)
+        yield {
+            "id": index,
+            "name": f"Benchmark Accord {index}",
+            "accord_type": generation_type,
+            "description": f"Synthetic {generation_type.lower()} accord",
+            "ingredients_composition": composition,
+            "total_percentage": 100.0,
+            "longevity": f"{rng.randint(2, 8)} hours",
+            "sillage": rng.choice(["soft", "moderate", "strong"]),
+            # Core INSERT는 create_accord를 거치지 않으므로 노트 컬럼을 직접 채움
+            **composition_notes(composition),
+        }
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(database_url: str, ingredients: int, formulas: int, accords: int, seed_value: int = 42, reset: bool = True) -> Dict[str, Any]:
+    """
+    카탈로그 생성
+
+    Returns:
+        {"ingredients": n, "formulas": n, "accords": n, "seconds": ...}
+    """
+    from sqlalchemy import create_engine, insert, text
+    from app.db.schema import Base, Ingredient, Formula, Accord
+    from app.db.queries import bump_table_versions
+
+    if database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(database_url[len("sqlite:///"):])), exist_ok=True)
+
+    started = time.perf_counter()
+    engine = create_engine(database_url)
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(seed_value)
+    tables = (
+        (Ingredient, _ingredient_rows(ingredients, rng)),
+        (Formula, _formula_rows(formulas, ingredients, rng)),
+        (Accord, _accord_rows(accords, ingredients, rng)),
+    )
+    with engine.begin() as conn:
+        for model, rows in tables:
+            for batch in _batches(rows, BATCH_SIZE):
+                conn.execute(insert(model), batch)
+        # Core INSERT는 ORM listener를 거치지 않으므로 목록 ETag 버전을 직접 증가
+        bump_table_versions(conn, [model.__tablename__ for model, _ in tables])
+        if engine.dialect.name == "postgresql":
+            # ID를 직접 넣었으므로 이후 INSERT가 충돌하지 않도록 sequence 이동
+            for model, _ in tables:
+                table = model.__tablename__
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+                ))
+    engine.dispose()
+
+    return {
+        "ingredients": ingredients,
+        "formulas": formulas,
+        "accords": accords,
+        "seed": seed_value,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Seed a synthetic catalogue for benchmarks")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL") or DEFAULT_DATABASE_URL)
+    parser.add_argument("--ingredients", type=int, default=1000)
+    parser.add_argument("--formulas", type=int, default=1000)
+    parser.add_argument("--accords", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-reset", action="store_true", help="기존 테이블을 지우지 않음 (ID 충돌 주의)")
+    args = parser.parse_args()
+
+    result = seed(args.database_url, args.ingredients, args.formulas, args.accords, args.seed, reset=not args.no_reset)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
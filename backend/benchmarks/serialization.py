@@ -0,0 +1,139 @@
+"""
+Serialization benchmark - 목록 응답 payload 생성 시간 (ORM + jsonable_encoder vs row tuple + orjson)
+
+같은 seed 카탈로그에서 두 방식으로 목록 응답 본문(bytes)을 만들어 시간과 결과를 비교합니다.
+- legacy: ORM 객체 전체 로드 → 행마다 dict 구성 → FastAPI 기본 경로 (jsonable_encoder + json.dumps)
+- rows: `*_list_rows` (필요한 컬럼만) → `app/schema/responses.py`의 orjson 응답
+
+두 결과를 파싱하여 같은 내용인지 확인하고, 속도 향상이 --min-speedup보다 작으면 exit code 1.
+
+사용법 (backend/ 에서):
+    python -m benchmarks.serialization --rows 10000
+"""
+
+from typing import Any, Callable, Dict
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.seed import seed
+
+
+def _legacy_ingredients(db: Any) -> Dict[str, Any]:
+    from app.db.queries import get_all_ingredients
+    return {
+        "ingredients": [
+            {
+                "id": ing.id,
+                "ingredient_name": ing.ingredient_name,
+                "inci_name": ing.inci_name,
+                "cas_number": ing.cas_number,
+                "synonyms": ing.synonyms,
+                "odor_description": ing.odor_description,
+                "note_family": ing.note_family,
+                "suggested_usage_level": ing.suggested_usage_level,
+                "max_usage_percentage": ing.max_usage_percentage,
+                "stability": ing.stability,
+                "tenacity": ing.tenacity,
+                "volatility": ing.volatility,
+            }
+            for ing in get_all_ingredients(db)
+        ]
+    }
+
+
+def _legacy_formulas(db: Any) -> Dict[str, Any]:
+    from app.db.queries import get_all_formulas
+    formulas = get_all_formulas(db)
+    return {
+        "count": len(formulas),
+        "formulas": [
+            {
+                "id": f.id,
+                "name": f.name,
+                "type": f.formula_type,
+                "ingredients_count": len(f.ingredients_composition) if f.ingredients_composition else 0,
+                "created_at": f.created_at.isoformat() if f.created_at else None
+            }
+            for f in formulas
+        ]
+    }
+
+
+def _fastapi_body(content: Any) -> bytes:
+    """FastAPI 기본 응답 경로 (serialize_response → JSONResponse.render)"""
+    from fastapi.encoders import jsonable_encoder
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _time(build: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    samples = []
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = build()
+        samples.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(samples) * 1000, 2), "bytes": len(body), "body": body}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare list payload generation paths")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-speedup", type=float, default=3.0)
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serialization.db')}"
+    seed(database_url, ingredients=args.rows, formulas=args.rows, accords=0)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.queries import get_ingredient_list_rows, get_formula_list_rows
+    from app.schema.responses import rows_response
+
+    engine = create_engine(database_url)
+    Session = sessionmaker(bind=engine)
+
+    def run(build: Callable[[Any], bytes]) -> Callable[[], bytes]:
+        def measured() -> bytes:
+            with Session() as db:
+                return build(db)
+        return measured
+
+    cases = {
+        "ingredients": (
+            lambda db: _fastapi_body(_legacy_ingredients(db)),
+            lambda db: rows_response("ingredients", get_ingredient_list_rows(db), count=False).body,
+        ),
+        "formulas": (
+            lambda db: _fastapi_body(_legacy_formulas(db)),
+            lambda db: rows_response("formulas", get_formula_list_rows(db)).body,
+        ),
+    }
+
+    failed = False
+    report: Dict[str, Any] = {"rows": args.rows}
+    for name, (legacy, rows) in cases.items():
+        before = _time(run(legacy), args.repeat)
+        after = _time(run(rows), args.repeat)
+        same = json.loads(before.pop("body")) == json.loads(after.pop("body"))
+        speedup = round(before["median_ms"] / after["median_ms"], 2) if after["median_ms"] else None
+        report[name] = {"legacy": before, "rows_orjson": after, "speedup": speedup, "same_payload": same}
+        failed |= not same or (speedup or 0) < args.min_speedup
+    engine.dispose()
+
+    print(json.dumps(report, indent=2))
+    if failed:
+        print(f"FAIL: payload mismatch or speedup below {args.min_speedup}x", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Benchmark server - 로컬 fake를 연결한 API 서버 실행
+
+ChromaDB 리소스를 메모리 내 fake로 교체한 뒤 uvicorn으로 `app.main:app`을 실행합니다.
+fake를 쓸 때는 `EMBEDDING_BACKEND`를 지정하지 않으면 `hashing` (모델 다운로드 / ONNX 없이 동작)을 사용합니다.
+Anthropic은 `ANTHROPIC_BASE_URL` 환경 변수로 fake 서버를 가리킵니다 (`benchmarks/api.py`가 설정).
+
+사용법 (backend/ 에서):
+    DATABASE_URL=sqlite:///./data/benchmark.db ANTHROPIC_BASE_URL=http://127.0.0.1:8089 ANTHROPIC_API_KEY=bench \\
+        python -m benchmarks.serve --port 8765
+"""
+
+import argparse
+import os
+import sys
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the API with local fakes for benchmarking")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--real-chroma", action="store_true", help="fake 대신 CHROMADB_PATH의 ChromaDB 사용")
+    args = parser.parse_args()
+
+    if not args.real_chroma:
+        os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+
+    import uvicorn
+    from app.resources import resources
+    from app.main import app
+
+    if not args.real_chroma:
+        from benchmarks.fake_chroma import FakeChromaClient
+        resources.override("chroma", FakeChromaClient)
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Startup benchmark - `app.main` import + lifespan 시작 시간 측정
+
+새 프로세스에서 여러 번 측정하여 중앙값이 예산을 넘으면 exit code 1 (회귀 방지용).
+자격 증명 없이 실행되므로 (DATABASE_URL / ANTHROPIC_API_KEY 비움) import 시점에
+외부 리소스를 만드는 코드가 다시 들어오면 바로 실패하거나 느려집니다.
+
+사용법 (backend/ 에서):
+    python -m benchmarks.startup --runs 5 --budget 1.5
+    python -m benchmarks.startup --warm-up database,anthropic
+"""
+
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 자식 프로세스에서 실행: import / lifespan 시작 시간 (초)을 JSON으로 출력
+_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({"import": imported - started, "startup": ready - imported, "total": ready - started}))
+"""
+
+
+def measure(runs: int, warm_up: List[str]) -> List[Dict[str, float]]:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": "",
+        "ANTHROPIC_API_KEY": "",
+        "JOB_WORKERS": "0",
+        "STARTUP_WARM_UP": json.dumps(warm_up),
+        "ENV": "benchmark",
+    })
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            cwd=BACKEND_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Any]:
+    return {
+        phase: {
+            "median_s": round(statistics.median(s[phase] for s in samples), 3),
+            "max_s": round(max(s[phase] for s in samples), 3),
+        }
+        for phase in ("import", "startup", "total")
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.5, help="중앙값 total 예산 (초)")
+    parser.add_argument("--warm-up", default="", help="콤마로 구분한 STARTUP_WARM_UP 리소스")
+    args = parser.parse_args()
+
+    warm_up = [name.strip() for name in args.warm_up.split(",") if name.strip()]
+    result = summarize(measure(args.runs, warm_up))
+    result["budget_s"] = args.budget
+    result["warm_up"] = warm_up
+    print(json.dumps(result, indent=2))
+
+    if result["total"]["median_s"] > args.budget:
+        print(f"FAIL: median startup {result['total']['median_s']}s exceeds budget {args.budget}s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+공용 fixture
+
+- `cd backend && python -m pytest` (외부 서비스 없이 SQLite 파일 DB만 사용)
+- DB가 필요한 테스트는 `session_factory` (테스트마다 새 SQLite 파일, 전체 스키마 생성)
+- API 테스트는 `api_request(app, method, url, ...)` (httpx ASGITransport, 서버 없이 호출)
+"""
+
+from pathlib import Path
+import asyncio
+import os
+import sys
+
+# app 패키지 import (backend/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# 설정은 처음 읽을 때 로드 - app import 전에 테스트 환경 지정 (SQL echo 끔, .env의 DB / API 키 무시)
+os.environ["ENV"] = "test"
+os.environ["DATABASE_URL"] = ""
+os.environ["ANTHROPIC_API_KEY"] = ""
+os.environ["JOB_WORKERS"] = "0"
+os.environ["STARTUP_WARM_UP"] = "[]"
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.schema import Base
+from app.db.queries.version_queries import listen_table_versions
+
+
+def sqlite_url(path: Path) -> str:
+    return f"sqlite:///{path}"
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Path:
+    """스키마가 생성된 SQLite 파일"""
+    path = tmp_path / "primary.sqlite"
+    engine = create_engine(sqlite_url(path))
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def session_factory(database_path: Path):
+    """`SessionLocal`과 같은 설정의 세션 factory (table_versions 추적 포함)"""
+    engine = create_engine(sqlite_url(database_path))
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    listen_table_versions(factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def api_request():
+    """ASGI 앱 직접 호출 → httpx.Response (lifespan 없이)"""
+    def request(app, method: str, url: str, **kwargs) -> httpx.Response:
+        async def send() -> httpx.Response:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, url, **kwargs)
+        return asyncio.run(send())
+    return request
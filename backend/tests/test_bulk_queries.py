@@ -0,0 +1,179 @@
+"""
+대량 수정 / 삭제 - UPDATE / DELETE ... RETURNING 한 번, 선택 조건 (ids / filter), table_versions 증가,
+동시 삭제 시 각 행은 한 요청에서만 반환
+"""
+
+import threading
+import pytest
+from fastapi import FastAPI
+from app.db.initialization.session import get_db
+from app.db.queries import (
+    bulk_delete_formulas,
+    bulk_delete_ingredients,
+    bulk_update_formulas,
+    bulk_update_ingredients,
+    get_table_version,
+)
+from app.db.schema import Formula, Ingredient
+from app.db.vector import composition_index as composition_index_module
+from app.db.vector.composition_index import CompositionIndex
+from app.routes import formulas
+
+
+def seed(db):
+    ingredients = [
+        Ingredient(ingredient_name=name, inci_name=name, note_family=family)
+        for name, family in [("Rose", "Floral"), ("Jasmine", "Floral"), ("Cedar", "Woody"), ("Bergamot", "Citrus")]
+    ]
+    saved = [
+        Formula(name=name, formula_type=formula_type, ingredients_composition=[{"name": ingredient, "percentage": 10}])
+        for name, formula_type, ingredient in [
+            ("rose eau", "EDP", "Rose"),
+            ("cedar eau", "EDP", "Cedar"),
+            ("rose cologne", "EDC", "Rose"),
+        ]
+    ]
+    db.add_all(ingredients + saved)
+    db.commit()
+    return {row.ingredient_name: row.id for row in ingredients}, {row.name: row.id for row in saved}
+
+
+def test_bulk_update_returns_only_updated_rows(session_factory):
+    db = session_factory()
+    _, formula_ids = seed(db)
+    version, _ = get_table_version(db, "formulas")
+
+    rows = bulk_update_formulas(db, {"description": "bulk"}, ids=[formula_ids["rose eau"], formula_ids["cedar eau"], 999])
+    assert sorted((row.id, row.name) for row in rows) == sorted(
+        (formula_ids[name], name) for name in ["rose eau", "cedar eau"]
+    )
+    # 한 번의 문장 = 한 번의 버전 증가 (목록 ETag 변경)
+    assert get_table_version(db, "formulas")[0] == version + 1
+
+    other = session_factory()
+    descriptions = {row.name: row.description for row in other.query(Formula)}
+    assert descriptions == {"rose eau": "bulk", "cedar eau": "bulk", "rose cologne": None}
+    other.close()
+    db.close()
+
+
+def test_ids_and_filter_must_both_match(session_factory):
+    db = session_factory()
+    _, formula_ids = seed(db)
+
+    rows = bulk_update_formulas(db, {"longevity": "long"}, filters={"type": "EDP", "ingredient": "Rose"})
+    assert [row.name for row in rows] == ["rose eau"]
+
+    rows = bulk_delete_formulas(db, ids=[formula_ids["rose eau"], formula_ids["rose cologne"]], filters={"type": ["EDC"]})
+    assert [row.name for row in rows] == ["rose cologne"]
+    assert sorted(name for (name,) in db.query(Formula.name)) == ["cedar eau", "rose eau"]
+    db.close()
+
+
+def test_bulk_delete_ingredients_by_facet(session_factory):
+    db = session_factory()
+    seed(db)
+    version, _ = get_table_version(db, "ingredients")
+
+    rows = bulk_delete_ingredients(db, filters={"note_family": ["Floral", "Citrus"]})
+    assert sorted(row.ingredient_name for row in rows) == ["Bergamot", "Jasmine", "Rose"]
+    assert get_table_version(db, "ingredients")[0] == version + 1
+
+    # 고른 행이 없으면 버전 유지
+    assert bulk_delete_ingredients(db, filters={"note_family": ["Floral"]}) == []
+    assert get_table_version(db, "ingredients")[0] == version + 1
+    assert [name for (name,) in db.query(Ingredient.ingredient_name)] == ["Cedar"]
+    db.close()
+
+
+@pytest.mark.parametrize("call", [
+    lambda db: bulk_update_ingredients(db, {"note_family": "Amber"}),
+    lambda db: bulk_update_ingredients(db, {}, ids=[1]),
+    lambda db: bulk_update_ingredients(db, {"ingredient_name": "renamed"}, ids=[1]),
+    lambda db: bulk_update_formulas(db, {"description": "x"}, filters={"name": "rose eau"}),
+    lambda db: bulk_delete_formulas(db),
+    lambda db: bulk_delete_ingredients(db, filters={"unknown": ["x"]}),
+])
+def test_invalid_selection_or_values_write_nothing(session_factory, call):
+    db = session_factory()
+    seed(db)
+    versions = [get_table_version(db, table) for table in ("ingredients", "formulas")]
+
+    with pytest.raises(ValueError):
+        call(db)
+    db.rollback()
+
+    assert [get_table_version(db, table) for table in ("ingredients", "formulas")] == versions
+    assert db.query(Ingredient).count() == 4 and db.query(Formula).count() == 3
+    db.close()
+
+
+def test_concurrent_deletes_return_each_row_once(session_factory):
+    db = session_factory()
+    db.add_all(Ingredient(ingredient_name=f"ing-{index}", inci_name=f"ing-{index}") for index in range(40))
+    db.commit()
+    ids = [ingredient_id for (ingredient_id,) in db.query(Ingredient.id)]
+    db.close()
+
+    deleted = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        session = session_factory()
+        try:
+            # 겹치는 id 범위를 서로 다른 순서로 삭제
+            selection = ids[offset:] + ids[:offset]
+            rows = bulk_delete_ingredients(session, ids=selection[:30])
+            with lock:
+                deleted.extend(row.id for row in rows)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in (0, 10, 20, 30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert sorted(deleted) == sorted(ids)
+
+
+@pytest.fixture
+def formulas_app(session_factory, monkeypatch):
+    monkeypatch.setattr(composition_index_module, "formula_composition_index", CompositionIndex("formulas"))
+    app = FastAPI()
+    app.include_router(formulas.router)
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override
+    return app
+
+
+def test_bulk_routes(formulas_app, api_request, session_factory):
+    db = session_factory()
+    _, formula_ids = seed(db)
+    db.close()
+
+    response = api_request(formulas_app, "PATCH", "/api/formulas/bulk", json={"filter": {"type": "EDP"}, "values": {"sillage": "soft"}})
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+
+    # 선택 조건 없음 / 수정할 수 없는 컬럼
+    assert api_request(formulas_app, "PATCH", "/api/formulas/bulk", json={"filter": {}, "values": {"sillage": "x"}}).status_code == 422
+    assert api_request(formulas_app, "PATCH", "/api/formulas/bulk", json={"ids": [1], "values": {"name": "x"}}).status_code == 400
+
+    response = api_request(formulas_app, "DELETE", "/api/formulas/bulk", json={"filter": {"ingredient": "Rose"}})
+    assert response.status_code == 200
+    assert sorted(response.json()["ids"]) == sorted([formula_ids["rose eau"], formula_ids["rose cologne"]])
+
+    # 삭제된 Formula는 유사도 색인에서도 제거
+    db = session_factory()
+    matches = composition_index_module.get_formula_composition_index(db).query([{"name": "Rose", "percentage": 10}])
+    assert matches == []
+    db.close()
@@ -0,0 +1,195 @@
+"""
+Composition 유사도 색인 - 점수 계산, 증분 갱신, 다른 워커의 변경 반영 (table_versions),
+이 프로세스의 저장 / 삭제 후에는 다시 로드하지 않음
+"""
+
+import math
+import pytest
+from fastapi import FastAPI
+from app.db.initialization.session import get_db
+from app.db.queries import get_formula_compositions, pop_table_versions
+from app.db.schema import Formula
+from app.db.vector import composition_index as composition_index_module
+from app.db.vector.composition_index import CompositionIndex, composition_vector, get_formula_composition_index
+from app.routes import formulas
+
+
+def composition(**percentages):
+    return [{"name": name.replace("_", " "), "percentage": value} for name, value in percentages.items()]
+
+
+def test_composition_vector_normalizes_names_and_skips_invalid_items():
+    vector = composition_vector([
+        {"name": "  Bergamot   Oil ", "percentage": 10},
+        {"name": "bergamot oil", "percentage": "5"},
+        {"name": "Rose", "percentage": 0},
+        {"name": "", "percentage": 20},
+        {"name": "Musk", "percentage": "n/a"},
+        "not an item",
+    ])
+    assert vector == {"bergamot oil": 15.0}
+
+
+@pytest.fixture
+def index():
+    index = CompositionIndex("test")
+    index.upsert(1, composition(rose=50, jasmine=50))
+    index.upsert(2, composition(rose=50, cedar=50))
+    index.upsert(3, composition(cedar=100))
+    return index
+
+
+def test_cosine_and_jaccard_scores(index):
+    query = composition(rose=50, jasmine=50)
+
+    assert index.query(query, metric="cosine") == [(1, 1.0), (2, 0.5)]
+    # 가중 Jaccard: 겹치는 비율 합 / (두 배합 비율 합 - 겹치는 비율 합)
+    assert index.query(query, metric="jaccard") == [(1, 1.0), (2, round(50 / 150, 6))]
+
+
+def test_query_options(index):
+    query = composition(rose=50, cedar=50)
+    assert index.query(query, exclude_id=2) == [(3, round(1 / math.sqrt(2), 6)), (1, 0.5)]
+    assert index.query(query, limit=1) == [(2, 1.0)]
+    assert index.find_duplicates(query, threshold=0.9) == [(2, 1.0)]
+    assert index.query([]) == []
+    with pytest.raises(ValueError):
+        index.query(query, metric="euclidean")
+
+
+def test_upsert_and_remove_update_postings(index):
+    index.upsert(1, composition(vetiver=100))
+    assert index.query(composition(jasmine=100)) == []
+    assert index.query(composition(vetiver=100)) == [(1, 1.0)]
+
+    index.remove_many([1, 2, 3])
+    assert len(index) == 0
+    assert index._postings == {}
+
+
+@pytest.fixture
+def formula_index(monkeypatch):
+    index = CompositionIndex("formulas")
+    monkeypatch.setattr(composition_index_module, "formula_composition_index", index)
+    return index
+
+
+def save_formula(session_factory, name, **percentages):
+    db = session_factory()
+    formula = Formula(name=name, formula_type="Test", ingredients_composition=composition(**percentages))
+    db.add(formula)
+    db.commit()
+    formula_id = formula.id
+    db.close()
+    return formula_id
+
+
+def test_index_reloads_when_another_worker_changes_formulas(session_factory, formula_index):
+    first = save_formula(session_factory, "first", rose=100)
+    db = session_factory()
+    assert get_formula_composition_index(db).query(composition(rose=100)) == [(first, 1.0)]
+    loaded_version = formula_index.version
+
+    # 같은 버전이면 다시 로드하지 않음
+    get_formula_composition_index(db)
+    assert formula_index.version == loaded_version
+
+    # 다른 워커가 저장 / 삭제 (이 프로세스의 색인은 upsert / remove를 받지 못함)
+    second = save_formula(session_factory, "second", rose=100)
+    other = session_factory()
+    other.delete(other.get(Formula, first))
+    other.commit()
+    other.close()
+
+    db.rollback()
+    assert get_formula_composition_index(db).query(composition(rose=100)) == [(second, 1.0)]
+    assert formula_index.version > loaded_version
+    db.close()
+
+
+@pytest.fixture
+def formulas_app(session_factory, formula_index, monkeypatch):
+    """Formula 라우터 + 전체 로드 횟수 기록"""
+    loads = []
+
+    def counting_loader(db):
+        loads.append(formula_index.version)
+        return get_formula_compositions(db)
+
+    monkeypatch.setattr(composition_index_module, "get_formula_compositions", counting_loader)
+    app = FastAPI()
+    app.include_router(formulas.router)
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override
+    return app, loads
+
+
+def test_own_writes_do_not_reload_the_index(formulas_app, api_request, session_factory):
+    app, loads = formulas_app
+    first = save_formula(session_factory, "first", rose=100)
+    assert api_request(app, "GET", f"/api/formulas/{first}/similar").status_code == 200
+    assert len(loads) == 1
+
+    # 저장 → /similar: upsert로 반영, 다시 로드하지 않음
+    response = api_request(app, "POST", "/api/formulas/save", json={
+        "name": "second", "formula_type": "EDP", "ingredients": composition(rose=50, jasmine=50),
+    })
+    assert response.status_code == 200
+    second = response.json()["formula_id"]
+    response = api_request(app, "GET", f"/api/formulas/{first}/similar")
+    assert [match["id"] for match in response.json()["results"]] == [second]
+
+    # 수정 (composition / 다른 필드), 대량 수정, 삭제도 마찬가지
+    for method, url, body in [
+        ("PUT", f"/api/formulas/{second}", {"ingredients_composition": composition(rose=100)}),
+        ("PUT", f"/api/formulas/{second}", {"description": "renamed"}),
+        ("PATCH", "/api/formulas/bulk", {"ids": [second], "values": {"sillage": "soft"}}),
+    ]:
+        assert api_request(app, method, url, json=body).status_code == 200
+    response = api_request(app, "GET", f"/api/formulas/{first}/similar")
+    assert response.json()["results"][0]["score"] == 1.0
+    assert api_request(app, "DELETE", f"/api/formulas/{second}").status_code == 200
+    assert api_request(app, "GET", f"/api/formulas/{first}/similar").json()["results"] == []
+    assert len(loads) == 1
+
+    # 다른 워커의 저장이 끼어들면 다시 로드
+    save_formula(session_factory, "third", rose=100)
+    response = api_request(app, "POST", "/api/formulas/save", json={
+        "name": "fourth", "formula_type": "EDP", "ingredients": composition(cedar=100),
+    })
+    assert response.status_code == 200
+    response = api_request(app, "GET", f"/api/formulas/{first}/similar")
+    assert [match["name"] for match in response.json()["results"]] == ["third"]
+    assert len(loads) == 2
+
+
+def test_written_versions_are_own_consecutive_bumps(session_factory):
+    db = session_factory()
+    db.add(Formula(name="a", formula_type="Test", ingredients_composition=[]))
+    db.flush()
+    db.add(Formula(name="b", formula_type="Test", ingredients_composition=[]))
+    db.commit()
+    assert pop_table_versions(db, "formulas") == (1, 2)
+    assert pop_table_versions(db, "formulas") is None
+
+    # 다른 세션의 쓰기 후: 범위는 이 세션의 버전부터 다시 시작
+    db.add(Formula(name="c", formula_type="Test", ingredients_composition=[]))
+    db.commit()
+    save_formula(session_factory, "d", rose=100)
+    db.add(Formula(name="e", formula_type="Test", ingredients_composition=[]))
+    db.commit()
+    assert pop_table_versions(db, "formulas") == (5, 5)
+
+    # rollback된 쓰기는 기록하지 않음
+    db.add(Formula(name="f", formula_type="Test", ingredients_composition=[]))
+    db.flush()
+    db.rollback()
+    assert pop_table_versions(db, "formulas") is None
+    db.close()
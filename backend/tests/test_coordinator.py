@@ -0,0 +1,97 @@
+"""
+Coordinator 워크플로우 - 저장된 Formula 기반 시장 트렌드, 실패한 실행의 checkpoint 정리
+"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from app.agents import coordinator as coordinator_module
+from app.agents.research.market_research_agent import analyze_market_trends, load_formula_trends
+from app.db.schema import Formula, Ingredient
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def seed_catalogue(db):
+    for name, family in [("Rose Absolute", "Floral"), ("Jasmine", "Floral"), ("Cedarwood", "Woody"), ("Bergamot", "Citrus")]:
+        db.add(Ingredient(ingredient_name=name, inci_name=name, note_family=family))
+    formulas = [
+        ("old floral", ["rose absolute", "Jasmine"], 400),
+        ("old woody", ["Cedarwood"], 300),
+        ("old floral woody", ["Rose Absolute", "Cedarwood"], 200),
+        ("new citrus", ["Bergamot", "unknown musk"], 10),
+        ("new citrus floral", ["bergamot", "Rose  Absolute"], 5),
+    ]
+    for name, ingredients, age_days in formulas:
+        db.add(Formula(
+            name=name,
+            formula_type="Test",
+            ingredients_composition=[{"name": ingredient, "percentage": 10} for ingredient in ingredients],
+            created_at=NOW - timedelta(days=age_days),
+        ))
+    db.commit()
+
+
+def test_market_trends_from_saved_formulas(session_factory):
+    db = session_factory()
+    seed_catalogue(db)
+
+    trends = load_formula_trends(db, recent_days=30, now=NOW)
+    assert trends["formulas"] == 5 and trends["recent_formulas"] == 2
+    assert trends["families"] == {"Floral": 3, "Woody": 2, "Citrus": 2}
+    assert trends["recent_families"] == {"Citrus": 2, "Floral": 1}
+
+    result = analyze_market_trends("a fresh citrus cologne", trends)
+    assert [item["note_family"] for item in result["popular_families"]] == ["Floral", "Citrus", "Woody"]
+    assert result["popular_families"][0] == {"note_family": "Floral", "formulas": 3, "share": 0.6}
+    # 최근 2개 모두 Citrus (100%) vs 전체 40%
+    assert [item["note_family"] for item in result["growing_categories"]] == ["Citrus"]
+    assert result["growing_categories"][0]["growth"] == 0.6
+    assert [item["note_family"] for item in result["requested_families"]] == ["Citrus"]
+    assert result["trend_keywords"][0] == "bergamot"
+    db.close()
+
+
+def test_market_trends_without_data():
+    result = analyze_market_trends("anything")
+    assert result["formulas_analyzed"] == 0
+    assert result["popular_families"] == [] and result["growing_categories"] == []
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    saver = MemorySaver()
+    compiled = coordinator_module.build_coordinator_graph(saver)
+    monkeypatch.setattr(coordinator_module, "get_coordinator_graph", lambda: compiled)
+    monkeypatch.setattr(coordinator_module.settings, "LANGGRAPH_MAX_RETRIES", 2)
+    return saver
+
+
+def test_successful_run_includes_trends_and_drops_checkpoint(session_factory, graph, monkeypatch):
+    monkeypatch.setattr(coordinator_module, "search_ingredients_semantic", lambda query, n_results: [])
+    db = session_factory()
+    seed_catalogue(db)
+
+    result = coordinator_module.run_coordinator("s1", [{"role": "user", "content": "floral please"}], db)
+    assert result["research_result"]["formulas_analyzed"] == 5
+    assert "Popular note families in 5 saved formulas: Floral" in result["final_response"]
+    assert list(graph.list(None)) == []
+    db.close()
+
+
+def test_failed_run_drops_checkpoint_after_last_retry(session_factory, graph, monkeypatch):
+    calls = []
+
+    def failing_search(query, n_results):
+        calls.append(query)
+        raise RuntimeError("vector store unavailable")
+
+    monkeypatch.setattr(coordinator_module, "search_ingredients_semantic", failing_search)
+    db = session_factory()
+
+    with pytest.raises(RuntimeError):
+        coordinator_module.run_coordinator("s1", [{"role": "user", "content": "woody"}], db)
+
+    assert len(calls) == 2
+    assert list(graph.list(None)) == []
+    db.close()
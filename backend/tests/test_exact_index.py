@@ -0,0 +1,115 @@
+"""
+Exact index - 전체 재색인 후 단건 / 대량 색인과 삭제를 새 generation에 반영 (CURRENT 유지),
+ChromaDB 경로와 같은 거리 (값이 없는 필드 포함)
+"""
+
+import os
+import numpy as np
+import pytest
+from app.db.vector import exact_index as exact_index_module
+from app.db.vector import ingredient_vector as ingredient_vector_module
+from app.db.vector.exact_index import CURRENT_FILE, ExactIndex
+
+FIELDS = ("odor", "name")
+MODEL = "test-model"
+WEIGHTS = {"odor": 0.5, "name": 0.5}
+
+
+def records(ingredient_id, family, odor, name=None):
+    """한 원료의 필드 레코드 (metadata, 벡터) - 값이 없는 필드는 레코드 없음"""
+    metadata = {"id": ingredient_id, "name": f"ing-{ingredient_id}", "note_family": family, "cas_number": ""}
+    pairs = [({**metadata, "field": "odor"}, odor)]
+    if name is not None:
+        pairs.append(({**metadata, "field": "name"}, name))
+    return pairs
+
+
+def split(*ingredients):
+    pairs = [pair for ingredient in ingredients for pair in ingredient]
+    return [metadata for metadata, _ in pairs], np.array([vector for _, vector in pairs], dtype=np.float32)
+
+
+def ranked(index, query, note_family=None):
+    snapshot = index.snapshot(MODEL)
+    matches = index.search(snapshot, np.array([query], dtype=np.float32), 10, WEIGHTS, note_family)[0]
+    return [(match["id"], round(match["distance"], 4)) for match in matches]
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(exact_index_module.settings, "EXACT_INDEX_PATH", str(tmp_path / "exact"))
+    index = ExactIndex()
+    index.build(MODEL, FIELDS, *split(
+        records(1, "Floral", [1, 0], [1, 0]),
+        records(2, "Woody", [0, 1], [0, 1]),
+        records(3, "Floral", [0, 1]),
+    ))
+    return index
+
+
+def test_apply_replaces_only_changed_rows(index):
+    assert ranked(index, [1, 0], ["Floral"]) == [(1, 0.0), (3, 2.0)]
+
+    # 3번 재색인 (odor / name 모두 [1, 0]), 2번 삭제, 4번 추가
+    assert index.apply(MODEL, FIELDS, [2, 3, 4], *split(
+        records(3, "Floral", [1, 0], [1, 0]),
+        records(4, "Citrus", [0, 1], [0, 1]),
+    ))
+
+    assert ranked(index, [1, 0]) == [(1, 0.0), (3, 0.0), (4, 2.0)]
+    assert ranked(index, [1, 0], ["Woody"]) == []
+    # 다른 프로세스도 새 generation을 읽음 (CURRENT는 교체될 뿐 제거되지 않음)
+    other = ExactIndex()
+    assert ranked(other, [1, 0]) == [(1, 0.0), (3, 0.0), (4, 2.0)]
+
+
+def test_remove_only_keeps_current_and_old_generations_are_cleaned(index):
+    assert index.apply(MODEL, FIELDS, [1])
+    assert ranked(index, [1, 0]) == [(2, 2.0), (3, 2.0)]
+    generations = [entry for entry in os.listdir(index.path) if os.path.isdir(os.path.join(index.path, entry))]
+    assert len(generations) == 1
+    assert open(os.path.join(index.path, CURRENT_FILE)).read() == generations[0]
+
+
+def test_apply_without_index_or_with_other_model_is_skipped(index):
+    assert not index.apply("other-model", FIELDS, [1])
+    assert ranked(index, [1, 0], ["Floral"]) == [(1, 0.0), (3, 2.0)]
+
+    index.invalidate()
+    assert not index.apply(MODEL, FIELDS, [4], *split(records(4, "Citrus", [0, 1])))
+    assert index.snapshot(MODEL) is None
+
+
+class FieldCollection:
+    """필드별 squared L2 top-k를 반환하는 ChromaDB collection 대역"""
+
+    def __init__(self, metadatas, embeddings):
+        self.records = list(zip(metadatas, np.asarray(embeddings, dtype=np.float32)))
+
+    def query(self, query_embeddings, n_results, where):
+        response = {"metadatas": [], "distances": []}
+        for query in np.asarray(query_embeddings, dtype=np.float32):
+            matches = sorted((
+                (float(np.sum((query - vector) ** 2)), metadata)
+                for metadata, vector in self.records if metadata["field"] == where["field"]
+            ), key=lambda match: (match[0], match[1]["id"]))[:n_results]
+            response["metadatas"].append([metadata for _, metadata in matches])
+            response["distances"].append([distance for distance, _ in matches])
+        return response
+
+
+def test_chroma_merge_scores_missing_field_like_exact_index(index, monkeypatch):
+    metadatas, embeddings = split(
+        records(1, "Floral", [1, 0], [1, 0]),
+        records(2, "Woody", [0, 1], [0.8, 0.6]),
+        records(3, "Floral", [0, 1]),
+    )
+    index.build(MODEL, FIELDS, metadatas, embeddings)
+    monkeypatch.setattr(ingredient_vector_module, "get_or_create_collection", lambda: FieldCollection(metadatas, embeddings))
+    query = np.array([[1, 0]], dtype=np.float32)
+
+    merged = ingredient_vector_module._search_chroma(query, 10, None, WEIGHTS, "query")[0]
+    # 3번은 name 필드가 없음 → 직교 거리 2.0 (결과에 있는 name 필드 최대 거리 0.4가 아님)
+    assert [(match["id"], round(match["distance"], 4)) for match in merged] == ranked(index, [1, 0])
+    assert ranked(index, [1, 0]) == [(1, 0.0), (2, 1.2), (3, 2.0)]
+    assert ingredient_vector_module.MISSING_FIELD_DISTANCE == 2.0
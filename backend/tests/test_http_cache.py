@@ -0,0 +1,126 @@
+"""
+조건부 GET (ETag / Last-Modified) - 카탈로그 목록 / 상세, 다른 세션의 쓰기 후 validator 변경
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+from fastapi import FastAPI
+from app.db.initialization.session import get_db
+from app.db.schema import Formula
+from app.routes import formulas
+
+
+@pytest.fixture
+def formulas_app(session_factory):
+    app = FastAPI()
+    app.include_router(formulas.router)
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override
+    return app
+
+
+def save_formula(session_factory, name):
+    db = session_factory()
+    formula = Formula(name=name, formula_type="Test", ingredients_composition=[{"name": "Rose", "percentage": 10}])
+    db.add(formula)
+    db.commit()
+    formula_id = formula.id
+    db.close()
+    return formula_id
+
+
+def test_list_returns_304_until_the_table_changes(formulas_app, api_request, session_factory):
+    save_formula(session_factory, "first")
+
+    response = api_request(formulas_app, "GET", "/api/formulas")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"formulas-v1-')
+    assert response.headers["cache-control"] == "no-cache"
+
+    # 약한 비교 (W/ 유무 무관), 여러 태그 중 하나만 일치해도 304
+    for if_none_match in [etag, etag[2:], f'"other", {etag}', "*"]:
+        response = api_request(formulas_app, "GET", "/api/formulas", headers={"if-none-match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    # 다른 세션(워커)의 저장 → 버전 증가, 이전 ETag는 200
+    save_formula(session_factory, "second")
+    response = api_request(formulas_app, "GET", "/api/formulas", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"formulas-v2-')
+    assert len(response.json()["formulas"]) == 2
+
+
+def test_rolled_back_write_keeps_the_list_etag(formulas_app, api_request, session_factory):
+    save_formula(session_factory, "first")
+    etag = api_request(formulas_app, "GET", "/api/formulas").headers["etag"]
+
+    db = session_factory()
+    db.add(Formula(name="discarded", formula_type="Test", ingredients_composition=[]))
+    db.flush()
+    db.rollback()
+    db.close()
+
+    response = api_request(formulas_app, "GET", "/api/formulas", headers={"if-none-match": etag})
+    assert response.status_code == 304
+
+
+def test_if_modified_since(formulas_app, api_request, session_factory):
+    save_formula(session_factory, "first")
+    response = api_request(formulas_app, "GET", "/api/formulas")
+    last_modified = response.headers["last-modified"]
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+
+    assert api_request(formulas_app, "GET", "/api/formulas", headers={"if-modified-since": last_modified}).status_code == 304
+    assert api_request(formulas_app, "GET", "/api/formulas", headers={"if-modified-since": earlier}).status_code == 200
+    assert api_request(formulas_app, "GET", "/api/formulas", headers={"if-modified-since": "not a date"}).status_code == 200
+    # If-None-Match가 있으면 If-Modified-Since는 보지 않음
+    response = api_request(
+        formulas_app, "GET", "/api/formulas",
+        headers={"if-none-match": '"stale"', "if-modified-since": last_modified},
+    )
+    assert response.status_code == 200
+
+
+def test_detail_etag_follows_the_row(formulas_app, api_request, session_factory):
+    formula_id = save_formula(session_factory, "first")
+    other_id = save_formula(session_factory, "other")
+
+    response = api_request(formulas_app, "GET", f"/api/formulas/{formula_id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith(f'W/"formulas-{formula_id}-')
+    assert api_request(formulas_app, "GET", f"/api/formulas/{formula_id}", headers={"if-none-match": etag}).status_code == 304
+
+    # 다른 행의 변경은 상세 ETag에 영향 없음
+    db = session_factory()
+    db.get(Formula, other_id).description = "changed"
+    db.commit()
+    assert api_request(formulas_app, "GET", f"/api/formulas/{formula_id}", headers={"if-none-match": etag}).status_code == 304
+
+    # SQLite의 now()는 초 단위 - 같은 초 안의 수정과 구분되도록 updated_at 지정
+    formula = db.get(Formula, formula_id)
+    formula.description = "changed"
+    formula.updated_at = datetime.now(timezone.utc) + timedelta(seconds=5)
+    db.commit()
+    db.close()
+
+    response = api_request(formulas_app, "GET", f"/api/formulas/{formula_id}", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.json()["description"] == "changed"
+    assert response.headers["etag"] != etag
+
+
+def test_missing_row_is_404_even_with_wildcard(formulas_app, api_request):
+    response = api_request(formulas_app, "GET", "/api/formulas/999", headers={"if-none-match": "*"})
+    assert response.status_code == 404
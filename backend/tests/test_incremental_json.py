@@ -0,0 +1,75 @@
+"""
+Incremental JSON 파서 - 조각 경계와 무관하게 얕은 경로의 값이 완성되는 즉시 반환
+"""
+
+import json
+import pytest
+from app.services.incremental_json import IncrementalJSONParser
+
+DOCUMENT = {
+    "description": 'say "hi" \\ {not} [json], ok',
+    "items": [
+        {"name": "Bergamot", "percentage": 12.5, "note": None},
+        {"name": "Cedar, Atlas", "percentage": 7, "tags": ["dry", "woody"]},
+    ],
+    "count": 123,
+    "final": True,
+}
+
+EXPECTED = [
+    (("description",), DOCUMENT["description"]),
+    (("items", 0), DOCUMENT["items"][0]),
+    (("items", 1), DOCUMENT["items"][1]),
+    (("items",), DOCUMENT["items"]),
+    (("count",), 123),
+    (("final",), True),
+]
+
+
+def feed_all(parser, chunks):
+    return [completed for chunk in chunks for completed in parser.feed(chunk)]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_whole_document(indent):
+    text = json.dumps(DOCUMENT, indent=indent)
+    assert feed_all(IncrementalJSONParser(), [text]) == EXPECTED
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_any_chunk_boundary_gives_same_values(size):
+    # 문자열 escape, 숫자, 키 중간에서 잘려도 같은 결과
+    text = json.dumps(DOCUMENT)
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+    assert feed_all(IncrementalJSONParser(), chunks) == EXPECTED
+
+
+def test_values_are_returned_as_soon_as_they_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"description": "a fresh') == []
+    assert parser.feed(' cologne", "items": [{"name": "Bergamot", "percentage": 1') == [
+        (("description",), "a fresh cologne"),
+    ]
+    # 원소 안의 필드(깊이 3)는 반환하지 않고 원소가 닫힐 때 한 번에 반환
+    assert parser.feed('0}, {"name": "Rose"') == [(("items", 0), {"name": "Bergamot", "percentage": 10})]
+    assert parser.feed("}]") == [
+        (("items", 1), {"name": "Rose"}),
+        (("items",), [{"name": "Bergamot", "percentage": 10}, {"name": "Rose"}]),
+    ]
+    # 숫자는 구분자가 와야 완성
+    assert parser.feed(', "count": 4') == []
+    assert parser.feed("2}") == [(("count",), 42)]
+
+
+def test_max_depth():
+    text = json.dumps({"name": "A", "items": [{"name": "x"}]})
+    assert feed_all(IncrementalJSONParser(max_depth=1), [text]) == [
+        (("name",), "A"),
+        (("items",), [{"name": "x"}]),
+    ]
+    assert feed_all(IncrementalJSONParser(max_depth=3), [text]) == [
+        (("name",), "A"),
+        (("items", 0, "name"), "x"),
+        (("items", 0), {"name": "x"}),
+        (("items",), [{"name": "x"}]),
+    ]
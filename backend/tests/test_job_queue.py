@@ -0,0 +1,177 @@
+"""
+Job queue - 동시 claim, heartbeat, 죽은 워커의 작업 재할당 / 실패 처리, max_attempts 검증
+"""
+
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from app.db.initialization.session import get_db
+from app.db.queries import claim_next_job, create_job, get_job_by_id, requeue_stale_jobs
+from app.db.schema import Job, JobStatus
+from app.routes import jobs
+from app.services.job_queue import JobWorkerPool, job_handler
+
+
+def test_concurrent_workers_claim_each_job_once(session_factory):
+    db = session_factory()
+    job_ids = {create_job(db, "test_noop").id for _ in range(20)}
+    db.close()
+
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        session = session_factory()
+        try:
+            while True:
+                job = claim_next_job(session, worker_id, ["test_noop"])
+                if job is None:
+                    return
+                with lock:
+                    claimed.append(job.id)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(f"worker-{index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert sorted(claimed) == sorted(job_ids)
+
+
+def make_stale(db, job_id, attempts, max_attempts):
+    job = db.get(Job, job_id)
+    job.status = JobStatus.RUNNING.value
+    job.locked_by = "dead-worker"
+    job.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    job.attempts = attempts
+    job.max_attempts = max_attempts
+    db.commit()
+
+
+def test_stale_job_is_requeued_until_attempts_run_out(session_factory):
+    db = session_factory()
+    retry = create_job(db, "test_noop")
+    exhausted = create_job(db, "test_noop")
+    make_stale(db, retry.id, attempts=1, max_attempts=3)
+    make_stale(db, exhausted.id, attempts=3, max_attempts=3)
+
+    assert requeue_stale_jobs(db, 60) == {"requeued": 1, "failed": 1}
+
+    db.expire_all()
+    assert get_job_by_id(db, retry.id).status == JobStatus.QUEUED.value
+    failed = get_job_by_id(db, exhausted.id)
+    assert failed.status == JobStatus.FAILED.value
+    assert failed.finished_at is not None and failed.locked_by is None
+    db.close()
+
+
+def test_claim_skips_jobs_without_attempts_left(session_factory):
+    db = session_factory()
+    job = create_job(db, "test_noop", max_attempts=2)
+    job.attempts = 2
+    db.commit()
+    assert claim_next_job(db, "worker", ["test_noop"]) is None
+    db.close()
+
+
+def test_heartbeat_keeps_long_running_job_from_being_requeued(session_factory):
+    calls = []
+
+    @job_handler("test_slow")
+    def slow(db, payload):
+        calls.append(payload)
+        time.sleep(0.6)
+        return {"ok": True}
+
+    pool = JobWorkerPool(session_factory, workers=0, lock_timeout=0.3, heartbeat_interval=0.05)
+    db = session_factory()
+    job = create_job(db, "test_slow")
+
+    sweeps = []
+
+    def sweep():
+        # 핸들러 실행 중에 lock_timeout보다 오래 지난 시점에서 재할당 시도
+        time.sleep(0.45)
+        other = session_factory()
+        try:
+            sweeps.append(requeue_stale_jobs(other, pool.lock_timeout))
+        finally:
+            other.close()
+
+    sweeper = threading.Thread(target=sweep)
+    sweeper.start()
+    assert pool.run_once("worker-1")
+    sweeper.join()
+
+    assert sweeps == [{"requeued": 0, "failed": 0}]
+    db.expire_all()
+    finished = get_job_by_id(db, job.id)
+    assert finished.status == JobStatus.SUCCEEDED.value
+    assert finished.result == {"ok": True}
+    assert len(calls) == 1
+    # 다시 claim할 작업이 없음 (중복 실행 안 됨)
+    assert not pool.run_once("worker-2")
+    db.close()
+
+
+def test_result_of_requeued_job_is_discarded(session_factory):
+    @job_handler("test_lost_lock")
+    def lost_lock(db, payload):
+        # 실행 중에 다른 워커가 작업을 가져감 (heartbeat가 끊겼던 경우)
+        other = session_factory()
+        try:
+            job = other.query(Job).filter(Job.job_type == "test_lost_lock").one()
+            job.locked_by = "worker-2"
+            other.commit()
+        finally:
+            other.close()
+        return {"from": "worker-1"}
+
+    pool = JobWorkerPool(session_factory, workers=0, heartbeat_interval=10)
+    db = session_factory()
+    job = create_job(db, "test_lost_lock")
+    assert pool.run_once("worker-1")
+
+    db.expire_all()
+    current = get_job_by_id(db, job.id)
+    assert current.status == JobStatus.RUNNING.value
+    assert current.locked_by == "worker-2"
+    assert current.result is None
+    db.close()
+
+
+@pytest.fixture
+def jobs_app(session_factory):
+    @job_handler("test_noop")
+    def noop(db, payload):
+        return None
+
+    app = FastAPI()
+    app.include_router(jobs.router)
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override
+    return app
+
+
+@pytest.mark.parametrize("max_attempts", [0, -1, 11, "3", 2.5, True])
+def test_create_job_rejects_invalid_max_attempts(jobs_app, api_request, max_attempts):
+    response = api_request(jobs_app, "POST", "/api/jobs", json={"job_type": "test_noop", "max_attempts": max_attempts})
+    assert response.status_code == 400
+
+
+def test_create_job_accepts_valid_max_attempts(jobs_app, api_request):
+    response = api_request(jobs_app, "POST", "/api/jobs", json={"job_type": "test_noop", "max_attempts": 5})
+    assert response.status_code == 202
+    assert response.json()["max_attempts"] == 5
@@ -0,0 +1,334 @@
+"""
+LLM admission scheduler - 우선순위, 선점, 503 shedding, 스트리밍 응답의 슬롯 반환,
+재시도 backoff / hedge 요청의 슬롯 사용 (`llm_client`)
+"""
+
+from types import SimpleNamespace
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+from anthropic import APIConnectionError
+from fastapi import FastAPI
+from app.db.initialization.session import get_db
+from app.routes import accords
+from app.services import accord_service as accord_service_module
+from app.services.llm_client import ResilientLLMClient
+from app.services.llm_scheduler import LLMScheduler, LLMOverloadedError, Priority
+
+
+def admit_in_thread(scheduler, priority, results, name):
+    def run():
+        try:
+            ticket = scheduler.admit(priority)
+            results.append(name)
+            ticket.release()
+        except LLMOverloadedError:
+            results.append(f"{name}:rejected")
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def wait_for_queue(scheduler, depth):
+    for _ in range(200):
+        if scheduler.stats()["queue_depth"] == depth:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"queue depth never reached {depth}")
+
+
+def test_higher_priority_is_admitted_first():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10)
+    running = scheduler.admit(Priority.STANDARD)
+    results = []
+
+    batch = admit_in_thread(scheduler, Priority.BATCH, results, "batch")
+    wait_for_queue(scheduler, 1)
+    interactive = admit_in_thread(scheduler, Priority.INTERACTIVE, results, "interactive")
+    wait_for_queue(scheduler, 2)
+
+    running.release()
+    batch.join(5)
+    interactive.join(5)
+    assert results == ["interactive", "batch"]
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_full_queue_preempts_lower_priority_waiter():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1)
+    running = scheduler.admit(Priority.STANDARD)
+    results = []
+
+    batch = admit_in_thread(scheduler, Priority.BATCH, results, "batch")
+    wait_for_queue(scheduler, 1)
+    interactive = admit_in_thread(scheduler, Priority.INTERACTIVE, results, "interactive")
+    batch.join(5)
+    assert results == ["batch:rejected"]
+
+    running.release()
+    interactive.join(5)
+    assert results == ["batch:rejected", "interactive"]
+
+
+def test_full_queue_sheds_equal_priority_immediately():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1)
+    running = scheduler.admit(Priority.STANDARD)
+    results = []
+    waiter = admit_in_thread(scheduler, Priority.STANDARD, results, "waiter")
+    wait_for_queue(scheduler, 1)
+
+    with pytest.raises(LLMOverloadedError) as error:
+        scheduler.admit(Priority.STANDARD)
+    assert error.value.retry_after >= 1
+
+    running.release()
+    waiter.join(5)
+    assert results == ["waiter"]
+
+
+def test_queue_timeout_rejects_waiter():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10)
+    running = scheduler.admit(Priority.STANDARD)
+    with pytest.raises(LLMOverloadedError):
+        scheduler.admit(Priority.BATCH, timeout=0.05)
+    assert scheduler.stats()["timed_out_total"] == 1
+    running.release()
+
+
+def test_guarded_stream_releases_when_closed_before_iteration():
+    scheduler = LLMScheduler(max_concurrency=1)
+    closed = []
+
+    def upstream():
+        try:
+            yield "chunk"
+        finally:
+            closed.append(True)
+
+    stream = scheduler.admit(Priority.INTERACTIVE).guard(upstream())
+    assert scheduler.stats()["in_flight"] == 1
+    stream.close()
+    stream.close()
+    assert scheduler.stats()["in_flight"] == 0
+    assert list(stream) == []
+
+
+def test_suspended_ticket_yields_slot_until_resumed():
+    scheduler = LLMScheduler(max_concurrency=1)
+    ticket = scheduler.admit(Priority.STANDARD)
+    assert ticket.suspend()
+    assert not ticket.suspend()
+
+    other = scheduler.admit(Priority.BATCH, timeout=0.1)
+    resumed = []
+    thread = threading.Thread(target=lambda: resumed.append(ticket.resume()))
+    thread.start()
+    wait_for_queue(scheduler, 1)
+    other.release()
+    thread.join(5)
+
+    assert resumed == [True]
+    assert scheduler.stats()["in_flight"] == 1
+    ticket.release()
+    ticket.release()
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_release_while_suspended_does_not_return_the_slot_twice():
+    scheduler = LLMScheduler(max_concurrency=1)
+    ticket = scheduler.admit(Priority.STANDARD)
+    ticket.suspend()
+    ticket.release()
+    assert not ticket.resume()
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_try_admit_never_waits_or_jumps_the_queue():
+    scheduler = LLMScheduler(max_concurrency=1)
+    ticket = scheduler.try_admit(Priority.STANDARD)
+    assert ticket is not None
+    assert scheduler.try_admit(Priority.INTERACTIVE) is None
+    ticket.release()
+    assert scheduler.stats()["in_flight"] == 0
+
+
+# =====================
+# llm_client (재시도 / hedge)
+# =====================
+
+def fake_client(create):
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    return ResilientLLMClient(client_factory=lambda: client, max_retries=2, base_delay=0.0)
+
+
+def test_retry_backoff_releases_the_slot(monkeypatch):
+    scheduler = LLMScheduler(max_concurrency=1)
+    events = []
+
+    def waiting_request():
+        ticket = scheduler.admit(Priority.BATCH, timeout=5)
+        events.append("other")
+        ticket.release()
+
+    def create(**kwargs):
+        if not events:
+            events.append("first")
+            threading.Thread(target=waiting_request).start()
+            wait_for_queue(scheduler, 1)
+            raise APIConnectionError(request=httpx.Request("POST", "https://api.anthropic.com"))
+        events.append("retry")
+        return SimpleNamespace(usage=None)
+
+    client = fake_client(create)
+    monkeypatch.setattr(client, "_backoff", lambda attempt, retry_after: 0.2)
+    with scheduler.admit(Priority.STANDARD):
+        client.create(model="primary")
+
+    # backoff 동안 대기 중이던 요청이 슬롯을 받아 먼저 실행됨
+    assert events == ["first", "other", "retry"]
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def slow_primary_client(hedge_after):
+    finished = threading.Event()
+
+    def create(model, **kwargs):
+        if model == "primary":
+            time.sleep(0.3)
+            finished.set()
+        return SimpleNamespace(model=model, usage=None)
+
+    client = fake_client(create)
+    client.fallback_models = {"primary": "fallback"}
+    client.hedge_after = hedge_after
+    return client, finished
+
+
+def test_hedge_is_skipped_when_scheduler_is_saturated():
+    scheduler = LLMScheduler(max_concurrency=1)
+    client, _ = slow_primary_client(hedge_after=0.05)
+
+    with scheduler.admit(Priority.STANDARD):
+        response = client.create(model="primary")
+
+    assert response.model == "primary"
+    assert client.stats()["primary"]["hedges_skipped_total"] == 1
+    assert client.stats()["primary"]["hedges_total"] == 0
+
+
+def test_hedge_holds_its_own_slot_until_both_requests_finish():
+    scheduler = LLMScheduler(max_concurrency=2)
+    client, primary_finished = slow_primary_client(hedge_after=0.05)
+
+    with scheduler.admit(Priority.STANDARD):
+        response = client.create(model="primary")
+        assert response.model == "fallback"
+        assert scheduler.stats()["in_flight"] == 2
+
+    # 늦은 기본 모델 요청이 백그라운드에서 끝날 때까지 hedge 슬롯 유지
+    assert scheduler.stats()["in_flight"] == 1
+    primary_finished.wait(5)
+    for _ in range(100):
+        if scheduler.stats()["in_flight"] == 0:
+            break
+        time.sleep(0.01)
+    assert scheduler.stats()["in_flight"] == 0
+
+
+# =====================
+# /api/accords/generate/stream
+# =====================
+
+class SlowStream:
+    """첫 청크 전에 지연되는 LLM 스트림 - upstream이 닫혔는지 기록"""
+
+    CHUNKS = 50
+
+    def __init__(self, first_chunk_delay: float):
+        self.first_chunk_delay = first_chunk_delay
+        self.started = threading.Event()
+        self.closed = threading.Event()
+        self.produced = 0
+
+    def __call__(self, prompt):
+        self.started.set()
+        try:
+            time.sleep(self.first_chunk_delay)
+            for index in range(self.CHUNKS):
+                self.produced += 1
+                yield {"type": "ingredient", "index": index}
+                time.sleep(0.05)
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def stream_app(monkeypatch):
+    scheduler = LLMScheduler(max_concurrency=1)
+    stream = SlowStream(first_chunk_delay=0.3)
+    monkeypatch.setattr(accord_service_module, "llm_scheduler", scheduler)
+    monkeypatch.setattr(accord_service_module, "get_ingredient_names", lambda db: [])
+    monkeypatch.setattr(accord_service_module.accord_service, "_stream_from_prompt", stream)
+
+    app = FastAPI()
+    app.include_router(accords.router)
+    app.dependency_overrides[get_db] = lambda: None
+    return app, scheduler, stream
+
+
+def call(app, receive, send):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/accords/generate/stream", "raw_path": b"/api/accords/generate/stream",
+        "query_string": b"", "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    return app(scope, receive, send)
+
+
+def test_stream_slot_released_when_client_disconnects_before_first_chunk(stream_app):
+    app, scheduler, stream = stream_app
+    messages = [{"type": "http.request", "body": b'{"accord_type": "Woody"}', "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # 본문 iterator가 시작되자마자 연결 끊김 (첫 청크 전)
+        await asyncio.get_running_loop().run_in_executor(None, stream.started.wait, 5)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(call(app, receive, send))
+
+    # upstream LLM 스트림은 끝까지 읽히지 않고 닫힘 (진행 중이던 첫 청크까지만)
+    assert stream.closed.is_set()
+    assert stream.produced < SlowStream.CHUNKS
+    assert scheduler.stats()["in_flight"] == 0
+    # 슬롯이 반환되었으므로 다음 요청이 바로 허가됨
+    scheduler.admit(Priority.INTERACTIVE, timeout=0.1).release()
+
+
+def test_stream_slot_released_when_response_fails_before_body(stream_app):
+    app, scheduler, stream = stream_app
+    messages = [{"type": "http.request", "body": b'{"accord_type": "Woody"}', "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # 응답 헤더를 보내기 전에 연결이 끊긴 상태
+        raise OSError("connection reset")
+
+    with pytest.raises(Exception):
+        asyncio.run(call(app, receive, send))
+
+    assert not stream.started.is_set()
+    assert scheduler.stats()["in_flight"] == 0
@@ -0,0 +1,161 @@
+"""
+Read replica 라우팅 - primary / replica SQLite 파일 두 개 (같은 스키마, 다른 행)
+
+replica에만 있는 행이 보이면 replica에서 읽은 것
+"""
+
+from pathlib import Path
+import time
+from typing import List
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.initialization import session as session_module
+from app.db.initialization.replicas import ReplicaRouter
+from app.db.initialization.session import RoutingSession, get_db
+from app.db.schema import Base, Ingredient
+from app.middleware import ReplicaStickinessMiddleware
+from app.resources import resources
+from app.schema.config import settings
+from conftest import sqlite_url
+
+
+def seed(path: Path, name: str) -> None:
+    engine = create_engine(sqlite_url(path))
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Ingredient(ingredient_name=name, inci_name=name))
+        db.commit()
+    engine.dispose()
+
+
+def names(db) -> List[str]:
+    return sorted(row.ingredient_name for row in db.query(Ingredient).all())
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """primary / replica 엔진을 리소스에 연결하고 RoutingSession factory 반환"""
+    primary_path = tmp_path / "primary.sqlite"
+    replica_path = tmp_path / "replica.sqlite"
+    seed(primary_path, "primary-only")
+    seed(replica_path, "replica-only")
+
+    def connect(replica_url: str):
+        monkeypatch.setattr(settings, "DATABASE_URL", sqlite_url(primary_path))
+        monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [replica_url])
+        monkeypatch.setattr(session_module, "replica_router", ReplicaRouter())
+        primary = create_engine(sqlite_url(primary_path))
+        replica = create_engine(replica_url)
+        resources.override("database", lambda: primary, close=lambda engine: engine.dispose())
+        resources.override("database_replicas", lambda: [replica], close=lambda engines: engines[0].dispose())
+        return sessionmaker(bind=primary, class_=RoutingSession, autocommit=False, autoflush=False)
+
+    database = resources._resource("database")
+    replicas = resources._resource("database_replicas")
+    originals = [(database, database.factory, database._close), (replicas, replicas.factory, replicas._close)]
+
+    yield connect, replica_path
+
+    for resource, factory, close in originals:
+        resources.override(resource.name, factory, close)
+
+
+def test_plain_select_is_routed_to_replica(replicated):
+    connect, replica_path = replicated
+    factory = connect(sqlite_url(replica_path))
+    db = factory()
+    assert names(db) == ["replica-only"]
+    # use_primary 옵션을 준 쿼리만 primary
+    assert [row.ingredient_name for row in db.query(Ingredient).execution_options(use_primary=True)] == ["primary-only"]
+    assert not db.wrote
+    db.close()
+
+
+def test_reads_after_write_stay_on_primary(replicated):
+    connect, replica_path = replicated
+    factory = connect(sqlite_url(replica_path))
+    db = factory()
+    assert names(db) == ["replica-only"]
+
+    db.add(Ingredient(ingredient_name="written", inci_name="written"))
+    db.commit()
+
+    # commit 이후에도 같은 세션의 읽기는 primary (replica에는 아직 없는 행)
+    assert db.wrote
+    assert names(db) == ["primary-only", "written"]
+    db.close()
+
+    assert names(factory()) == ["replica-only"]
+
+
+def test_replica_connection_failure_falls_back_to_primary(replicated, tmp_path):
+    connect, _ = replicated
+    missing = tmp_path / "missing" / "replica.sqlite"
+    factory = connect(sqlite_url(missing))
+
+    db = factory()
+    assert names(db) == ["primary-only"]
+    db.close()
+
+    router = session_module.replica_router
+    status = router.status()
+    assert len(status) == 1 and not status[0]["available"]
+    assert status[0]["last_error"]
+    # 재시도 시각 전에는 replica를 고르지 않음
+    assert router.choose() is None
+
+
+@pytest.fixture
+def sticky_app(replicated):
+    connect, replica_path = replicated
+    factory = connect(sqlite_url(replica_path))
+
+    app = FastAPI()
+    app.add_middleware(ReplicaStickinessMiddleware)
+
+    def override():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/ingredients")
+    def list_ingredients(db: Session = Depends(get_db)):
+        return names(db)
+
+    @app.post("/ingredients/{name}")
+    def add_ingredient(name: str, db: Session = Depends(get_db)):
+        db.add(Ingredient(ingredient_name=name, inci_name=name))
+        db.commit()
+        return {"name": name}
+
+    app.dependency_overrides[get_db] = override
+    return app
+
+
+def test_write_sets_cookie_and_following_reads_use_primary(sticky_app, api_request, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5.0)
+    cookie = ReplicaStickinessMiddleware.COOKIE
+
+    response = api_request(sticky_app, "GET", "/ingredients")
+    assert response.json() == ["replica-only"]
+    assert cookie not in response.cookies
+
+    response = api_request(sticky_app, "POST", "/ingredients/written")
+    assert response.status_code == 200
+    until = float(response.cookies[cookie])
+    assert time.time() < until <= time.time() + 5.0
+
+    # cookie가 유효한 동안: 방금 쓴 행이 보이는 primary
+    response = api_request(sticky_app, "GET", "/ingredients", headers={"cookie": f"{cookie}={until:.3f}"})
+    assert response.json() == ["primary-only", "written"]
+    assert cookie not in response.cookies
+
+    # 만료된 cookie / cookie 없음: replica
+    response = api_request(sticky_app, "GET", "/ingredients", headers={"cookie": f"{cookie}={time.time() - 1:.3f}"})
+    assert response.json() == ["replica-only"]
+    response = api_request(sticky_app, "GET", "/ingredients")
+    assert response.json() == ["replica-only"]
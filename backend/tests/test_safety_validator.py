@@ -0,0 +1,40 @@
+"""
+Safety Validator - 알레르기 유발 성분을 원료명의 단어 단위로, 긴 이름부터 판별
+"""
+
+import pytest
+from app.agents.validation.safety_validator import find_allergens, validate_safety
+
+
+def allergens(*names):
+    return [item["allergen"] for item in find_allergens({"ingredients": [{"name": name, "percentage": 1} for name in names]})]
+
+
+@pytest.mark.parametrize("name, allergen", [
+    ("Isoeugenol", "isoeugenol"),
+    ("Eugenol", "eugenol"),
+    ("Hexyl Cinnamal", "hexyl cinnamal"),
+    ("Amyl  Cinnamal", "amyl cinnamal"),
+    ("Cinnamal", "cinnamal"),
+    ("Hydroxycitronellal", "hydroxycitronellal"),
+    ("Amylcinnamyl Alcohol", "amylcinnamyl alcohol"),
+    ("D-Limonene", "d-limonene"),
+    ("d limonene", "d-limonene"),
+    ("ALPHA ISOMETHYL-IONONE", "alpha-isomethyl ionone"),
+    ("Oakmoss absolute 50%", "oakmoss"),
+])
+def test_allergen_is_the_longest_whole_word_match(name, allergen):
+    assert allergens(name) == [allergen]
+
+
+@pytest.mark.parametrize("name", ["Citralva", "Linalyl Acetate", "Cinnamyl Acetate", "Isoeugenyl Acetate"])
+def test_names_containing_an_allergen_as_a_substring_are_not_flagged(name):
+    assert allergens(name) == []
+
+
+def test_validate_safety_warns_with_the_ingredient_names():
+    result = validate_safety({"ingredients": [
+        {"name": "Isoeugenol", "percentage": 0.01},
+        {"name": "Citralva", "percentage": 1},
+    ]})
+    assert "Contains declarable allergens: Isoeugenol" in result["validation_warnings"]
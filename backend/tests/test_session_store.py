@@ -0,0 +1,150 @@
+"""
+Development 세션 저장소 - 같은 DB를 쓰는 두 워커(store 두 개)
+"""
+
+from datetime import datetime, timedelta, timezone
+import threading
+import pytest
+from app.db.queries import get_development_session, save_development_session
+from app.services import session_store as session_store_module
+from app.services.session_store import DevelopmentSessionStore, SessionBusyError
+
+
+def reply(*chunks):
+    return lambda messages: iter(chunks)
+
+
+def run_turn(store, db, session, message, *chunks):
+    """턴을 시작하고 생성이 끝날 때까지 스트림을 읽음"""
+    store.start_turn(db, session, message, reply(*chunks))
+    return [payload for kind, payload in store.iter_events(session) if kind == "chunk"]
+
+
+def wait_saved(session_factory, session_id, turn):
+    """producer 스레드가 완료된 턴을 저장할 때까지 대기"""
+    for _ in range(200):
+        db = session_factory()
+        try:
+            row = get_development_session(db, session_id)
+            if row is not None and row.turn == turn and row.stream_complete:
+                return row
+        finally:
+            db.close()
+        threading.Event().wait(0.01)
+    raise AssertionError(f"turn {turn} was not saved")
+
+
+@pytest.fixture
+def workers(session_factory):
+    return DevelopmentSessionStore(session_factory), DevelopmentSessionStore(session_factory)
+
+
+def test_cached_session_reloads_turns_saved_by_another_worker(session_factory, workers):
+    worker_a, worker_b = workers
+    db = session_factory()
+
+    session = worker_a.create("s1")
+    assert run_turn(worker_a, db, session, "first", "a", "b") == [("1-0", "a"), ("1-1", "b")]
+    wait_saved(session_factory, "s1", 1)
+
+    other = worker_b.get(db, "s1")
+    run_turn(worker_b, db, other, "second", "c")
+    wait_saved(session_factory, "s1", 2)
+
+    reloaded = worker_a.get(db, "s1")
+    assert reloaded.turn == 2
+    assert [message["content"] for message in reloaded.messages] == ["first", "ab", "second", "c"]
+    db.close()
+
+
+def test_outdated_copy_cannot_overwrite_newer_turns(session_factory, workers):
+    worker_a, worker_b = workers
+    db = session_factory()
+
+    session = worker_a.create("s1")
+    run_turn(worker_a, db, session, "first", "a")
+    wait_saved(session_factory, "s1", 1)
+    outdated = worker_a.get(db, "s1")
+
+    run_turn(worker_b, db, worker_b.get(db, "s1"), "second", "b")
+    wait_saved(session_factory, "s1", 2)
+
+    with pytest.raises(SessionBusyError):
+        worker_a.start_turn(db, outdated, "from outdated copy", reply("x"))
+
+    assert outdated.turn == 1 and not outdated.streaming
+    row = wait_saved(session_factory, "s1", 2)
+    assert [message["content"] for message in row.messages] == ["first", "a", "second", "b"]
+    # 실패한 사본은 캐시에서 빠지고 다음 조회는 DB의 턴
+    assert worker_a.get(db, "s1").turn == 2
+    db.close()
+
+
+def save_in_progress(db, heartbeat_age: float):
+    save_development_session(
+        db,
+        session_id="s1",
+        messages=[{"role": "user", "content": "hello"}],
+        turn=1,
+        last_chunks=None,
+        stream_complete=False,
+        producer_id="other-worker",
+    )
+    row = get_development_session(db, "s1")
+    row.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=heartbeat_age)
+    db.commit()
+
+
+def test_turn_streaming_on_another_worker_is_not_interrupted(session_factory):
+    store = DevelopmentSessionStore(session_factory)
+    db = session_factory()
+    save_in_progress(db, heartbeat_age=1)
+
+    session = store.get(db, "s1")
+    assert session.streaming and session.remote
+    assert session.messages == [{"role": "user", "content": "hello"}]
+    with pytest.raises(SessionBusyError):
+        store.start_turn(db, session, "again", reply("x"))
+    db.close()
+
+
+def test_turn_with_stale_heartbeat_is_interrupted(session_factory, monkeypatch):
+    monkeypatch.setattr(session_store_module.settings, "DEVELOPMENT_SESSION_STALE_SECONDS", 30.0)
+    store = DevelopmentSessionStore(session_factory)
+    db = session_factory()
+    save_in_progress(db, heartbeat_age=60)
+
+    session = store.get(db, "s1")
+    assert not session.streaming
+    assert session.error == "Stream was interrupted"
+    assert session.messages == []
+    db.close()
+
+
+def test_remote_stream_is_sent_once_the_other_worker_saves_it(session_factory, monkeypatch):
+    monkeypatch.setattr(session_store_module, "REMOTE_POLL_SECONDS", 0.01)
+    store = DevelopmentSessionStore(session_factory)
+    db = session_factory()
+    save_in_progress(db, heartbeat_age=0)
+    session = store.get(db, "s1")
+
+    def finish():
+        other = session_factory()
+        save_development_session(
+            other,
+            session_id="s1",
+            messages=[{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi there"}],
+            turn=1,
+            last_chunks=["hi", " there"],
+            stream_complete=True,
+            expected_turn=1,
+            producer_id="other-worker",
+        )
+        other.close()
+
+    timer = threading.Timer(0.05, finish)
+    timer.start()
+    events = list(store.iter_events(session, after=(1, 0)))
+    timer.join()
+    assert events == [("chunk", ("1-1", " there"))]
+    db.close()